@@ -0,0 +1,50 @@
+"""Add trs_stats_rollup table
+
+Revision ID: c1d5a3f0e8b2
+Revises: b533c33be802
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import INTEGER, TINYINT
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c1d5a3f0e8b2'
+down_revision = 'b533c33be802'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'trs_stats_rollup',
+        sa.Column('worker', sa.String(100, collation='utf8mb4_unicode_ci'), primary_key=True),
+        sa.Column('period', TINYINT(1), primary_key=True, autoincrement=False),
+        sa.Column('period_start', INTEGER(11), primary_key=True, autoincrement=False),
+        sa.Column('mon', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+        sa.Column('mon_iv', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+        sa.Column('raid', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+        sa.Column('quest', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+        sa.Column('location_ok', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+        sa.Column('location_nok', INTEGER(11), nullable=False, server_default=sa.text("'0'")),
+    )
+    op.create_index('period_start', 'trs_stats_rollup', ['period', 'period_start'])
+    # Backfill from the stats currently stored
+    for period, period_length in ((0, 3600), (1, 86400)):
+        op.execute(
+            "INSERT INTO trs_stats_rollup (worker, period, period_start, mon, mon_iv, raid, quest) "
+            "SELECT worker, {period}, timestamp_scan - timestamp_scan % {length}, COALESCE(SUM(mon), 0), "
+            "COALESCE(SUM(mon_iv), 0), COALESCE(SUM(raid), 0), COALESCE(SUM(quest), 0) "
+            "FROM trs_stats_detect GROUP BY 1, 2, 3".format(period=period, length=period_length))
+        op.execute(
+            "INSERT INTO trs_stats_rollup (worker, period, period_start, location_ok, location_nok) "
+            "SELECT worker, {period}, timestamp_scan - timestamp_scan % {length}, SUM(location_ok), "
+            "SUM(location_nok) FROM trs_stats_location GROUP BY 1, 2, 3 "
+            "ON DUPLICATE KEY UPDATE location_ok = VALUES(location_ok), location_nok = VALUES(location_nok)"
+            .format(period=period, length=period_length))
+
+
+def downgrade():
+    op.drop_table('trs_stats_rollup')
@@ -0,0 +1,28 @@
+"""Add despawn_sec to trs_spawn
+
+Revision ID: d7a2c91f4e60
+Revises: c1d5a3f0e8b2
+Create Date: 2026-10-19 14:03:27.512946
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import SMALLINT
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd7a2c91f4e60'
+down_revision = 'c1d5a3f0e8b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trs_spawn', sa.Column('despawn_sec', SMALLINT(5, unsigned=True), nullable=True))
+    # Backfill from the MM:SS strings currently stored
+    op.execute("UPDATE trs_spawn SET despawn_sec = SUBSTRING(calc_endminsec, 1, 2) * 60 "
+               "+ SUBSTRING(calc_endminsec, 4, 2) WHERE calc_endminsec IS NOT NULL")
+
+
+def downgrade():
+    op.drop_column('trs_spawn', 'despawn_sec')
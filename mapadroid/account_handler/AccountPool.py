@@ -0,0 +1,325 @@
+import asyncio
+import datetime
+import functools
+import heapq
+import math
+import re
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.account_handler.AbstractAccountHandler import (AccountPurpose,
+                                                              BurnType)
+from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.db.helper.SettingsPogoauthHelper import (LoginType,
+                                                        SettingsPogoauthHelper)
+from mapadroid.db.model import SettingsPogoauth
+from mapadroid.utils.collections import Location
+from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
+from mapadroid.utils.global_variables import (MAINTENANCE_COOLDOWN_HOURS,
+                                              MIN_LEVEL_IV, MIN_LEVEL_RAID)
+from mapadroid.utils.madGlobals import MadGlobals
+
+# Accounts are bucketed by the level thresholds relevant for the purposes
+LEVEL_BUCKET_LOW: int = 0
+LEVEL_BUCKET_RAID: int = 1
+LEVEL_BUCKET_IV: int = 2
+LEVEL_BUCKETS_OF_PURPOSE: Dict[AccountPurpose, Tuple[int, ...]] = {
+    AccountPurpose.MON_RAID: (LEVEL_BUCKET_RAID, LEVEL_BUCKET_IV),
+    AccountPurpose.IV: (LEVEL_BUCKET_IV,),
+    AccountPurpose.QUEST: (LEVEL_BUCKET_IV,),
+    AccountPurpose.IV_QUEST: (LEVEL_BUCKET_IV,),
+    AccountPurpose.LEVEL: (LEVEL_BUCKET_LOW, LEVEL_BUCKET_RAID),
+}
+SUSPENSION_COOLDOWN_HOURS: int = 7 * 24
+# Candidates tried if the accounts picked turn out to be assigned by another process or removed meanwhile
+MAX_ASSIGNMENT_ATTEMPTS: int = 3
+
+
+class AccountPool:
+    """
+    Keeps the settings_pogoauth entries in memory, indexed by eligibility:
+    Unassigned PTC accounts which are not cooling down are kept in one heap per level bucket ordered by their last
+    burn, accounts cooling down after a burn are kept in a heap ordered by the end of their cooldown.
+    Selecting and assigning an account is done in memory without any await in between, changes are written through
+    to the DB afterwards. Changes done to the table by other parts of MAD (e.g., MADmin) are picked up by reloading
+    the pool every --account_pool_resync_interval seconds.
+    """
+
+    def __init__(self, db_wrapper: DbWrapper):
+        self.__db_wrapper: DbWrapper = db_wrapper
+        self.__accounts: Dict[int, SettingsPogoauth] = {}
+        # device_id -> account_id
+        self.__assignments: Dict[int, int] = {}
+        self.__free: Set[int] = set()
+        self.__google_accounts: Set[int] = set()
+        # level bucket -> heap of (last burn, account_id) of free PTC accounts, entries are invalidated lazily
+        self.__free_by_level: Dict[int, List[Tuple[float, int]]] = {}
+        # heap of (end of cooldown, account_id)
+        self.__cooldowns: List[Tuple[float, int]] = []
+        self.__last_sync: float = 0
+        self.__sync_lock: asyncio.Lock = asyncio.Lock()
+        self.__writes_started: int = 0
+        self.__pending_writes: int = 0
+
+    async def sync(self, force: bool = False) -> None:
+        """
+        (Re-)Loads all accounts from the DB if the pool is outdated
+        """
+        if not force and self.__last_sync + MadGlobals.application_args.account_pool_resync_interval > time.time():
+            return
+        async with self.__sync_lock:
+            if not force and self.__last_sync + MadGlobals.application_args.account_pool_resync_interval \
+                    > time.time():
+                return
+            writes_started: int = self.__writes_started
+            async with self.__db_wrapper as session, session:
+                accounts: List[SettingsPogoauth] = await SettingsPogoauthHelper.get_all(
+                    session, self.__db_wrapper.get_instance_id())
+                # Detach the entries to not have them refreshed outside a session
+                session.expunge_all()
+            if self.__pending_writes or writes_started != self.__writes_started:
+                # The snapshot may not contain changes done in the meantime, keep the current state and retry later
+                logger.debug("Accounts were modified while reloading the account pool, retrying later")
+                return
+            self.__rebuild(accounts)
+            self.__last_sync = time.time()
+            logger.debug("Loaded {} accounts ({} free) into the account pool", len(self.__accounts),
+                         len(self.__free))
+
+    def get_assigned(self, device_id: int) -> Optional[SettingsPogoauth]:
+        account_id: Optional[int] = self.__assignments.get(device_id)
+        return None if account_id is None else self.__accounts.get(account_id)
+
+    @staticmethod
+    def get_burn_expiry(auth: SettingsPogoauth) -> Optional[float]:
+        """
+        Returns: None if the account was never burnt, otherwise the timestamp at which the account can be used again
+        (inf in case of bans)
+        """
+        if auth.last_burn_type is None:
+            return None
+        elif auth.last_burn_type == BurnType.BAN.value:
+            return math.inf
+        elif auth.last_burn is None:
+            return None
+        elif auth.last_burn_type == BurnType.SUSPENDED.value:
+            # Account had the suspension screen, wait for 7 days for now
+            return (auth.last_burn + datetime.timedelta(hours=SUSPENSION_COOLDOWN_HOURS)).timestamp()
+        elif auth.last_burn_type == BurnType.MAINTENANCE.value:
+            return (auth.last_burn + datetime.timedelta(hours=MAINTENANCE_COOLDOWN_HOURS)).timestamp()
+        return None
+
+    def is_burnt(self, auth: SettingsPogoauth) -> bool:
+        burn_expiry: Optional[float] = self.get_burn_expiry(auth)
+        return burn_expiry is not None and burn_expiry > time.time()
+
+    async def acquire(self, device_id: int, purpose: AccountPurpose,
+                      is_usable: Callable[[SettingsPogoauth], bool],
+                      ggl_login_mail: Optional[str]) -> Optional[SettingsPogoauth]:
+        """
+        Picks the account to be used by the device and assigns it. The account currently assigned to the device is
+        released and considered as well.
+        Args:
+            device_id:
+            purpose: Used to determine the level buckets to pick from
+            is_usable: Additional check of candidates (e.g., softban cooldown based on the location to be scanned)
+            ggl_login_mail: The google login of the device which is preferred if usable
+
+        Returns: The account assigned or None if none is available
+        """
+        for _ in range(MAX_ASSIGNMENT_ATTEMPTS):
+            currently_assigned: Optional[SettingsPogoauth] = self.get_assigned(device_id)
+            if currently_assigned is not None:
+                self.__set_device(currently_assigned, None)
+            self.__release_cooled_down()
+            buckets: Tuple[int, ...] = LEVEL_BUCKETS_OF_PURPOSE.get(purpose, ())
+            login_to_use: Optional[SettingsPogoauth] = self.__pop_google_of_device(buckets, is_usable,
+                                                                                   ggl_login_mail)
+            if login_to_use is None:
+                login_to_use = self.__pop_ptc(buckets, is_usable)
+            if login_to_use is None:
+                if currently_assigned is not None:
+                    # Keep the previous assignment as it is
+                    self.__set_device(currently_assigned, device_id)
+                return None
+            self.__set_device(login_to_use, device_id)
+            if await self.__write_through(functools.partial(SettingsPogoauthHelper.assign_to_device,
+                                                            device_id=device_id,
+                                                            account_id=login_to_use.account_id)):
+                return login_to_use
+            # The pool was outdated, the previous assignment has been kept in the DB
+            logger.info("Account {} has been assigned elsewhere or removed meanwhile, reloading the account pool",
+                        login_to_use.username)
+            self.__forget(login_to_use)
+            if currently_assigned is not None:
+                self.__set_device(currently_assigned, device_id)
+            await self.sync(force=True)
+        return None
+
+    async def release(self, device_id: int) -> None:
+        currently_assigned: Optional[SettingsPogoauth] = self.get_assigned(device_id)
+        if currently_assigned is None:
+            return
+        logger.debug("Removing binding of {} from {}", device_id, currently_assigned.username)
+        self.__set_device(currently_assigned, None)
+        await self.__write_through(lambda session: SettingsPogoauthHelper.assign_to_device(session, device_id, None))
+
+    async def mark_burnt(self, auth: SettingsPogoauth, burn_type: Optional[BurnType]) -> None:
+        if burn_type is None:
+            auth.last_burn = None
+            auth.last_burn_type = None
+        else:
+            auth.last_burn = DatetimeWrapper.now()
+            auth.last_burn_type = burn_type.value
+        self.__index(auth)
+        await self.__write_through(lambda session: SettingsPogoauthHelper.update_values(
+            session, auth.account_id, last_burn=auth.last_burn, last_burn_type=auth.last_burn_type))
+
+    async def set_last_softban_action(self, auth: SettingsPogoauth, time_of_action: datetime.datetime,
+                                      location_of_action: Location) -> None:
+        auth.last_softban_action = time_of_action
+        auth.last_softban_action_location = (location_of_action.lat, location_of_action.lng)
+        await self.__write_through(lambda session: SettingsPogoauthHelper.update_values(
+            session, auth.account_id, last_softban_action=auth.last_softban_action,
+            last_softban_action_location=auth.last_softban_action_location))
+
+    async def set_level(self, auth: SettingsPogoauth, level: int) -> None:
+        auth.level = level
+        self.__index(auth)
+        await self.__write_through(lambda session: SettingsPogoauthHelper.update_values(
+            session, auth.account_id, level=level))
+
+    async def __write_through(self, write: Callable[[AsyncSession], Awaitable[Optional[bool]]]) -> bool:
+        """
+        Returns: False if the write returned False, i.e. it did not apply and has been rolled back
+        """
+        self.__writes_started += 1
+        self.__pending_writes += 1
+        try:
+            async with self.__db_wrapper as session, session:
+                applied: bool = await write(session) is not False
+                if applied:
+                    await session.commit()
+                else:
+                    await session.rollback()
+                return applied
+        except Exception:
+            # The pool may now deviate from the DB, reload it upon the next access
+            self.__last_sync = 0
+            raise
+        finally:
+            self.__pending_writes -= 1
+
+    def __rebuild(self, accounts: List[SettingsPogoauth]) -> None:
+        self.__accounts = {auth.account_id: auth for auth in accounts}
+        self.__assignments = {auth.device_id: auth.account_id for auth in accounts if auth.device_id is not None}
+        self.__free = set()
+        self.__google_accounts = {auth.account_id for auth in accounts
+                                  if auth.login_type == LoginType.GOOGLE.value}
+        self.__free_by_level = {LEVEL_BUCKET_LOW: [], LEVEL_BUCKET_RAID: [], LEVEL_BUCKET_IV: []}
+        self.__cooldowns = []
+        for auth in accounts:
+            self.__index(auth)
+
+    def __set_device(self, auth: SettingsPogoauth, device_id: Optional[int]) -> None:
+        if auth.device_id is not None and self.__assignments.get(auth.device_id) == auth.account_id:
+            del self.__assignments[auth.device_id]
+        auth.device_id = device_id
+        if device_id is not None:
+            self.__assignments[device_id] = auth.account_id
+        self.__index(auth)
+
+    def __forget(self, auth: SettingsPogoauth) -> None:
+        """
+        Removes the account from the pool until the next sync
+        """
+        self.__set_device(auth, None)
+        self.__free.discard(auth.account_id)
+        self.__accounts.pop(auth.account_id, None)
+
+    def __index(self, auth: SettingsPogoauth) -> None:
+        """
+        Adds the account to the free accounts or the cooldowns according to its current state. Existing heap entries
+        of the account are invalidated lazily.
+        """
+        self.__free.discard(auth.account_id)
+        if auth.device_id is not None:
+            return
+        burn_expiry: Optional[float] = self.get_burn_expiry(auth)
+        if burn_expiry is None or burn_expiry <= time.time():
+            self.__free.add(auth.account_id)
+            if auth.account_id not in self.__google_accounts:
+                heapq.heappush(self.__free_by_level[self.__get_level_bucket(auth)],
+                               (self.__get_sort_key(auth), auth.account_id))
+        elif burn_expiry != math.inf:
+            heapq.heappush(self.__cooldowns, (burn_expiry, auth.account_id))
+
+    def __release_cooled_down(self) -> None:
+        now: float = time.time()
+        while self.__cooldowns and self.__cooldowns[0][0] <= now:
+            _, account_id = heapq.heappop(self.__cooldowns)
+            auth: Optional[SettingsPogoauth] = self.__accounts.get(account_id)
+            if auth is not None and account_id not in self.__free:
+                self.__index(auth)
+
+    def __pop_google_of_device(self, buckets: Tuple[int, ...], is_usable: Callable[[SettingsPogoauth], bool],
+                               ggl_login_mail: Optional[str]) -> Optional[SettingsPogoauth]:
+        if not ggl_login_mail:
+            return None
+        for account_id in self.__google_accounts:
+            auth: SettingsPogoauth = self.__accounts[account_id]
+            if (account_id in self.__free and self.__get_level_bucket(auth) in buckets
+                    and re.search(auth.username, ggl_login_mail, re.IGNORECASE) and is_usable(auth)):
+                logger.info("Shortcut auth selection to google login {} set for device", auth.username)
+                return auth
+        return None
+
+    def __pop_ptc(self, buckets: Tuple[int, ...],
+                  is_usable: Callable[[SettingsPogoauth], bool]) -> Optional[SettingsPogoauth]:
+        # Pick the usable account with the oldest burn across the buckets of the purpose
+        candidates: List[Tuple[Tuple[float, int], int]] = []
+        for bucket in buckets:
+            entry: Optional[Tuple[float, int]] = self.__pop_usable(bucket, is_usable)
+            if entry is not None:
+                candidates.append((entry, bucket))
+        if not candidates:
+            return None
+        candidates.sort()
+        for entry, bucket in candidates[1:]:
+            heapq.heappush(self.__free_by_level[bucket], entry)
+        return self.__accounts[candidates[0][0][1]]
+
+    def __pop_usable(self, bucket: int, is_usable: Callable[[SettingsPogoauth], bool]) -> Optional[Tuple[float, int]]:
+        heap: List[Tuple[float, int]] = self.__free_by_level[bucket]
+        skipped: List[Tuple[float, int]] = []
+        found: Optional[Tuple[float, int]] = None
+        while heap:
+            entry: Tuple[float, int] = heapq.heappop(heap)
+            sort_key, account_id = entry
+            auth: Optional[SettingsPogoauth] = self.__accounts.get(account_id)
+            if (auth is None or account_id not in self.__free or self.__get_level_bucket(auth) != bucket
+                    or self.__get_sort_key(auth) != sort_key):
+                # Outdated entry
+                continue
+            elif is_usable(auth):
+                found = entry
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
+
+    @staticmethod
+    def __get_level_bucket(auth: SettingsPogoauth) -> int:
+        if auth.level >= MIN_LEVEL_IV:
+            return LEVEL_BUCKET_IV
+        elif auth.level >= MIN_LEVEL_RAID:
+            return LEVEL_BUCKET_RAID
+        return LEVEL_BUCKET_LOW
+
+    @staticmethod
+    def __get_sort_key(auth: SettingsPogoauth) -> float:
+        return 0 if auth.last_burn is None else auth.last_burn.timestamp()
@@ -19,6 +19,7 @@ from mapadroid.grpc.compiled.shared.Ack_pb2 import Ack
 from mapadroid.grpc.compiled.shared.Worker_pb2 import Worker
 from mapadroid.grpc.stubs.mitm_mapper.mitm_mapper_pb2_grpc import (
     MitmMapperServicer, add_MitmMapperServicer_to_server)
+from mapadroid.grpc.TimingInterceptor import TimingServerInterceptor
 from mapadroid.utils.collections import Location
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MadGlobals
@@ -38,7 +39,7 @@ class MitmMapperServer(MitmMapperServicer, MitmMapper):
         if MadGlobals.application_args.mitmmapper_compression:
             options.extend([('grpc.default_compression_algorithm', CompressionAlgorithm.gzip),
                             ('grpc.grpc.default_compression_level', CompressionLevel.medium)])
-        self.__server = grpc.aio.server(options=options)
+        self.__server = grpc.aio.server(options=options, interceptors=[TimingServerInterceptor()])
         add_MitmMapperServicer_to_server(self, self.__server)
         address = f'{MadGlobals.application_args.mitmmapper_ip}:{MadGlobals.application_args.mitmmapper_port}'
 
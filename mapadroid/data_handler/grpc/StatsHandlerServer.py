@@ -9,6 +9,7 @@ from mapadroid.grpc.compiled.shared.Ack_pb2 import Ack
 from mapadroid.grpc.compiled.stats_handler.stats_handler_pb2 import Stats
 from mapadroid.grpc.stubs.stats_handler.stats_handler_pb2_grpc import (
     StatsHandlerServicer, add_StatsHandlerServicer_to_server)
+from mapadroid.grpc.TimingInterceptor import TimingServerInterceptor
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.logging import LoggerEnums, get_logger
@@ -32,7 +33,7 @@ class StatsHandlerServer(StatsHandlerServicer, StatsHandler):
         if MadGlobals.application_args.statshandler_compression:
             options.extend([('grpc.default_compression_algorithm', CompressionAlgorithm.gzip),
                             ('grpc.grpc.default_compression_level', CompressionLevel.medium)])
-        self.__server = grpc.aio.server(options=options)
+        self.__server = grpc.aio.server(options=options, interceptors=[TimingServerInterceptor()])
         add_StatsHandlerServicer_to_server(self, self.__server)
         address = f'{MadGlobals.application_args.statshandler_ip}:{MadGlobals.application_args.statshandler_port}'
 
@@ -1,8 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import \
     AbstractStatsHolder
 from mapadroid.data_handler.stats.holder.stats_detect.StatsDetectHolder import \
@@ -13,13 +11,12 @@ from mapadroid.data_handler.stats.holder.stats_location_raw.StatsLocationRawHold
     StatsLocationRawHolder
 from mapadroid.data_handler.stats.holder.wild_mon_stats.WildMonStatsHolder import \
     WildMonStatsHolder
+from mapadroid.data_handler.stats.StatsSubmissionBatch import \
+    StatsSubmissionBatch
 from mapadroid.utils.collections import Location
-from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MadGlobals, PositionType, TransportType
 from mapadroid.worker.WorkerType import WorkerType
 
-logger = get_logger(LoggerEnums.stats_handler)
-
 
 class PlayerStats(AbstractStatsHolder):
     def __init__(self, origin: str):
@@ -35,27 +32,15 @@ class PlayerStats(AbstractStatsHolder):
             self._wild_mon_stats_holder: WildMonStatsHolder = WildMonStatsHolder(self._worker)
             self._stats_location_raw_holder: StatsLocationRawHolder = StatsLocationRawHolder(self._worker)
 
-    async def submit(self, session: AsyncSession) -> None:
+    def append_to(self, batch: StatsSubmissionBatch) -> None:
         holders_to_submit: List[AbstractStatsHolder] = [self._stats_detect_holder, self._stats_location_holder]
         if self._wild_mon_stats_holder:
             holders_to_submit.append(self._wild_mon_stats_holder)
-        if MadGlobals.application_args.game_stats_raw:
+        if self._stats_location_raw_holder:
             holders_to_submit.append(self._stats_location_raw_holder)
-        del self._stats_location_holder
-        del self._stats_detect_holder
-        del self._wild_mon_stats_holder
-        del self._stats_location_raw_holder
         self.__init_holders()
-
         for holder in holders_to_submit:
-            async with session.begin_nested() as nested:
-                try:
-                    await holder.submit(session)
-                    await nested.commit()
-                except Exception as e:
-                    await nested.rollback()
-                    logger.warning("Failed submitting stats: {}", e)
-        del holders_to_submit
+            holder.append_to(batch)
 
     def stats_collect_wild_mon(self, encounter_id: int, time_scanned: datetime):
         if self._wild_mon_stats_holder:
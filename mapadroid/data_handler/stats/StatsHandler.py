@@ -13,6 +13,9 @@ from mapadroid.data_handler.stats.holder.AbstractStatsHolder import \
 from mapadroid.data_handler.stats.holder.stats_detect_seen.StatsDetectSeenTypeHolder import \
     StatsDetectSeenTypeHolder
 from mapadroid.data_handler.stats.PlayerStats import PlayerStats
+from mapadroid.data_handler.stats.StatsSubmissionBatch import \
+    StatsSubmissionBatch
+from mapadroid.db.DbRetention import DbRetention
 from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.db.helper.TrsStatsDetectHelper import TrsStatsDetectHelper
 from mapadroid.db.helper.TrsStatsDetectWildMonRawHelper import \
@@ -20,6 +23,10 @@ from mapadroid.db.helper.TrsStatsDetectWildMonRawHelper import \
 from mapadroid.db.helper.TrsStatsLocationHelper import TrsStatsLocationHelper
 from mapadroid.db.helper.TrsStatsLocationRawHelper import \
     TrsStatsLocationRawHelper
+from mapadroid.db.helper.TrsStatsRollupHelper import TrsStatsRollupHelper
+from mapadroid.db.model import (TrsStatsDetect, TrsStatsDetectWildMonRaw,
+                                TrsStatsLocation, TrsStatsLocationRaw,
+                                TrsStatsRollup)
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.logging import LoggerEnums, get_logger
@@ -38,6 +45,7 @@ class StatsHandler(AbstractStatsHandler):
 
     def __init__(self, db_wrapper: DbWrapper):
         self.__db_wrapper = db_wrapper
+        self.__db_retention: DbRetention = DbRetention(db_wrapper)
         self.__submission_loop_task: Optional[Task] = None
         self.__stats_detect_seen_type_holder: Optional[StatsDetectSeenTypeHolder] = None
         self.__init_stats_holders()
@@ -107,16 +115,29 @@ class StatsHandler(AbstractStatsHandler):
 
     async def __run_stats_processing(self):
         logger.info("Running stats processing")
-        async with self.__db_wrapper as session, session:
+        # Swap the holders first, collecting stats continues on fresh holders while the batch is written
+        batch: StatsSubmissionBatch = self.__collect_submission_batch()
+        amount_of_rows: int = len(batch)
+        duration: float = await batch.submit(self.__db_wrapper,
+                                             MadGlobals.application_args.game_stats_submit_chunk_size)
+        logger.info("Submitted {} rows of stats in {:.3f}s", amount_of_rows, duration)
+        del batch
+        if self.__db_retention.is_enabled():
             try:
-                await self.__process_stats(session)
-                await session.commit()
+                await self.__expire_stats()
             except Exception as e:
                 logger.exception(e)
-                await session.rollback()
-
-    async def __process_stats(self, session: AsyncSession):
-        logger.info('Submitting stats')
+        else:
+            async with self.__db_wrapper as session, session:
+                try:
+                    await self.__cleanup_stats(session)
+                    await session.commit()
+                except Exception as e:
+                    logger.exception(e)
+                    await session.rollback()
+        logger.info("Done processing stats")
+
+    def __collect_submission_batch(self) -> StatsSubmissionBatch:
         submittable_stats: List[AbstractStatsHolder] = []
         if self.__stats_detect_seen_type_holder:
             submittable_stats.append(self.__stats_detect_seen_type_holder)
@@ -124,11 +145,10 @@ class StatsHandler(AbstractStatsHandler):
         submittable_stats.extend(self.__worker_stats.values())
         self.__worker_stats = None
         self.__init_stats_holders()
+        batch: StatsSubmissionBatch = StatsSubmissionBatch()
         for submittable in submittable_stats:
-            await submittable.submit(session)
-
-        await self.__cleanup_stats(session)
-        logger.info("Done submitting stats")
+            submittable.append_to(batch)
+        return batch
 
     async def __cleanup_stats(self, session: AsyncSession) -> None:
         delete_before_timestamp: int = int(time.time()) - 604800
@@ -138,3 +158,23 @@ class StatsHandler(AbstractStatsHandler):
                                                      raw_delete_shiny_days=int(MadGlobals.application_args.raw_delete_shiny))
         await TrsStatsLocationHelper.cleanup(session, delete_before_timestamp)
         await TrsStatsLocationRawHelper.cleanup(session, delete_before_timestamp)
+        await TrsStatsRollupHelper.cleanup(session, delete_before_timestamp)
+
+    async def __expire_stats(self) -> None:
+        delete_before_timestamp: int = int(time.time()) - 604800
+        await self.__db_retention.expire(TrsStatsDetect.__table__,
+                                         TrsStatsDetect.timestamp_scan < delete_before_timestamp,
+                                         delete_before_timestamp)
+        await self.__db_retention.expire(TrsStatsLocation.__table__,
+                                         TrsStatsLocation.timestamp_scan < delete_before_timestamp,
+                                         delete_before_timestamp)
+        await self.__db_retention.expire(TrsStatsLocationRaw.__table__,
+                                         TrsStatsLocationRaw.period < delete_before_timestamp,
+                                         delete_before_timestamp)
+        await self.__db_retention.expire(
+            TrsStatsDetectWildMonRaw.__table__,
+            TrsStatsDetectWildMonRawHelper.get_cleanup_condition(
+                DatetimeWrapper.fromtimestamp(delete_before_timestamp),
+                raw_delete_shiny_days=int(MadGlobals.application_args.raw_delete_shiny)))
+        await self.__db_retention.expire(TrsStatsRollup.__table__,
+                                         TrsStatsRollup.period_start < delete_before_timestamp)
@@ -0,0 +1,91 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.data_handler.stats.holder.StatsColumnBuffer import \
+    StatsColumnBuffer
+from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.db.helper.TrsStatsDetectHelper import TrsStatsDetectHelper
+from mapadroid.db.helper.TrsStatsDetectSeenTypeHelper import \
+    TrsStatsDetectSeenTypeHelper
+from mapadroid.db.helper.TrsStatsDetectWildMonRawHelper import \
+    TrsStatsDetectWildMonRawHelper
+from mapadroid.db.helper.TrsStatsLocationHelper import TrsStatsLocationHelper
+from mapadroid.db.helper.TrsStatsLocationRawHelper import \
+    TrsStatsLocationRawHelper
+from mapadroid.db.helper.TrsStatsRollupHelper import TrsStatsRollupHelper
+from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.madGlobals import StatsRollupPeriod
+
+logger = get_logger(LoggerEnums.stats_handler)
+
+
+class StatsSubmissionBatch:
+    """
+    Collects the columnar data of all stats holders of one submission interval (across all workers) and
+    writes it to the DB using multi-row statements. Every chunk is committed on its own to keep the
+    row locks on trs_stats_* short.
+    """
+
+    def __init__(self):
+        self.detect: StatsColumnBuffer = StatsColumnBuffer(
+            "worker", "timestamp_scan", "mon", "raid", "mon_iv", "quest")
+        self.location: StatsColumnBuffer = StatsColumnBuffer(
+            "worker", "timestamp_scan", "location_ok", "location_nok")
+        self.location_raw: StatsColumnBuffer = StatsColumnBuffer(
+            "worker", "lat", "lng", "fix_ts", "data_ts", "type", "walker", "success", "period", "transporttype")
+        self.wild_mon_raw: StatsColumnBuffer = StatsColumnBuffer(
+            "worker", "encounter_id", "count", "is_shiny", "first_scanned", "last_scanned")
+        self.seen_type: StatsColumnBuffer = StatsColumnBuffer(
+            "encounter_id", "encounter", "wild", "nearby_stop", "nearby_cell", "lure_encounter", "lure_wild")
+        self.rollup: StatsColumnBuffer = StatsColumnBuffer(
+            "worker", "period", "period_start", "mon", "mon_iv", "raid", "quest", "location_ok", "location_nok")
+
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer, _ in self.__get_submissions())
+
+    def __update_rollups(self) -> None:
+        """
+        Aggregates the detection and location stats of the batch to the hourly/daily rollups per worker
+        """
+        for source, counters in ((self.detect, ("mon", "mon_iv", "raid", "quest")),
+                                 (self.location, ("location_ok", "location_nok"))):
+            for source_row in source.rows():
+                for period in StatsRollupPeriod:
+                    period_start: int = TrsStatsRollupHelper.get_period_start(source_row["timestamp_scan"], period)
+                    key = (source_row["worker"], period.value, period_start)
+                    row: Optional[int] = self.rollup.row_of(key)
+                    if row is None:
+                        row = self.rollup.append(key, worker=source_row["worker"], period=period.value,
+                                                 period_start=period_start, mon=0, mon_iv=0, raid=0, quest=0,
+                                                 location_ok=0, location_nok=0)
+                    for counter in counters:
+                        self.rollup.add(counter, row, source_row[counter] or 0)
+
+    def __get_submissions(self) -> List[Tuple[StatsColumnBuffer,
+                                              Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[None]]]]:
+        return [(self.detect, TrsStatsDetectHelper.insert_bulk),
+                (self.location, TrsStatsLocationHelper.insert_bulk),
+                (self.location_raw, TrsStatsLocationRawHelper.insert_bulk),
+                (self.wild_mon_raw, TrsStatsDetectWildMonRawHelper.create_or_update_bulk),
+                (self.seen_type, TrsStatsDetectSeenTypeHelper.create_or_update_bulk),
+                (self.rollup, TrsStatsRollupHelper.add_bulk)]
+
+    async def submit(self, db_wrapper: DbWrapper, chunk_size: int) -> float:
+        """
+        Writes all rows to the DB in chunks of chunk_size rows per statement.
+        Returns: the time spent in seconds
+        """
+        start: float = time.perf_counter()
+        self.__update_rollups()
+        for buffer, insert_chunk in self.__get_submissions():
+            for chunk in buffer.chunks(chunk_size):
+                async with db_wrapper as session, session:
+                    try:
+                        await insert_chunk(session, chunk)
+                        await session.commit()
+                    except Exception as e:
+                        logger.warning("Failed submitting chunk of {} stats rows: {}", len(chunk), e)
+                        await session.rollback()
+        return time.perf_counter() - start
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from mapadroid.data_handler.stats.StatsSubmissionBatch import \
+    StatsSubmissionBatch
 
 
 class AbstractStatsHolder(ABC):
     @abstractmethod
-    async def submit(self, session: AsyncSession) -> None:
+    def append_to(self, batch: StatsSubmissionBatch) -> None:
+        """
+        Moves the data collected by the holder to the batch to be submitted.
+        The holder is not to be used afterwards.
+        """
         pass
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class StatsColumnBuffer:
+    """
+    Accumulates stats rows column-wise (one list per column) rather than as ORM instances.
+    Rows may optionally be registered with a key in order to update them in place (e.g. per encounter ID).
+    """
+
+    def __init__(self, *columns: str):
+        self.columns: Tuple[str, ...] = columns
+        self._values: Dict[str, List[Any]] = {column: [] for column in columns}
+        self._rows_by_key: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values[self.columns[0]])
+
+    def append(self, key: Optional[Hashable] = None, **values) -> int:
+        row: int = len(self)
+        for column in self.columns:
+            self._values[column].append(values.get(column))
+        if key is not None:
+            self._rows_by_key[key] = row
+        return row
+
+    def row_of(self, key: Hashable) -> Optional[int]:
+        return self._rows_by_key.get(key)
+
+    def get(self, column: str, row: int) -> Any:
+        return self._values[column][row]
+
+    def set(self, column: str, row: int, value: Any) -> None:
+        self._values[column][row] = value
+
+    def add(self, column: str, row: int, amount: int = 1) -> None:
+        self._values[column][row] += amount
+
+    def extend(self, other: "StatsColumnBuffer") -> None:
+        """
+        Appends all rows of other to this buffer. Keys of other are not carried over as keyed rows are
+        expected to be unique across the buffers merged (e.g. keyed per worker).
+        """
+        for column in self.columns:
+            self._values[column].extend(other._values[column])
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for row_values in zip(*(self._values[column] for column in self.columns)):
+            yield dict(zip(self.columns, row_values))
+
+    def chunks(self, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the rows in chunks of at most chunk_size as lists of dicts to be passed to multi-row inserts
+        """
+        columns: List[List[Any]] = [self._values[column] for column in self.columns]
+        for start in range(0, len(self), chunk_size):
+            yield [dict(zip(self.columns, row_values))
+                   for row_values in zip(*(values[start:start + chunk_size] for values in columns))]
@@ -1,34 +1,31 @@
 import time
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
-from mapadroid.data_handler.stats.holder.stats_detect.StatsDetectEntry import StatsDetectEntry
+from mapadroid.data_handler.stats.StatsSubmissionBatch import StatsSubmissionBatch
 
 
 class StatsDetectHolder(AbstractStatsHolder, AbstractWorkerHolder):
     def __init__(self, worker: str):
-        # Wild mon encounterID to counts seen mapping
         AbstractWorkerHolder.__init__(self, worker)
-        self._entry: StatsDetectEntry = StatsDetectEntry(worker)
+        self._mon: int = 0
+        self._raid: int = 0
+        self._mon_iv: int = 0
+        self._quest: int = 0
 
-    async def submit(self, session: AsyncSession) -> None:
-        self._entry.timestamp_scan = int(time.time())
-        async with session.begin_nested() as nested:
-            session.add(self._entry)
-            await nested.commit()
-        del self._entry
+    def append_to(self, batch: StatsSubmissionBatch) -> None:
+        batch.detect.append(worker=self._worker, timestamp_scan=int(time.time()), mon=self._mon,
+                            raid=self._raid, mon_iv=self._mon_iv, quest=self._quest)
 
     def add_mon(self, time_scanned: datetime) -> None:
-        self._entry.update(time_scanned, new_mons=1)
+        self._mon += 1
 
     def add_raid(self, time_scanned: datetime, amount: int = 1) -> None:
-        self._entry.update(time_scanned, new_raids=amount)
+        self._raid += amount
 
     def add_mon_iv(self, time_scanned: datetime) -> None:
-        self._entry.update(time_scanned, new_mon_ivs=1)
+        self._mon_iv += 1
 
     def add_quest(self, time_scanned: datetime) -> None:
-        self._entry.update(time_scanned, new_quests=1)
+        self._quest += 1
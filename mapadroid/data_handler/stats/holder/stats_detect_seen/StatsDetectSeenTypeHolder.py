@@ -1,49 +1,26 @@
 from datetime import datetime
-from typing import Dict
-
-import sqlalchemy
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
-from mapadroid.data_handler.stats.holder.stats_detect_seen.StatsDetectSeenTypeEntry import StatsDetectSeenTypeEntry
-from mapadroid.db.helper.TrsStatsDetectSeenTypeHelper import TrsStatsDetectSeenTypeHelper
-from mapadroid.utils.logging import get_logger, LoggerEnums
+from mapadroid.data_handler.stats.holder.StatsColumnBuffer import StatsColumnBuffer
+from mapadroid.data_handler.stats.StatsSubmissionBatch import StatsSubmissionBatch
 from mapadroid.utils.madGlobals import MonSeenTypes
 
-logger = get_logger(LoggerEnums.mitm_mapper)
-
 
 class StatsDetectSeenTypeHolder(AbstractStatsHolder):
     def __init__(self):
-        self._entries: Dict[int, StatsDetectSeenTypeEntry] = {}
-
-    async def submit(self, session: AsyncSession) -> None:
-        for encounter_id, stat_entry in self._entries.items():
-            async with session.begin_nested() as nested:
-                try:
-                    await TrsStatsDetectSeenTypeHelper.create_or_update(session, stat_entry)
-                    await nested.commit()
-                except sqlalchemy.exc.IntegrityError as e:
-                    logger.warning("Failed submitting seen type stats. {}", e)
-                    await nested.rollback()
-        del self._entries
+        self._entries: StatsColumnBuffer = StatsColumnBuffer(
+            "encounter_id", "encounter", "wild", "nearby_stop", "nearby_cell", "lure_encounter", "lure_wild")
 
-    def __ensure_entry_available(self, encounter_id: int) -> StatsDetectSeenTypeEntry:
-        if encounter_id not in self._entries:
-            self._entries[encounter_id] = StatsDetectSeenTypeEntry(encounter_id)
-        return self._entries[encounter_id]
+    def append_to(self, batch: StatsSubmissionBatch) -> None:
+        batch.seen_type.extend(self._entries)
 
     def add(self, encounter_id: int, type_of_detection: MonSeenTypes, time_of_scan: datetime) -> None:
-        entry: StatsDetectSeenTypeEntry = self.__ensure_entry_available(encounter_id)
-        if type_of_detection == MonSeenTypes.encounter:
-            entry.update(encounter=time_of_scan)
-        elif type_of_detection == MonSeenTypes.wild:
-            entry.update(wild=time_of_scan)
-        elif type_of_detection == MonSeenTypes.nearby_stop:
-            entry.update(nearby_stop=time_of_scan)
-        elif type_of_detection == MonSeenTypes.nearby_cell:
-            entry.update(nearby_cell=time_of_scan)
-        elif type_of_detection == MonSeenTypes.lure_encounter:
-            entry.update(lure_encounter=time_of_scan)
-        elif type_of_detection == MonSeenTypes.lure_wild:
-            entry.update(lure_wild=time_of_scan)
+        if type_of_detection not in (MonSeenTypes.encounter, MonSeenTypes.wild, MonSeenTypes.nearby_stop,
+                                     MonSeenTypes.nearby_cell, MonSeenTypes.lure_encounter,
+                                     MonSeenTypes.lure_wild):
+            return
+        row: Optional[int] = self._entries.row_of(encounter_id)
+        if row is None:
+            row = self._entries.append(encounter_id, encounter_id=encounter_id)
+        self._entries.set(type_of_detection.name, row, time_of_scan)
@@ -1,29 +1,25 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import time
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
-from mapadroid.data_handler.stats.holder.stats_location.StatsLocationEntry import StatsLocationEntry
-from mapadroid.utils.logging import get_logger, LoggerEnums
-
-logger = get_logger(LoggerEnums.mitm_mapper)
+from mapadroid.data_handler.stats.StatsSubmissionBatch import StatsSubmissionBatch
 
 
 class StatsLocationHolder(AbstractStatsHolder, AbstractWorkerHolder):
     def __init__(self, worker: str):
         AbstractWorkerHolder.__init__(self, worker)
-        self._entry: StatsLocationEntry = StatsLocationEntry(worker)
+        self._timestamp_scan: int = int(time.time())
+        self._location_ok: int = 0
+        self._location_nok: int = 0
 
-    async def submit(self, session: AsyncSession) -> None:
-        async with session.begin_nested() as nested:
-            try:
-                session.add(self._entry)
-                await nested.commit()
-            except Exception as e:
-                logger.warning("Failed submitting location data of {}", self._worker)
-        del self._entry
+    def append_to(self, batch: StatsSubmissionBatch) -> None:
+        batch.location.append(worker=self._worker, timestamp_scan=self._timestamp_scan,
+                              location_ok=self._location_ok, location_nok=self._location_nok)
 
     def add_location_ok(self, time_of_scan: int) -> None:
-        self._entry.update(time_of_scan, location_ok=True)
+        self._timestamp_scan = time_of_scan
+        self._location_ok += 1
 
     def add_location_not_ok(self, time_of_scan: int) -> None:
-        self._entry.update(time_of_scan, location_ok=False)
+        self._timestamp_scan = time_of_scan
+        self._location_nok += 1
@@ -1,10 +1,22 @@
 import asyncio
-from typing import Optional
+import time
+from typing import Optional, Tuple
 
 from loguru import logger
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     create_async_engine)
 
+from mapadroid.utils.metrics import Histogram
+
+SESSION_WAIT_SECONDS: Histogram = Histogram("mad_db_session_wait_seconds",
+                                            "Seconds waited for a DB session to be available")
+STATEMENT_SECONDS: Histogram = Histogram("mad_db_statement_seconds", "Seconds spent executing statements by type",
+                                         ["statement"])
+STATEMENT_TYPES: Tuple[str, ...] = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE")
+# Key of the start times of the statements running on a connection in Connection.info
+STATEMENT_STARTS_KEY: str = "mad_statement_starts"
+
 
 class DbAccessor:
     def __init__(self, connection_data: str, pool_size: int = 10):
@@ -16,7 +28,8 @@ class DbAccessor:
         self.__db_access_semaphore: Optional[asyncio.Semaphore] = None
 
     async def __aenter__(self) -> AsyncSession:
-        await self.__db_access_semaphore.acquire()
+        with SESSION_WAIT_SECONDS.time():
+            await self.__db_access_semaphore.acquire()
         return AsyncSession(self.__db_engine, autoflush=True)
 
     async def __aexit__(self, type_, value, traceback):
@@ -33,6 +46,9 @@ class DbAccessor:
             self.__db_engine: AsyncEngine = create_async_engine(
                 self.__connection_data, echo=False, pool_size=self.__pool_size
             )
+            event.listen(self.__db_engine.sync_engine, "before_cursor_execute", self.__before_cursor_execute)
+            event.listen(self.__db_engine.sync_engine, "after_cursor_execute", self.__after_cursor_execute)
+            event.listen(self.__db_engine.sync_engine, "handle_error", self.__handle_error)
 
     async def tear_down(self):
         async with self.__setup_lock:
@@ -40,6 +56,24 @@ class DbAccessor:
                 return
             await self.__db_engine.dispose()
 
+    @staticmethod
+    def __before_cursor_execute(conn, cursor, statement: str, parameters, context, executemany) -> None:
+        conn.info.setdefault(STATEMENT_STARTS_KEY, []).append(time.perf_counter())
+
+    @staticmethod
+    def __after_cursor_execute(conn, cursor, statement: str, parameters, context, executemany) -> None:
+        duration: float = time.perf_counter() - conn.info[STATEMENT_STARTS_KEY].pop()
+        start_of_statement: str = statement.lstrip()[:7].upper()
+        statement_type: str = next((statement_type for statement_type in STATEMENT_TYPES
+                                    if start_of_statement.startswith(statement_type)), "OTHER")
+        STATEMENT_SECONDS.labels(statement_type).observe(duration)
+
+    @staticmethod
+    def __handle_error(exception_context) -> None:
+        # Statements failing are not timed
+        if exception_context.connection is not None and exception_context.connection.info.get(STATEMENT_STARTS_KEY):
+            exception_context.connection.info[STATEMENT_STARTS_KEY].pop()
+
     @staticmethod
     def __convert_to_dict(descr, rows):
         desc = [n for n in descr]
@@ -2,9 +2,11 @@ import asyncio
 from asyncio import Task
 from typing import Optional
 
+from mapadroid.db.DbRetention import DbRetention
 from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.db.helper.PokemonHelper import PokemonHelper
 from mapadroid.db.helper.PokestopIncidentHelper import PokestopIncidentHelper
+from mapadroid.db.model import Pokemon, PokestopIncident
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MadGlobals
 
@@ -13,10 +15,12 @@ logger = get_logger(LoggerEnums.database_cleanup)
 
 class DbCleanup(object):
     __db_wrapper: DbWrapper
+    __db_retention: DbRetention
     __cleanup_task: Optional[Task]
 
     def __init__(self, db_wrapper: DbWrapper):
         self.__db_wrapper = db_wrapper
+        self.__db_retention = DbRetention(db_wrapper)
         self.__cleanup_task = None
 
     async def start(self):
@@ -34,6 +38,10 @@ class DbCleanup(object):
     async def _run_cleanup_routine(self):
         optimize_counter: int = 0
         while True:
+            if self.__db_retention.is_enabled():
+                await self.__run_chunked_cleanup()
+                await asyncio.sleep(MadGlobals.application_args.cleanup_interval)
+                continue
             try:
                 async with self.__db_wrapper as session, session:
                     mon_limit: Optional[int] = None if MadGlobals.application_args.delete_mons_limit <= 0 \
@@ -62,3 +70,31 @@ class DbCleanup(object):
                 logger.exception(e)
             await asyncio.sleep(MadGlobals.application_args.cleanup_interval)
             optimize_counter = (optimize_counter + 1) % 10
+
+    async def __run_chunked_cleanup(self) -> None:
+        """
+        Deletes expired mons and incidents in small chunks. No OPTIMIZE TABLE is run as the table is not
+        rebuilt to reclaim space of a huge delete.
+        """
+        try:
+            mon_limit: Optional[int] = None if MadGlobals.application_args.delete_mons_limit <= 0 \
+                else MadGlobals.application_args.delete_mons_limit
+            if MadGlobals.application_args.delete_mons_n_hours:
+                logger.info("Cleaning up records of mons disappeared more than {} hours ago.",
+                            MadGlobals.application_args.delete_mons_n_hours)
+                await self.__db_retention.expire(
+                    Pokemon.__table__,
+                    PokemonHelper.get_older_than_n_hours_condition(MadGlobals.application_args.delete_mons_n_hours),
+                    limit=mon_limit)
+            if MadGlobals.application_args.delete_incidents_n_hours:
+                logger.info("Cleaning up records of incidents disappeared more than {} hours ago.",
+                            MadGlobals.application_args.delete_incidents_n_hours)
+                await self.__db_retention.expire(
+                    PokestopIncident.__table__,
+                    PokestopIncidentHelper.get_older_than_n_hours_condition(
+                        MadGlobals.application_args.delete_incidents_n_hours),
+                    limit=mon_limit)
+            logger.success("Done cleaning up DB, sleeping {}s", MadGlobals.application_args.cleanup_interval)
+        except Exception as e:
+            logger.error("Failed cleaning up DB.")
+            logger.exception(e)
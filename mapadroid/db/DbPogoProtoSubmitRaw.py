@@ -47,11 +47,17 @@ from mapadroid.utils.madConstants import (REDIS_CACHETIME_CELLS,
                                           REDIS_CACHETIME_STOP_DETAILS,
                                           REDIS_CACHETIME_WEATHER)
 from mapadroid.utils.madGlobals import MadGlobals, MonSeenTypes, QuestLayer
+from mapadroid.utils.metrics import Histogram
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.s2Helper import S2Helper
+from mapadroid.webhook.WebhookChangeStream import (publish_changes,
+                                                   record_change)
 
 logger = get_logger(LoggerEnums.database)
 
+SUBMIT_SECONDS: Histogram = Histogram("mad_proto_submit_seconds", "Seconds spent submitting data of protos to the DB",
+                                      ["method"])
+
 
 class DbPogoProtoSubmitRaw:
     """
@@ -67,6 +73,15 @@ class DbPogoProtoSubmitRaw:
     async def setup(self):
         self._cache: Redis = await self._db_exec.get_cache()
 
+    @SUBMIT_SECONDS.labels("publish_webhook_changes").time()
+    async def publish_webhook_changes(self, session: AsyncSession) -> None:
+        """
+        Publishes the IDs of the mons, raids, quests, gyms, stops and weather written within the session for the webhook
+        worker. To be called once the session has been committed.
+        """
+        await publish_changes(self._cache, session)
+
+    @SUBMIT_SECONDS.labels("mons").time()
     async def mons(self, session: AsyncSession, timestamp: float,
                    map_proto: pogoprotos.GetMapObjectsOutProto) -> List[int]:
         """
@@ -145,6 +160,7 @@ class DbPogoProtoSubmitRaw:
                     try:
                         session.add(mon)
                         await nested_transaction.commit()
+                        record_change(session, "pokemon", encounter_id)
                         cache_time = int(despawn_time_unix - int(DatetimeWrapper.now().timestamp()))
                         if cache_time > 0:
                             await self._cache.set(cache_key, 1, ex=cache_time)
@@ -155,6 +171,7 @@ class DbPogoProtoSubmitRaw:
                 await session.commit()
         return encounter_ids_in_gmo
 
+    @SUBMIT_SECONDS.labels("mons_nearby").time()
     async def mons_nearby(self, session: AsyncSession, timestamp: float,
                           map_proto: pogoprotos.GetMapObjectsOutProto) -> Tuple[List[int], List[int]]:
         """
@@ -243,6 +260,7 @@ class DbPogoProtoSubmitRaw:
                         mon.last_modified = now
                         session.add(mon)
                         await nested_transaction.commit()
+                        record_change(session, "pokemon", encounter_id)
                         await self._cache.set(cache_key, 1, ex=MadGlobals.application_args.default_nearby_timeleft * 60)
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.debug("Failed committing nearby mon {} ({}). Safe to ignore.", encounter_id, str(e))
@@ -250,6 +268,7 @@ class DbPogoProtoSubmitRaw:
                     continue
         return cell_encounters, stop_encounters
 
+    @SUBMIT_SECONDS.labels("mon_iv").time()
     async def mon_iv(self, session: AsyncSession, timestamp: float,
                      encounter_proto: pogoprotos.EncounterOutProto) -> Optional[Tuple[int, bool]]:
         """
@@ -329,7 +348,9 @@ class DbPogoProtoSubmitRaw:
         logger.debug("Submitting IV {} scanned at {}", encounter_id, timestamp)
         session.add(mon)
         await self.maybe_save_ditto(session, pokemon_display, encounter_id, mon_id, pokemon_data)
+        record_change(session, "pokemon", encounter_id)
         await session.commit()
+        await self.publish_webhook_changes(session)
         cache_time = int(despawn_time_unix - int(DatetimeWrapper.now().timestamp()))
         if cache_time > 0:
             await self._cache.set(cache_key, 1, ex=cache_time)
@@ -354,6 +375,7 @@ class DbPogoProtoSubmitRaw:
             form = pokemon_display.form
         return form, gender, mon_id, move_1, move_2
 
+    @SUBMIT_SECONDS.labels("mon_lure_iv").time()
     async def mon_lure_iv(self, session: AsyncSession, timestamp: float,
                           encounter_proto: pogoprotos.DiskEncounterOutProto) -> Optional[Tuple[int, datetime]]:
         """
@@ -419,11 +441,13 @@ class DbPogoProtoSubmitRaw:
             session.add(mon)
             await self.maybe_save_ditto(session, display, encounter_id, mon_id, pokemon_data)
             await nested_transaction.commit()
+            record_change(session, "pokemon", encounter_id)
             await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_MON_LURE_IV)
             time_done = time.time() - time_start_submit
             logger.debug("Done updating mon lure IV in DB in {} seconds", time_done)
         return encounter_id, now
 
+    @SUBMIT_SECONDS.labels("mon_lure_noiv").time()
     async def mon_lure_noiv(self, session: AsyncSession, timestamp: float,
                             gmo: pogoprotos.GetMapObjectsOutProto) -> List[int]:
         """
@@ -478,6 +502,7 @@ class DbPogoProtoSubmitRaw:
                             logger.debug("Submitting lured non-IV mon {}", encounter_id)
                             session.add(mon)
                             await nested_transaction.commit()
+                            record_change(session, "pokemon", encounter_id)
                             await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_MON_LURE_IV)
                         except sqlalchemy.exc.IntegrityError as e:
                             logger.debug("Failed committing lured non-IV mon {} ({}). Safe to ignore.", encounter_id,
@@ -485,6 +510,7 @@ class DbPogoProtoSubmitRaw:
                             await nested_transaction.rollback()
         return encounter_ids
 
+    @SUBMIT_SECONDS.labels("update_seen_type_stats").time()
     async def update_seen_type_stats(self, session: AsyncSession, **kwargs):
         insert: Dict[int, Dict[MonSeenTypes, datetime]] = {}
         for seen_type in [MonSeenTypes.encounter, MonSeenTypes.wild, MonSeenTypes.nearby_stop,
@@ -531,6 +557,7 @@ class DbPogoProtoSubmitRaw:
                     await nested_transaction.rollback()
                     logger.debug("Failed submitting stat...")
 
+    @SUBMIT_SECONDS.labels("spawnpoints").time()
     async def spawnpoints(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto,
                           received_timestamp: int):
         logger.debug3("DbPogoProtoSubmit::spawnpoints called with data received")
@@ -586,6 +613,7 @@ class DbPogoProtoSubmitRaw:
                         spawn.first_detection = DatetimeWrapper.fromtimestamp(received_timestamp)
                     spawn.last_scanned = DatetimeWrapper.fromtimestamp(received_timestamp)
                     spawn.calc_endminsec = calcendtime
+                    spawn.despawn_sec = fulldate.minute * 60 + fulldate.second
                 else:
                     # TODO: Reduce "complexity..."
                     if spawn:
@@ -603,6 +631,7 @@ class DbPogoProtoSubmitRaw:
                 spawns_do_add.append(spawn)
         session.add_all(spawns_do_add)
 
+    @SUBMIT_SECONDS.labels("stops").time()
     async def stops(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto):
         """
         Update/Insert pokestops from a map_proto dict
@@ -623,6 +652,7 @@ class DbPogoProtoSubmitRaw:
             await self._cache.set(cell_cache_key, 1, ex=REDIS_CACHETIME_CELLS)
         return True
 
+    @SUBMIT_SECONDS.labels("stop_details").time()
     async def stop_details(self, session: AsyncSession, stop_proto: pogoprotos.FortDetailsOutProto):
         """
         Update/Insert pokestop details from a GMO
@@ -648,12 +678,14 @@ class DbPogoProtoSubmitRaw:
                 try:
                     session.add(stop)
                     await nested_transaction.commit()
+                    record_change(session, "pokestop", stop.pokestop_id)
                     await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_STOP_DETAILS)
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.warning("Failed committing stop details of {} ({})", stop.pokestop_id, str(e))
                     await nested_transaction.rollback()
         return stop is not None
 
+    @SUBMIT_SECONDS.labels("quest").time()
     async def quest(self, session: AsyncSession, quest_proto: pogoprotos.FortSearchOutProto,
                     quest_gen: QuestGen,
                     quest_layer: QuestLayer) -> bool:
@@ -743,11 +775,13 @@ class DbPogoProtoSubmitRaw:
             try:
                 session.add(quest)
                 await nested_transaction.commit()
+                record_change(session, "quest", fort_id)
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing quest of stop {}, ({})", fort_id, str(e))
                 await nested_transaction.rollback()
         return True
 
+    @SUBMIT_SECONDS.labels("gyms").time()
     async def gyms(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto, received_timestamp: int):
         """
         Update/Insert gyms from a map_proto dict
@@ -757,6 +791,14 @@ class DbPogoProtoSubmitRaw:
         if not cells:
             return False
         time_receiver: datetime = DatetimeWrapper.fromtimestamp(received_timestamp)
+        # The weather cells of all gyms at once, gyms of a GMO mostly share one weather cell
+        gyms: List[pogoprotos.PokemonFortProto] = [fort for cell in cells for fort in cell.fort
+                                                   if fort.fort_type == pogoprotos.FortType.GYM]
+        weather_cell_ids = S2Helper.lat_lng_to_cell_ids([gym.latitude for gym in gyms],
+                                                        [gym.longitude for gym in gyms])
+        weather_cell_of_gym: Dict[str, int] = {gym.fort_id: int(s2_cell_id)
+                                               for gym, s2_cell_id in zip(gyms, weather_cell_ids)}
+        gameplay_weather_of_cell: Dict[int, int] = {}
         for cell in cells:
             cell_id: int = cell.s2_cell_id
             cell_cache_key: str = f"gyms_{cell_id}"
@@ -768,9 +810,11 @@ class DbPogoProtoSubmitRaw:
                     last_modified_ts: float = gym.last_modified_ms / 1000
                     last_modified: datetime = DatetimeWrapper.fromtimestamp(
                         last_modified_ts)
-                    s2_cell_id = S2Helper.lat_lng_to_cell_id(gym.latitude, gym.longitude)
-                    weather: Optional[Weather] = await WeatherHelper.get(session, str(s2_cell_id))
-                    gameplay_weather: int = weather.gameplay_weather if weather is not None else 0
+                    s2_cell_id: int = weather_cell_of_gym[gymid]
+                    if s2_cell_id not in gameplay_weather_of_cell:
+                        weather: Optional[Weather] = await WeatherHelper.get(session, str(s2_cell_id))
+                        gameplay_weather_of_cell[s2_cell_id] = weather.gameplay_weather if weather is not None else 0
+                    gameplay_weather: int = gameplay_weather_of_cell[s2_cell_id]
                     cache_key = "gym{}{}{}".format(gymid, last_modified_ts, gameplay_weather)
                     if await self._cache.exists(cache_key):
                         continue
@@ -810,6 +854,7 @@ class DbPogoProtoSubmitRaw:
                             session.add(gym_obj)
                             session.add(gym_detail)
                             await nested_transaction.commit()
+                            record_change(session, "gym", gymid)
                             await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_GYMS)
                         except sqlalchemy.exc.IntegrityError as e:
                             logger.warning("Failed committing gym data of {} ({})", gymid, str(e))
@@ -818,6 +863,7 @@ class DbPogoProtoSubmitRaw:
             await self._cache.set(cell_cache_key, 1, ex=REDIS_CACHETIME_CELLS)
         return True
 
+    @SUBMIT_SECONDS.labels("gym_info").time()
     async def gym_info(self, session: AsyncSession, gym_info: pogoprotos.GymGetInfoOutProto):
         """
         Update gyms from a map_proto dict
@@ -851,11 +897,13 @@ class DbPogoProtoSubmitRaw:
                 try:
                     session.add(gym_detail)
                     await nested_transaction.commit()
+                    record_change(session, "gym", gym_id)
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.warning("Failed committing gym info {} ({})", gym_id, str(e))
                     await nested_transaction.rollback()
         return True
 
+    @SUBMIT_SECONDS.labels("raids").time()
     async def raids(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto, timestamp: int) -> int:
         """
         Update/Insert raids from a map_proto dict
@@ -935,6 +983,7 @@ class DbPogoProtoSubmitRaw:
                         try:
                             session.add(raid)
                             await nested_transaction.commit()
+                            record_change(session, "raid", gymid)
                             await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_RAIDS)
                         except sqlalchemy.exc.IntegrityError as e:
                             logger.warning("Failed committing raid for gym {} ({})", gymid, str(e))
@@ -942,6 +991,7 @@ class DbPogoProtoSubmitRaw:
         logger.debug3("DbPogoProtoSubmit::raids: Done submitting raids with data received")
         return raids_seen
 
+    @SUBMIT_SECONDS.labels("routes").time()
     async def routes(self, session: AsyncSession, routes_proto: pogoprotos.GetRoutesOutProto,
                      timestamp_received: int) -> None:
         logger.debug3("DbPogoProtoSubmit::routes called with data received")
@@ -1032,6 +1082,7 @@ class DbPogoProtoSubmitRaw:
                 logger.warning("Failed committing route {} of cell {} ({})", route_id, s2_cell_id, str(e))
                 await nested_transaction.rollback()
 
+    @SUBMIT_SECONDS.labels("weather").time()
     async def weather(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto,
                       received_timestamp: int) -> bool:
         """
@@ -1047,6 +1098,7 @@ class DbPogoProtoSubmitRaw:
             await self._handle_weather_data(session, client_weather, time_of_day, received_timestamp)
         return True
 
+    @SUBMIT_SECONDS.labels("cells").time()
     async def cells(self, session: AsyncSession, map_proto: pogoprotos.GetMapObjectsOutProto):
         protocells: RepeatedCompositeFieldContainer[pogoprotos.ClientMapCellProto] = map_proto.map_cell
 
@@ -1105,6 +1157,7 @@ class DbPogoProtoSubmitRaw:
                 logger.debug("Adding or updating incident {}", incident_id)
                 session.add(incident)
                 await nested_transaction.commit()
+                record_change(session, "pokestop", stop_id)
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing incident {} for pokestop {} ({})",
                                incident_id, stop_id, str(e))
@@ -1173,6 +1226,7 @@ class DbPogoProtoSubmitRaw:
             try:
                 session.add(pokestop)
                 await nested_transaction.commit()
+                record_change(session, "pokestop", stop_id)
                 await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_POKESTOP_DATA)
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing stop {} ({})", stop_id, str(e))
@@ -1247,6 +1301,7 @@ class DbPogoProtoSubmitRaw:
                 session.add(weather)
                 await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_WEATHER)
                 await nested_transaction.commit()
+                record_change(session, "weather", weather.s2_cell_id)
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing weather of cell {} ({})", cell_id, str(e))
                 await nested_transaction.rollback()
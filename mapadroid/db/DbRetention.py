@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, ColumnElement, Table, delete, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.db.model import (TrsStatsDetect, TrsStatsLocation,
+                                TrsStatsLocationRaw)
+from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.madGlobals import MadGlobals
+
+logger = get_logger(LoggerEnums.database_cleanup)
+
+# Tables which can be partitioned by day on an unix timestamp column. The primary key of those tables is extended by
+# the timestamp column as MariaDB requires the partitioning column to be part of every unique key. This is only done
+# with --db_cleanup_partitioning, the models keep the primary key on id as inserts never rely on it.
+PARTITIONABLE_TABLES: Dict[str, Column] = {
+    TrsStatsDetect.__tablename__: TrsStatsDetect.timestamp_scan,
+    TrsStatsLocation.__tablename__: TrsStatsLocation.timestamp_scan,
+    TrsStatsLocationRaw.__tablename__: TrsStatsLocationRaw.period,
+}
+PARTITION_MAX: str = "pmax"
+SECONDS_PER_DAY: int = 86400
+
+
+class DbRetention:
+    """
+    Expires rows of high-churn tables without running one huge DELETE (and OPTIMIZE TABLE afterwards).
+    If enabled (--db_cleanup_partitioning), tables listed in PARTITIONABLE_TABLES are partitioned by day (once, the
+    first time the cleanup runs with the flag set) and expired data is removed by dropping partitions (metadata-only).
+    All other tables are cleaned up in bounded, primary-key ordered chunks with a pause in between to not block
+    ingest.
+    """
+
+    def __init__(self, db_wrapper: DbWrapper):
+        self.__db_wrapper: DbWrapper = db_wrapper
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return MadGlobals.application_args.db_cleanup_partitioning
+
+    async def expire(self, table: Table, condition: ColumnElement,
+                     delete_before_timestamp: Optional[int] = None, limit: Optional[int] = None) -> int:
+        """
+        Removes the rows of table matching condition.
+        Args:
+            table: The table to clean up
+            condition: The where condition of rows to be removed
+            delete_before_timestamp: If the table is partitionable, partitions only containing rows older than the
+            timestamp are dropped instead of deleting rows matching the condition
+            limit: Rows to be deleted at most (if rows are deleted), all rows matching if None
+
+        Returns: Amount of rows deleted (not including rows of dropped partitions)
+        """
+        if delete_before_timestamp is not None and table.name in PARTITIONABLE_TABLES:
+            try:
+                if await self.__maintain_partitions(table.name, delete_before_timestamp):
+                    return 0
+            except Exception as e:
+                logger.warning("Failed maintaining partitions of {}, falling back to chunked deletes: {}",
+                               table.name, e)
+        return await self.delete_in_chunks(table, condition, limit)
+
+    async def delete_in_chunks(self, table: Table, condition: ColumnElement, limit: Optional[int] = None) -> int:
+        primary_key: List[Column] = list(table.primary_key.columns)
+        pk_expression = primary_key[0] if len(primary_key) == 1 else tuple_(*primary_key)
+        deleted: int = 0
+        while limit is None or deleted < limit:
+            chunk_size: int = MadGlobals.application_args.db_cleanup_chunk_size
+            if limit is not None:
+                chunk_size = min(chunk_size, limit - deleted)
+            async with self.__db_wrapper as session, session:
+                select_stmt = select(*primary_key).where(condition).order_by(*primary_key).limit(chunk_size)
+                result = await session.execute(select_stmt)
+                keys = [row[0] if len(primary_key) == 1 else tuple(row) for row in result.all()]
+                if keys:
+                    await session.execute(delete(table).where(pk_expression.in_(keys)))
+                await session.commit()
+            deleted += len(keys)
+            if len(keys) < chunk_size:
+                break
+            # Give the ingest a chance to acquire the locks
+            await asyncio.sleep(MadGlobals.application_args.db_cleanup_chunk_pause)
+        logger.info("Removed {} rows of {}", deleted, table.name)
+        return deleted
+
+    async def __maintain_partitions(self, table_name: str, delete_before_timestamp: int) -> bool:
+        async with self.__db_wrapper as session, session:
+            partitions: Dict[str, Optional[int]] = await self.__get_partitions(session, table_name)
+            if not partitions:
+                await self.__partition_table(session, table_name, delete_before_timestamp)
+                partitions = await self.__get_partitions(session, table_name)
+            if PARTITION_MAX not in partitions:
+                logger.warning("Table {} is partitioned in an unknown way, not touching its partitions", table_name)
+                return False
+            await self.__create_future_partitions(session, table_name, partitions)
+            expired: List[str] = [name for name, less_than in partitions.items()
+                                  if less_than is not None and less_than <= delete_before_timestamp]
+            if expired:
+                logger.info("Dropping partitions {} of {}", expired, table_name)
+                await session.execute(text("ALTER TABLE {} DROP PARTITION {}".format(table_name, ", ".join(expired))))
+            await session.commit()
+        return True
+
+    @staticmethod
+    async def __get_partitions(session: AsyncSession, table_name: str) -> Dict[str, Optional[int]]:
+        """
+        Returns: partition name -> upper bound (exclusive) of the partition, None for MAXVALUE
+        """
+        stmt = text("SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name AND PARTITION_NAME IS NOT NULL "
+                    "ORDER BY PARTITION_ORDINAL_POSITION")
+        result = await session.execute(stmt, {"table_name": table_name})
+        return {name: None if description == "MAXVALUE" else int(description)
+                for name, description in result.all()}
+
+    @staticmethod
+    def __partition_definition(day_start: int) -> str:
+        day_end: int = day_start + SECONDS_PER_DAY
+        return "PARTITION p{} VALUES LESS THAN ({})".format(time.strftime("%Y%m%d", time.gmtime(day_start)), day_end)
+
+    @staticmethod
+    def __days_to_create(first_day_start: int) -> List[int]:
+        today: int = int(time.time()) // SECONDS_PER_DAY * SECONDS_PER_DAY
+        last_day: int = today + MadGlobals.application_args.db_cleanup_partitions_ahead * SECONDS_PER_DAY
+        return list(range(first_day_start, last_day + 1, SECONDS_PER_DAY))
+
+    async def __partition_table(self, session: AsyncSession, table_name: str, delete_before_timestamp: int) -> None:
+        column: str = PARTITIONABLE_TABLES[table_name].name
+        logger.warning("Partitioning table {} by {}. This rebuilds the table once and may take a while.",
+                       table_name, column)
+        await session.execute(text("ALTER TABLE {} DROP PRIMARY KEY, ADD PRIMARY KEY (id, {})"
+                                   .format(table_name, column)))
+        first_day: int = delete_before_timestamp // SECONDS_PER_DAY * SECONDS_PER_DAY
+        definitions: List[str] = ["PARTITION pold VALUES LESS THAN ({})".format(first_day)]
+        definitions.extend(self.__partition_definition(day) for day in self.__days_to_create(first_day))
+        definitions.append("PARTITION {} VALUES LESS THAN MAXVALUE".format(PARTITION_MAX))
+        await session.execute(text("ALTER TABLE {} PARTITION BY RANGE ({}) ({})"
+                                   .format(table_name, column, ", ".join(definitions))))
+
+    async def __create_future_partitions(self, session: AsyncSession, table_name: str,
+                                         partitions: Dict[str, Optional[int]]) -> None:
+        bounds: List[int] = [less_than for less_than in partitions.values() if less_than is not None]
+        if bounds:
+            first_day: int = max(bounds)
+        else:
+            # Only pmax exists (e.g. partitioned by hand), the first daily partition created takes all rows older too
+            first_day = int(time.time()) // SECONDS_PER_DAY * SECONDS_PER_DAY
+        definitions: List[str] = [self.__partition_definition(day)
+                                  for day in self.__days_to_create(first_day)]
+        if not definitions:
+            return
+        definitions.append("PARTITION {} VALUES LESS THAN MAXVALUE".format(PARTITION_MAX))
+        # pmax is expected to be empty, reorganizing it is cheap
+        await session.execute(text("ALTER TABLE {} REORGANIZE PARTITION {} INTO ({})"
+                                   .format(table_name, PARTITION_MAX, ", ".join(definitions))))
@@ -1,5 +1,5 @@
 import json
-from typing import Tuple, List, Dict, Optional, Set, Any
+from typing import Tuple, List, Dict, Optional, Set, Any, Collection
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,11 +19,12 @@ logger = get_logger(LoggerEnums.webhook)
 
 class DbWebhookReader:
     @staticmethod
-    async def get_raids_changed_since(session: AsyncSession, _timestamp: int):
+    async def get_raids_changed_since(session: AsyncSession, _timestamp: int,
+                                      gym_ids: Optional[Collection[str]] = None):
         logger.debug2("DbWebhookReader::get_raids_changed_since called")
         # TODO: Consider geofences?
-        raids_changed: List[Tuple[Raid, GymDetail, Gym]] = await RaidHelper.get_raids_changed_since(session,
-                                                                                                    _timestamp=_timestamp)
+        raids_changed: List[Tuple[Raid, GymDetail, Gym]] = await RaidHelper.get_raids_changed_since(
+            session, _timestamp=_timestamp, gym_ids=gym_ids)
 
         ret = []
         for (raid, gym_detail, gym) in raids_changed:
@@ -54,9 +55,11 @@ class DbWebhookReader:
         return ret
 
     @staticmethod
-    async def get_weather_changed_since(session: AsyncSession, _timestamp: int):
+    async def get_weather_changed_since(session: AsyncSession, _timestamp: int,
+                                        s2_cell_ids: Optional[Collection[str]] = None):
         logger.debug2("DbWebhookReader::get_weather_changed_since called")
-        weather_changed: List[Weather] = await WeatherHelper.get_changed_since(session, _timestamp=_timestamp)
+        weather_changed: List[Weather] = await WeatherHelper.get_changed_since(session, _timestamp=_timestamp,
+                                                                               s2_cell_ids=s2_cell_ids)
 
         ret = []
         for weather in weather_changed:
@@ -79,17 +82,19 @@ class DbWebhookReader:
         return ret
 
     @staticmethod
-    async def get_quests_changed_since(session: AsyncSession, _timestamp: int) -> Dict[int, Tuple[Pokestop,
-                                                                                                  Dict[int, TrsQuest]]]:
+    async def get_quests_changed_since(session: AsyncSession, _timestamp: int,
+                                       pokestop_ids: Optional[Collection[str]] = None) \
+            -> Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]:
         logger.debug2("DbWebhookReader::get_quests_changed_since called")
         quests_with_changes: Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]] = await PokestopHelper.get_with_quests(
-            session, timestamp=_timestamp)
+            session, timestamp=_timestamp, pokestop_ids=pokestop_ids)
         return quests_with_changes
 
     @staticmethod
-    async def get_gyms_changed_since(session: AsyncSession, _timestamp: int):
+    async def get_gyms_changed_since(session: AsyncSession, _timestamp: int,
+                                     gym_ids: Optional[Collection[str]] = None):
         logger.debug2("DbWebhookReader::get_gyms_changed_since called")
-        gyms_changed: List[Tuple[Gym, GymDetail]] = await GymHelper.get_changed_since(session, _timestamp)
+        gyms_changed: List[Tuple[Gym, GymDetail]] = await GymHelper.get_changed_since(session, _timestamp, gym_ids)
 
         ret = []
         for (gym, gym_detail) in gyms_changed:
@@ -114,10 +119,11 @@ class DbWebhookReader:
         return ret
 
     @staticmethod
-    async def get_stops_changed_since(session: AsyncSession, _timestamp: int) -> List[Dict[str, Any]]:
+    async def get_stops_changed_since(session: AsyncSession, _timestamp: int,
+                                      pokestop_ids: Optional[Collection[str]] = None) -> List[Dict[str, Any]]:
         logger.debug2("DbWebhookReader::get_stops_changed_since called")
         stops_with_changes: Dict[Pokestop, List[PokestopIncident]] = await PokestopHelper\
-            .get_changed_since_or_incidents(session, _timestamp)
+            .get_changed_since_or_incidents(session, _timestamp, pokestop_ids)
         ret: List[Dict[str, Any]] = []
         for stop, incidents in stops_with_changes.items():
             stop_entry: Dict[str, Any] = {
@@ -148,14 +154,16 @@ class DbWebhookReader:
 
     @staticmethod
     async def get_mon_changed_since(session: AsyncSession, _timestamp: int,
-                                    mon_types: Optional[Set[MonSeenTypes]] = None):
+                                    mon_types: Optional[Set[MonSeenTypes]] = None,
+                                    encounter_ids: Optional[Collection[int]] = None):
         logger.debug2("DbWebhookReader::get_mon_changed_since called")
         mons_with_changes: List[
             Tuple[Pokemon, TrsSpawn, Optional[Pokestop], Optional[
                 PokemonDisplay]]] = await PokemonHelper.get_changed_since(
             session,
             _timestamp,
-            mon_types)
+            mon_types,
+            encounter_ids)
         ret = []
         for (mon, spawn, stop, mon_display) in mons_with_changes:
             if mon.latitude == 0 and mon.seen_type == MonSeenTypes.lure_encounter.value:
@@ -8,12 +8,12 @@ from typing import Optional
 import redis as Redis
 from aiofile import async_open
 from loguru import logger
-from redis import asyncio as aioredis
 from sqlalchemy import text
 
 from alembic import command
 from alembic.config import Config
 from mapadroid.db.DbAccessor import DbAccessor
+from mapadroid.db.TimedRedis import TimedRedis
 from mapadroid.db.helper.TrsEventHelper import TrsEventHelper
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 
@@ -54,7 +54,7 @@ class PooledQueryExecutor:
                 redis_credentials["password"] = self.args.cache_password
             if self.args.cache_database:
                 redis_credentials["db"] = self.args.cache_database
-            self._redis_cache: Redis = await aioredis.Redis(**redis_credentials)
+            self._redis_cache: Redis = await TimedRedis(**redis_credentials)
             await self._redis_cache.ping()
 
     async def get_cache(self) -> Redis:
@@ -0,0 +1,16 @@
+from redis.asyncio import Redis
+
+from mapadroid.utils.metrics import Histogram
+
+REDIS_COMMAND_SECONDS: Histogram = Histogram("mad_redis_command_seconds", "Seconds spent executing redis commands",
+                                             ["command"])
+
+
+class TimedRedis(Redis):
+    """
+    Redis client recording the duration of each command sent (not of pipelines) by the name of the command
+    """
+
+    async def execute_command(self, *args, **options):
+        with REDIS_COMMAND_SECONDS.labels(str(args[0]).upper()).time():
+            return await super().execute_command(*args, **options)
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -88,10 +88,13 @@ class GymHelper:
         return team_count
 
     @staticmethod
-    async def get_changed_since(session: AsyncSession, timestamp: int) -> List[Tuple[Gym, GymDetail]]:
+    async def get_changed_since(session: AsyncSession, timestamp: int,
+                                gym_ids: Optional[Collection[str]] = None) -> List[Tuple[Gym, GymDetail]]:
         stmt = select(Gym, GymDetail) \
             .join(GymDetail, GymDetail.gym_id == Gym.gym_id, isouter=False) \
             .where(Gym.last_modified >= DatetimeWrapper.fromtimestamp(timestamp))
+        if gym_ids is not None:
+            stmt = stmt.where(Gym.gym_id.in_(gym_ids))
         # TODO: Consider last_scanned above
         result = await session.execute(stmt)
         return result.all()
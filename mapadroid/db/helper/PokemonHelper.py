@@ -1,9 +1,9 @@
 import datetime
 import time
 from functools import reduce
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Collection, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import Result, and_, delete, desc, func, text
+from sqlalchemy import ColumnElement, Result, and_, delete, desc, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -294,7 +294,8 @@ class PokemonHelper:
 
     @staticmethod
     async def get_changed_since(session: AsyncSession, _timestamp: int,
-                                mon_types: Optional[Set[MonSeenTypes]] = None) -> List[Tuple[Pokemon, TrsSpawn,
+                                mon_types: Optional[Set[MonSeenTypes]] = None,
+                                encounter_ids: Optional[Collection[int]] = None) -> List[Tuple[Pokemon, TrsSpawn,
     Optional[Pokestop],
     Optional[PokemonDisplay]]]:
         if not mon_types:
@@ -312,13 +313,19 @@ class PokemonHelper:
         stmt = stmt.join(PokemonDisplay, Pokemon.encounter_id == PokemonDisplay.encounter_id, isouter=True)
         stmt = stmt.where(and_(Pokemon.last_modified >= DatetimeWrapper.fromtimestamp(_timestamp),
                                Pokemon.seen_type.in_(raw_types)))
+        if encounter_ids is not None:
+            stmt = stmt.where(Pokemon.encounter_id.in_(encounter_ids))
 
         result = await session.execute(stmt)
         return result.all()
 
+    @staticmethod
+    def get_older_than_n_hours_condition(hours: int) -> ColumnElement:
+        return Pokemon.disappear_time < DatetimeWrapper.now() - datetime.timedelta(hours=hours)
+
     @staticmethod
     async def delete_older_than_n_hours(session: AsyncSession, hours: int, limit: Optional[int]) -> None:
-        where_condition = Pokemon.disappear_time < DatetimeWrapper.now() - datetime.timedelta(hours=hours)
+        where_condition = PokemonHelper.get_older_than_n_hours_condition(hours)
         stmt = delete(Pokemon).where(where_condition)
         if limit:
             # Rather ugly construct as stmt.with_dialect_options currently does not work
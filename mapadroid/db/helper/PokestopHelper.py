@@ -1,6 +1,6 @@
 from datetime import datetime
 from operator import or_
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -59,6 +59,24 @@ class PokestopHelper:
         else:
             return list_of_coords
 
+    @staticmethod
+    async def get_ids_and_locations_in_fence(session: AsyncSession,
+                                             geofence_helper: GeofenceHelper) -> List[Tuple[str, Location]]:
+        """
+        Loads only the IDs and coordinates of the stops rather than the entire rows
+        Returns: The ID and location of the stops inside the geofence
+        """
+        min_lat, min_lon, max_lat, max_lon = geofence_helper.get_polygon_from_fence()
+        stmt = select(Pokestop.pokestop_id, Pokestop.latitude, Pokestop.longitude) \
+            .where(and_(Pokestop.latitude >= min_lat, Pokestop.longitude >= min_lon,
+                        Pokestop.latitude <= max_lat, Pokestop.longitude <= max_lon))
+        result = await session.execute(stmt)
+        stops: List[Tuple[str, Location]] = [(pokestop_id, Location(float(latitude), float(longitude)))
+                                             for pokestop_id, latitude, longitude in result.all()]
+        inside: List[bool] = geofence_helper.are_coords_inside_include_geofence(
+            [(location.lat, location.lng) for _, location in stops])
+        return [stop for stop, is_inside in zip(stops, inside) if is_inside]
+
     @staticmethod
     async def any_stops_unvisited(session: AsyncSession, geofence_helper: GeofenceHelper, origin: str) -> bool:
         return len(await PokestopHelper.stops_not_visited(session, geofence_helper, origin)) > 0
@@ -199,7 +217,8 @@ class PokestopHelper:
                               ne_corner: Optional[Location] = None, sw_corner: Optional[Location] = None,
                               old_ne_corner: Optional[Location] = None, old_sw_corner: Optional[Location] = None,
                               timestamp: Optional[int] = None,
-                              fence: Optional[Tuple[str, Optional[GeofenceHelper]]] = None) -> \
+                              fence: Optional[Tuple[str, Optional[GeofenceHelper]]] = None,
+                              pokestop_ids: Optional[Collection[str]] = None) -> \
             Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]:
         """
         quests_from_db
@@ -211,6 +230,7 @@ class PokestopHelper:
             old_sw_corner:
             timestamp:
             fence:
+            pokestop_ids: Only return the quests of the stops given
 
         Returns:
 
@@ -250,6 +270,8 @@ class PokestopHelper:
                                          Pokestop.longitude <= old_ne_corner.lng))
         if timestamp:
             where_conditions.append(TrsQuest.quest_timestamp >= timestamp)
+        if pokestop_ids is not None:
+            where_conditions.append(Pokestop.pokestop_id.in_(pokestop_ids))
 
         if fence:
             fence_str, geofence_helper = fence
@@ -370,7 +392,8 @@ class PokestopHelper:
         await session.execute(stmt)
 
     @staticmethod
-    async def get_changed_since_or_incidents(session: AsyncSession, timestamp: int) \
+    async def get_changed_since_or_incidents(session: AsyncSession, timestamp: int,
+                                             pokestop_ids: Optional[Collection[str]] = None) \
             -> Dict[Pokestop, List[PokestopIncident]]:
         stmt = select(Pokestop, PokestopIncident) \
             .join(PokestopIncident, Pokestop.pokestop_id == PokestopIncident.pokestop_id,
@@ -386,6 +409,8 @@ class PokestopHelper:
                 )
             )
         )
+        if pokestop_ids is not None:
+            stmt = stmt.where(Pokestop.pokestop_id.in_(pokestop_ids))
         result = await session.execute(stmt)
         stops_and_incidents: Dict[Pokestop, List[PokestopIncident]] = {}
         for pokestop, incident in result.all():
@@ -1,7 +1,7 @@
 import datetime
 from typing import Optional
 
-from sqlalchemy import and_, delete, text
+from sqlalchemy import ColumnElement, and_, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -20,9 +20,13 @@ class PokestopIncidentHelper:
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    @staticmethod
+    def get_older_than_n_hours_condition(hours: int) -> ColumnElement:
+        return PokestopIncident.incident_expiration < DatetimeWrapper.now() - datetime.timedelta(hours=hours)
+
     @staticmethod
     async def delete_older_than_n_hours(session: AsyncSession, hours: int, limit: Optional[int]) -> None:
-        where_condition = PokestopIncident.incident_expiration < DatetimeWrapper.now() - datetime.timedelta(hours=hours)
+        where_condition = PokestopIncidentHelper.get_older_than_n_hours_condition(hours)
         stmt = delete(PokestopIncident).where(where_condition)
         if limit:
             # Rather ugly construct as stmt.with_dialect_options currently does not work
@@ -1,5 +1,5 @@
 import datetime
-from typing import List, Optional, Tuple
+from typing import Collection, List, Optional, Tuple
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -46,12 +46,15 @@ class RaidHelper:
 
     @staticmethod
     async def get_raids_changed_since(session: AsyncSession, _timestamp: int,
-                                      geofence_helper: GeofenceHelper = None) -> List[Tuple[Raid, GymDetail, Gym]]:
+                                      geofence_helper: GeofenceHelper = None,
+                                      gym_ids: Optional[Collection[str]] = None) -> List[Tuple[Raid, GymDetail, Gym]]:
         stmt = select(Raid, GymDetail, Gym) \
             .select_from(Raid) \
             .join(GymDetail, GymDetail.gym_id == Raid.gym_id) \
             .join(Gym, Gym.gym_id == Raid.gym_id) \
             .where(Raid.last_scanned > DatetimeWrapper.fromtimestamp(_timestamp))
+        if gym_ids is not None:
+            stmt = stmt.where(Raid.gym_id.in_(gym_ids))
         result = await session.execute(stmt)
         changed_data: List[Tuple[Raid, GymDetail, Gym]] = []
         raw = result.all()
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Dict, List, Optional
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -226,3 +226,34 @@ class SettingsPogoauthHelper:
         async with session.begin_nested() as nested:
             session.add(auth)
             await nested.commit()
+
+    @staticmethod
+    async def assign_to_device(session: AsyncSession, device_id: int, account_id: Optional[int]) -> bool:
+        """
+        Releases the account currently assigned to the device (if any) and assigns the account given instead
+        Args:
+            session:
+            device_id: settings_device.device_id to assign the account to
+            account_id: The account to be assigned or None to only release the current assignment
+
+        Returns: False if the account has been assigned to another device or does not exist (anymore). The release
+        should be rolled back in that case.
+        """
+        release_stmt = update(SettingsPogoauth).where(SettingsPogoauth.device_id == device_id).values(device_id=None)
+        await session.execute(release_stmt)
+        if account_id is None:
+            return True
+        assign_stmt = update(SettingsPogoauth) \
+            .where(and_(SettingsPogoauth.account_id == account_id,
+                        or_(SettingsPogoauth.device_id.is_(None), SettingsPogoauth.device_id == device_id))) \
+            .values(device_id=device_id)
+        result = await session.execute(assign_stmt)
+        return result.rowcount > 0
+
+    @staticmethod
+    async def update_values(session: AsyncSession, account_id: int, **values) -> None:
+        """
+        Updates the columns passed as keyword arguments of the account without loading it first
+        """
+        stmt = update(SettingsPogoauth).where(SettingsPogoauth.account_id == account_id).values(**values)
+        await session.execute(stmt)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import and_
+from sqlalchemy import Float, Row, and_, type_coerce
 from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -57,3 +57,24 @@ class TrsS2CellHelper:
         stmt = stmt.where(and_(*where_conditions))
         result = await session.execute(stmt)
         return result.scalars().all()
+
+    @staticmethod
+    async def get_cell_columns_in_rectangle(session: AsyncSession, ne_corner: Location, sw_corner: Location,
+                                            timestamp: Optional[int] = None) -> List[Row]:
+        """
+        Selects only the columns displayed on the map rather than ORM entities (no identity map, no decimals)
+        Returns: Rows of id, center_latitude, center_longitude, updated
+        """
+        stmt = select(TrsS2Cell.id,
+                      type_coerce(TrsS2Cell.center_latitude, Float).label("center_latitude"),
+                      type_coerce(TrsS2Cell.center_longitude, Float).label("center_longitude"),
+                      TrsS2Cell.updated)
+        where_conditions = [and_(TrsS2Cell.center_latitude >= sw_corner.lat,
+                                 TrsS2Cell.center_longitude >= sw_corner.lng,
+                                 TrsS2Cell.center_latitude <= ne_corner.lat,
+                                 TrsS2Cell.center_longitude <= ne_corner.lng)]
+        if timestamp:
+            where_conditions.append(TrsS2Cell.updated >= timestamp)
+        stmt = stmt.where(and_(*where_conditions))
+        result = await session.execute(stmt)
+        return result.all()
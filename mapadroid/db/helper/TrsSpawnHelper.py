@@ -1,12 +1,10 @@
 import asyncio
 import concurrent.futures
-import functools
-import time
 from datetime import datetime
 from typing import Collection, Dict, List, Optional, Tuple
 
 from _datetime import timedelta
-from sqlalchemy import and_, delete, func, not_, update
+from sqlalchemy import Float, Row, and_, delete, func, not_, or_, type_coerce, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -107,79 +105,42 @@ class TrsSpawnHelper:
         await session.execute(stmt)
 
     @staticmethod
-    async def get_next_spawns(session: AsyncSession, geofence_helper: GeofenceHelper,
-                              additional_event: Optional[int] = None,
-                              limit_next_n_seconds: Optional[int] = None) -> List[Tuple[int, Location]]:
+    async def get_spawn_timings_in_fence(session: AsyncSession, geofence_helper: GeofenceHelper,
+                                         additional_event: Optional[int] = None,
+                                         changed_since: Optional[datetime] = None) -> List[Row]:
         """
-        Used to be DbWrapper::retrieve_next_spawns
-        Fetches the spawnpoints of which the calculated spawn time is upcoming within the next hour and converts it
-        to a List of tuples consisting of (timestamp of spawn, Location)
+        Selects the spawnpoints with a known despawn time within the bounding box of the geofence given. Filtering by
+        the geofence itself is left to the caller.
         Args:
-            limit_next_n_seconds:
             session:
             geofence_helper:
-            additional_event:
-
-        Returns:
+            additional_event: Event to consider the spawnpoints of along with the default event (1)
+            changed_since: Only select spawnpoints scanned (or seen without a despawn time) since
 
+        Returns: Rows of spawnpoint, latitude, longitude, spawndef, despawn_sec
         """
-        if not geofence_helper:
-            logger.warning("No geofence helper was passed. Returning empty list of spawns.")
-            return []
         min_lat, min_lon, max_lat, max_lon = geofence_helper.get_polygon_from_fence()
         event_ids: list = [1]
         if additional_event is not None:
             event_ids.append(additional_event)
 
-        stmt = select(TrsSpawn).where(and_(TrsSpawn.eventid.in_(event_ids),
-                                           TrsSpawn.latitude >= min_lat,
-                                           TrsSpawn.longitude >= min_lon,
-                                           TrsSpawn.latitude <= max_lat,
-                                           TrsSpawn.longitude <= max_lon,
-                                           TrsSpawn.calc_endminsec != None))
+        stmt = select(TrsSpawn.spawnpoint,
+                      type_coerce(TrsSpawn.latitude, Float).label("latitude"),
+                      type_coerce(TrsSpawn.longitude, Float).label("longitude"),
+                      TrsSpawn.spawndef,
+                      TrsSpawn.despawn_sec)
+        where_conditions = [TrsSpawn.eventid.in_(event_ids),
+                            TrsSpawn.latitude >= min_lat,
+                            TrsSpawn.longitude >= min_lon,
+                            TrsSpawn.latitude <= max_lat,
+                            TrsSpawn.longitude <= max_lon,
+                            TrsSpawn.despawn_sec != None]
+        if changed_since:
+            where_conditions.append(or_(TrsSpawn.last_scanned >= changed_since,
+                                        TrsSpawn.last_non_scanned >= changed_since))
+        stmt = stmt.where(and_(*where_conditions))
         result = await session.execute(stmt)
-        loop = asyncio.get_running_loop()
-        # with concurrent.futures.ThreadPoolExecutor() as pool:
-        next_up = await loop.run_in_executor(
-            None, functools.partial(TrsSpawnHelper.__process_next_to_encounter, result=result.scalars().all(),
-                                    geofence_helper=geofence_helper,
-                                    limit_next_n_seconds=limit_next_n_seconds))
-
-        return next_up
-
-    @staticmethod
-    def __process_next_to_encounter(result, geofence_helper=None,
-                                    limit_next_n_seconds: Optional[int] = None) -> List[Tuple[int, Location]]:
-        next_up: List[Tuple[int, Location]] = []
-        current_time = time.time()
-        current_time_of_day = DatetimeWrapper.now().replace(microsecond=0)
-        timedelta_to_be_added = timedelta(hours=1)
-
-        for spawn in result:
-            if not geofence_helper.is_coord_inside_include_geofence([spawn.latitude, spawn.longitude]):
-                continue
-            endminsec_split = spawn.calc_endminsec.split(":")
-            minutes = int(endminsec_split[0])
-            seconds = int(endminsec_split[1])
-            despawn_time = current_time_of_day.replace(
-                minute=minutes, second=seconds)
-            if minutes < current_time_of_day.minute:
-                # Add an hour to have the next spawn at the following hour respectively
-                despawn_time = despawn_time + timedelta_to_be_added
-
-            spawn_duration_minutes = 60 if spawn.spawndef == 15 else 30
-            spawn_time = despawn_time - timedelta(minutes=spawn_duration_minutes)
-
-            if (spawn_time < current_time_of_day or limit_next_n_seconds
-                    and spawn_time > current_time_of_day + timedelta(seconds=limit_next_n_seconds)):
-                # spawn has already happened, we should've added it in the past or it's too far in the future
-                # TODO: consider crosschecking against current mons...
-                continue
-
-            # check if we calculated a time in the past, if so, add an hour to it...
-            # timestamp = timestamp + 60 * 60 if timestamp < current_time else timestamp
-            next_up.append((int(spawn_time.timestamp()), Location(float(spawn.latitude), float(spawn.longitude))))
-        return next_up
+        return result.all()
 
     @staticmethod
     async def download_spawns(session: AsyncSession,
@@ -232,6 +193,34 @@ class TrsSpawnHelper:
         del result
         return spawns
 
+    @staticmethod
+    async def get_spawn_columns_in_rectangle(session: AsyncSession, ne_corner: Location, sw_corner: Location,
+                                             timestamp: Optional[int] = None) -> List[Row]:
+        """
+        Selects only the columns displayed on the map rather than ORM entities (no identity map, no decimals)
+        Returns: Rows of spawnpoint, latitude, longitude, spawndef, calc_endminsec, last_scanned, last_non_scanned,
+        first_detection, event_name
+        """
+        stmt = select(TrsSpawn.spawnpoint,
+                      type_coerce(TrsSpawn.latitude, Float).label("latitude"),
+                      type_coerce(TrsSpawn.longitude, Float).label("longitude"),
+                      TrsSpawn.spawndef,
+                      TrsSpawn.calc_endminsec,
+                      TrsSpawn.last_scanned,
+                      TrsSpawn.last_non_scanned,
+                      TrsSpawn.first_detection,
+                      TrsEvent.event_name) \
+            .join(TrsEvent, TrsEvent.id == TrsSpawn.eventid, isouter=False)
+        where_conditions = [and_(TrsSpawn.latitude >= sw_corner.lat,
+                                 TrsSpawn.longitude >= sw_corner.lng,
+                                 TrsSpawn.latitude <= ne_corner.lat,
+                                 TrsSpawn.longitude <= ne_corner.lng)]
+        if timestamp:
+            where_conditions.append(TrsSpawn.last_scanned >= DatetimeWrapper.fromtimestamp(timestamp))
+        stmt = stmt.where(and_(*where_conditions))
+        result = await session.execute(stmt)
+        return result.all()
+
     @staticmethod
     def __transform_result(result):
         spawns: Dict[int, Tuple[TrsSpawn, TrsEvent]] = {}
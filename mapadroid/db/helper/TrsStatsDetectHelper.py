@@ -1,7 +1,7 @@
 from datetime import timedelta
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, delete, func
+from sqlalchemy import and_, delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -76,6 +76,12 @@ class TrsStatsDetectHelper:
         stat.quest = quest
         session.add(stat)
 
+    @staticmethod
+    async def insert_bulk(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        await session.execute(insert(TrsStatsDetect).values(rows))
+
     @staticmethod
     async def cleanup(session: AsyncSession, delete_before_timestamp_scan: int) -> None:
         stmt = delete(TrsStatsDetect).where(TrsStatsDetect.timestamp_scan < delete_before_timestamp_scan)
@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -18,24 +20,18 @@ class TrsStatsDetectSeenTypeHelper:
         return result.scalars().first()
 
     @staticmethod
-    async def create_or_update(session, stat_entry: TrsStatsDetectSeenType) -> None:
-        existing: Optional[TrsStatsDetectSeenType] = await TrsStatsDetectSeenTypeHelper.get(session,
-                                                                                            stat_entry.encounter_id)
-        if not existing:
-            session.add(stat_entry)
-        else:
-            # Update existing with instance
-            if not existing.wild or stat_entry.wild and existing.wild > stat_entry.wild:
-                existing.wild = stat_entry.wild
-            if not existing.encounter or stat_entry.encounter and existing.encounter > stat_entry.encounter:
-                existing.encounter = stat_entry.encounter
-            if not existing.lure_encounter or stat_entry.lure_encounter \
-                    and existing.lure_encounter > stat_entry.lure_encounter:
-                existing.lure_encounter = stat_entry.lure_encounter
-            if not existing.lure_wild or stat_entry.lure_wild and existing.lure_wild > stat_entry.lure_wild:
-                existing.lure_wild = stat_entry.lure_wild
-            if not existing.nearby_cell or stat_entry.nearby_cell and existing.nearby_cell > stat_entry.nearby_cell:
-                existing.nearby_cell = stat_entry.nearby_cell
-            if not existing.nearby_stop or stat_entry.nearby_stop and existing.nearby_stop > stat_entry.nearby_stop:
-                existing.nearby_stop = stat_entry.nearby_stop
-            session.add(existing)
+    async def create_or_update_bulk(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserts the rows given in one multi-row statement. Existing rows keep the earliest timestamp per
+        type of detection.
+        """
+        if not rows:
+            return
+        insert_stmt = insert(TrsStatsDetectSeenType).values(rows)
+        updates = {}
+        for column_name in ("encounter", "wild", "nearby_stop", "nearby_cell", "lure_encounter", "lure_wild"):
+            existing_value = getattr(TrsStatsDetectSeenType, column_name)
+            new_value = getattr(insert_stmt.inserted, column_name)
+            # LEAST returns NULL if either argument is NULL
+            updates[column_name] = func.coalesce(func.least(existing_value, new_value), existing_value, new_value)
+        await session.execute(insert_stmt.on_duplicate_key_update(**updates))
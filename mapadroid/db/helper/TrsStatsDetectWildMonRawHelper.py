@@ -1,8 +1,9 @@
 import datetime
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import delete, and_, or_, select
+from sqlalchemy import ColumnElement, delete, and_, func, or_, select
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.db.model import TrsStatsDetectWildMonRaw
@@ -18,26 +19,34 @@ class TrsStatsDetectWildMonRawHelper:
         return result.scalars().first()
 
     @staticmethod
-    async def create_or_update(session: AsyncSession, instance: TrsStatsDetectWildMonRaw) -> None:
-        existing: Optional[TrsStatsDetectWildMonRaw] = await TrsStatsDetectWildMonRawHelper.get(session,
-                                                                                                instance.worker,
-                                                                                                instance.encounter_id)
-        if not existing:
-            session.add(instance)
-        else:
-            # Update existing with instance
-            if existing.first_scanned > instance.first_scanned:
-                existing.first_scanned = instance.first_scanned
-            if existing.last_scanned < instance.last_scanned:
-                existing.last_scanned = instance.last_scanned
-            existing.count = instance.count + existing.count
-            if instance.is_shiny:
-                existing.is_shiny = instance.is_shiny
-            session.add(existing)
+    async def create_or_update_bulk(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserts the rows given in one multi-row statement. Existing rows (worker, encounter_id) are merged by
+        summing up the counts and widening the scan period.
+        """
+        if not rows:
+            return
+        insert_stmt = insert(TrsStatsDetectWildMonRaw).values(rows)
+        stmt = insert_stmt.on_duplicate_key_update(
+            count=TrsStatsDetectWildMonRaw.count + insert_stmt.inserted.count,
+            is_shiny=func.greatest(TrsStatsDetectWildMonRaw.is_shiny, insert_stmt.inserted.is_shiny),
+            first_scanned=func.least(TrsStatsDetectWildMonRaw.first_scanned, insert_stmt.inserted.first_scanned),
+            last_scanned=func.greatest(TrsStatsDetectWildMonRaw.last_scanned, insert_stmt.inserted.last_scanned)
+        )
+        await session.execute(stmt)
 
     @staticmethod
     async def cleanup(session: AsyncSession, delete_before_timestap_scan: datetime.datetime,
                       raw_delete_shiny_days: int = 0) -> None:
+        where_condition = TrsStatsDetectWildMonRawHelper.get_cleanup_condition(delete_before_timestap_scan,
+                                                                               raw_delete_shiny_days)
+        stmt = delete(TrsStatsDetectWildMonRaw) \
+            .where(where_condition)
+        await session.execute(stmt)
+
+    @staticmethod
+    def get_cleanup_condition(delete_before_timestap_scan: datetime.datetime,
+                              raw_delete_shiny_days: int = 0) -> ColumnElement:
         where_condition = and_(TrsStatsDetectWildMonRaw.last_scanned < delete_before_timestap_scan,
                                TrsStatsDetectWildMonRaw.is_shiny == 0)
         if raw_delete_shiny_days > 0:
@@ -46,6 +55,4 @@ class TrsStatsDetectWildMonRawHelper:
             shiny_condition = and_(TrsStatsDetectWildMonRaw.last_scanned < delete_shinies_before,
                                    TrsStatsDetectWildMonRaw.is_shiny == 1)
             where_condition = or_(where_condition, shiny_condition)
-        stmt = delete(TrsStatsDetectWildMonRaw) \
-            .where(where_condition)
-        await session.execute(stmt)
+        return where_condition
@@ -1,7 +1,8 @@
 from datetime import timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, asc, case, delete, desc, func, or_
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import aliased
@@ -253,6 +254,18 @@ class TrsStatsLocationRawHelper:
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    @staticmethod
+    async def insert_bulk(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserts the rows given in one multi-row statement. Rows already present for the same event
+        (worker, lat, lng, type, period) are kept as they are.
+        """
+        if not rows:
+            return
+        insert_stmt = insert(TrsStatsLocationRaw).values(rows)
+        stmt = insert_stmt.on_duplicate_key_update(fix_ts=TrsStatsLocationRaw.fix_ts)
+        await session.execute(stmt)
+
     @staticmethod
     async def cleanup(session: AsyncSession, delete_before_timestap_scan: int) -> None:
         stmt = delete(TrsStatsLocationRaw).where(TrsStatsLocationRaw.period < delete_before_timestap_scan)
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from mapadroid.db.model import TrsStatsRollup
+from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
+from mapadroid.utils.madGlobals import StatsRollupPeriod
+
+
+class TrsStatsRollupHelper:
+    """
+    Hourly and daily aggregates of trs_stats_detect and trs_stats_location per worker. Maintained by the stats
+    submission and used by MADmin statistics rather than grouping the raw stats for every page view.
+    """
+
+    @staticmethod
+    def get_period_start(timestamp: int, period: StatsRollupPeriod) -> int:
+        if period == StatsRollupPeriod.HOURLY:
+            return timestamp - timestamp % 3600
+        else:
+            return timestamp - timestamp % 86400
+
+    @staticmethod
+    async def add_bulk(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Adds the counts of the rows given to the rollups of the worker/period/period_start
+        """
+        if not rows:
+            return
+        insert_stmt = insert(TrsStatsRollup).values(rows)
+        stmt = insert_stmt.on_duplicate_key_update(
+            mon=TrsStatsRollup.mon + insert_stmt.inserted.mon,
+            mon_iv=TrsStatsRollup.mon_iv + insert_stmt.inserted.mon_iv,
+            raid=TrsStatsRollup.raid + insert_stmt.inserted.raid,
+            quest=TrsStatsRollup.quest + insert_stmt.inserted.quest,
+            location_ok=TrsStatsRollup.location_ok + insert_stmt.inserted.location_ok,
+            location_nok=TrsStatsRollup.location_nok + insert_stmt.inserted.location_nok
+        )
+        await session.execute(stmt)
+
+    @staticmethod
+    async def get_detection_count_per_worker(session: AsyncSession, include_last_n_minutes: Optional[int] = None,
+                                             hourly: bool = True,
+                                             worker: Optional[str] = None) -> Dict[str,
+                                                                                   Dict[int,
+                                                                                        Tuple[int, int, int, int]]]:
+        """
+        Same as TrsStatsDetectHelper.get_detection_count_per_worker based on the rollups.
+        Returns: {worker: {timestamp_hour: (mons, mon_ivs, raids, quests)}}
+        """
+        results: Dict[str, Dict[int, Tuple[int, int, int, int]]] = {}
+        for period_start, worker, mon, mon_iv, raid, quest, _, _ in await TrsStatsRollupHelper.__get_sums(
+                session, include_last_n_minutes, hourly, worker):
+            results.setdefault(worker, {})[period_start] = (int(mon), int(mon_iv), int(raid), int(quest))
+        return results
+
+    @staticmethod
+    async def get_locations(session: AsyncSession, include_last_n_minutes: Optional[int] = None,
+                            hourly: bool = True,
+                            worker: Optional[str] = None) -> Dict[str, Dict[int, Tuple[int, int, int]]]:
+        """
+        Same as TrsStatsLocationHelper.get_locations based on the rollups.
+        Returns: {worker: {timestamp_hour: (location_count, locations_ok, locations_nok)}}
+        """
+        results: Dict[str, Dict[int, Tuple[int, int, int]]] = {}
+        for period_start, worker, _, _, _, _, location_ok, location_nok in await TrsStatsRollupHelper.__get_sums(
+                session, include_last_n_minutes, hourly, worker):
+            results.setdefault(worker, {})[period_start] = (int(location_ok + location_nok), int(location_ok),
+                                                            int(location_nok))
+        return results
+
+    @staticmethod
+    async def get_location_info(session: AsyncSession) -> Dict[str, Tuple[int, int, int, float]]:
+        """
+        Same as TrsStatsLocationHelper.get_location_info based on the rollups.
+        Returns: Dict[worker, Tuple[sum_location_count, sum_location_ok, sum_location_not_ok, failure_rate]]
+        """
+        results: Dict[str, Tuple[int, int, int, float]] = {}
+        for _, worker, _, _, _, _, location_ok, location_nok in await TrsStatsRollupHelper.__get_sums(
+                session, None, False, None):
+            location_count: int = int(location_ok + location_nok)
+            failure_rate = int(location_nok) / location_count * 100 if location_count > 0 else 0
+            results[worker] = (location_count, int(location_ok), int(location_nok), failure_rate)
+        return results
+
+    @staticmethod
+    async def __get_sums(session: AsyncSession, include_last_n_minutes: Optional[int], hourly: bool,
+                         worker: Optional[str]) -> List[Tuple[int, str, int, int, int, int, int, int]]:
+        # Hourly data is read from the hourly rollups, totals are summed up from the daily rollups
+        period: StatsRollupPeriod = StatsRollupPeriod.HOURLY if hourly else StatsRollupPeriod.DAILY
+        stmt = select(func.min(TrsStatsRollup.period_start),
+                      TrsStatsRollup.worker,
+                      func.sum(TrsStatsRollup.mon),
+                      func.sum(TrsStatsRollup.mon_iv),
+                      func.sum(TrsStatsRollup.raid),
+                      func.sum(TrsStatsRollup.quest),
+                      func.sum(TrsStatsRollup.location_ok),
+                      func.sum(TrsStatsRollup.location_nok)) \
+            .select_from(TrsStatsRollup)
+        where_conditions = [TrsStatsRollup.period == period.value]
+        if worker:
+            where_conditions.append(TrsStatsRollup.worker == worker)
+        if include_last_n_minutes:
+            minutes = DatetimeWrapper.now().replace(
+                minute=0, second=0, microsecond=0) - timedelta(minutes=include_last_n_minutes)
+            where_conditions.append(TrsStatsRollup.period_start >= int(minutes.timestamp()))
+        stmt = stmt.where(and_(*where_conditions))
+        if hourly:
+            stmt = stmt.group_by(TrsStatsRollup.worker, TrsStatsRollup.period_start) \
+                .order_by(TrsStatsRollup.period_start)
+        else:
+            stmt = stmt.group_by(TrsStatsRollup.worker)
+        result = await session.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    async def cleanup(session: AsyncSession, delete_before_timestamp: int) -> None:
+        stmt = delete(TrsStatsRollup).where(TrsStatsRollup.period_start < delete_before_timestamp)
+        await session.execute(stmt)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Set
 
 from sqlalchemy import and_, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +16,12 @@ class TrsVisitedHelper:
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    @staticmethod
+    async def get_stop_ids_of_username(session: AsyncSession, username: str) -> Set[str]:
+        stmt = select(TrsVisited.pokestop_id).where(TrsVisited.username == username)
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
+
     @staticmethod
     async def flush_all_of_username(session: AsyncSession, username: str) -> None:
         stmt = delete(TrsVisited).where(TrsVisited.username == username)
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Collection, Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -15,7 +15,10 @@ class WeatherHelper:
         return result.scalars().first()
 
     @staticmethod
-    async def get_changed_since(session: AsyncSession, _timestamp: int) -> List[Weather]:
+    async def get_changed_since(session: AsyncSession, _timestamp: int,
+                                s2_cell_ids: Optional[Collection[str]] = None) -> List[Weather]:
         stmt = select(Weather).where(Weather.last_updated > DatetimeWrapper.fromtimestamp(_timestamp))
+        if s2_cell_ids is not None:
+            stmt = stmt.where(Weather.s2_cell_id.in_(s2_cell_ids))
         result = await session.execute(stmt)
         return result.scalars().all()
@@ -331,6 +331,8 @@ class TrsSpawn(Base):
     last_non_scanned = Column(TZDateTime)
     calc_endminsec = Column(String(5, 'utf8mb4_unicode_ci'))
     eventid = Column(INTEGER(11), nullable=False, server_default=text("'1'"))
+    # Second of the hour calc_endminsec refers to
+    despawn_sec = Column(SMALLINT(5, unsigned=True))
 
 
 class TrsStatsDetect(Base):
@@ -398,6 +400,24 @@ class TrsStatsLocationRaw(Base):
     transporttype = Column(TINYINT(1), nullable=False)
 
 
+class TrsStatsRollup(Base):
+    __tablename__ = 'trs_stats_rollup'
+    __table_args__ = (
+        Index('period_start', 'period', 'period_start'),
+    )
+
+    worker = Column(String(100, 'utf8mb4_unicode_ci'), primary_key=True)
+    # See StatsRollupPeriod: 0: hourly, 1: daily
+    period = Column(TINYINT(1), primary_key=True, autoincrement=False)
+    period_start = Column(INTEGER(11), primary_key=True, autoincrement=False)
+    mon = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+    mon_iv = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+    raid = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+    quest = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+    location_ok = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+    location_nok = Column(INTEGER(11), nullable=False, server_default=text("'0'"))
+
+
 class TrsUsage(Base):
     __tablename__ = 'trs_usage'
 
@@ -1,5 +1,5 @@
 import sys
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from mapadroid.db.model import SettingsGeofence
 from mapadroid.utils.logging import get_logger, LoggerEnums
@@ -11,6 +11,7 @@ logger = get_logger(LoggerEnums.system)
 # Trying to import matplotlib, which is not compatible with all hardware.
 # Matlplotlib is faster for big calculations.
 try:
+    import numpy as np
     from matplotlib.path import Path
 except ImportError:
     # Pass as this is an optional requirement. We're going to check later if it
@@ -24,6 +25,9 @@ class GeofenceHelper:
         self.geofenced_areas = []
         self.excluded_areas = []
         self.use_matplotlib = 'matplotlib' in sys.modules
+        # Paths of the geofenced and excluded areas built once for the batch tests
+        self.__geofenced_paths: Optional[List["Path"]] = None
+        self.__excluded_paths: Optional[List["Path"]] = None
         if include_geofence or exclude_geofence:
             self.geofenced_areas = self.parse_geofences_file(
                 include_geofence, excluded=False, fence_fallback=fence_name)
@@ -58,6 +62,36 @@ class GeofenceHelper:
             return True
         return False
 
+    def are_coords_inside_include_geofence(self, coordinates: Sequence[Sequence[float]]) -> List[bool]:
+        """
+        Batch variant of is_coord_inside_include_geofence. With matplotlib available, all coordinates are tested
+        against each area at once.
+        """
+        if not self.use_matplotlib or len(coordinates) == 0:
+            return [self.is_coord_inside_include_geofence(coordinate) for coordinate in coordinates]
+        if self.__geofenced_paths is None:
+            self.__geofenced_paths = [self.__to_path(area['polygon']) for area in self.geofenced_areas]
+            self.__excluded_paths = [self.__to_path(area['polygon']) for area in self.excluded_areas]
+        if isinstance(coordinates, np.ndarray):
+            points = coordinates.astype(float, copy=False)
+        else:
+            points = np.array([(float(coordinate[0]), float(coordinate[1])) for coordinate in coordinates])
+        if self.__geofenced_paths:
+            inside = np.zeros(len(points), dtype=bool)
+            for path in self.__geofenced_paths:
+                inside |= path.contains_points(points)
+        else:
+            inside = np.ones(len(points), dtype=bool)
+        for path in self.__excluded_paths:
+            inside &= ~path.contains_points(points)
+        return inside.tolist()
+
+    @staticmethod
+    def __to_path(polygon) -> "Path":
+        vertices = [(coord['lat'], coord['lon']) for coord in polygon]
+        vertices.append(vertices[0])
+        return Path(vertices)
+
     # TODO: Async/Threaded?
     def get_geofenced_coordinates(self, coordinates):
         # Import: We are working with n-tuples in some functions be carefull
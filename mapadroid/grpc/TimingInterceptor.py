@@ -0,0 +1,52 @@
+from typing import Callable, Dict
+
+import grpc
+
+from mapadroid.utils.metrics import Histogram
+
+GRPC_CLIENT_SECONDS: Histogram = Histogram("mad_grpc_client_seconds", "Seconds until unary calls were answered",
+                                           ["method"])
+GRPC_SERVER_SECONDS: Histogram = Histogram("mad_grpc_server_seconds", "Seconds spent handling unary calls",
+                                           ["method"])
+
+
+def _get_method_name(method) -> str:
+    # Full name of the method, e.g. mitm_mapper.MitmMapper/GetLevel
+    if isinstance(method, bytes):
+        method = method.decode()
+    return method.lstrip("/")
+
+
+class TimingClientInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """
+    Records the duration of the unary calls of a channel by method, passed to the channel in interceptors
+    """
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        with GRPC_CLIENT_SECONDS.labels(_get_method_name(client_call_details.method)).time():
+            call = await continuation(client_call_details, request)
+            return await call
+
+
+class TimingServerInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Records the duration of handling the unary calls of a server by method, passed to the server in interceptors
+    """
+
+    def __init__(self):
+        self.__handlers: Dict[str, grpc.RpcMethodHandler] = {}
+
+    async def intercept_service(self, continuation: Callable, handler_call_details: grpc.HandlerCallDetails):
+        method: str = handler_call_details.method
+        timed_handler = self.__handlers.get(method)
+        if timed_handler is not None:
+            return timed_handler
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        timed_handler = grpc.unary_unary_rpc_method_handler(
+            GRPC_SERVER_SECONDS.labels(_get_method_name(method)).time()(handler.unary_unary),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer)
+        self.__handlers[method] = timed_handler
+        return timed_handler
@@ -4,6 +4,8 @@ from abc import ABC
 from functools import wraps
 from typing import Any, Dict, List, Optional, Union
 
+import msgpack
+import orjson
 from aiohttp import hdrs, web
 from aiohttp.abc import Request
 from aiohttp.helpers import sentinel
@@ -20,7 +22,7 @@ from mapadroid.mapping_manager.MappingManager import MappingManager
 from mapadroid.updater.updater import DeviceUpdater
 from mapadroid.utils.aiohttp import add_prefix_to_url, get_forwarded_path
 from mapadroid.utils.authHelper import check_auth, get_auths_for_levl
-from mapadroid.utils.json_encoder import MADEncoder
+from mapadroid.utils.json_encoder import MADEncoder, mad_serialize_default
 from mapadroid.utils.madGlobals import (
     MadGlobals, WebsocketWorkerConnectionClosedException,
     WebsocketWorkerTimeoutException)
@@ -28,6 +30,8 @@ from mapadroid.utils.questGen import QuestGen
 from mapadroid.websocket.WebsocketServer import WebsocketServer
 
 FORWARDED_PATH_KEY = "forwarded_path"
+# Content types of the Accept header requesting msgpack encoded responses. The first one is used for responses.
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
 
 
 def expand_context() -> Any:
@@ -221,6 +225,32 @@ class AbstractMadminRootEndpoint(web.View, ABC):
             content_type=content_type,
         )
 
+    async def _encoded_response(self, data: Any, *, status: int = 200,
+                                headers: Optional[LooseHeaders] = None) -> web.Response:
+        """
+        Serializes the data in an executor according to the Accept header of the request (msgpack if accepted, JSON
+        otherwise). The body is compressed if the client accepts gzip/deflate.
+        """
+        loop = asyncio.get_running_loop()
+        if any(content_type in self.request.headers.get(hdrs.ACCEPT, "") for content_type in MSGPACK_CONTENT_TYPES):
+            body: bytes = await loop.run_in_executor(None, self.__msgpack_dumps, data)
+            content_type: str = MSGPACK_CONTENT_TYPES[0]
+        else:
+            body: bytes = await loop.run_in_executor(None, self.__orjson_dumps, data)
+            content_type: str = "application/json"
+        response = web.Response(body=body, status=status, headers=headers, content_type=content_type)
+        response.enable_compression()
+        return response
+
+    @staticmethod
+    def __msgpack_dumps(data) -> bytes:
+        return msgpack.packb(data, default=mad_serialize_default)
+
+    @staticmethod
+    def __orjson_dumps(data) -> bytes:
+        return orjson.dumps(data, default=mad_serialize_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
     @staticmethod
     def __json_dumps_proxy(data):
         return json.dumps(data, indent=None, cls=MADEncoder)
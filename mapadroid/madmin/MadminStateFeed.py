@@ -0,0 +1,123 @@
+import asyncio
+import time
+from asyncio import Task
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import orjson
+from loguru import logger
+
+from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.madmin.endpoints.routes.map.GetPriorouteEndpoint import \
+    GetPriorouteEndpoint
+from mapadroid.madmin.endpoints.routes.map.GetRouteEndpoint import \
+    GetRouteEndpoint
+from mapadroid.madmin.endpoints.routes.map.GetWorkersEndpoint import \
+    GetWorkersEndpoint
+from mapadroid.madmin.endpoints.routes.statistics.GetStatusEndpoint import \
+    GetStatusEndpoint
+from mapadroid.madmin.StateFeedSubscription import StateFeedSubscription
+from mapadroid.mapping_manager.MappingManager import MappingManager
+from mapadroid.utils.json_encoder import mad_serialize_default
+
+# Topics offered and the interval (seconds) their state is sampled at while anyone subscribed to them
+TOPIC_INTERVALS: Dict[str, float] = {
+    "workers": 1,
+    "prioroutes": 2,
+    "status": 5,
+    "routes": 10
+}
+
+
+class MadminStateFeed:
+    """
+    Samples the state of workers, routes, prio queues and device status once for all MADmin clients subscribed and
+    pushes the entries that changed to the subscriptions. The load caused is independent of the amount of clients.
+    Nothing is sampled while there are no subscriptions.
+    """
+
+    def __init__(self, db_wrapper: DbWrapper, mapping_manager: MappingManager):
+        self.__db_wrapper: DbWrapper = db_wrapper
+        self.__mapping_manager: MappingManager = mapping_manager
+        self.__subscriptions: Set[StateFeedSubscription] = set()
+        # Serialized entries per topic and key as sent last
+        self.__snapshots: Dict[str, Dict[str, bytes]] = {}
+        self.__sampler_task: Optional[Task] = None
+        # Name of the attribute identifying entries and the coroutine loading them per topic
+        self.__samplers: Dict[str, Tuple[str, Callable[[], Awaitable[List[Dict]]]]] = {
+            "workers": ("name", self.__sample_workers),
+            "prioroutes": ("name", self.__sample_prioroutes),
+            "status": ("device_id", self.__sample_status),
+            "routes": ("id", self.__sample_routes)
+        }
+
+    @staticmethod
+    def get_topics() -> Set[str]:
+        return set(TOPIC_INTERVALS.keys())
+
+    def subscribe(self, topics: Set[str]) -> StateFeedSubscription:
+        subscription: StateFeedSubscription = StateFeedSubscription(topics)
+        for topic in topics:
+            if topic in self.__snapshots:
+                subscription.push(topic, dict(self.__snapshots[topic]))
+        self.__subscriptions.add(subscription)
+        if self.__sampler_task is None or self.__sampler_task.done():
+            self.__sampler_task = asyncio.get_running_loop().create_task(self.__sample())
+        return subscription
+
+    def unsubscribe(self, subscription: StateFeedSubscription) -> None:
+        self.__subscriptions.discard(subscription)
+
+    async def __sample(self) -> None:
+        last_sampled: Dict[str, float] = {}
+        while self.__subscriptions:
+            subscribed: Set[str] = set()
+            for subscription in self.__subscriptions:
+                subscribed.update(subscription.topics)
+            for topic in set(self.__snapshots.keys()) - subscribed:
+                # Outdated once sampled again
+                del self.__snapshots[topic]
+                last_sampled.pop(topic, None)
+            for topic in subscribed:
+                now: float = time.time()
+                if now - last_sampled.get(topic, 0) < TOPIC_INTERVALS[topic]:
+                    continue
+                last_sampled[topic] = now
+                key, sampler = self.__samplers[topic]
+                try:
+                    entries: List[Dict] = await sampler()
+                except Exception as e:
+                    logger.warning("Failed sampling {} for the MADmin state feed: {}", topic, e)
+                    continue
+                self.__publish(topic, {str(entry[key]): orjson.dumps(entry, default=mad_serialize_default,
+                                                                     option=orjson.OPT_PASSTHROUGH_DATETIME)
+                                       for entry in entries})
+            await asyncio.sleep(min(TOPIC_INTERVALS.values()))
+        self.__snapshots.clear()
+
+    def __publish(self, topic: str, snapshot: Dict[str, bytes]) -> None:
+        previous: Dict[str, bytes] = self.__snapshots.get(topic, {})
+        changes: Dict[str, Optional[bytes]] = {key: entry for key, entry in snapshot.items()
+                                               if previous.get(key) != entry}
+        changes.update({key: None for key in previous.keys() - snapshot.keys()})
+        self.__snapshots[topic] = snapshot
+        if not changes:
+            return
+        for subscription in self.__subscriptions:
+            if topic in subscription.topics:
+                subscription.push(topic, changes)
+
+    async def __sample_workers(self) -> List[Dict]:
+        return await GetWorkersEndpoint.serialize_workers(self.__mapping_manager)
+
+    async def __sample_prioroutes(self) -> List[Dict]:
+        return await GetPriorouteEndpoint.serialize_prioroutes(self.__mapping_manager)
+
+    async def __sample_routes(self) -> List[Dict]:
+        async with self.__db_wrapper as session, session:
+            return await GetRouteEndpoint.serialize_routes(session, self.__mapping_manager,
+                                                           self.__db_wrapper.get_instance_id())
+
+    async def __sample_status(self) -> List[Dict]:
+        async with self.__db_wrapper as session, session:
+            return await GetStatusEndpoint.serialize_status(session, self.__db_wrapper, self.__mapping_manager,
+                                                            self.__db_wrapper.get_instance_id())
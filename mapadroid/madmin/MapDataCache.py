@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import (Awaitable, Callable, Dict, Hashable, Iterator, List,
+                    Optional, Tuple)
+
+from mapadroid.utils.collections import Location
+
+# Zoom levels of the slippy map tiles used to partition the map data. The zoom is picked per request to cover the
+# viewport with at most MAX_TILES_PER_REQUEST tiles.
+MIN_TILE_ZOOM: int = 2
+MAX_TILE_ZOOM: int = 14
+MAX_TILES_PER_REQUEST: int = 16
+# Latitude limits of the web mercator projection
+MAX_TILE_LATITUDE: float = 85.0511
+# Tiles are updated with the entries changed since the last update at most this often (seconds)
+DELTA_INTERVAL: float = 5
+# Entries changed shortly before an update may only be written to the DB after the update ran
+DELTA_MARGIN: float = 10
+# Tiles are loaded entirely again after this amount of seconds to drop entries removed from the DB
+FULL_RELOAD_INTERVAL: float = 300
+# Tiles not requested for this amount of seconds are dropped
+TILE_IDLE_TIMEOUT: float = 600
+
+
+@dataclass
+class MapDataEntry:
+    latitude: float
+    longitude: float
+    # Timestamp of the last change of the entry (as stored in the DB)
+    modified: int
+    serialized: Dict
+    # Timestamp the entry is removed at (or replaced by expired_serialized if set)
+    expires: Optional[int] = None
+    # Serialized entry once expired, e.g. a gym without the raid that ended
+    expired_serialized: Optional[Dict] = None
+
+
+# Fetches the entries within the rectangle (NE corner, SW corner) that changed since the timestamp passed (all entries
+# if None) keyed by their ID. The entries currently cached for the rectangle are passed as well.
+TileFetcher = Callable[[Location, Location, Optional[int], Dict[Hashable, MapDataEntry]],
+                       Awaitable[Dict[Hashable, MapDataEntry]]]
+
+
+@dataclass
+class MapDataTile:
+    entries: Dict[Hashable, MapDataEntry] = field(default_factory=dict)
+    loaded_at: float = 0
+    updated_at: float = 0
+    last_access: float = 0
+    # Changed whenever entries are added, changed or removed (unique across tiles to not reuse versions once evicted)
+    version: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def tile_of_location(latitude: float, longitude: float, zoom: int) -> Tuple[int, int]:
+    tiles_per_axis: int = 1 << zoom
+    latitude = max(-MAX_TILE_LATITUDE, min(MAX_TILE_LATITUDE, latitude))
+    longitude = max(-180.0, min(180.0, longitude))
+    x: int = int((longitude + 180.0) / 360.0 * tiles_per_axis)
+    y: int = int((1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0 * tiles_per_axis)
+    return min(x, tiles_per_axis - 1), min(y, tiles_per_axis - 1)
+
+
+def bounds_of_tile(x: int, y: int, zoom: int) -> Tuple[Location, Location]:
+    """
+    Returns: NE and SW corner of the tile
+    """
+    tiles_per_axis: int = 1 << zoom
+
+    def latitude_of(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / tiles_per_axis))))
+
+    def longitude_of(tile_x: int) -> float:
+        return tile_x / tiles_per_axis * 360.0 - 180.0
+
+    return (Location(latitude_of(y), longitude_of(x + 1)),
+            Location(latitude_of(y + 1), longitude_of(x)))
+
+
+def tiles_in_rectangle(ne_corner: Location, sw_corner: Location) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Returns: The zoom and the tiles of the zoom covering the rectangle. The highest zoom not exceeding
+    MAX_TILES_PER_REQUEST is used.
+    """
+    zoom: int = MAX_TILE_ZOOM
+    while True:
+        min_x, min_y = tile_of_location(ne_corner.lat, sw_corner.lng, zoom)
+        max_x, max_y = tile_of_location(sw_corner.lat, ne_corner.lng, zoom)
+        if zoom == MIN_TILE_ZOOM or (max_x - min_x + 1) * (max_y - min_y + 1) <= MAX_TILES_PER_REQUEST:
+            break
+        zoom -= 1
+    return zoom, [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+
+class MapDataCache:
+    """
+    Map data (mons, stops, gyms, ...) partitioned by slippy map tiles and shared by all MADmin clients.
+    Tiles are updated with the entries that changed since the last update of the tile (based on the timestamps
+    written by the data ingest) instead of querying the viewport of every client on every refresh.
+    Concurrent requests of the same tile wait for a single query.
+    """
+
+    def __init__(self):
+        self.__tiles: Dict[Tuple[str, int, int, int], MapDataTile] = {}
+        self.__last_eviction: float = 0
+        self.__versions: Iterator[int] = itertools.count(1)
+
+    async def get_entries(self, layer: str, fetcher: TileFetcher, ne_corner: Location,
+                          sw_corner: Location) -> Tuple[Dict[Hashable, MapDataEntry], str, float]:
+        """
+        Args:
+            layer: Name of the data cached (including any parameter changing the entries returned by the fetcher)
+            fetcher: Used to load/update tiles
+            ne_corner:
+            sw_corner:
+
+        Returns: The entries of the tiles covering the rectangle (may exceed the rectangle), a version string of the
+        tiles used and the timestamp the oldest tile used was updated at. Entries changed after the latter may not be
+        contained yet.
+        """
+        now: float = time.time()
+        self.__evict_idle_tiles(now)
+        zoom, tile_coords = tiles_in_rectangle(ne_corner, sw_corner)
+        entries: Dict[Hashable, MapDataEntry] = {}
+        versions: List[str] = []
+        updated_at: float = now
+        for x, y in tile_coords:
+            tile: MapDataTile = await self.__get_tile(layer, fetcher, zoom, x, y)
+            entries.update(tile.entries)
+            versions.append("{}/{}:{}".format(x, y, tile.version))
+            updated_at = min(updated_at, tile.updated_at)
+        return entries, "{}@{}|{}".format(layer, zoom, ",".join(versions)), updated_at
+
+    async def __get_tile(self, layer: str, fetcher: TileFetcher, zoom: int, x: int, y: int) -> MapDataTile:
+        key: Tuple[str, int, int, int] = (layer, zoom, x, y)
+        tile: Optional[MapDataTile] = self.__tiles.get(key)
+        if tile is None:
+            tile = MapDataTile()
+            self.__tiles[key] = tile
+        async with tile.lock:
+            now: float = time.time()
+            tile.last_access = now
+            if now - tile.updated_at < DELTA_INTERVAL:
+                # Updated by a concurrent request or recently enough
+                return tile
+            ne_corner, sw_corner = bounds_of_tile(x, y, zoom)
+            if now - tile.loaded_at >= FULL_RELOAD_INTERVAL:
+                tile.entries = await fetcher(ne_corner, sw_corner, None, tile.entries)
+                tile.loaded_at = now
+                tile.version = next(self.__versions)
+            else:
+                changed: Dict[Hashable, MapDataEntry] = await fetcher(
+                    ne_corner, sw_corner, int(tile.updated_at - DELTA_MARGIN), tile.entries)
+                if changed:
+                    tile.entries.update(changed)
+                    tile.version = next(self.__versions)
+            expired: List[Hashable] = [entry_id for entry_id, entry in tile.entries.items()
+                                       if entry.expires is not None and entry.expires <= now]
+            if expired:
+                for entry_id in expired:
+                    self.__expire_entry(tile, entry_id)
+                tile.version = next(self.__versions)
+            tile.updated_at = now
+        return tile
+
+    @staticmethod
+    def __expire_entry(tile: MapDataTile, entry_id: Hashable) -> None:
+        entry: MapDataEntry = tile.entries[entry_id]
+        if entry.expired_serialized is None:
+            del tile.entries[entry_id]
+        else:
+            # The entry itself stays, only the part expiring changes. Nothing is written to the DB at that time,
+            # hence the deltas do not contain the entry
+            tile.entries[entry_id] = MapDataEntry(latitude=entry.latitude, longitude=entry.longitude,
+                                                  modified=entry.modified, serialized=entry.expired_serialized)
+
+    def __evict_idle_tiles(self, now: float) -> None:
+        if now - self.__last_eviction < TILE_IDLE_TIMEOUT / 10:
+            return
+        self.__last_eviction = now
+        idle: List[Tuple[str, int, int, int]] = [key for key, tile in self.__tiles.items()
+                                                 if now - tile.last_access > TILE_IDLE_TIMEOUT
+                                                 and not tile.lock.locked()]
+        for key in idle:
+            del self.__tiles[key]
+
+
+def in_rectangle(entry: MapDataEntry, ne_corner: Location, sw_corner: Location) -> bool:
+    return sw_corner.lat <= entry.latitude <= ne_corner.lat and sw_corner.lng <= entry.longitude <= ne_corner.lng
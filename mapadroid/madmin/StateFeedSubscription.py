@@ -0,0 +1,39 @@
+import asyncio
+from typing import Dict, List, Optional, Set
+
+import orjson
+
+
+class StateFeedSubscription:
+    """
+    Changes of the topics subscribed to pending to be sent to a single client. Changes of the same entry are
+    coalesced until the client retrieves them.
+    """
+
+    def __init__(self, topics: Set[str]):
+        self.topics: Set[str] = topics
+        # Serialized entries per topic and key, None if the entry was removed
+        self.__pending: Dict[str, Dict[str, Optional[bytes]]] = {}
+        self.__changes_pending: asyncio.Event = asyncio.Event()
+
+    def push(self, topic: str, changes: Dict[str, Optional[bytes]]) -> None:
+        self.__pending.setdefault(topic, {}).update(changes)
+        self.__changes_pending.set()
+
+    async def get_events(self, timeout: float) -> Dict[str, bytes]:
+        """
+        Returns: JSON ({"changed": [...], "removed": [keys]}) per topic changed, empty if nothing changed within
+        the timeout
+        """
+        try:
+            await asyncio.wait_for(self.__changes_pending.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self.__changes_pending.clear()
+        pending, self.__pending = self.__pending, {}
+        events: Dict[str, bytes] = {}
+        for topic, changes in pending.items():
+            changed: List[bytes] = [entry for entry in changes.values() if entry is not None]
+            removed: List[str] = [key for key, entry in changes.items() if entry is None]
+            events[topic] = b'{"changed":[' + b",".join(changed) + b'],"removed":' + orjson.dumps(removed) + b'}'
+        return events
@@ -101,7 +101,7 @@ class AbstractResourceEndpoint(AbstractMadminRootEndpoint, ABC):
         if self.request.query.get("hide_resource", "0") == "0":
             # Include the resource info as it's not to be hidden...
             result["resource"] = self._resource_info()
-        return await self._json_response(data=result)
+        return await self._encoded_response(result)
 
     @check_authorization_header(AuthLevel.MADMIN_ADMIN)
     async def put(self) -> web.Response:
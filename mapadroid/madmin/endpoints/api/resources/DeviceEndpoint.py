@@ -14,6 +14,7 @@ from mapadroid.madmin.AbstractMadminRootEndpoint import \
     check_authorization_header
 from mapadroid.madmin.endpoints.api.resources.AbstractResourceEndpoint import \
     AbstractResourceEndpoint
+from mapadroid.route.LevelingVisitStream import publish_flush
 
 
 class DeviceEndpoint(AbstractResourceEndpoint):
@@ -75,6 +76,7 @@ class DeviceEndpoint(AbstractResourceEndpoint):
                         device_id=device.device_id)
                     if username:
                         await TrsVisitedHelper.flush_all_of_username(self._session, username)
+                        await publish_flush(await self._get_db_wrapper().get_cache(), username)
                         self._commit_trigger = True
                         return await self._json_response(dict(), status=204)
                     else:
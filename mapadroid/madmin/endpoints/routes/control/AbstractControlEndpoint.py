@@ -3,6 +3,7 @@ import os
 from abc import ABC
 from typing import Optional
 
+from aiofile import async_open
 from aiohttp.abc import Request
 from loguru import logger
 from PIL import Image
@@ -69,10 +70,15 @@ class AbstractControlEndpoint(AbstractMadminRootEndpoint, ABC):
         filename = generate_device_screenshot_path(mapping_entry.device_settings.name, mapping_entry,
                                                    self._get_mad_args())
 
-        await temp_comm.get_screenshot(filename, screenshot_quality, screenshot_type)
+        screenshot_data: Optional[bytes] = await temp_comm.get_screenshot_data(screenshot_quality, screenshot_type)
+        if screenshot_data is None:
+            logger.warning("Failed grabbing screenshot")
+            return
+        async with async_open(filename, "wb") as fh:
+            await fh.write(screenshot_data)
         logger.info("Done grabbing screenshot, resizing")
         await image_resize(filename, os.path.join(mapadroid.MAD_ROOT, self._get_mad_args().temp_path, "madmin"),
-                           width=250)
+                           width=250, data=screenshot_data)
         logger.info("Done resizing screenshot")
 
     @staticmethod
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from aiohttp import web
+
+from mapadroid.madmin.endpoints.routes.control.AbstractControlEndpoint import \
+    AbstractControlEndpoint
+from mapadroid.utils.logging import get_log_ring_buffer
+
+
+class GetOriginLogEndpoint(AbstractControlEndpoint):
+    """
+    "/get_origin_log"
+    Recent log records of an origin kept in memory. Returns the origins available if no origin is passed.
+    """
+
+    async def get(self) -> web.Response:
+        origin: Optional[str] = self.request.query.get("origin")
+        if not origin:
+            return await self._json_response(get_log_ring_buffer().get_origins())
+        since_raw: Optional[str] = self.request.query.get("since")
+        limit_raw: Optional[str] = self.request.query.get("limit")
+        try:
+            since: Optional[float] = float(since_raw) if since_raw else None
+            limit: Optional[int] = int(limit_raw) if limit_raw else None
+        except ValueError:
+            raise web.HTTPBadRequest()
+        return await self._json_response(get_log_ring_buffer().get_entries(origin, since=since, limit=limit))
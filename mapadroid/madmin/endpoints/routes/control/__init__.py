@@ -9,6 +9,7 @@ from mapadroid.madmin.endpoints.routes.control.DevicecontrolEndpoint import Devi
 from mapadroid.madmin.endpoints.routes.control.DownloadLogcatEndpoint import DownloadLogcatEndpoint
 from mapadroid.madmin.endpoints.routes.control.GetAllWorkersEndpoint import GetAllWorkersEndpoint
 from mapadroid.madmin.endpoints.routes.control.GetInstallLogEndpoint import GetInstallLogEndpoint
+from mapadroid.madmin.endpoints.routes.control.GetOriginLogEndpoint import GetOriginLogEndpoint
 from mapadroid.madmin.endpoints.routes.control.GetUploadedFilesEndpoint import GetUploadedFilesEndpoint
 from mapadroid.madmin.endpoints.routes.control.InstallFileAllDevicesEndpoint import InstallFileAllDevicesEndpoint
 from mapadroid.madmin.endpoints.routes.control.InstallFileEndpoint import InstallFileEndpoint
@@ -53,3 +54,4 @@ def register_routes_control_endpoints(app: web.Application):
     app.router.add_view('/get_all_workers', GetAllWorkersEndpoint, name='get_all_workers')
     app.router.add_view('/job_for_worker', JobForWorkerEndpoint, name='job_for_worker')
     app.router.add_view('/reload_jobs', ReloadJobsEndpoint, name='reload_jobs')
+    app.router.add_view('/get_origin_log', GetOriginLogEndpoint, name='get_origin_log')
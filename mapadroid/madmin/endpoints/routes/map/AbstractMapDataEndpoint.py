@@ -0,0 +1,99 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional
+
+from aiohttp import hdrs, web
+
+from mapadroid.db.model import AuthLevel
+from mapadroid.madmin.AbstractMadminRootEndpoint import (
+    AbstractMadminRootEndpoint, check_authorization_header)
+from mapadroid.madmin.functions import get_bound_params
+from mapadroid.madmin.MapDataCache import (DELTA_MARGIN, MAX_TILE_LATITUDE,
+                                           MapDataCache, MapDataEntry,
+                                           in_rectangle)
+from mapadroid.utils.collections import Location
+
+# Shared by all clients of MADmin
+_map_data_cache: MapDataCache = MapDataCache()
+
+
+class AbstractMapDataEndpoint(AbstractMadminRootEndpoint, ABC):
+    """
+    Map data served of the tiles of the MapDataCache. The viewport (and the old viewport) as well as the timestamp of
+    the previous request of a client are applied to the cached entries rather than queried.
+    Responses carry an ETag, requests passing a matching If-None-Match are answered with 304.
+    Passing layout=columnar returns the entries as parallel arrays per attribute ({"id": [...], "lat": [...]})
+    rather than a list of objects.
+    """
+
+    @abstractmethod
+    def _get_layer(self) -> str:
+        """
+        Returns: The name of the data in the cache
+        """
+        pass
+
+    @abstractmethod
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
+        """
+        Loads the entries of a tile. See TileFetcher
+        """
+        pass
+
+    def _prepare_response(self, entries: List[MapDataEntry], columnar: bool) -> Any:
+        serialized: List[Dict] = [entry.serialized for entry in entries]
+        return self._to_columns(serialized) if columnar else serialized
+
+    @staticmethod
+    def _to_columns(rows: List[Dict]) -> Dict[str, List]:
+        columns: Dict[str, List] = {key: [] for key in rows[0]} if rows else {}
+        for row in rows:
+            for key, values in columns.items():
+                values.append(row[key])
+        return columns
+
+    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
+    async def get(self):
+        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
+        timestamp: Optional[int] = self._request.query.get("timestamp")
+        if timestamp:
+            timestamp = int(timestamp)
+        if ne_lat and ne_lng and sw_lat and sw_lng:
+            ne_corner: Location = Location(ne_lat, ne_lng)
+            sw_corner: Location = Location(sw_lat, sw_lng)
+        else:
+            ne_corner: Location = Location(MAX_TILE_LATITUDE, 180.0)
+            sw_corner: Location = Location(-MAX_TILE_LATITUDE, -180.0)
+        old_ne_corner: Optional[Location] = None
+        old_sw_corner: Optional[Location] = None
+        if o_ne_lat and o_ne_lng and o_sw_lat and o_sw_lng:
+            old_ne_corner = Location(o_ne_lat, o_ne_lng)
+            old_sw_corner = Location(o_sw_lat, o_sw_lng)
+
+        entries, version, updated_at = await _map_data_cache.get_entries(self._get_layer(), self._fetch_tile,
+                                                                         ne_corner, sw_corner)
+        if timestamp:
+            # Changes made after the oldest tile was updated will be contained in a later update of the tile, the
+            # next request of the client needs to include them despite the client passing a newer timestamp
+            timestamp = min(timestamp, int(updated_at - DELTA_MARGIN))
+        # Weak as the representation depends on the encoding negotiated
+        etag: str = 'W/"{}"'.format(hashlib.sha1("{}|{}|{}|{}".format(version, self._request.query_string, timestamp,
+                                                                      self._request.headers.get(hdrs.ACCEPT))
+                                                 .encode()).hexdigest())
+        headers: Dict[str, str] = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache", hdrs.VARY: "Accept"}
+        if etag in self._request.headers.get(hdrs.IF_NONE_MATCH, ""):
+            return web.Response(status=304, headers=headers)
+
+        selected: List[MapDataEntry] = []
+        for entry in entries.values():
+            if not in_rectangle(entry, ne_corner, sw_corner):
+                continue
+            elif old_ne_corner and not in_rectangle(entry, old_ne_corner, old_sw_corner):
+                continue
+            elif timestamp and entry.modified < timestamp:
+                continue
+            selected.append(entry)
+        del entries
+        columnar: bool = self._request.query.get("layout") == "columnar"
+        return await self._encoded_response(self._prepare_response(selected, columnar), headers=headers)
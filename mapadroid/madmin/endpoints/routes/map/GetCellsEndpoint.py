@@ -1,41 +1,39 @@
-from typing import List, Optional
+from typing import Dict, Hashable, List, Optional
+
+from sqlalchemy import Row
 
 from mapadroid.db.helper.TrsS2CellHelper import TrsS2CellHelper
-from mapadroid.db.model import AuthLevel, TrsS2Cell
-from mapadroid.madmin.AbstractMadminRootEndpoint import (
-    AbstractMadminRootEndpoint, check_authorization_header)
-from mapadroid.madmin.functions import get_bound_params
+from mapadroid.madmin.endpoints.routes.map.AbstractMapDataEndpoint import \
+    AbstractMapDataEndpoint
+from mapadroid.madmin.MapDataCache import MapDataEntry
 from mapadroid.utils.collections import Location
 from mapadroid.utils.s2Helper import S2Helper
 
 
-class GetCellsEndpoint(AbstractMadminRootEndpoint):
+class GetCellsEndpoint(AbstractMapDataEndpoint):
     """
     "/get_cells"
     """
 
-    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
-    async def get(self):
-        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
-        timestamp: Optional[int] = self._request.query.get("timestamp")
-        if timestamp:
-            timestamp = int(timestamp)
-        data: List[TrsS2Cell] = \
-            await TrsS2CellHelper.get_cells_in_rectangle(self._session,
-                                                         ne_corner=Location(ne_lat, ne_lng),
-                                                         sw_corner=Location(sw_lat, sw_lng),
-                                                         old_ne_corner=Location(o_ne_lat, o_ne_lng),
-                                                         old_sw_corner=Location(o_sw_lat, o_sw_lng),
-                                                         timestamp=timestamp)
+    def _get_layer(self) -> str:
+        return "cells"
+
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
+        data: List[Row] = \
+            await TrsS2CellHelper.get_cell_columns_in_rectangle(self._session,
+                                                                ne_corner=ne_corner,
+                                                                sw_corner=sw_corner,
+                                                                timestamp=timestamp)
 
-        ret = []
+        ret: Dict[Hashable, MapDataEntry] = {}
         for cell in data:
-            ret.append({
+            cell_serialized: Dict = {
                 "id": cell.id,
                 "polygon": S2Helper.coords_of_cell(cell.id),
                 "updated": cell.updated
-            })
+            }
+            ret[cell.id] = MapDataEntry(latitude=cell.center_latitude, longitude=cell.center_longitude,
+                                        modified=cell.updated, serialized=cell_serialized)
         del data
-        resp = await self._json_response(ret)
-        del ret
-        return resp
+        return ret
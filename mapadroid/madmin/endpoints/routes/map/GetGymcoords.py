@@ -1,33 +1,30 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, Optional, Tuple
 
 from mapadroid.db.helper.GymHelper import GymHelper
-from mapadroid.db.model import AuthLevel, Gym, GymDetail, Raid
-from mapadroid.madmin.AbstractMadminRootEndpoint import (
-    AbstractMadminRootEndpoint, check_authorization_header)
-from mapadroid.madmin.functions import get_bound_params
+from mapadroid.db.model import Gym, GymDetail, Raid
+from mapadroid.madmin.endpoints.routes.map.AbstractMapDataEndpoint import \
+    AbstractMapDataEndpoint
+from mapadroid.madmin.MapDataCache import MapDataEntry
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 
 
-class GetGymcoordsEndpoint(AbstractMadminRootEndpoint):
+class GetGymcoordsEndpoint(AbstractMapDataEndpoint):
     """
     "/get_gymcoords"
     """
 
-    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
-    async def get(self):
-        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
-        timestamp: Optional[int] = self._request.query.get("timestamp")
-        if timestamp:
-            timestamp = int(timestamp)
-        coords: List[Dict] = []
+    def _get_layer(self) -> str:
+        return "gyms"
+
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
+        coords: Dict[Hashable, MapDataEntry] = {}
         data: Dict[int, Tuple[Gym, GymDetail, Raid]] = \
             await GymHelper.get_gyms_in_rectangle(self._session,
-                                                  ne_corner=Location(ne_lat, ne_lng),
-                                                  sw_corner=Location(sw_lat, sw_lng),
-                                                  old_ne_corner=Location(o_ne_lat, o_ne_lng),
-                                                  old_sw_corner=Location(o_sw_lat, o_sw_lng),
+                                                  ne_corner=ne_corner,
+                                                  sw_corner=sw_corner,
                                                   timestamp=timestamp)
 
         now: datetime = DatetimeWrapper.now()
@@ -46,7 +43,7 @@ class GetGymcoordsEndpoint(AbstractMadminRootEndpoint):
                     "evolution": raid.evolution
                 }
 
-            coords.append({
+            gym_serialized: Dict = {
                 "id": gym_id,
                 "name": gym_detail.name,
                 "img": gym_detail.url,
@@ -56,8 +53,13 @@ class GetGymcoordsEndpoint(AbstractMadminRootEndpoint):
                 "last_updated": gym.last_modified.timestamp(),
                 "last_scanned": gym.last_scanned.timestamp(),
                 "raid": raid_data
-            })
+            }
+            entry: MapDataEntry = MapDataEntry(latitude=gym.latitude, longitude=gym.longitude,
+                                               modified=int(gym.last_scanned.timestamp()), serialized=gym_serialized)
+            if raid_data:
+                # The gym is shown without the raid once it ended
+                entry.expires = raid_data["end"]
+                entry.expired_serialized = dict(gym_serialized, raid=None)
+            coords[gym_id] = entry
         del data
-        resp = await self._json_response(coords)
-        del coords
-        return resp
+        return coords
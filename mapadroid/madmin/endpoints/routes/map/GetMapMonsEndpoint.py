@@ -1,52 +1,46 @@
 import asyncio
 import random
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Optional
 
 from loguru import logger
 
 from mapadroid.db.helper.PokemonHelper import PokemonHelper
-from mapadroid.db.model import AuthLevel, Pokemon
-from mapadroid.madmin.AbstractMadminRootEndpoint import (
-    AbstractMadminRootEndpoint, check_authorization_header)
-from mapadroid.madmin.functions import get_bound_params
+from mapadroid.db.model import Pokemon
+from mapadroid.madmin.endpoints.routes.map.AbstractMapDataEndpoint import \
+    AbstractMapDataEndpoint
+from mapadroid.madmin.MapDataCache import MapDataEntry
 from mapadroid.utils.collections import Location
 from mapadroid.utils.language import get_mon_name_sync
 from mapadroid.utils.madGlobals import MonSeenTypes
 
 
-class GetMapMonsEndpoint(AbstractMadminRootEndpoint):
+class GetMapMonsEndpoint(AbstractMapDataEndpoint):
     """
     "/get_map_mons"
     """
 
-    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
-    async def get(self):
-        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
-        timestamp: Optional[int] = self._request.query.get("timestamp")
-        if timestamp:
-            timestamp = int(timestamp)
-        data: List[Pokemon] = \
-            await PokemonHelper.get_mons_in_rectangle(self._session,
-                                                      ne_corner=Location(ne_lat, ne_lng),
-                                                      sw_corner=Location(sw_lat, sw_lng),
-                                                      old_ne_corner=Location(o_ne_lat,
-                                                                             o_ne_lng) if o_ne_lat and o_ne_lng else None,
-                                                      old_sw_corner=Location(o_sw_lat,
-                                                                             o_sw_lng) if o_sw_lat and o_sw_lng else None,
-                                                      timestamp=timestamp)
+    def _get_layer(self) -> str:
+        return "mons"
+
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
+        data: List[Pokemon] = await PokemonHelper.get_mons_in_rectangle(self._session, ne_corner=ne_corner,
+                                                                        sw_corner=sw_corner, timestamp=timestamp)
         loop = asyncio.get_running_loop()
         mons_serialized = await loop.run_in_executor(
             None, self.__serialize_mons, data)
         del data
-        response = await self._json_response(mons_serialized)
-        return response
+        return mons_serialized
 
-    def __serialize_mons(self, data):
-        mons_serialized: List[Dict] = []
+    def __serialize_mons(self, data: List[Pokemon]) -> Dict[Hashable, MapDataEntry]:
+        mons_serialized: Dict[Hashable, MapDataEntry] = {}
         mon_name_cache: Dict[int, str] = self._get_mon_name_cache()
         for mon in data:
             serialized_entry = self.__serialize_single_mon(mon, mon_name_cache)
-            mons_serialized.append(serialized_entry)
+            mons_serialized[mon.encounter_id] = MapDataEntry(latitude=mon.latitude, longitude=mon.longitude,
+                                                             modified=serialized_entry["last_modified"],
+                                                             serialized=serialized_entry,
+                                                             expires=serialized_entry["disappear_time"])
         del data
         return mons_serialized
 
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from mapadroid.db.model import AuthLevel
 from mapadroid.madmin.AbstractMadminRootEndpoint import \
@@ -6,6 +6,7 @@ from mapadroid.madmin.AbstractMadminRootEndpoint import \
 from mapadroid.madmin.endpoints.routes.control.AbstractControlEndpoint import \
     AbstractControlEndpoint
 from mapadroid.madmin.functions import get_coord_float
+from mapadroid.mapping_manager.MappingManager import MappingManager
 from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import \
     RoutePriorityQueueEntry
 from mapadroid.worker.WorkerType import WorkerType
@@ -18,13 +19,20 @@ class GetPriorouteEndpoint(AbstractControlEndpoint):
 
     @check_authorization_header(AuthLevel.MADMIN_ADMIN)
     async def get(self):
+        routeexport: List[Dict] = await self.serialize_prioroutes(self._get_mapping_manager())
+        resp = await self._json_response(routeexport)
+        del routeexport
+        return resp
+
+    @staticmethod
+    async def serialize_prioroutes(mapping_manager: MappingManager) -> List[Dict]:
         routeexport = []
-        routemanager_ids: List[int] = await self._get_mapping_manager().get_all_routemanager_ids()
+        routemanager_ids: List[int] = await mapping_manager.get_all_routemanager_ids()
         for routemanager_id in routemanager_ids:
-            mode: WorkerType = await self._get_mapping_manager().routemanager_get_mode(routemanager_id)
-            name = await self._get_mapping_manager().routemanager_get_name(routemanager_id)
+            mode: WorkerType = await mapping_manager.routemanager_get_mode(routemanager_id)
+            name = await mapping_manager.routemanager_get_name(routemanager_id)
             route: Optional[
-                List[RoutePriorityQueueEntry]] = await self._get_mapping_manager().routemanager_get_current_prioroute(
+                List[RoutePriorityQueueEntry]] = await mapping_manager.routemanager_get_current_prioroute(
                 routemanager_id)
 
             if route is None:
@@ -43,6 +51,4 @@ class GetPriorouteEndpoint(AbstractControlEndpoint):
                 "mode": mode.value,
                 "coordinates": route_serialized
             })
-        resp = await self._json_response(routeexport)
-        del routeexport
-        return resp
+        return routeexport
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from mapadroid.db.helper.PokestopHelper import PokestopHelper
 from mapadroid.db.model import AuthLevel, Pokestop, TrsQuest
@@ -18,8 +18,6 @@ class GetQuestsEndpoint(AbstractMadminRootEndpoint):
 
     @check_authorization_header(AuthLevel.MADMIN_ADMIN)
     async def get(self):
-        quests = []
-
         fence_name = self._request.query.get("fence")
         fence: Optional[Tuple[str, Optional[GeofenceHelper]]] = None
         if fence_name not in (None, 'None', 'All'):
@@ -38,10 +36,10 @@ class GetQuestsEndpoint(AbstractMadminRootEndpoint):
                                                  timestamp=timestamp,
                                                  fence=fence)
         quest_gen: QuestGen = self._get_quest_gen()
+        # Quests are kept serialized by QuestGen, the response is merely the concatenation of them
+        quests: List[str] = []
         for stop_id, (stop, quests_of_stop) in data.items():
             for quest in quests_of_stop.values():
-                quests.append(await quest_gen.generate_quest(stop, quest))
+                quests.append(await quest_gen.get_rendered_quest(stop, quest))
         del data
-        resp = await self._json_response(quests)
-        del quests
-        return resp
+        return await self._json_response(text="[" + ",".join(quests) + "]")
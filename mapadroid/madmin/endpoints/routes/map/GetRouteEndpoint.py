@@ -1,6 +1,8 @@
 import asyncio
 from typing import Dict, List
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from mapadroid.db.helper import SettingsRoutecalcHelper
 from mapadroid.db.model import AuthLevel, SettingsRoutecalc
 from mapadroid.madmin.AbstractMadminRootEndpoint import \
@@ -8,6 +10,7 @@ from mapadroid.madmin.AbstractMadminRootEndpoint import \
 from mapadroid.madmin.endpoints.routes.control.AbstractControlEndpoint import \
     AbstractControlEndpoint
 from mapadroid.madmin.functions import get_coord_float
+from mapadroid.mapping_manager.MappingManager import MappingManager
 from mapadroid.route.routecalc.RoutecalcUtil import RoutecalcUtil
 from mapadroid.route.RoutePoolEntry import RoutePoolEntry
 from mapadroid.utils.collections import Location
@@ -21,17 +24,26 @@ class GetRouteEndpoint(AbstractControlEndpoint):
 
     @check_authorization_header(AuthLevel.MADMIN_ADMIN)
     async def get(self):
+        data: List[Dict] = await self.serialize_routes(self._session, self._get_mapping_manager(),
+                                                       self._get_instance_id())
+        resp = await self._json_response(data)
+        del data
+        return resp
+
+    @staticmethod
+    async def serialize_routes(session: AsyncSession, mapping_manager: MappingManager,
+                               instance_id: int) -> List[Dict]:
         routeinfo_by_id = {}
 
-        routemanager_ids: List[int] = await self._get_mapping_manager().get_all_routemanager_ids()
+        routemanager_ids: List[int] = await mapping_manager.get_all_routemanager_ids()
         for routemanager_id in routemanager_ids:
-            (route, workers) = await self._get_mapping_manager().routemanager_get_current_route(routemanager_id)
+            (route, workers) = await mapping_manager.routemanager_get_current_route(routemanager_id)
             if route is None:
                 continue
 
-            mode: WorkerType = await self._get_mapping_manager().routemanager_get_mode(routemanager_id)
-            name = await self._get_mapping_manager().routemanager_get_name(routemanager_id)
-            routecalc_id = await self._get_mapping_manager().routemanager_get_routecalc_id(routemanager_id)
+            mode: WorkerType = await mapping_manager.routemanager_get_mode(routemanager_id)
+            name = await mapping_manager.routemanager_get_name(routemanager_id)
+            routecalc_id = await mapping_manager.routemanager_get_routecalc_id(routemanager_id)
             routeinfo_by_id[routecalc_id] = routeinfo = {
                 "id": routecalc_id,
                 "route": route,
@@ -52,22 +64,21 @@ class GetRouteEndpoint(AbstractControlEndpoint):
 
         if len(routeinfo_by_id) > 0:
             routecalcs: Dict[int, SettingsRoutecalc] = await SettingsRoutecalcHelper \
-                .get_all(self._session, self._get_instance_id())
+                .get_all(session, instance_id)
             loop = asyncio.get_running_loop()
             await loop.run_in_executor(
-                None, self.__serialize_routecalcs, routecalcs, routeinfo_by_id)
+                None, GetRouteEndpoint.__serialize_routecalcs, routecalcs, routeinfo_by_id)
             del routecalcs
             data = await loop.run_in_executor(
-                None, self.__prepare_data, routeinfo_by_id)
+                None, GetRouteEndpoint.__prepare_data, routeinfo_by_id)
             del routeinfo_by_id
         else:
             data = []
-        resp = await self._json_response(data)
-        del data
-        return resp
+        return data
 
-    def __prepare_data(self, routeinfo_by_id):
-        data = list(map(lambda r: self.get_routepool_route(r), routeinfo_by_id.values()))
+    @staticmethod
+    def __prepare_data(routeinfo_by_id):
+        data = list(map(lambda r: GetRouteEndpoint.get_routepool_route(r), routeinfo_by_id.values()))
         return data
 
     @staticmethod
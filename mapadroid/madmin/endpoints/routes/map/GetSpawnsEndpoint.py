@@ -1,64 +1,67 @@
 import asyncio
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional
+
+from sqlalchemy import Row
 
 from mapadroid.db.helper.TrsSpawnHelper import TrsSpawnHelper
-from mapadroid.db.model import AuthLevel, TrsEvent, TrsSpawn
-from mapadroid.madmin.AbstractMadminRootEndpoint import (
-    AbstractMadminRootEndpoint, check_authorization_header)
-from mapadroid.madmin.functions import get_bound_params
+from mapadroid.madmin.endpoints.routes.map.AbstractMapDataEndpoint import \
+    AbstractMapDataEndpoint
+from mapadroid.madmin.MapDataCache import MapDataEntry
 from mapadroid.utils.collections import Location
 
 
-class GetSpawnsEndpoint(AbstractMadminRootEndpoint):
+class GetSpawnsEndpoint(AbstractMapDataEndpoint):
     """
     "/get_spawns"
     """
 
-    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
-    async def get(self):
-        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
-        timestamp: Optional[int] = self._request.query.get("timestamp")
-        if timestamp:
-            timestamp = int(timestamp)
+    def _get_layer(self) -> str:
+        return "spawns"
 
-        coords: Dict[str, List[Dict]] = {}
-        data: Dict[int, Tuple[TrsSpawn, TrsEvent]] = \
-            await TrsSpawnHelper.download_spawns(self._session,
-                                                 ne_corner=Location(ne_lat, ne_lng), sw_corner=Location(sw_lat, sw_lng),
-                                                 old_ne_corner=Location(o_ne_lat, o_ne_lng),
-                                                 old_sw_corner=Location(o_sw_lat, o_sw_lng),
-                                                 timestamp=timestamp)
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
+        data: List[Row] = await TrsSpawnHelper.get_spawn_columns_in_rectangle(self._session,
+                                                                              ne_corner=ne_corner,
+                                                                              sw_corner=sw_corner,
+                                                                              timestamp=timestamp)
         loop = asyncio.get_running_loop()
-        cluster_spawns = await loop.run_in_executor(
-            None, self.__serialize_spawns, coords, data)
+        spawns = await loop.run_in_executor(
+            None, self.__serialize_spawns, data)
         del data
-        resp = await self._json_response(cluster_spawns)
-        del cluster_spawns
-        return resp
+        return spawns
+
+    def _prepare_response(self, entries: List[MapDataEntry], columnar: bool) -> List[Dict]:
+        coords: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            coords.setdefault(entry.serialized["event"], []).append(entry.serialized)
+        cluster_spawns = []
+        for spawn in coords:
+            cluster_spawns.append({"EVENT": spawn,
+                                   "Coords": self._to_columns(coords[spawn]) if columnar else coords[spawn]})
+        return cluster_spawns
 
     @staticmethod
     def get_time_ms():
         return int(time.time() * 1000)
 
-    def __serialize_spawns(self, coords, data):
-        # TODO: Starmap/multiprocess if possible given the possible huge amount of data here?
-        for (spawn_id, (spawn, event)) in data.items():
-            if event.event_name not in coords:
-                coords[event.event_name] = []
-            coords[event.event_name].append({
-                "id": spawn_id,
-                "endtime": spawn.calc_endminsec,
-                "lat": spawn.latitude,
-                "lon": spawn.longitude,
-                "spawndef": spawn.spawndef,
-                "lastnonscan": spawn.last_non_scanned.strftime(
-                    self._datetimeformat) if spawn.last_non_scanned else None,
-                "lastscan": spawn.last_scanned.strftime(self._datetimeformat) if spawn.last_scanned else None,
-                "first_detection": spawn.first_detection.strftime(self._datetimeformat),
-                "event": event.event_name
-            })
-        cluster_spawns = []
-        for spawn in coords:
-            cluster_spawns.append({"EVENT": spawn, "Coords": coords[spawn]})
-        return cluster_spawns
+    def __serialize_spawns(self, data: List[Row]) -> Dict[Hashable, MapDataEntry]:
+        spawns: Dict[Hashable, MapDataEntry] = {}
+        for spawn in data:
+            spawn_id: int = spawn.spawnpoint
+            spawns[spawn_id] = MapDataEntry(
+                latitude=spawn.latitude, longitude=spawn.longitude,
+                modified=int(spawn.last_scanned.timestamp()) if spawn.last_scanned else 0,
+                serialized={
+                    "id": spawn_id,
+                    "endtime": spawn.calc_endminsec,
+                    "lat": spawn.latitude,
+                    "lon": spawn.longitude,
+                    "spawndef": spawn.spawndef,
+                    "lastnonscan": spawn.last_non_scanned.strftime(
+                        self._datetimeformat) if spawn.last_non_scanned else None,
+                    "lastscan": spawn.last_scanned.strftime(self._datetimeformat) if spawn.last_scanned else None,
+                    "first_detection": spawn.first_detection.strftime(self._datetimeformat),
+                    "event": spawn.event_name
+                })
+        return spawns
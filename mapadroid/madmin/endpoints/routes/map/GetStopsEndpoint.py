@@ -1,58 +1,66 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from mapadroid.db.helper.PokestopHelper import PokestopHelper
-from mapadroid.db.model import AuthLevel, Pokestop, TrsQuest
-from mapadroid.madmin.AbstractMadminRootEndpoint import (
-    AbstractMadminRootEndpoint, check_authorization_header)
-from mapadroid.madmin.functions import get_bound_params
+from mapadroid.db.model import Pokestop, TrsQuest
+from mapadroid.madmin.endpoints.routes.map.AbstractMapDataEndpoint import \
+    AbstractMapDataEndpoint
+from mapadroid.madmin.MapDataCache import MapDataEntry
 from mapadroid.utils.collections import Location
 
 
-class GetStopsEndpoint(AbstractMadminRootEndpoint):
+class GetStopsEndpoint(AbstractMapDataEndpoint):
     """
     "/get_stops"
     """
 
-    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
-    async def get(self):
-        ne_lat, ne_lng, sw_lat, sw_lng, o_ne_lat, o_ne_lng, o_sw_lat, o_sw_lng = get_bound_params(self._request)
-        timestamp: Optional[int] = self._request.query.get("timestamp")
-        if timestamp:
-            timestamp = int(timestamp)
+    def _get_layer(self) -> str:
+        return "stops"
+
+    async def _fetch_tile(self, ne_corner: Location, sw_corner: Location, timestamp: Optional[int],
+                          cached: Dict[Hashable, MapDataEntry]) -> Dict[Hashable, MapDataEntry]:
         data: List[Pokestop] = \
             await PokestopHelper.get_in_rectangle(self._session,
-                                                  ne_corner=Location(ne_lat, ne_lng),
-                                                  sw_corner=Location(sw_lat, sw_lng),
-                                                  old_ne_corner=Location(o_ne_lat, o_ne_lng),
-                                                  old_sw_corner=Location(o_sw_lat, o_sw_lng),
+                                                  ne_corner=ne_corner,
+                                                  sw_corner=sw_corner,
                                                   timestamp=timestamp)
         stops_with_quests: Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]] = \
             await PokestopHelper.get_with_quests(self._session,
-                                                 ne_corner=Location(ne_lat, ne_lng),
-                                                 sw_corner=Location(sw_lat, sw_lng),
-                                                 old_ne_corner=Location(o_ne_lat, o_ne_lng),
-                                                 old_sw_corner=Location(o_sw_lat, o_sw_lng),
+                                                 ne_corner=ne_corner,
+                                                 sw_corner=sw_corner,
                                                  timestamp=timestamp)
-        prepared_for_serialization: List[Dict] = []
+        prepared_for_serialization: Dict[Hashable, MapDataEntry] = {}
         for stop in data:
-            stop_serialized = {variable: value for variable, value in vars(stop).items() if
-                               not variable.startswith("_")}
-            stop_serialized["last_modified"] = int(
-                stop.last_modified.timestamp()) if stop.last_modified else 0
-            stop_serialized["lure_expiration"] = int(
-                stop.lure_expiration.timestamp()) if stop.lure_expiration else 0
-            stop_serialized["last_updated"] = int(
-                stop.last_updated.timestamp()) if stop.last_updated else 0
-            # TODO: Add incidents list
-            #stop_serialized["incident_start"] = int(
-            #    stop.incident_start.timestamp()) if stop.incident_start else 0
-            #stop_serialized["incident_expiration"] = int(
-            #    stop.incident_expiration.timestamp()) if stop.incident_expiration else 0
-            stop_serialized["has_quest"] = stop.pokestop_id in stops_with_quests
-            prepared_for_serialization.append(stop_serialized)
+            has_quest: bool = stop.pokestop_id in stops_with_quests
+            if not has_quest and timestamp and stop.pokestop_id in cached:
+                # Only quests changed since the timestamp have been queried, quests are only removed by full loads
+                has_quest = cached[stop.pokestop_id].serialized["has_quest"]
+            prepared_for_serialization[stop.pokestop_id] = self.__serialize_stop(stop, has_quest)
+        for stop_id, (stop, quests) in stops_with_quests.items():
+            if stop_id in prepared_for_serialization:
+                continue
+            # The quest changed but the stop itself did not
+            entry: MapDataEntry = self.__serialize_stop(stop, True)
+            entry.modified = max([entry.modified] + [quest.quest_timestamp for quest in quests.values()])
+            prepared_for_serialization[stop_id] = entry
         del data
         del stops_with_quests
+        return prepared_for_serialization
 
-        resp = await self._json_response(prepared_for_serialization)
-        del prepared_for_serialization
-        return resp
+    @staticmethod
+    def __serialize_stop(stop: Pokestop, has_quest: bool) -> MapDataEntry:
+        stop_serialized = {variable: value for variable, value in vars(stop).items() if
+                           not variable.startswith("_")}
+        stop_serialized["last_modified"] = int(
+            stop.last_modified.timestamp()) if stop.last_modified else 0
+        stop_serialized["lure_expiration"] = int(
+            stop.lure_expiration.timestamp()) if stop.lure_expiration else 0
+        stop_serialized["last_updated"] = int(
+            stop.last_updated.timestamp()) if stop.last_updated else 0
+        # TODO: Add incidents list
+        #stop_serialized["incident_start"] = int(
+        #    stop.incident_start.timestamp()) if stop.incident_start else 0
+        #stop_serialized["incident_expiration"] = int(
+        #    stop.incident_expiration.timestamp()) if stop.incident_expiration else 0
+        stop_serialized["has_quest"] = has_quest
+        return MapDataEntry(latitude=stop.latitude, longitude=stop.longitude,
+                            modified=stop_serialized["last_updated"], serialized=stop_serialized)
@@ -1,11 +1,12 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from mapadroid.db.model import AuthLevel
 from mapadroid.madmin.AbstractMadminRootEndpoint import \
     check_authorization_header
 from mapadroid.madmin.endpoints.routes.control.AbstractControlEndpoint import \
     AbstractControlEndpoint
-from mapadroid.mapping_manager.MappingManager import DeviceMappingsEntry
+from mapadroid.mapping_manager.MappingManager import (DeviceMappingsEntry,
+                                                      MappingManager)
 
 
 class GetWorkersEndpoint(AbstractControlEndpoint):
@@ -15,9 +16,16 @@ class GetWorkersEndpoint(AbstractControlEndpoint):
 
     @check_authorization_header(AuthLevel.MADMIN_ADMIN)
     async def get(self):
+        positions: List[Dict] = await self.serialize_workers(self._get_mapping_manager())
+        resp = await self._json_response(positions)
+        del positions
+        return resp
+
+    @staticmethod
+    async def serialize_workers(mapping_manager: MappingManager) -> List[Dict]:
         positions = []
         devicemappings: Optional[
-            Dict[str, DeviceMappingsEntry]] = await self._get_mapping_manager().get_all_devicemappings()
+            Dict[str, DeviceMappingsEntry]] = await mapping_manager.get_all_devicemappings()
         for name, device_mapping_entry in devicemappings.items():
             worker = {
                 "name": name,
@@ -26,6 +34,4 @@ class GetWorkersEndpoint(AbstractControlEndpoint):
             }
             positions.append(worker)
         del devicemappings
-        resp = await self._json_response(positions)
-        del positions
-        return resp
+        return positions
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Dict, Set
+
+from aiohttp import hdrs, web
+
+from mapadroid.db.model import AuthLevel
+from mapadroid.madmin.AbstractMadminRootEndpoint import (
+    AbstractMadminRootEndpoint, check_authorization_header)
+from mapadroid.madmin.StateFeedSubscription import StateFeedSubscription
+
+# Events are sent to a single client at most this often, changes in between are coalesced
+CLIENT_MIN_INTERVAL: float = 1
+# Comment lines are sent to idle clients to detect disconnects
+CLIENT_KEEPALIVE_INTERVAL: float = 15
+
+
+class StateFeedEndpoint(AbstractMadminRootEndpoint):
+    """
+    "/state_feed"
+    Server-sent events of the topics passed (e.g. topics=workers,routes). Every event contains the entries that changed
+    and the keys of the entries removed since the previous event of the topic, the first event contains all entries.
+    """
+
+    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
+    async def get(self):
+        # The feed is not imported here as it depends on the endpoints of the map
+        state_feed = self.request.app["state_feed"]
+        topics: Set[str] = set(self.request.query.get("topics", "").split(",")) & state_feed.get_topics()
+        if not topics:
+            raise web.HTTPBadRequest(text="Pass any of the topics {}".format(", ".join(state_feed.get_topics())))
+        response = web.StreamResponse(headers={hdrs.CACHE_CONTROL: "no-cache",
+                                               # Do not let reverse proxies buffer the events
+                                               "X-Accel-Buffering": "no"})
+        response.content_type = "text/event-stream"
+        await response.prepare(self.request)
+        subscription: StateFeedSubscription = state_feed.subscribe(topics)
+        try:
+            while True:
+                events: Dict[str, bytes] = await subscription.get_events(CLIENT_KEEPALIVE_INTERVAL)
+                if not events:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                await response.write(b"".join(b"event: " + topic.encode() + b"\ndata: " + data + b"\n\n"
+                                              for topic, data in events.items()))
+                await asyncio.sleep(CLIENT_MIN_INTERVAL)
+        except ConnectionResetError:
+            pass
+        finally:
+            state_feed.unsubscribe(subscription)
+        return response
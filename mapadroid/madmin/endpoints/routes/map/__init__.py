@@ -13,6 +13,7 @@ from mapadroid.madmin.endpoints.routes.map.GetStopsEndpoint import GetStopsEndpo
 from mapadroid.madmin.endpoints.routes.map.GetWorkersEndpoint import GetWorkersEndpoint
 from mapadroid.madmin.endpoints.routes.map.MapEndpoint import MapEndpoint
 from mapadroid.madmin.endpoints.routes.map.SaveFenceEndpoint import SaveFenceEndpoint
+from mapadroid.madmin.endpoints.routes.map.StateFeedEndpoint import StateFeedEndpoint
 
 
 def register_routes_map_endpoints(app: web.Application):
@@ -29,3 +30,4 @@ def register_routes_map_endpoints(app: web.Application):
     app.router.add_view('/get_cells', GetCellsEndpoint, name='get_cells')
     app.router.add_view('/get_stops', GetStopsEndpoint, name='get_stops')
     app.router.add_view('/savefence', SaveFenceEndpoint, name='savefence')
+    app.router.add_view('/state_feed', StateFeedEndpoint, name='state_feed')
@@ -1,7 +1,8 @@
 from abc import ABC
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
 from aiohttp.abc import Request
+from cachetools import TTLCache
 from loguru import logger
 
 from mapadroid.db.helper.TrsSpawnHelper import TrsSpawnHelper
@@ -12,6 +13,10 @@ from mapadroid.madmin.AbstractMadminRootEndpoint import (
 from mapadroid.madmin.functions import (generate_coords_from_geofence,
                                         get_geofences)
 
+# Statistics are aggregated over large amounts of rows. Responses are kept for a short while to not query the DB
+# for every page view (keyed by the URL requested incl. query arguments)
+_stats_response_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+
 
 class AbstractStatisticsRootEndpoint(AbstractMadminRootEndpoint, ABC):
     """
@@ -44,6 +49,14 @@ class AbstractStatisticsRootEndpoint(AbstractMadminRootEndpoint, ABC):
 
         return "{}/pokemon_icon_{:03d}{}{}{}.png".format(base_path, mon_id, form_str, costume_str, shiny_str)
 
+    async def _get_cached_stats(self, generate_stats: Callable[[], Awaitable[Dict]]) -> Dict:
+        cache_key: str = str(self._request.rel_url)
+        stats: Optional[Dict] = _stats_response_cache.get(cache_key)
+        if stats is None:
+            stats = await generate_stats()
+            _stats_response_cache[cache_key] = stats
+        return stats
+
     def _get_minutes_usage_query_args(self) -> int:
         try:
             minutes_usage: Optional[int] = int(self._request.query.get("minutes_usage"))
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from mapadroid.db.helper.PokemonHelper import PokemonHelper
 from mapadroid.db.model import Pokemon
@@ -15,6 +15,10 @@ class GameStatsMonEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         minutes_usage = self._get_minutes_usage_query_args()
         # Spawn
         iv = []
@@ -57,4 +61,4 @@ class GameStatsMonEndpoint(AbstractStatisticsRootEndpoint):
                                     'periode': DatetimeWrapper.fromtimestamp(mon.last_modified.timestamp())
                                    .strftime(self._datetimeformat)})
         stats = {'spawn': spawn, 'good_spawns': good_spawns}
-        return await self._json_response(stats)
+        return stats
@@ -15,6 +15,10 @@ class GameStatsShinyEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         logger.debug2('game_stats_shiny_v2')
         timestamp_from: Optional[int] = self._request.query.get("from")
         if timestamp_from:
@@ -35,7 +39,7 @@ class GameStatsShinyEndpoint(AbstractStatisticsRootEndpoint):
 
         if data is None or len(data) == 0:
             # Whyyyyy....
-            return await self._json_response({'empty': True})
+            return {'empty': True}
 
         shiny_stats_v2 = []
         for encounter_id, (mon, stats) in data.items():
@@ -92,4 +96,4 @@ class GameStatsShinyEndpoint(AbstractStatisticsRootEndpoint):
         stats = {'empty': False, 'shiny_statistics': shiny_stats_v2,
                  'global_shiny_statistics': global_shiny_stats_v2, 'per_worker': shiny_stats_perworker_v2,
                  'per_hour': shiny_stats_perhour_v2}
-        return await self._json_response(stats)
+        return stats
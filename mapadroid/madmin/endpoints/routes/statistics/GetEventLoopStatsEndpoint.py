@@ -0,0 +1,16 @@
+from mapadroid.db.model import AuthLevel
+from mapadroid.madmin.AbstractMadminRootEndpoint import \
+    check_authorization_header
+from mapadroid.madmin.endpoints.routes.statistics.AbstractStatistictsRootEndpoint import \
+    AbstractStatisticsRootEndpoint
+from mapadroid.utils.EventLoopMonitor import event_loop_monitor
+
+
+class GetEventLoopStatsEndpoint(AbstractStatisticsRootEndpoint):
+    """
+    "/get_event_loop_stats"
+    """
+
+    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
+    async def get(self):
+        return await self._json_response(event_loop_monitor.get_stats())
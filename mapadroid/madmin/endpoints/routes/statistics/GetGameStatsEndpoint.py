@@ -1,9 +1,8 @@
 from typing import List, Optional, Tuple, Dict
 
 from mapadroid.db.helper.GymHelper import GymHelper
-from mapadroid.db.helper.TrsStatsDetectHelper import TrsStatsDetectHelper
-from mapadroid.db.helper.TrsStatsLocationHelper import TrsStatsLocationHelper
 from mapadroid.db.helper.TrsStatsLocationRawHelper import TrsStatsLocationRawHelper
+from mapadroid.db.helper.TrsStatsRollupHelper import TrsStatsRollupHelper
 from mapadroid.db.helper.TrsUsageHelper import TrsUsageHelper
 from mapadroid.db.model import TrsUsage
 from mapadroid.madmin.endpoints.routes.statistics.AbstractStatistictsRootEndpoint import AbstractStatisticsRootEndpoint
@@ -18,11 +17,15 @@ class GetGameStatsEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         minutes_usage: Optional[int] = self._get_minutes_usage_query_args()
 
         # statistics_get_detection_count
         stats_detect: Dict[
-            str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsDetectHelper.get_detection_count_per_worker(
+            str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsRollupHelper.get_detection_count_per_worker(
             self._session, hourly=False)
         detection = []
         for worker, mapped_data in stats_detect.items():
@@ -34,7 +37,7 @@ class GetGameStatsEndpoint(AbstractStatisticsRootEndpoint):
                                   'raids': str(sum_raids),
                                   'quests': str(sum_quests)})
 
-        stats_location: Dict[str, Tuple[int, int, int, float]] = await TrsStatsLocationHelper.get_location_info(
+        stats_location: Dict[str, Tuple[int, int, int, float]] = await TrsStatsRollupHelper.get_location_info(
             self._session)
         location_info = []
         for worker, mapped_data in stats_location.items():
@@ -111,4 +114,4 @@ class GetGameStatsEndpoint(AbstractStatisticsRootEndpoint):
 
         stats = {'gym': gyms, 'detection_empty': detection_empty, 'usage': usages,
                  'location_info': location_info, 'detection': detection}
-        return await self._json_response(stats)
+        return stats
@@ -17,15 +17,19 @@ class GetSpawnpointStatsEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         geofence_type: Optional[str] = self._request.query.get("type", "mon_mitm")
         if not geofence_type:
             stats = {'spawnpoints': []}
-            return await self._json_response(stats)
+            return stats
         try:
             area_worker_type: WorkerType = WorkerType(geofence_type)
         except ValueError:
             stats = {'spawnpoints': []}
-            return await self._json_response(stats)
+            return stats
 
         geofence_id: Optional[int] = int(self._request.query.get("fence", -1))
         coords = []
@@ -95,4 +99,4 @@ class GetSpawnpointStatsEndpoint(AbstractStatisticsRootEndpoint):
                 subfenceindex += 1
 
         stats = {'spawnpoints': coords}
-        return await self._json_response(stats)
+        return stats
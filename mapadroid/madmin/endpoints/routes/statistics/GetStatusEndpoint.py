@@ -1,9 +1,13 @@
 from typing import Optional, Dict, List
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.db.helper.SettingsDeviceHelper import SettingsDeviceHelper
 from mapadroid.db.helper.TrsStatusHelper import TrsStatusHelper
 from mapadroid.db.model import SettingsArea, TrsStatus, SettingsDevice
 from mapadroid.madmin.endpoints.routes.statistics.AbstractStatistictsRootEndpoint import AbstractStatisticsRootEndpoint
+from mapadroid.mapping_manager.MappingManager import MappingManager
 
 
 class GetStatusEndpoint(AbstractStatisticsRootEndpoint):
@@ -13,10 +17,17 @@ class GetStatusEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
-        stats: List[TrsStatus] = await TrsStatusHelper.get_all_of_instance(self._session, self._get_instance_id())
-        settings_devices: Dict[int, SettingsDevice] = await SettingsDeviceHelper.get_all_mapped(self._session,
-                                                                                                self._get_instance_id())
-        areas: Dict[int, SettingsArea] = await self._get_db_wrapper().get_all_areas(self._session)
+        serialized: List[Dict] = await self.serialize_status(self._session, self._get_db_wrapper(),
+                                                             self._get_mapping_manager(), self._get_instance_id())
+        return await self._json_response(serialized)
+
+    @staticmethod
+    async def serialize_status(session: AsyncSession, db_wrapper: DbWrapper, mapping_manager: MappingManager,
+                               instance_id: int) -> List[Dict]:
+        stats: List[TrsStatus] = await TrsStatusHelper.get_all_of_instance(session, instance_id)
+        settings_devices: Dict[int, SettingsDevice] = await SettingsDeviceHelper.get_all_mapped(session,
+                                                                                                instance_id)
+        areas: Dict[int, SettingsArea] = await db_wrapper.get_all_areas(session)
         serialized = []
         for stat in stats:
             settings_of_device: Optional[SettingsDevice] = settings_devices.get(stat.device_id)
@@ -26,13 +37,13 @@ class GetStatusEndpoint(AbstractStatisticsRootEndpoint):
             settings_serialized = {var: val for var, val in vars(settings_of_device).items() if not var.startswith("_")}
             stat_serialized.update(settings_serialized)
             routemanager_id_device_is_using: Optional[
-                int] = await self._get_mapping_manager().get_routemanager_id_where_device_is_registered(stat.device_id)
+                int] = await mapping_manager.get_routemanager_id_where_device_is_registered(stat.device_id)
             if routemanager_id_device_is_using:
                 # append routemanager name, routemanager mode and area id...
-                stat_serialized["rmname"] = await self._get_mapping_manager().routemanager_get_name(
+                stat_serialized["rmname"] = await mapping_manager.routemanager_get_name(
                     routemanager_id_device_is_using)
                 stat_serialized["mode"] = (
-                    await self._get_mapping_manager().routemanager_get_mode(routemanager_id_device_is_using)).value
+                    await mapping_manager.routemanager_get_mode(routemanager_id_device_is_using)).value
             else:
                 area: Optional[SettingsArea] = areas.get(stat.area_id)
                 stat_serialized["rmname"] = area.name if area else None
@@ -41,4 +52,4 @@ class GetStatusEndpoint(AbstractStatisticsRootEndpoint):
             stat_serialized["area_id"] = stat.area_id
 
             serialized.append(stat_serialized)
-        return await self._json_response(serialized)
+        return serialized
@@ -19,6 +19,10 @@ class GetStopQuestStatsEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         stats_process = []
         processed_fences = []
         possible_fences: Dict[int, Dict] = await get_geofences(self._get_mapping_manager(),
@@ -79,4 +83,4 @@ class GetStopQuestStatsEndpoint(AbstractStatisticsRootEndpoint):
             stop.append({'label': label, 'data': timestamp})
 
         stats = {'stop_quest_stats': stats_process, 'quest': quest, 'stop': stop}
-        return await self._json_response(stats)
+        return stats
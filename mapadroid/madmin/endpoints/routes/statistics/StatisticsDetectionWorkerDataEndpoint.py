@@ -1,8 +1,7 @@
 from typing import List, Optional, Tuple, Dict
 
-from mapadroid.db.helper.TrsStatsDetectHelper import TrsStatsDetectHelper
-from mapadroid.db.helper.TrsStatsLocationHelper import TrsStatsLocationHelper
 from mapadroid.db.helper.TrsStatsLocationRawHelper import TrsStatsLocationRawHelper
+from mapadroid.db.helper.TrsStatsRollupHelper import TrsStatsRollupHelper
 from mapadroid.madmin.endpoints.routes.statistics.AbstractStatistictsRootEndpoint import AbstractStatisticsRootEndpoint
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.collections import Location
@@ -16,6 +15,10 @@ class StatisticsDetectionWorkerDataEndpoint(AbstractStatisticsRootEndpoint):
 
     # TODO: Auth
     async def get(self):
+        stats: Dict = await self._get_cached_stats(self.__generate_stats)
+        return await self._json_response(stats)
+
+    async def __generate_stats(self) -> Dict:
         minutes: Optional[int] = self._get_minutes_usage_query_args()
         worker: Optional[str] = self._request.query.get("worker")
 
@@ -26,7 +29,7 @@ class StatisticsDetectionWorkerDataEndpoint(AbstractStatisticsRootEndpoint):
         quest = []
         usage = []
 
-        data: Dict[str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsDetectHelper \
+        data: Dict[str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsRollupHelper \
             .get_detection_count_per_worker(self._session,
                                             include_last_n_minutes=minutes,
                                             worker=worker)
@@ -61,7 +64,7 @@ class StatisticsDetectionWorkerDataEndpoint(AbstractStatisticsRootEndpoint):
         nok = []
         sumloc = []
         locations = []
-        locations_scanned_by_workers: Dict[str, Dict[int, Tuple[int, int, int]]] = await TrsStatsLocationHelper \
+        locations_scanned_by_workers: Dict[str, Dict[int, Tuple[int, int, int]]] = await TrsStatsRollupHelper \
             .get_locations(self._session, include_last_n_minutes=minutes, worker=worker)
         for worker, data_entry in locations_scanned_by_workers.items():
             for timestamp, location_data in data_entry.items():
@@ -88,7 +91,7 @@ class StatisticsDetectionWorkerDataEndpoint(AbstractStatisticsRootEndpoint):
 
         # all spaws
         all_spawns = []
-        detection_count_not_grouped: Dict[str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsDetectHelper \
+        detection_count_not_grouped: Dict[str, Dict[int, Tuple[int, int, int, int]]] = await TrsStatsRollupHelper \
             .get_detection_count_per_worker(self._session, hourly=False, worker=worker)
         mon_spawn_count: int = 0
         mon_iv_count: int = 0
@@ -138,4 +141,4 @@ class StatisticsDetectionWorkerDataEndpoint(AbstractStatisticsRootEndpoint):
         workerstats = {'avg': locations_avg, 'receiving': usage, 'locations': locations,
                        'ratio': loctionratio, 'allspawns': all_spawns,
                        'location_raw': location_raw}
-        return await self._json_response(workerstats)
+        return workerstats
@@ -0,0 +1,22 @@
+import aiohttp_jinja2
+
+from mapadroid.db.model import AuthLevel
+from mapadroid.madmin.AbstractMadminRootEndpoint import (
+    check_authorization_header, expand_context)
+from mapadroid.madmin.endpoints.routes.statistics.AbstractStatistictsRootEndpoint import \
+    AbstractStatisticsRootEndpoint
+
+
+class StatisticsEventLoopEndpoint(AbstractStatisticsRootEndpoint):
+    """
+    "/statistics_event_loop"
+    """
+
+    @check_authorization_header(AuthLevel.MADMIN_ADMIN)
+    @aiohttp_jinja2.template('statistics/event_loop_statistics.html')
+    @expand_context()
+    async def get(self):
+        return {
+            "title": "MAD Event Loop Statistics",
+            "responsive": str(self._get_mad_args().madmin_noresponsive).lower()
+        }
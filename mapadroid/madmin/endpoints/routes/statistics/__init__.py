@@ -8,6 +8,7 @@ from mapadroid.madmin.endpoints.routes.statistics.DeleteStatusEntryEndpoint impo
 from mapadroid.madmin.endpoints.routes.statistics.DeleteUnfencedSpawnsEndpoint import DeleteUnfencedSpawnsEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.GameStatsMonEndpoint import GameStatsMonEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.GameStatsShinyEndpoint import GameStatsShinyEndpoint
+from mapadroid.madmin.endpoints.routes.statistics.GetEventLoopStatsEndpoint import GetEventLoopStatsEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.GetGameStatsEndpoint import GetGameStatsEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.GetNonivEncountersCountEndpoint import GetNonivEncountersCountEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.GetSpawnDetailsEndpoint import GetSpawnDetailsEndpoint
@@ -24,6 +25,7 @@ from mapadroid.madmin.endpoints.routes.statistics.StatisticsDetectionWorkerDataE
 from mapadroid.madmin.endpoints.routes.statistics.StatisticsDetectionWorkerEndpoint import \
     StatisticsDetectionWorkerEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.StatisticsEndpoint import StatisticsEndpoint
+from mapadroid.madmin.endpoints.routes.statistics.StatisticsEventLoopEndpoint import StatisticsEventLoopEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.StatisticsMonEndpoint import StatisticsMonEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.StatisticsShinyEndpoint import StatisticsShinyEndpoint
 from mapadroid.madmin.endpoints.routes.statistics.StatisticsSpawnsEndpoint import StatisticsSpawnsEndpoint
@@ -62,3 +64,5 @@ def register_routes_statistics_endpoints(app: web.Application):
     app.router.add_view('/statistics_stop_quest', StatisticsStopQuestEndpoint, name='statistics_stop_quest')
     app.router.add_view('/get_noniv_encounters_count', GetNonivEncountersCountEndpoint,
                         name='get_noniv_encounters_count')
+    app.router.add_view('/statistics_event_loop', StatisticsEventLoopEndpoint, name='statistics_event_loop')
+    app.router.add_view('/get_event_loop_stats', GetEventLoopStatsEndpoint, name='get_event_loop_stats')
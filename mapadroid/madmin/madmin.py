@@ -31,6 +31,7 @@ from mapadroid.madmin.endpoints.routes.settings import \
     register_routes_settings_endpoints
 from mapadroid.madmin.endpoints.routes.statistics import \
     register_routes_statistics_endpoints
+from mapadroid.madmin.MadminStateFeed import MadminStateFeed
 from mapadroid.mapping_manager import MappingManager
 from mapadroid.updater.updater import DeviceUpdater
 from mapadroid.utils.aiohttp.XPathForwardedFor import XPathForwarded
@@ -113,6 +114,7 @@ class MADmin(object):
         self._app['quest_gen'] = self._quest_gen
         self._app['account_handler'] = self._account_handler
         self._app['mon_name_cache'] = {}
+        self._app['state_feed'] = MadminStateFeed(self._db_wrapper, self._mapping_manager)
 
         if MadGlobals.application_args.enable_x_forwarded_path_madmin:
             reverse_proxied = XPathForwarded()
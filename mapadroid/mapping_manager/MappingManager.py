@@ -7,13 +7,13 @@ from threading import Event
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from redis import WatchError
-from redis import asyncio as aioredis
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.account_handler.AbstractAccountHandler import (
     AbstractAccountHandler, AccountPurpose)
 from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.db.TimedRedis import TimedRedis
 from mapadroid.db.helper.SettingsAuthHelper import SettingsAuthHelper
 from mapadroid.db.helper.SettingsDeviceHelper import SettingsDeviceHelper
 from mapadroid.db.helper.SettingsDevicepoolHelper import \
@@ -50,6 +50,9 @@ from mapadroid.worker.WorkerType import WorkerType
 
 logger = get_logger(LoggerEnums.utils)
 
+# Routes of areas prepared at once in the background after the mappings have been (re)loaded
+ROUTE_PREPARATION_CONCURRENCY: int = 4
+
 mode_mapping = {
     "raids_mitm": {
         "s2_cell_level": 15,
@@ -128,6 +131,7 @@ class MappingManager(AbstractMappingManager):
         self.__mappings_mutex: Optional[asyncio.Lock] = None
         self.__ptc_mutex: Optional[asyncio.Lock] = None
         self._redis_cache: Optional[Redis] = None
+        self.__route_preparation_task: Optional[Task] = None
 
     async def setup(self):
         self.__mappings_mutex: asyncio.Lock = asyncio.Lock()
@@ -148,7 +152,7 @@ class MappingManager(AbstractMappingManager):
                 redis_credentials["password"] = MadGlobals.application_args.login_tracking_password
             if MadGlobals.application_args.login_tracking_database:
                 redis_credentials["db"] = MadGlobals.application_args.login_tracking_database
-            self._redis_cache = await aioredis.Redis(**redis_credentials)
+            self._redis_cache = await TimedRedis(**redis_credentials)
             await self._redis_cache.ping()
         else:
             self._redis_cache = await self.__db_wrapper.get_cache()
@@ -880,6 +884,36 @@ class MappingManager(AbstractMappingManager):
                     self._geofence_helpers = await self.__get_latest_geofence_helpers(session)
 
         logger.info("Mappings have been updated")
+        if self.__route_preparation_task is not None and not self.__route_preparation_task.done():
+            self.__route_preparation_task.cancel()
+        self.__route_preparation_task = asyncio.get_running_loop().create_task(
+            self.__prepare_routes(self._routemanagers, self._devicemappings))
+
+    async def __prepare_routes(self, routemanagers: Dict[int, RouteManagerBase],
+                               devicemappings: Dict[str, DeviceMappingsEntry]) -> None:
+        """
+        Prepares the routes of the areas devices are mapped to concurrently rather than calculating (or loading) them
+        once the devices register, which happens for all areas at once after a restart. Devices reconnecting to areas
+        already prepared are served right away.
+        """
+        area_ids: Set[int] = {walker_area.area_id for mapping in devicemappings.values()
+                              for walker_area in mapping.walker_areas if walker_area is not None}
+        to_prepare: List[RouteManagerBase] = [routemanager for area_id, routemanager in routemanagers.items()
+                                              if area_id in area_ids]
+        if not to_prepare:
+            return
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(ROUTE_PREPARATION_CONCURRENCY)
+        start: float = time.time()
+
+        async def prepare(routemanager: RouteManagerBase) -> None:
+            async with semaphore:
+                try:
+                    await routemanager.prepare_route()
+                except Exception as e:
+                    logger.warning("Failed preparing the route of area {}: {}", routemanager.name, e)
+
+        await asyncio.gather(*[prepare(routemanager) for routemanager in to_prepare])
+        logger.info("Prepared the routes of {} areas in {:.2f}s", len(to_prepare), time.time() - start)
 
     async def get_all_devicenames(self) -> List[str]:
         async with self.__db_wrapper as session, session:
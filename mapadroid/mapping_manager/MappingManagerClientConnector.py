@@ -3,6 +3,7 @@ from typing import Optional
 import grpc
 from grpc._cython.cygrpc import CompressionAlgorithm, CompressionLevel
 
+from mapadroid.grpc.TimingInterceptor import TimingClientInterceptor
 from mapadroid.mapping_manager.MappingManagerClient import MappingManagerClient
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MadGlobals
@@ -29,13 +30,15 @@ class MappingManagerClientConnector:
 
     async def __setup_insecure_channel(self, address, options):
         logger.warning("Insecure MitmMapper gRPC API client")
-        self._channel = grpc.aio.insecure_channel(address, options=options)
+        self._channel = grpc.aio.insecure_channel(address, options=options,
+                                                  interceptors=[TimingClientInterceptor()])
 
     async def __setup_secure_channel(self, address, options):
         with open(MadGlobals.application_args.mappingmanager_tls_cert_file, 'r') as certfile:
             cert = certfile.read()
         credentials = grpc.ssl_channel_credentials(cert)
-        self._channel = grpc.aio.secure_channel(address, credentials=credentials, options=options)
+        self._channel = grpc.aio.secure_channel(address, credentials=credentials, options=options,
+                                                interceptors=[TimingClientInterceptor()])
 
     async def get_client(self) -> MappingManagerClient:
         if not self._channel:
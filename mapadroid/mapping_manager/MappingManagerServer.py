@@ -16,6 +16,7 @@ from mapadroid.grpc.compiled.mapping_manager.mapping_manager_pb2 import (
     IsRoutemanagerOfOriginLevelmodeResponse)
 from mapadroid.grpc.stubs.mapping_manager.mapping_manager_pb2_grpc import (
     MappingManagerServicer, add_MappingManagerServicer_to_server)
+from mapadroid.grpc.TimingInterceptor import TimingServerInterceptor
 from mapadroid.mapping_manager.AbstractMappingManager import \
     AbstractMappingManager
 from mapadroid.utils.logging import LoggerEnums, get_logger
@@ -36,7 +37,7 @@ class MappingManagerServer(MappingManagerServicer):
         if MadGlobals.application_args.mappingmanager_compression:
             options.extend([('grpc.default_compression_algorithm', CompressionAlgorithm.gzip),
                             ('grpc.grpc.default_compression_level', CompressionLevel.medium)])
-        self.__server = grpc.aio.server(options=options)
+        self.__server = grpc.aio.server(options=options, interceptors=[TimingServerInterceptor()])
         add_MappingManagerServicer_to_server(self, self.__server)
         address = f'{MadGlobals.application_args.mappingmanager_ip}:{MadGlobals.application_args.mappingmanager_port}'
         if MadGlobals.application_args.mappingmanager_tls_cert_file and MadGlobals.application_args.mappingmanager_tls_private_key_file:
@@ -1,6 +1,10 @@
 import asyncio
 from abc import ABC
 
+from mapadroid.utils.metrics import Gauge
+
+MITM_DATA_QUEUE_SIZE: Gauge = Gauge("mad_mitm_data_queue_size", "Items waiting in the data queue to be processed")
+
 
 class AbstractMitmDataProcessingManager(ABC):
     _mitm_data_queue: asyncio.Queue
@@ -8,6 +12,7 @@ class AbstractMitmDataProcessingManager(ABC):
     def __init__(self):
         super(AbstractMitmDataProcessingManager, self).__init__()
         self._mitm_data_queue = asyncio.Queue()
+        MITM_DATA_QUEUE_SIZE.set_function(self._mitm_data_queue.qsize)
 
     def get_queue(self) -> asyncio.Queue:
         return self._mitm_data_queue
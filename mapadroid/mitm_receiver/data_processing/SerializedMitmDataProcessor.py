@@ -23,11 +23,19 @@ from mapadroid.mitm_receiver.protos.ProtoHelper import ProtoHelper
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.ProtoIdentifier import ProtoIdentifier
 from mapadroid.utils.gamemechanicutil import determine_current_quest_layer
+from mapadroid.utils.logging import log_sampled
 from mapadroid.utils.madGlobals import (MadGlobals, MitmReceiverRetry,
                                         MonSeenTypes, QuestLayer)
+from mapadroid.utils.metrics import Histogram
 from mapadroid.utils.questGen import QuestGen
 import mapadroid.mitm_receiver.protos.Rpc_pb2 as pogoprotos
 
+QUEUE_WAIT_SECONDS: Histogram = Histogram("mad_mitm_data_queue_wait_seconds",
+                                          "Seconds items waited in the data queue to be processed")
+PROCESSING_SECONDS: Histogram = Histogram("mad_mitm_data_processing_seconds",
+                                          "Seconds spent processing an item of the data queue by proto type",
+                                          ["type"])
+
 
 class SerializedMitmDataProcessor:
     def __init__(self, data_queue: asyncio.Queue, stats_handler: AbstractStatsHandler,
@@ -53,18 +61,23 @@ class SerializedMitmDataProcessor:
                     if item is None:
                         logger.info("Received signal to stop MITM data processor")
                         break
+                    QUEUE_WAIT_SECONDS.observe(time.monotonic() - item[3])
                     threshold_seconds = MadGlobals.application_args.mitm_ignore_proc_time_thresh
                     start_time = self.get_time_ms()
                     if threshold_seconds > 0:
                         minimum_timestamp = (start_time / 1000) - threshold_seconds
                         if item[0] < minimum_timestamp:
-                            logger.debug(
-                                "Data received at {} is older than configured threshold of {}s ({}). Ignoring data.",
-                                item[0], threshold_seconds,
-                                DatetimeWrapper.fromtimestamp(minimum_timestamp))
+                            # Applies to every item queued while the processors fall behind
+                            suppressed: Optional[int] = log_sampled("outdated_data_" + item[2], 10)
+                            if suppressed is not None:
+                                logger.debug("Data received at {} is older than configured threshold of {}s ({}). "
+                                             "Ignoring data ({} similar messages suppressed).",
+                                             item[0], threshold_seconds,
+                                             DatetimeWrapper.fromtimestamp(minimum_timestamp), suppressed)
                             return
                     try:
-                        with logger.contextualize(identifier=item[2], name="mitm-processor"):
+                        with logger.contextualize(identifier=item[2], name="mitm-processor"), \
+                                PROCESSING_SECONDS.labels(item[1].get("type")).time():
                             if item[1].get("raw", False):
                                 await self._process_data_raw(received_timestamp=item[0], data=item[1],
                                                              origin=item[2])
@@ -73,7 +86,7 @@ class SerializedMitmDataProcessor:
                         del item
                     except (sqlalchemy.exc.IntegrityError, MitmReceiverRetry, sqlalchemy.exc.InternalError) as e:
                         logger.info("Failed submitting data to DB, rescheduling. {}", e)
-                        await self.__queue.put(item)
+                        await self.__queue.put(item[:3] + (time.monotonic(),))
                     except Exception as e:
                         logger.exception(e)
                         logger.info("Failed processing data. {}", e)
@@ -120,6 +133,7 @@ class SerializedMitmDataProcessor:
                         if new_quest:
                             await self.__stats_handler.stats_collect_quest(origin, processed_timestamp)
                         await session.commit()
+                        await self.__db_submit.publish_webhook_changes(session)
                 except Exception as e:
                     logger.warning("Failed submitting quests to DB: {}", e)
 
@@ -133,6 +147,7 @@ class SerializedMitmDataProcessor:
                     fort_details.ParseFromString(data["payload"])
                     await self.__db_submit.stop_details(session, fort_details)
                     await session.commit()
+                    await self.__db_submit.publish_webhook_changes(session)
                 except Exception as e:
                     logger.warning("Failed fort details to DB: {}", e)
 
@@ -156,6 +171,7 @@ class SerializedMitmDataProcessor:
                 try:
                     await self.__db_submit.gym_info(session, gym_info)
                     await session.commit()
+                    await self.__db_submit.publish_webhook_changes(session)
                 except Exception as e:
                     logger.warning("Failed submitting gym info to DB: {}", e)
 
@@ -178,6 +194,7 @@ class SerializedMitmDataProcessor:
                 if MadGlobals.application_args.game_stats:
                     await self.__db_submit.update_seen_type_stats(session, lure_encounter=[lure_encounter])
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             end_time = self.get_time_ms() - start_time_ms
             logger.debug("Done processing lure encounter in {}ms", end_time)
 
@@ -289,6 +306,7 @@ class SerializedMitmDataProcessor:
             try:
                 lure_wild = await self.__db_submit.mon_lure_noiv(session, received_timestamp, gmo)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting lure no iv: {}", e)
         lure_processing_time = self.get_time_ms() - lurenoiv_start
@@ -304,6 +322,7 @@ class SerializedMitmDataProcessor:
                 cell_encounters, stop_encounters = await self.__db_submit.mons_nearby(session, received_timestamp,
                                                                                       gmo)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting nearby mons: {}", e)
         nearby_mons_time = self.get_time_ms() - nearby_mons_time_start
@@ -319,6 +338,7 @@ class SerializedMitmDataProcessor:
                                                                    received_timestamp,
                                                                    gmo)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting wild mons: {}", e)
         mons_time = self.get_time_ms() - mons_time_start
@@ -363,6 +383,7 @@ class SerializedMitmDataProcessor:
             try:
                 amount_raids = await self.__db_submit.raids(session, gmo, timestamp)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting raids: {}", e)
         raids_time = self.get_time_ms() - raids_time_start
@@ -388,6 +409,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.gyms(session, gmo, received_timestamp)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting gyms: {}", e)
         gyms_time = self.get_time_ms() - gyms_time_start
@@ -399,6 +421,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.stops(session, gmo)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting stops: {}", e)
                 logger.exception(e)
@@ -411,6 +434,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.weather(session, gmo, received_timestamp)
                 await session.commit()
+                await self.__db_submit.publish_webhook_changes(session)
             except Exception as e:
                 logger.warning("Failed submitting weather: {}", e)
         weather_time = self.get_time_ms() - weather_time_start
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import socket
+import time
 from abc import ABC
 from functools import wraps
 from typing import Any, Dict, Optional, Tuple, Union
@@ -33,6 +34,9 @@ from mapadroid.utils.apk_enums import APKArch, APKPackage, APKType
 from mapadroid.utils.authHelper import check_auth, get_auths_for_levl
 from mapadroid.utils.json_encoder import MADEncoder
 from mapadroid.utils.madGlobals import MadGlobals
+from mapadroid.utils.metrics import Counter
+
+QUEUE_ITEMS_DROPPED: Counter = Counter("mad_mitm_data_queue_dropped", "Items dropped as the data queue was full")
 
 
 def validate_accepted(func) -> Any:
@@ -291,8 +295,10 @@ class AbstractMitmReceiverRootEndpoint(web.View, ABC):
         while queue.qsize() > 200:
             self._get_data_queue().get_nowait()
             queue.task_done()
+            QUEUE_ITEMS_DROPPED.inc()
             logger.warning("Dropped task")
-        await self._get_data_queue().put(data)
+        # Along with the time queued at to measure the time spent waiting in the queue
+        await self._get_data_queue().put(data + (time.monotonic(),))
 
     def _check_mitm_status_auth(self):
         """
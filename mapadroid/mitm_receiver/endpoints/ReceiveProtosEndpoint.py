@@ -12,11 +12,19 @@ from mapadroid.db.model import SettingsDevice
 from mapadroid.mitm_receiver.endpoints.AbstractMitmReceiverRootEndpoint import \
     AbstractMitmReceiverRootEndpoint
 from mapadroid.mitm_receiver.protos.ProtoHelper import ProtoHelper
+from mapadroid.route.LevelingVisitStream import publish_visit
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
+from mapadroid.utils.logging import log_sampled
+from mapadroid.utils.metrics import Counter, Histogram
 from mapadroid.utils.ProtoIdentifier import ProtoIdentifier
 import mapadroid.mitm_receiver.protos.Rpc_pb2 as pogoprotos
 
+RECEIVE_PROTOS_SECONDS: Histogram = Histogram("mad_mitm_receiver_request_seconds",
+                                              "Seconds spent handling a request of protos of a device")
+PROTOS_QUEUED: Counter = Counter("mad_mitm_receiver_protos_queued", "Protos placed in the data queue by type",
+                                 ["type"])
+
 
 class ReceiveProtosEndpoint(AbstractMitmReceiverRootEndpoint):
     """
@@ -30,6 +38,7 @@ class ReceiveProtosEndpoint(AbstractMitmReceiverRootEndpoint):
             return await super()._iter()
 
     # TODO: Auth
+    @RECEIVE_PROTOS_SECONDS.time()
     async def post(self):
         raw_data = await self.request.read()
         loop = asyncio.get_running_loop()
@@ -97,7 +106,9 @@ class ReceiveProtosEndpoint(AbstractMitmReceiverRootEndpoint):
             # TODO: Offload transformation
             gmo: pogoprotos.GetMapObjectsOutProto = ProtoHelper.parse(ProtoIdentifier.GMO, decoded_raw_proto)
             if not gmo.map_cell:
-                logger.debug("Ignoring apparently empty GMO")
+                suppressed: Optional[int] = log_sampled("empty_gmo_" + origin, 10)
+                if suppressed is not None:
+                    logger.debug("Ignoring apparently empty GMO ({} similar messages suppressed)", suppressed)
                 return
         elif proto_type == ProtoIdentifier.FORT_SEARCH.value:
             logger.debug("Checking fort search proto type 101")
@@ -130,6 +141,7 @@ class ReceiveProtosEndpoint(AbstractMitmReceiverRootEndpoint):
                                                     location=location_of_data)
 
         logger.debug2("Placing data received to data_queue")
+        PROTOS_QUEUED.labels(proto_type).inc()
         await self._add_to_queue((timestamp, data, origin))
 
     async def _handle_fort_search_proto(self, origin: str, quest_proto: pogoprotos.FortSearchOutProto,
@@ -153,6 +165,7 @@ class ReceiveProtosEndpoint(AbstractMitmReceiverRootEndpoint):
         username: Optional[str] = await self._get_account_handler().get_assigned_username(device_id=device.device_id)
         if username:
             await TrsVisitedHelper.mark_visited(self._session, username, quest_proto.fort_id)
+            await publish_visit(await self._get_db_wrapper().get_cache(), username, quest_proto.fort_id)
         else:
             logger.warning("Unable to retrieve username last assigned to {} to mark stop as visited", origin)
         # TODO: Stop doing anything after the above marking as visited given nothing happens below
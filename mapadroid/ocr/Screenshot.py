@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import io
+import time
+from typing import Optional
+
+from aiofile import async_open
+from PIL import Image
+
+from mapadroid.utils.LazyImport import lazy_import
+from mapadroid.utils.madGlobals import ScreenshotType
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+class Screenshot:
+    """
+    A screenshot as received from the device (encoded JPEG/PNG bytes). The screen analysis decodes it in memory,
+    it is only written to disk if explicitly requested (debugging/MADmin).
+    Instances are passed to the process pool of the screen analysis as is, i.e., only the encoded bytes are pickled.
+    """
+
+    def __init__(self, data: bytes, screenshot_type: ScreenshotType):
+        self.data: bytes = data
+        self.screenshot_type: ScreenshotType = screenshot_type
+        self.taken_at: float = time.time()
+
+    def decode(self) -> Optional[np.ndarray]:
+        """
+        Returns: The image in BGR like cv2.imread would or None if the data could not be decoded
+        """
+        return cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def open(self) -> Image.Image:
+        return Image.open(io.BytesIO(self.data))
+
+    async def save(self, path: str) -> None:
+        async with async_open(path, "wb") as fh:
+            await fh.write(self.data)
@@ -8,12 +8,11 @@ import os
 import os.path
 from concurrent.futures.process import BrokenProcessPool
 from functools import wraps
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Union
 
-import cv2
-import numpy as np
 from loguru import logger
 
+from mapadroid.ocr.Screenshot import Screenshot
 from mapadroid.ocr.screen_type import ScreenType
 from mapadroid.ocr.utils import (check_pogo_mainscreen, get_screen_text,
                                  most_frequent_colour_internal,
@@ -21,6 +20,10 @@ from mapadroid.ocr.utils import (check_pogo_mainscreen, get_screen_text,
 from mapadroid.utils.AsyncioCv2 import AsyncioCv2
 from mapadroid.utils.AsyncioOsUtil import AsyncioOsUtil
 from mapadroid.utils.collections import ScreenCoordinates
+from mapadroid.utils.LazyImport import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
 
 
 def check_process_pool(func) -> Any:
@@ -52,21 +55,24 @@ class PogoWindows:
     async def shutdown(self):
         self.__process_executor_pool.shutdown()
 
+    async def __read_image(self, screenshot: Union[str, Screenshot]) -> Optional[np.ndarray]:
+        """
+        Decodes the screenshot. In-memory screenshots are decoded in a thread to not pickle the decoded image,
+        paths are read in the process pool.
+        """
+        if isinstance(screenshot, Screenshot):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, screenshot.decode)
+        elif not await AsyncioOsUtil.isfile(screenshot):
+            logger.error("{} does not exist", screenshot)
+            return None
+        return await AsyncioCv2.imread(screenshot, executor=self.__process_executor_pool)
+
     @check_process_pool
-    async def __read_circles(self, filename, ratio, xcord=False, crop=False,
+    async def __read_circles(self, screenshot_read: np.ndarray, ratio, xcord=False, crop=False,
                              canny=False, secondratio=False) -> List[ScreenCoordinates]:
         logger.debug2("__read_circles: Reading circles")
         circles_found: List[ScreenCoordinates] = []
-        try:
-            screenshot_read = await AsyncioCv2.imread(filename, executor=self.__process_executor_pool)
-        except Exception:
-            logger.error("Screenshot corrupted")
-            return circles_found
-
-        if screenshot_read is None:
-            logger.error("Screenshot corrupted")
-            return circles_found
-
         height, width, _ = screenshot_read.shape
 
         if crop:
@@ -112,22 +118,25 @@ class PogoWindows:
             logger.debug("__read_circles: Determined screenshot to have 0 Circle")
             return circles_found
 
-    async def look_for_button(self, filename, ratiomin, ratiomax,
+    async def look_for_button(self, filename: Union[str, Screenshot], ratiomin, ratiomax,
                               upper: bool = False) -> Optional[ScreenCoordinates]:
-        if not await AsyncioOsUtil.isfile(filename):
-            logger.error("look_for_button: {} does not exist", filename)
+        if filename is None:
+            logger.error("look_for_button: no screenshot available")
             return None
 
         return await self.__internal_look_for_button(filename, ratiomin, ratiomax, upper)
 
     @check_process_pool
-    async def __internal_look_for_button(self, filename, ratiomin, ratiomax,
+    async def __internal_look_for_button(self, filename: Union[str, Screenshot], ratiomin, ratiomax,
                                          upper) -> Optional[ScreenCoordinates]:
         logger.debug("lookForButton: Reading lines")
         min_distance_to_middle = None
         screenshot_read = None
         try:
-            screenshot_read = await AsyncioCv2.imread(filename, executor=self.__process_executor_pool)
+            screenshot_read = await self.__read_image(filename)
+            if screenshot_read is None:
+                logger.error("Screenshot corrupted")
+                return None
             gray = await AsyncioCv2.cvtColor(screenshot_read, cv2.COLOR_BGR2GRAY, executor=self.__process_executor_pool)
         except cv2.error:
             if screenshot_read is not None:
@@ -135,10 +144,6 @@ class PogoWindows:
             logger.error("Screenshot corrupted")
             return None
 
-        if screenshot_read is None:
-            logger.error("Screenshot corrupted")
-            return None
-
         height, width, _ = screenshot_read.shape
         _widthold = float(width)
         logger.debug("lookForButton: Determined screenshot scale: {} x {}", height, width)
@@ -249,20 +254,12 @@ class PogoWindows:
         return np.asarray(sort_lines, dtype=np.int32)
 
     @check_process_pool
-    async def __check_raid_line(self, filename, left_side=False) -> Optional[ScreenCoordinates]:
+    async def __check_raid_line(self, screenshot_read: np.ndarray, left_side=False) -> Optional[ScreenCoordinates]:
         logger.debug("__check_raid_line: Reading lines")
         if left_side:
             logger.debug("__check_raid_line: Check nearby open ")
-        try:
-            screenshot_read = await AsyncioCv2.imread(filename, executor=self.__process_executor_pool)
-        except Exception:
-            logger.error("Screenshot corrupted")
-            return None
-        if screenshot_read is None:
-            logger.error("Screenshot corrupted")
-            return None
 
-        if len(await self.__read_circles(os.path.join('', filename), float(11),
+        if len(await self.__read_circles(screenshot_read, float(11),
                                          xcord=False,
                                          crop=True,
                                          canny=True)) == 0:
@@ -273,7 +270,6 @@ class PogoWindows:
         # TODO: Async?
         screenshot_partial = screenshot_read[int(height / 2) - int(height / 3):int(height / 2) + int(height / 3),
                              int(0):int(width)]
-        del screenshot_read
         gray = await AsyncioCv2.cvtColor(screenshot_partial, cv2.COLOR_BGR2GRAY, executor=self.__process_executor_pool)
         del screenshot_partial
         gaussian = await AsyncioCv2.GaussianBlur(gray, (5, 5), 0, executor=self.__process_executor_pool)
@@ -316,47 +312,26 @@ class PogoWindows:
         logger.debug("__check_raid_line: Not active")
         return None
 
-    async def __check_close_present(self, filename, identifier, radiusratio=12, x_coord=True) -> List[
-        ScreenCoordinates]:
-        if not await AsyncioOsUtil.isfile(filename):
-            logger.warning("__check_close_present: {} does not exist", filename)
-            return []
-
-        try:
-            image = await AsyncioCv2.imread(filename, executor=self.__process_executor_pool)
-            height, width, _ = image.shape
-        except Exception as e:
-            logger.error("Screenshot corrupted: {}", e)
-            return []
-        tmp_file_path = os.path.join(self.temp_dir_path,
-                                     str(identifier) + '_exitcircle.jpg')
-        imwrite_status = await AsyncioCv2.imwrite(tmp_file_path, image, executor=self.__process_executor_pool)
-        if not imwrite_status:
-            logger.error("Could not save file: {} - check permissions and path",
-                         tmp_file_path)
-            return []
-
-        return await self.__read_circles(tmp_file_path,
+    async def __check_close_present(self, screenshot_read: np.ndarray, radiusratio=12) -> List[ScreenCoordinates]:
+        return await self.__read_circles(screenshot_read,
                                          float(radiusratio), xcord=False, crop=True,
                                          canny=True)
 
     @check_process_pool
-    async def check_close_except_nearby_button(self, filename, identifier, close_raid=False) -> List[ScreenCoordinates]:
-        if not await AsyncioOsUtil.isfile(filename):
-            logger.error("check_close_except_nearby_button: {} does not exist", filename)
+    async def check_close_except_nearby_button(self, filename: Union[str, Screenshot], identifier,
+                                               close_raid=False) -> List[ScreenCoordinates]:
+        if filename is None:
+            logger.error("check_close_except_nearby_button: no screenshot available")
             return []
         return await self.__internal_check_close_except_nearby_button(filename, identifier, close_raid)
 
     # checks for X button on any screen... could kill raidscreen, handle properly
-    async def __internal_check_close_except_nearby_button(self, filename, identifier,
+    async def __internal_check_close_except_nearby_button(self, filename: Union[str, Screenshot], identifier,
                                                           close_raid=False) -> List[ScreenCoordinates]:
         logger.debug("__internal_check_close_except_nearby_button: Checking close except nearby with: file {}",
                      filename)
-        if not filename or not await AsyncioOsUtil.isfile(filename):
-            logger.error("Screenshot not available")
-            return []
         try:
-            screenshot_read = await AsyncioCv2.imread(filename, executor=self.__process_executor_pool)
+            screenshot_read = await self.__read_image(filename)
         except cv2.error:
             logger.error("Screenshot corrupted")
             logger.debug("__internal_check_close_except_nearby_button: Screenshot corrupted...")
@@ -364,13 +339,11 @@ class PogoWindows:
         if screenshot_read is None:
             logger.error("__internal_check_close_except_nearby_button: Screenshot corrupted")
             return []
-        else:
-            del screenshot_read
 
         if not close_raid:
             logger.debug("__internal_check_close_except_nearby_button: Raid is not to be closed...")
-            if await self.__check_raid_line(filename) \
-                    or await self.__check_raid_line(filename, left_side=True):
+            if await self.__check_raid_line(screenshot_read) \
+                    or await self.__check_raid_line(screenshot_read, left_side=True):
                 # file not found or raid tab present
                 logger.debug("__internal_check_close_except_nearby_button: Not checking for close button (X). "
                              "Nearby or raid tab open but not to be closed.")
@@ -380,7 +353,7 @@ class PogoWindows:
         ratio_to_use: int = 10
         coordinates_of_close_found: List[ScreenCoordinates] = []
         while not coordinates_of_close_found and ratio_to_use < 15:
-            coordinates_of_close_found = await self.__check_close_present(filename, identifier, 10, True)
+            coordinates_of_close_found = await self.__check_close_present(screenshot_read, 10)
             if not coordinates_of_close_found:
                 ratio_to_use += 1
             else:
@@ -389,8 +362,8 @@ class PogoWindows:
         return []
 
     @check_process_pool
-    async def check_pogo_mainscreen(self, filename, identifier) -> bool:
-        if not await AsyncioOsUtil.isfile(filename):
+    async def check_pogo_mainscreen(self, filename: Union[str, Screenshot], identifier) -> bool:
+        if filename is None or isinstance(filename, str) and not await AsyncioOsUtil.isfile(filename):
             logger.error("check_pogo_mainscreen: {} does not exist", filename)
             return False
         loop = asyncio.get_running_loop()
@@ -398,7 +371,7 @@ class PogoWindows:
                                           filename, identifier)
 
     @check_process_pool
-    async def get_screen_text(self, screenpath: str, identifier) -> Optional[dict]:
+    async def get_screen_text(self, screenpath: Union[str, Screenshot], identifier) -> Optional[dict]:
         if screenpath is None:
             logger.error("get_screen_text: image does not exist")
             return None
@@ -408,7 +381,8 @@ class PogoWindows:
                                           screenpath, identifier)
 
     @check_process_pool
-    async def most_frequent_colour(self, screenshot, identifier, y_offset: int = 0) -> Optional[List[int]]:
+    async def most_frequent_colour(self, screenshot: Union[str, Screenshot], identifier,
+                                   y_offset: int = 0) -> Optional[List[int]]:
         if screenshot is None:
             logger.error("get_screen_text: image does not exist")
             return None
@@ -417,10 +391,13 @@ class PogoWindows:
                                           screenshot, identifier, y_offset)
 
     @check_process_pool
-    async def screendetection_get_type_by_screen_analysis(self, image,
+    async def screendetection_get_type_by_screen_analysis(self, image: Union[str, Screenshot],
                                                           identifier) -> Optional[Tuple[ScreenType,
                                                                                         Optional[
                                                                                             dict], int, int, int]]:
+        if image is None:
+            logger.error("screendetection_get_type_by_screen_analysis: image does not exist")
+            return None
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(self.__process_executor_pool, screendetection_get_type_internal,
                                           image, identifier)
@@ -5,7 +5,7 @@ import re
 import time
 import xml.etree.ElementTree as ET  # noqa: N817
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
 from loguru import logger
 
@@ -18,6 +18,7 @@ from mapadroid.mapping_manager import MappingManager
 from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
     MappingManagerDevicemappingKey
 from mapadroid.ocr.screen_type import ScreenType
+from mapadroid.ocr.Screenshot import Screenshot
 from mapadroid.utils.collections import Location, ScreenCoordinates
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.madGlobals import MadGlobals, ScreenshotType
@@ -331,11 +332,11 @@ class WordToScreenMatching(object):
         return screentype
 
     async def __check_pogo_screen_ban_or_loading(self, screentype, y_offset: int = 0) -> ScreenType:
-        screenshot_path: str = await self.get_screenshot_path()
-        backgroundcolor = await self._worker_state.pogo_windows.most_frequent_colour(screenshot_path,
+        screenshot = self._worker_state.last_screenshot
+        backgroundcolor = await self._worker_state.pogo_windows.most_frequent_colour(screenshot,
                                                                                      self._worker_state.origin,
                                                                                      y_offset=y_offset)
-        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot_path, self._worker_state.origin)
+        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot, self._worker_state.origin)
         welcome_text = ['Willkommen', 'Welcome']
         if backgroundcolor is not None and (
                 backgroundcolor[0] == 0 and
@@ -596,9 +597,9 @@ class WordToScreenMatching(object):
 
     async def __handle_returning_player_or_wrong_credentials(self) -> None:
         self._nextscreen = ScreenType.UNDEFINED
-        screenshot_path = await self.get_screenshot_path()
+        screenshot = self._worker_state.last_screenshot
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -641,9 +642,9 @@ class WordToScreenMatching(object):
         await asyncio.sleep(1)
 
     async def __handle_welcome_screen(self) -> ScreenType:
-        screenshot_path = await self.get_screenshot_path()
+        screenshot = self._worker_state.last_screenshot
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -653,11 +654,11 @@ class WordToScreenMatching(object):
         return ScreenType.NOTRESPONDING
 
     async def __handle_tos_screen(self) -> ScreenType:
-        screenshot_path = await self.get_screenshot_path()
+        screenshot = self._worker_state.last_screenshot
         await self._communicator.click(int(self._worker_state.resolution_calculator.screen_size_x / 2),
                                        int(self._worker_state.resolution_calculator.screen_size_y * 0.47))
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -667,9 +668,9 @@ class WordToScreenMatching(object):
         return ScreenType.NOTRESPONDING
 
     async def __handle_privacy_screen(self) -> ScreenType:
-        screenshot_path = await self.get_screenshot_path()
+        screenshot = self._worker_state.last_screenshot
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -697,9 +698,9 @@ class WordToScreenMatching(object):
             logger.error("Failed getting screenshot")
             return ScreenType.ERROR
 
-        screenshot_path = await self.get_screenshot_path()
+        screenshot = self._worker_state.last_screenshot
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -723,8 +724,8 @@ class WordToScreenMatching(object):
                                                delay_after=2):
                 logger.error("Failed getting screenshot")
                 return ScreenType.ERROR
-            screenshot_path = await self.get_screenshot_path()
-            globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot_path,
+            screenshot = self._worker_state.last_screenshot
+            globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot,
                                                                                self._worker_state.origin)
             starter = ['Bulbasaur', 'Charmander', 'Squirtle', 'Bisasam', 'Glumanda', 'Schiggy', 'Bulbizarre',
                        'Salameche', 'Carapuce']
@@ -744,9 +745,9 @@ class WordToScreenMatching(object):
                 logger.error("Failed getting screenshot")
                 return ScreenType.ERROR
 
-            screenshot_path = await self.get_screenshot_path()
+            screenshot = self._worker_state.last_screenshot
             coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-                screenshot_path,
+                screenshot,
                 2.20, 3.01,
                 upper=True)
             if coordinates:
@@ -786,8 +787,8 @@ class WordToScreenMatching(object):
                                            delay_after=2):
             logger.error("Failed getting screenshot")
             return ScreenType.ERROR
-        screenshot_path = await self.get_screenshot_path()
-        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot_path, self._worker_state.origin)
+        screenshot = self._worker_state.last_screenshot
+        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot, self._worker_state.origin)
         errortext = ['available.', 'verfugbar.', 'disponible.']
         if any(text in errortext for text in globaldict['text']):
             logger.warning('Account name is not available. Marking account as permabanned!')
@@ -823,8 +824,8 @@ class WordToScreenMatching(object):
         return await self.__handle_screentype(screentype=screentype, global_dict=global_dict, diff=diff,
                                               y_offset=y_offset)
 
-    async def check_quest(self, screenpath: str) -> ScreenType:
-        if screenpath is None or len(screenpath) == 0:
+    async def check_quest(self, screenpath: Union[str, Screenshot]) -> ScreenType:
+        if not screenpath:
             logger.error("Invalid screen path: {}", screenpath)
             return ScreenType.ERROR
         globaldict = await self._worker_state.pogo_windows.get_screen_text(screenpath, self._worker_state.origin)
@@ -1004,15 +1005,17 @@ class WordToScreenMatching(object):
 
         screenshot_quality: int = 80
 
-        take_screenshot = await self._communicator.get_screenshot(await self.get_screenshot_path(fileaddon=errorscreen),
-                                                                  screenshot_quality, screenshot_type)
-
-        if not take_screenshot:
+        screenshot_data: Optional[bytes] = await self._communicator.get_screenshot_data(screenshot_quality,
+                                                                                        screenshot_type)
+        if screenshot_data is None:
             logger.error("takeScreenshot: Failed retrieving screenshot")
             logger.debug("Failed retrieving screenshot")
             return False
         else:
             logger.debug("Success retrieving screenshot")
+            self._worker_state.last_screenshot = Screenshot(screenshot_data, screenshot_type)
+            if errorscreen or MadGlobals.application_args.save_worker_screenshots:
+                await self._worker_state.last_screenshot.save(await self.get_screenshot_path(fileaddon=errorscreen))
             self._lastScreenshotTaken = time.time()
             await asyncio.sleep(delay_after)
             return True
@@ -1037,12 +1040,11 @@ class WordToScreenMatching(object):
             logger.error("Failed getting screenshot")
             return None
 
-        screenpath = await self.get_screenshot_path()
-
         result: Optional[Tuple[ScreenType,
         Optional[
             dict], int, int, int]] = await self._worker_state.pogo_windows \
-            .screendetection_get_type_by_screen_analysis(screenpath, self._worker_state.origin)
+            .screendetection_get_type_by_screen_analysis(self._worker_state.last_screenshot,
+                                                         self._worker_state.origin)
         if result is None:
             logger.error("Failed analyzing screen")
             return None
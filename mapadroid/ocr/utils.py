@@ -1,12 +1,18 @@
-from typing import List, Optional, Tuple
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
 
-import cv2
-import numpy as np
 from loguru import logger
 from PIL import Image
-from pytesseract import Output, pytesseract
 
+from mapadroid.ocr.Screenshot import Screenshot
 from mapadroid.ocr.screen_type import ScreenType
+from mapadroid.utils.LazyImport import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+pytesseract = lazy_import("pytesseract")
 
 screen_texts: dict = {1: ['Geburtdatum', 'birth.', 'naissance.', 'date'],
                       2: ['ZURUCKKEHRENDER', 'ZURÜCKKEHRENDER', 'GAME', 'FREAK', 'SPIELER'],
@@ -47,69 +53,173 @@ screen_texts: dict = {1: ['Geburtdatum', 'birth.', 'naissance.', 'date'],
                       38: ['limitations']
                      }
 
+# Amount of screens (by perceptual hash) whose detected type is remembered by each process of the OCR pool
+SCREEN_DETECTION_CACHE_SIZE: int = 256
+# The perceptual hash consists of PHASH_SIZE * PHASH_SIZE bits
+PHASH_SIZE: int = 16
+# Screens wider than this are downscaled for the OCR of the region of interest
+ROI_OCR_MAX_WIDTH: int = 1080
+_screen_detection_cache: OrderedDict = OrderedDict()
+
+
+def read_image(image: Union[str, Screenshot]) -> Optional[np.ndarray]:
+    """
+    Reads the image like cv2.imread either from the path given or from the in-memory screenshot
+    """
+    if isinstance(image, Screenshot):
+        return image.decode()
+    return cv2.imread(image)
+
+
+def open_image(image: Union[str, Screenshot]) -> Image.Image:
+    if isinstance(image, Screenshot):
+        return image.open()
+    return Image.open(image)
+
+
+def perceptual_hash(frame: Image.Image) -> bytes:
+    """
+    Difference hash of the frame, i.e. whether each pixel of the downscaled grayscale frame is brighter than its left
+    neighbour. Screenshots of the same screen (including JPEG noise) result in the same hash.
+    """
+    small = np.asarray(frame.convert('L').resize((PHASH_SIZE + 1, PHASH_SIZE), Image.BOX), dtype=np.int16)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+def clear_screen_detection_cache() -> None:
+    _screen_detection_cache.clear()
+
 
-def screendetection_get_type_internal(image,
-                                      identifier) -> Optional[Tuple[ScreenType, Optional[dict], int, int, int]]:
+def _image_to_data(frame: Image.Image) -> Optional[dict]:
+    try:
+        globaldict = pytesseract.image_to_data(frame, output_type=pytesseract.Output.DICT, timeout=40,
+                                               config='--dpi 70')
+    except Exception as e:
+        logger.error("Tesseract Error: {}", e)
+        return None
+    logger.debug("Screentext: {}", globaldict)
+    if not isinstance(globaldict, dict) or 'text' not in globaldict:
+        return None
+    return globaldict
+
+
+def _match_screen_type(globaldict: dict, height: int) -> ScreenType:
+    returntype: ScreenType = ScreenType.UNDEFINED
+    for index in range(len(globaldict['text'])):
+        if returntype != ScreenType.UNDEFINED:
+            break
+        if len(globaldict['text'][index]) > 3:
+            for screen_elem in screen_texts:
+                heightlimit = 0 if (screen_elem == 21 or screen_elem == 30) else height / 4
+                if globaldict['top'][index] > heightlimit and globaldict['text'][index] in \
+                        screen_texts[screen_elem]:
+                    returntype = ScreenType(screen_elem)
+    return returntype
+
+
+def _detect_in_region_of_interest(frame_org: Image.Image, height: int) -> Tuple[ScreenType, Optional[dict]]:
+    """
+    Single OCR pass on the grayscale part of the frame below the height limit of screen_texts, downscaled to at most
+    ROI_OCR_MAX_WIDTH. The boxes found are translated to the coordinates of frame_org.
+    """
+    width_org, height_org = frame_org.size
+    top: int = min(int(height / 4), height_org - 1)
+    roi = frame_org.crop((0, top, width_org, height_org)).convert('L')
+    scale: float = 1.0
+    if width_org > ROI_OCR_MAX_WIDTH:
+        scale = width_org / ROI_OCR_MAX_WIDTH
+        roi = roi.resize((ROI_OCR_MAX_WIDTH, max(1, int(roi.size[1] / scale))), Image.LANCZOS)
+    globaldict: Optional[dict] = _image_to_data(roi)
+    roi.close()
+    if globaldict is None:
+        return ScreenType.UNDEFINED, None
+    for key in ('left', 'width', 'height'):
+        globaldict[key] = [int(value * scale) for value in globaldict[key]]
+    globaldict['top'] = [int(value * scale) + top for value in globaldict['top']]
+    return _match_screen_type(globaldict, height), globaldict
+
+
+def _detect_in_full_frame(frame_org: Image.Image, height: int) -> Tuple[ScreenType, Optional[dict]]:
+    """
+    OCR of the entire frame and of binarized versions at decreasing thresholds until a screen type is found
+    """
+    returntype: ScreenType = ScreenType.UNDEFINED
+    globaldict: Optional[dict] = {}
+    texts = [frame_org]
+    for thresh in [200, 175, 150]:
+        fn = lambda x: 255 if x > thresh else 0  # noqa: E731
+        frame = frame_org.convert('L').point(fn, mode='1')
+        texts.append(frame)
+    for text in texts:
+        globaldict = _image_to_data(text)
+        if globaldict is None:
+            continue
+        returntype = _match_screen_type(globaldict, height)
+        if returntype != ScreenType.UNDEFINED:
+            break
+    for text in texts[1:]:
+        text.close()
+    return returntype, globaldict
+
+
+def screendetection_get_type_internal(image: Union[str, Screenshot],
+                                      identifier,
+                                      staged: bool = True) -> Optional[Tuple[ScreenType, Optional[dict],
+                                                                             int, int, int]]:
+    """
+    Detects the screen type in stages, stopping at the first one yielding a result:
+    1. Result of a screen with the same resolution and perceptual hash analyzed earlier by this process. Only
+       screens of a known type are remembered, UNDEFINED ones are analyzed (in full) again each time.
+    2. OCR of the grayscale region in which screen_texts are searched
+    3. OCR of the entire frame (and binarized versions of it)
+    With staged=False, only the full OCR is run and nothing is cached.
+    """
     with logger.contextualize(identifier=identifier):
         returntype: ScreenType = ScreenType.UNDEFINED
         globaldict: Optional[dict] = {}
         diff: int = 1
         logger.debug("__screendetection_get_type_internal: Detecting screen type")
 
-        texts = []
         try:
-            with Image.open(image) as frame_org:
+            with open_image(image) as frame_org:
                 width, height = frame_org.size
 
                 logger.debug("Screensize: W:{} x H:{}", width, height)
+                cache_key: Optional[Tuple[int, int, bytes]] = None
+                if staged:
+                    cache_key = (width, height, perceptual_hash(frame_org))
+                    cached: Optional[Tuple[ScreenType, Optional[dict]]] = _screen_detection_cache.get(cache_key)
+                    if cached is not None:
+                        _screen_detection_cache.move_to_end(cache_key)
+                        returntype, globaldict = cached
+                        logger.debug("Screen {} known by its hash", returntype)
+                        return returntype, globaldict, width, height, 2 if width < 1080 else 1
 
                 if width < 1080:
                     logger.info('Resize screen ...')
                     frame_org = frame_org.resize([int(2 * s) for s in frame_org.size], Image.LANCZOS)
                     diff: int = 2
 
-                texts = [frame_org]
-                for thresh in [200, 175, 150]:
-                    fn = lambda x: 255 if x > thresh else 0  # noqa: E731
-                    frame = frame_org.convert('L').point(fn, mode='1')
-                    texts.append(frame)
-                for text in texts:
-                    try:
-                        globaldict = pytesseract.image_to_data(text, output_type=Output.DICT, timeout=40,
-                                                               config='--dpi 70')
-                    except Exception as e:
-                        logger.error("Tesseract Error: {}. Exception: {}", globaldict, e)
-                        globaldict = None
-                    logger.debug("Screentext: {}", globaldict)
-                    if globaldict is None or 'text' not in globaldict:
-                        continue
-                    n_boxes = len(globaldict['text'])
-                    for index in range(n_boxes):
-                        if returntype != ScreenType.UNDEFINED:
-                            break
-                        if len(globaldict['text'][index]) > 3:
-                            for screen_elem in screen_texts:
-                                heightlimit = 0 if (screen_elem == 21 or screen_elem == 30) else height / 4
-                                if globaldict['top'][index] > heightlimit and globaldict['text'][index] in \
-                                        screen_texts[screen_elem]:
-                                    returntype = ScreenType(screen_elem)
-                    if returntype != ScreenType.UNDEFINED:
-                        break
-
-                del texts
-                frame.close()
-        except (FileNotFoundError, ValueError) as e:
+                if staged:
+                    returntype, globaldict = _detect_in_region_of_interest(frame_org, height)
+                if returntype == ScreenType.UNDEFINED:
+                    returntype, globaldict = _detect_in_full_frame(frame_org, height)
+        except (FileNotFoundError, ValueError, OSError) as e:
             logger.error("Failed opening image {} with exception {}", image, e)
             return None
 
+        if cache_key is not None and globaldict is not None and returntype != ScreenType.UNDEFINED:
+            _screen_detection_cache[cache_key] = (returntype, globaldict)
+            while len(_screen_detection_cache) > SCREEN_DETECTION_CACHE_SIZE:
+                _screen_detection_cache.popitem(last=False)
         return returntype, globaldict, width, height, diff
 
 
-def check_pogo_mainscreen(filename, identifier) -> bool:
+def check_pogo_mainscreen(filename: Union[str, Screenshot], identifier) -> bool:
     with logger.contextualize(identifier=identifier):
         logger.debug("__internal_check_pogo_mainscreen: Checking close except nearby with: file {}", filename)
         try:
-            screenshot_read = cv2.imread(filename)
+            screenshot_read = read_image(filename)
         except Exception:
             logger.error("Screenshot corrupted")
             logger.debug("__internal_check_pogo_mainscreen: Screenshot corrupted...")
@@ -150,11 +260,12 @@ def check_pogo_mainscreen(filename, identifier) -> bool:
         return False
 
 
-def most_frequent_colour_internal(image, identifier, y_offset: int = 0) -> Optional[List[int]]:
+def most_frequent_colour_internal(image: Union[str, Screenshot], identifier,
+                                  y_offset: int = 0) -> Optional[List[int]]:
     with logger.contextualize(identifier=identifier):
         logger.debug("most_frequent_colour_internal: Reading screen text")
         try:
-            with Image.open(image) as img:
+            with open_image(image) as img:
                 w, h = img.size
                 left = 0
                 top = int(h * 0.05)
@@ -177,16 +288,16 @@ def most_frequent_colour_internal(image, identifier, y_offset: int = 0) -> Optio
         return most_frequent_pixel[1]
 
 
-def get_screen_text(screenpath: str, identifier) -> Optional[dict]:
+def get_screen_text(screenpath: Union[str, Screenshot], identifier) -> Optional[dict]:
     with logger.contextualize(identifier=identifier):
         returning_dict: Optional[dict] = {}
         logger.debug("get_screen_text: Reading screen text")
 
         try:
-            with Image.open(screenpath) as frame:
+            with open_image(screenpath) as frame:
                 frame = frame.convert('LA')
                 try:
-                    returning_dict = pytesseract.image_to_data(frame, output_type=Output.DICT, timeout=40,
+                    returning_dict = pytesseract.image_to_data(frame, output_type=pytesseract.Output.DICT, timeout=40,
                                                                config='--dpi 70')
                 except Exception as e:
                     logger.error("Tesseract Error: {}. Exception: {}", returning_dict, e)
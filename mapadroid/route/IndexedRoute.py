@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from mapadroid.utils.collections import Location
+
+
+class IndexedRoute:
+    """
+    Coords of a route in order along with the positions of each coord and whether the coord has been visited (i.e.
+    removed). Removing, checking for and appending coords does not depend on the length of the route.
+    Iterating and splitting only returns the coords not visited.
+    """
+
+    def __init__(self, coords: Optional[Iterable[Location]] = None):
+        self.__coords: List[Location] = []
+        self.__positions: Dict[Location, List[int]] = {}
+        # One byte per position, 1 if the coord has been visited
+        self.__visited: bytearray = bytearray()
+        self.__unvisited: int = 0
+        if coords:
+            self.extend(coords)
+
+    def __len__(self) -> int:
+        return self.__unvisited
+
+    def __contains__(self, location: Location) -> bool:
+        # Positions of visited coords are dropped
+        return location in self.__positions
+
+    def __iter__(self) -> Iterator[Location]:
+        position: int = self.__visited.find(0)
+        while position != -1:
+            yield self.__coords[position]
+            position = self.__visited.find(0, position + 1)
+
+    def clear(self) -> None:
+        self.__coords.clear()
+        self.__positions.clear()
+        self.__visited.clear()
+        self.__unvisited = 0
+
+    def reset(self, coords: Iterable[Location]) -> None:
+        self.clear()
+        self.extend(coords)
+
+    def append(self, location: Location) -> None:
+        self.__positions.setdefault(location, []).append(len(self.__coords))
+        self.__coords.append(location)
+        self.__visited.append(0)
+        self.__unvisited += 1
+
+    def extend(self, coords: Iterable[Location]) -> None:
+        for location in coords:
+            self.append(location)
+
+    def remove(self, location: Location) -> int:
+        """
+        Marks all occurrences of the coord as visited
+        Returns: The amount of occurrences removed
+        """
+        positions: Optional[List[int]] = self.__positions.pop(location, None)
+        if not positions:
+            return 0
+        for position in positions:
+            self.__visited[position] = 1
+        self.__unvisited -= len(positions)
+        if self.__unvisited == 0:
+            # Do not keep growing if coords are appended after visiting all (e.g. redone at the end)
+            self.clear()
+        return len(positions)
+
+    def split(self, parts: int, excluded: Optional[Set[Location]] = None) -> List[List[Location]]:
+        """
+        Splits the coords not visited (and not excluded) in order into the amount of parts given. The lengths of the
+        parts differ by one at most, the first parts being the longer ones.
+        """
+        coords: List[Location] = [location for location in self
+                                  if not excluded or location not in excluded]
+        length, extra = divmod(len(coords), parts)
+        subroutes: List[List[Location]] = []
+        start: int = 0
+        for part in range(parts):
+            end: int = start + length + (1 if part < extra else 0)
+            subroutes.append(coords[start:end])
+            start = end
+        return subroutes
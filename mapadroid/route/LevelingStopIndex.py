@@ -0,0 +1,119 @@
+import math
+import time
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.db.DbWrapper import DbWrapper
+from mapadroid.db.helper.PokestopHelper import PokestopHelper
+from mapadroid.db.helper.TrsVisitedHelper import TrsVisitedHelper
+from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.route.LevelingVisitStream import LevelingVisitConsumer
+from mapadroid.utils.collections import Location
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.routemanager)
+
+# Seconds until the stops of the area are loaded again to pick up stops added or moved
+STOPS_RELOAD_INTERVAL: int = 3600
+
+
+class LevelingStopIndex:
+    """
+    Keeps the stops of a leveling area and the stops visited per account in memory. The stops are loaded once (and
+    reloaded every STOPS_RELOAD_INTERVAL), the stops visited by an account are loaded from trs_visited when the
+    account is first queried and kept up to date with the visits published by the fort searches of the MITM receivers.
+    Visited stops are stored as a bitset per account indexed by the position of the stop in the index.
+    """
+
+    def __init__(self, db_wrapper: DbWrapper, geofence_helper: GeofenceHelper):
+        self.__db_wrapper: DbWrapper = db_wrapper
+        self.__geofence_helper: GeofenceHelper = geofence_helper
+        self.__stop_ids: List[str] = []
+        self.__stop_positions: Dict[str, int] = {}
+        # Latitude and longitude of the stops, indexed like __stop_ids
+        self.__coords = np.empty((0, 2))
+        self.__loaded_at: float = 0
+        # Packed bitset of the stops visited per username
+        self.__visited: Dict[str, np.ndarray] = {}
+        self.__visit_consumer: Optional[LevelingVisitConsumer] = None
+
+    async def get_nearest_unvisited(self, session: AsyncSession, username: str, location: Location, limit: int,
+                                    ignore_spun: bool = True,
+                                    ignored: Optional[Set[Location]] = None) -> List[Location]:
+        """
+        Args:
+            session:
+            username: the username of the account in use
+            location: Location to be used for the search of nearby stops
+            limit: Limiting amount of stops returned
+            ignore_spun: Ignore stops that have been spun by the account
+            ignored: Locations to be skipped (e.g. stops that failed the spinnable test)
+
+        Returns: The locations of the stops nearest to the location given, nearest first
+        """
+        await self.__update(session)
+        if not self.__stop_ids:
+            return []
+        candidates = np.ones(len(self.__stop_ids), dtype=bool)
+        if ignore_spun:
+            visited = await self.__get_visited(session, username)
+            candidates &= ~np.unpackbits(visited, count=len(self.__stop_ids)).astype(bool)
+        if ignored:
+            for ignored_location in ignored:
+                candidates &= ~((self.__coords[:, 0] == ignored_location.lat)
+                                & (self.__coords[:, 1] == ignored_location.lng))
+        positions = np.flatnonzero(candidates)
+        if len(positions) == 0:
+            return []
+        # Equirectangular approximation, accurate enough for ordering by distance within an area
+        delta_lat = self.__coords[positions, 0] - location.lat
+        delta_lng = (self.__coords[positions, 1] - location.lng) * math.cos(math.radians(location.lat))
+        distances = delta_lat * delta_lat + delta_lng * delta_lng
+        if 0 < limit < len(positions):
+            nearest = np.argpartition(distances, limit - 1)[:limit]
+            positions = positions[nearest[np.argsort(distances[nearest])]]
+        else:
+            positions = positions[np.argsort(distances)]
+        return [Location(float(lat), float(lng)) for lat, lng in self.__coords[positions]]
+
+    async def __update(self, session: AsyncSession) -> None:
+        if time.time() - self.__loaded_at > STOPS_RELOAD_INTERVAL:
+            await self.__load_stops(session)
+            return
+        for username, stop_id in await self.__visit_consumer.read():
+            visited: Optional[np.ndarray] = self.__visited.get(username)
+            if visited is None:
+                # Loaded from trs_visited once queried
+                continue
+            elif stop_id is None:
+                visited[:] = 0
+            elif stop_id in self.__stop_positions:
+                position: int = self.__stop_positions[stop_id]
+                visited[position >> 3] |= 0x80 >> (position & 7)
+
+    async def __load_stops(self, session: AsyncSession) -> None:
+        # Visits published meanwhile are read by the next update
+        self.__visit_consumer = LevelingVisitConsumer(await self.__db_wrapper.get_cache())
+        stops = await PokestopHelper.get_ids_and_locations_in_fence(session, self.__geofence_helper)
+        self.__stop_ids = [stop_id for stop_id, _ in stops]
+        self.__stop_positions = {stop_id: position for position, stop_id in enumerate(self.__stop_ids)}
+        self.__coords = np.array([(location.lat, location.lng) for _, location in stops],
+                                 dtype=float).reshape(-1, 2)
+        # The positions changed, the visited stops are loaded again
+        self.__visited.clear()
+        self.__loaded_at = time.time()
+        logger.info("Loaded {} stops for leveling", len(self.__stop_ids))
+
+    async def __get_visited(self, session: AsyncSession, username: str) -> np.ndarray:
+        visited: Optional[np.ndarray] = self.__visited.get(username)
+        if visited is not None and self.__visit_consumer.available:
+            return visited
+        # Not loaded yet or visits may have been missed
+        visited_ids: Set[str] = await TrsVisitedHelper.get_stop_ids_of_username(session, username)
+        is_visited = np.fromiter((stop_id in visited_ids for stop_id in self.__stop_ids), dtype=bool,
+                                 count=len(self.__stop_ids))
+        visited = np.packbits(is_visited)
+        self.__visited[username] = visited
+        return visited
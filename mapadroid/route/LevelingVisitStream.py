@@ -0,0 +1,78 @@
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from redis.asyncio import Redis
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.routemanager)
+
+# Redis stream the stops visited by accounts (fort searches) are published to for the leveling routes to update their
+# visited stops without querying trs_visited. Entries either map "visited" to the stop ID or "flushed" to an empty
+# value (trs_visited of the account has been cleared), both along with the "username".
+VISIT_STREAM_KEY: str = "leveling_visits"
+# Approximate amount of entries kept. Leveling routes only read the stream when updating their routepools, entries
+# are thus kept for a few hours of fort searches of all leveling devices.
+VISIT_STREAM_MAXLEN: int = 100000
+VISIT_STREAM_READ_COUNT: int = 1000
+
+
+async def publish_visit(cache: Redis, username: str, stop_id: str) -> None:
+    await _publish(cache, {"username": username, "visited": stop_id})
+
+
+async def publish_flush(cache: Redis, username: str) -> None:
+    await _publish(cache, {"username": username, "flushed": ""})
+
+
+async def _publish(cache: Redis, entry: Dict[str, str]) -> None:
+    try:
+        await cache.xadd(VISIT_STREAM_KEY, entry, maxlen=VISIT_STREAM_MAXLEN, approximate=True)
+    except Exception as e:
+        # Leveling routes unable to read the stream fall back to reading trs_visited
+        logger.warning("Failed publishing visit of {}: {}", entry["username"], e)
+
+
+class LevelingVisitConsumer:
+    """
+    Reads the visits published since the consumer was created.
+    """
+
+    def __init__(self, cache: Redis):
+        self.__cache: Redis = cache
+        # The IDs of stream entries start with the time (ms) the entry was added at
+        self.__last_id: Union[str, bytes] = "{}-0".format(int(time.time() * 1000))
+        self.__available: bool = True
+
+    @property
+    def available(self) -> bool:
+        """
+        Returns: False if reading the stream failed last time, visits may have been missed
+        """
+        return self.__available
+
+    async def read(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Returns: The username and the stop visited (None if the visits of the account have been flushed) in the order
+        published. Empty if nothing was published or the stream cannot be read.
+        """
+        visits: List[Tuple[str, Optional[str]]] = []
+        while True:
+            try:
+                response = await self.__cache.xread({VISIT_STREAM_KEY: self.__last_id},
+                                                    count=VISIT_STREAM_READ_COUNT)
+            except Exception as e:
+                if self.__available:
+                    logger.warning("Failed reading visits of the leveling accounts, falling back to the DB: {}", e)
+                self.__available = False
+                return visits
+            self.__available = True
+            entries = response[0][1] if response else []
+            for entry_id, fields in entries:
+                self.__last_id = entry_id
+                fields = {key.decode() if isinstance(key, bytes) else key:
+                          value.decode() if isinstance(value, bytes) else value
+                          for key, value in fields.items()}
+                visits.append((fields["username"], fields.get("visited")))
+            if len(entries) < VISIT_STREAM_READ_COUNT:
+                return visits
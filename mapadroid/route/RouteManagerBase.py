@@ -12,6 +12,7 @@ from mapadroid.account_handler.AbstractAccountHandler import AccountPurpose
 from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.db.model import SettingsArea, SettingsRoutecalc
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.route.IndexedRoute import IndexedRoute
 from mapadroid.route.prioq.RoutePriorityQueue import RoutePriorityQueue
 from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import (
     AbstractRoutePriorityQueueStrategy, RoutePriorityQueueEntry)
@@ -69,7 +70,8 @@ class RouteManagerBase(ABC):
         self._mode: WorkerType = WorkerType(area.mode)
         self._is_started: asyncio.Event = asyncio.Event()
         self._first_started = False
-        self._current_route_round_coords: List[Location] = []
+        # Coords of the route not yet visited in the current round (only removed if _delete_coord_after_fetch)
+        self._current_route_round_coords: IndexedRoute = IndexedRoute()
         self._start_calc: asyncio.Event = asyncio.Event()
         self._coords_to_be_ignored = set()
         self._overwrite_calculation: bool = False
@@ -82,6 +84,8 @@ class RouteManagerBase(ABC):
         self._workers_registered: Set[str] = set()
         self._round_started_time = None
         self._route: List[Location] = []
+        # Route calculated by prepare_route to be used by the next start rather than calculating it again
+        self._route_prepared: bool = False
 
         # TOOD: Only allow this in some classmethod...
         # if coords is not None:
@@ -161,10 +165,8 @@ class RouteManagerBase(ABC):
 
     def _init_route_queue(self):
         if len(self._route) > 0:
-            self._current_route_round_coords.clear()
             logger.debug("Creating queue for coords")
-            for latlng in self._route:
-                self._current_route_round_coords.append(latlng)
+            self._current_route_round_coords.reset(self._route)
             logger.debug("Finished creating queue")
 
     def _clear_coords(self):
@@ -237,7 +239,7 @@ class RouteManagerBase(ABC):
         async with self._manager_mutex:
             self._route.clear()
             self._route.extend(new_route)
-            self._current_route_round_coords = self._route.copy()
+            self._current_route_round_coords.clear()
             # TODO: Also reset the subroutes of the workers?
             self._init_route_queue()
             await self._update_routepool()
@@ -280,12 +282,27 @@ class RouteManagerBase(ABC):
                 self._is_started.set()
                 self._coords_to_be_ignored.clear()
                 logger.info("Starting routemanager {}", self.name)
-                await self.calculate_route(dynamic=False, overwrite_persisted_route=False)
+                if not self._route_prepared:
+                    await self.calculate_route(dynamic=False, overwrite_persisted_route=False)
+                self._route_prepared = False
                 await self._start_priority_queue()
                 await self._start_check_routepools()
                 self._init_route_queue()
         return True
 
+    async def prepare_route(self) -> None:
+        """
+        Calculates the route (or loads the persisted route) before any worker registered to the routemanager. The next
+        start of the routemanager uses the prepared route instead of calculating it once more.
+        """
+        if not self._can_prepare_route():
+            return
+        async with self._manager_mutex:
+            if self._is_started.is_set() or self._shutdown_route.is_set() or self._route_prepared:
+                return
+            await self.calculate_route(dynamic=False, overwrite_persisted_route=False)
+            self._route_prepared = True
+
     @abstractmethod
     async def _quit_route(self):
         """
@@ -341,6 +358,14 @@ class RouteManagerBase(ABC):
         """
         return True
 
+    def _can_prepare_route(self) -> bool:
+        """
+        Whether the route can be calculated before the routemanager is started (see prepare_route).
+        Routemanagers calculating their route based on the data at the time of the start (e.g. quests) or not using
+        a normal route return False.
+        """
+        return self._has_normal_route()
+
     def _can_pass_prioq_coords(self) -> bool:
         """
         Whether or not passing prioq coords to another closer worker is
@@ -544,12 +569,11 @@ class RouteManagerBase(ABC):
 
         """
         if self._check_coords_before_returning(next_coord.lat, next_coord.lng, origin):
-            if self._delete_coord_after_fetch() and next_coord in self._current_route_round_coords:
-                logger.debug("Removing coord {} from _current_route_round_coords "
-                             "(occurrences: {})", next_coord, self._current_route_round_coords.count(next_coord))
-                while next_coord in self._current_route_round_coords:
-                    self._current_route_round_coords.remove(next_coord)
-                logger.debug("Done removing coord from current round coords")
+            if self._delete_coord_after_fetch():
+                removed: int = self._current_route_round_coords.remove(next_coord)
+                if removed:
+                    logger.debug("Removed coord {} from _current_route_round_coords (occurrences: {})", next_coord,
+                                 removed)
             return True
         return False
 
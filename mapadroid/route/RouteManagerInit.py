@@ -59,6 +59,6 @@ class RouteManagerInit(SubrouteReplacingMixin, RouteManagerBase):
             coords = [coord for coord in coords if coord not in self._coords_to_be_ignored]
         async with self._manager_mutex:
             self._route = coords
-            self._current_route_round_coords = self._route.copy()
+            self._current_route_round_coords.clear()
             self._init_route_queue()
             await self._update_routepool()
@@ -5,16 +5,15 @@ from loguru import logger
 from mapadroid.account_handler.AbstractAccountHandler import (
     AbstractAccountHandler, AccountPurpose)
 from mapadroid.db.DbWrapper import DbWrapper
-from mapadroid.db.helper.PokestopHelper import PokestopHelper
 from mapadroid.db.helper.SettingsDeviceHelper import SettingsDeviceHelper
-from mapadroid.db.model import (Pokestop, SettingsAreaPokestop, SettingsDevice,
+from mapadroid.db.model import (SettingsAreaPokestop, SettingsDevice,
                                 SettingsRoutecalc)
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.route.LevelingStopIndex import LevelingStopIndex
 from mapadroid.route.routecalc.RoutecalcUtil import RoutecalcUtil
 from mapadroid.route.RouteManagerBase import RouteManagerBase
 from mapadroid.route.RoutePoolEntry import RoutePoolEntry
 from mapadroid.utils.collections import Location
-from mapadroid.utils.madGlobals import RoutecalculationTypes
 
 
 class RouteManagerLeveling(RouteManagerBase):
@@ -38,6 +37,7 @@ class RouteManagerLeveling(RouteManagerBase):
                                   initial_prioq_strategy=None)
         self.remove_from_queue_backlog = None
         self.__account_handler = account_handler
+        self.__stop_index: LevelingStopIndex = LevelingStopIndex(db_wrapper, geofence_helper)
 
     async def _worker_changed_update_routepools(self, routepool: Dict[str, RoutePoolEntry]) \
             -> Optional[Dict[str, RoutePoolEntry]]:
@@ -50,7 +50,6 @@ class RouteManagerLeveling(RouteManagerBase):
             any_at_all = False
             async with self.db_wrapper as session, session:
                 for origin in routepool.keys():
-                    origin_local_list = []
                     entry: Optional[RoutePoolEntry] = routepool.get(origin)
                     if not entry:
                         logger.debug("{} was removed during updating of routepools", origin)
@@ -71,33 +70,23 @@ class RouteManagerLeveling(RouteManagerBase):
                     if not username:
                         logger.error("Unable to determine the username last assigned to {}", origin)
                         continue
-                    unvisited_stops: List[Pokestop] = await PokestopHelper.get_nearby_increasing_range_within_area(
+                    # Stops that failed the spinnable test are skipped
+                    unvisited_stops: List[Location] = await self.__stop_index.get_nearest_unvisited(
                         session,
-                        geofence_helper=self.geofence_helper,
                         username=username,
                         location=current_worker_pos,
                         limit=150,
                         ignore_spun=True
                         if self._settings.ignore_spinned_stops or self._settings.ignore_spinned_stops is None
                         else False,
-                        max_distance=1)
+                        ignored=self._coords_to_be_ignored)
                     if not unvisited_stops:
                         logger.info("There are no unvisited stops left in DB for {} - nothing more to do!", origin)
                         continue
 
-                    for stop in unvisited_stops:
-                        coord_location = Location(float(stop.latitude), float(stop.longitude))
-                        if coord_location in self._coords_to_be_ignored:
-                            logger.info('Already tried this Stop but it failed spinnable test, skip it')
-                            continue
-                        origin_local_list.append(coord_location)
-
-                    if unvisited_stops:
-                        logger.info("Recalc a route")
-                        new_route = await self._local_recalc_subroute(unvisited_stops)
-                        origin_local_list.clear()
-                        for coord in new_route:
-                            origin_local_list.append(coord)
+                    logger.info("Recalc a route")
+                    origin_local_list: List[Location] = self._local_recalc_subroute(current_worker_pos,
+                                                                                    unvisited_stops)
 
                     # subroute is all stops unvisited
                     logger.info("Origin {} has {} unvisited stops for this route", origin, len(origin_local_list))
@@ -118,22 +107,12 @@ class RouteManagerLeveling(RouteManagerBase):
                     logger.warning("Failed storing last walker positions: {}", e)
                 return routepool
 
-    async def _local_recalc_subroute(self, unvisited_stops: List[Pokestop]) -> List[Location]:
-        coords: List[Location] = []
-        for stop in unvisited_stops:
-            coords.append(Location(float(stop.latitude), float(stop.longitude)))
-        new_route: List[Location] = await RoutecalcUtil.calculate_route(self.db_wrapper,
-                                                                        self._routecalc.routecalc_id,
-                                                                        coords,
-                                                                        self.get_max_radius(),
-                                                                        self.get_max_coords_within_radius(),
-                                                                        algorithm=RoutecalculationTypes.TSP_QUICK,
-                                                                        use_s2=self.useS2,
-                                                                        s2_level=self.S2level,
-                                                                        route_name=self.name,
-                                                                        overwrite_persisted_route=False,
-                                                                        load_persisted_route=False)
-        return new_route
+    def _local_recalc_subroute(self, start: Location, unvisited_stops: List[Location]) -> List[Location]:
+        return RoutecalcUtil.calculate_local_route(start, unvisited_stops,
+                                                   self.get_max_radius(),
+                                                   self.get_max_coords_within_radius(),
+                                                   use_s2=self.useS2,
+                                                   s2_level=self.S2level)
 
     async def _any_coords_left_after_finishing_route(self) -> bool:
         # TODO: Return False/stop route of single worker based on whether that worker has any stops left...
@@ -177,6 +156,10 @@ class RouteManagerLeveling(RouteManagerBase):
     def _delete_coord_after_fetch(self) -> bool:
         return False
 
+    def _can_prepare_route(self) -> bool:
+        # Routes are calculated per worker
+        return False
+
     def is_level_mode(self) -> bool:
         return True
 
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,7 +12,7 @@ from mapadroid.geofence.geofenceHelper import GeofenceHelper
 from mapadroid.route.RouteManagerBase import RouteManagerBase
 from mapadroid.route.SubrouteReplacingMixin import SubrouteReplacingMixin
 from mapadroid.utils.collections import Location
-from mapadroid.utils.geo import get_distance_of_two_points_in_meters
+from mapadroid.utils.geo import get_nearest
 from mapadroid.utils.madGlobals import QuestLayer
 
 
@@ -123,6 +123,10 @@ class RouteManagerQuests(SubrouteReplacingMixin, RouteManagerBase):
     def _delete_coord_after_fetch(self) -> bool:
         return True
 
+    def _can_prepare_route(self) -> bool:
+        # The route consists of the stops without quests at the time of the start
+        return False
+
     async def _quit_route(self):
         logger.info('Shutdown Route')
         if self._is_started.is_set():
@@ -153,9 +157,8 @@ class RouteManagerQuests(SubrouteReplacingMixin, RouteManagerBase):
             # Clustering is enabled but the stoplist contains the location to be checked. I.e., the location
             # only has one stop in range that is to be scanned
             return True
-        # Clustering is enabled, go through the stoplist one by one and check the range
-        for stop in self._stoplist:
-            if get_distance_of_two_points_in_meters(stop.lat, stop.lng,
-                                                    location.lat, location.lng) < self.get_max_radius():
-                return True
-        return False
+        # Clustering is enabled, check the range to the stops
+        nearest: Optional[Tuple[int, float]] = get_nearest(location.lat, location.lng,
+                                                           [stop.lat for stop in self._stoplist],
+                                                           [stop.lng for stop in self._stoplist])
+        return nearest is not None and nearest[1] < self.get_max_radius()
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.db.helper.TrsSpawnHelper import TrsSpawnHelper
+from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.utils.collections import Location
+from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.routemanager)
+
+# Seconds until all spawnpoints of the area are loaded again, the spawnpoints changed are loaded with every update
+SCHEDULE_RELOAD_INTERVAL: int = 3600
+# Seconds the spawnpoints changed are loaded again for to account for data received but stored later on
+SCHEDULE_UPDATE_OVERLAP: int = 120
+SECONDS_PER_HOUR: int = 3600
+# Spawndef of spawnpoints the mons of which stay for an hour, 30 minutes otherwise
+SPAWNDEF_ONE_HOUR: int = 15
+
+
+class SpawnSchedule:
+    """
+    Keeps the spawnpoints of an area sorted by the second of the hour their mons spawn at. The spawnpoints are loaded
+    once (and reloaded every SCHEDULE_RELOAD_INTERVAL), the spawnpoints scanned meanwhile are merged with every update.
+    Since the spawns repeat hourly, the spawns of the next seconds are a range of the sorted seconds wrapping around at
+    the end of the hour.
+    """
+
+    def __init__(self, geofence_helper: GeofenceHelper, include_event_id: Optional[int]):
+        self.__geofence_helper: GeofenceHelper = geofence_helper
+        self.__include_event_id: Optional[int] = include_event_id
+        # All indexed like __spawn_secs, i.e. sorted by the second of the hour the mons spawn at
+        self.__spawnpoints = np.empty(0, dtype=np.int64)
+        self.__coords = np.empty((0, 2))
+        self.__spawn_secs = np.empty(0, dtype=np.int64)
+        self.__loaded_at: float = 0
+        self.__updated_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.__spawn_secs)
+
+    async def get_next_spawns(self, session: AsyncSession,
+                              next_n_seconds: Optional[int] = None) -> List[Tuple[int, Location]]:
+        """
+        Args:
+            session:
+            next_n_seconds: Seconds to return the spawns of, the next hour if not set
+
+        Returns: The timestamp of the spawn and the location of the spawnpoint of the spawns coming up in the next
+        seconds given (including now), soonest first
+        """
+        await self.__update(session)
+        now: datetime = DatetimeWrapper.now().replace(microsecond=0)
+        return self.get_spawns_between(now, next_n_seconds)
+
+    def get_spawns_between(self, now: datetime, next_n_seconds: Optional[int] = None) -> List[Tuple[int, Location]]:
+        if len(self.__spawn_secs) == 0:
+            return []
+        if next_n_seconds is None or next_n_seconds >= SECONDS_PER_HOUR:
+            # A range of an hour would contain the spawns at the current second twice
+            next_n_seconds = SECONDS_PER_HOUR - 1
+        current_sec: int = now.minute * 60 + now.second
+        end_sec: int = current_sec + next_n_seconds
+        start: int = int(np.searchsorted(self.__spawn_secs, current_sec, side="left"))
+        if end_sec < SECONDS_PER_HOUR:
+            positions = np.arange(start, np.searchsorted(self.__spawn_secs, end_sec, side="right"))
+        else:
+            # Wrapping around into the next hour
+            positions = np.concatenate([np.arange(start, len(self.__spawn_secs)),
+                                        np.arange(np.searchsorted(self.__spawn_secs, end_sec - SECONDS_PER_HOUR,
+                                                                  side="right"))])
+        timestamps = int(now.timestamp()) + (self.__spawn_secs[positions] - current_sec) % SECONDS_PER_HOUR
+        return [(timestamp, Location(lat, lng))
+                for timestamp, (lat, lng) in zip(timestamps.tolist(), self.__coords[positions].tolist())]
+
+    async def __update(self, session: AsyncSession) -> None:
+        now: datetime = DatetimeWrapper.now()
+        if time.time() - self.__loaded_at > SCHEDULE_RELOAD_INTERVAL:
+            rows = await TrsSpawnHelper.get_spawn_timings_in_fence(session, self.__geofence_helper,
+                                                                   self.__include_event_id)
+            self.__spawnpoints = np.empty(0, dtype=np.int64)
+            self.__coords = np.empty((0, 2))
+            self.__spawn_secs = np.empty(0, dtype=np.int64)
+            self.merge(rows)
+            self.__loaded_at = time.time()
+            logger.info("Loaded {} spawnpoints with known spawn times", len(self.__spawn_secs))
+        else:
+            rows = await TrsSpawnHelper.get_spawn_timings_in_fence(
+                session, self.__geofence_helper, self.__include_event_id,
+                changed_since=self.__updated_at - timedelta(seconds=SCHEDULE_UPDATE_OVERLAP))
+            self.merge(rows)
+            logger.debug("Merged {} spawnpoints changed", len(rows))
+        self.__updated_at = now
+
+    def merge(self, rows: List[Tuple[int, float, float, int, int]]) -> None:
+        """
+        Adds the spawnpoints given (spawnpoint, latitude, longitude, spawndef, despawn_sec) or replaces the spawnpoints
+        known already.
+        """
+        if not rows:
+            return
+        spawnpoints = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        coords = np.array([(row[1], row[2]) for row in rows], dtype=float).reshape(-1, 2)
+        spawndefs = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        despawn_secs = np.fromiter((row[4] for row in rows), dtype=np.int64, count=len(rows))
+        inside = np.asarray(self.__geofence_helper.are_coords_inside_include_geofence(coords), dtype=bool)
+        spawn_secs = (despawn_secs - np.where(spawndefs == SPAWNDEF_ONE_HOUR, 3600, 1800)) % SECONDS_PER_HOUR
+
+        spawnpoints = np.concatenate([self.__spawnpoints, spawnpoints[inside]])
+        coords = np.concatenate([self.__coords, coords[inside]])
+        spawn_secs = np.concatenate([self.__spawn_secs, spawn_secs[inside]])
+        # Keep the last occurrence of each spawnpoint, i.e. the one merged
+        _, last_from_end = np.unique(spawnpoints[::-1], return_index=True)
+        keep = len(spawnpoints) - 1 - last_from_end
+        order = keep[np.argsort(spawn_secs[keep], kind="stable")]
+        self.__spawnpoints = spawnpoints[order]
+        self.__coords = coords[order]
+        self.__spawn_secs = spawn_secs[order]
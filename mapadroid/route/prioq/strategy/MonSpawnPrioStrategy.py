@@ -1,8 +1,8 @@
 from typing import List, Optional, Tuple
 
 from mapadroid.db.DbWrapper import DbWrapper
-from mapadroid.db.helper.TrsSpawnHelper import TrsSpawnHelper
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.route.SpawnSchedule import SpawnSchedule
 from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import AbstractRoutePriorityQueueStrategy, \
     RoutePriorityQueueEntry
 from mapadroid.route.routecalc.ClusteringHelper import ClusteringHelper
@@ -25,14 +25,13 @@ class MonSpawnPrioStrategy(AbstractRoutePriorityQueueStrategy):
         self._db_wrapper: DbWrapper = db_wrapper
         self._geofence_helper: GeofenceHelper = geofence_helper
         self._include_event_id: Optional[int] = include_event_id
+        self._spawn_schedule: SpawnSchedule = SpawnSchedule(geofence_helper, include_event_id)
 
     async def retrieve_new_coords(self) -> List[RoutePriorityQueueEntry]:
         logger.debug("Fetching mon spawn coords")
         async with self._db_wrapper as session, session:
-            next_spawns: List[Tuple[int, Location]] = await TrsSpawnHelper.get_next_spawns(session,
-                                                                                           self._geofence_helper,
-                                                                                           self._include_event_id,
-                                                                                           limit_next_n_seconds=self.get_update_interval())
+            next_spawns: List[Tuple[int, Location]] = await self._spawn_schedule.get_next_spawns(
+                session, next_n_seconds=self.get_update_interval())
         new_coords: List[RoutePriorityQueueEntry] = []
         for (timestamp_due, location) in next_spawns:
             entry: RoutePriorityQueueEntry = RoutePriorityQueueEntry(timestamp_due=timestamp_due,
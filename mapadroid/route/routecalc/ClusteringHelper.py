@@ -1,13 +1,16 @@
-from typing import Tuple, List
+from typing import Dict, List, Set, Tuple
 
-import s2sphere
 from loguru import logger
 
 from mapadroid.utils.collections import Relation, Location
 from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
+                                 get_distances_in_meters,
                                  get_middle_of_coord_list)
+from mapadroid.utils.LazyImport import lazy_import
 from mapadroid.utils.s2Helper import S2Helper
 
+np = lazy_import("numpy")
+
 
 class ClusteringHelper:
     def __init__(self, max_radius, max_count_per_circle: int, max_timedelta_seconds, use_s2: bool = False,
@@ -20,27 +23,26 @@ class ClusteringHelper:
 
     def _get_relations_in_range_within_time(self, queue: List[Tuple[int, Location]], max_radius):
         relations = {}
-        for event in queue:
-            for other_event in queue:
-                if event[1].lat == other_event[1].lat and event[1].lng == other_event[1].lng and \
-                        event not in relations.keys():
-                    relations[event] = []
-                distance = get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
-                                                                other_event[1].lat, other_event[1].lng)
-                # we will always build relations from the event at hand subtracted by the event inspected
-                timedelta = event[0] - other_event[0]
-                if 0 <= distance <= max_radius * 2 and 0 <= timedelta <= self.max_timedelta_seconds:
-                    if event not in relations.keys():
-                        relations[event] = []
-                    # avoid duplicates
-                    already_present = False
-                    for relation in relations[event]:
-                        if relation[0][1].lat == other_event[1].lat and \
-                                relation[0][1].lng == other_event[1].lng:
-                            already_present = True
-                    if not already_present:
-                        relations[event].append(
-                            Relation(other_event, distance, timedelta))
+        # Coords of the events related to per event to avoid duplicates
+        related_coords: Dict[Tuple[int, Location], Set[Tuple[float, float]]] = {}
+        lats = np.array([event[1].lat for event in queue], dtype=float)
+        lngs = np.array([event[1].lng for event in queue], dtype=float)
+        timestamps = np.array([event[0] for event in queue], dtype=float)
+        for index, event in enumerate(queue):
+            # Each event is related to itself at least
+            relations.setdefault(event, [])
+            present: Set[Tuple[float, float]] = related_coords.setdefault(event, set())
+            distances = get_distances_in_meters(event[1].lat, event[1].lng, lats, lngs)
+            # we will always build relations from the event at hand subtracted by the event inspected
+            timedeltas = event[0] - timestamps
+            in_range = (distances <= max_radius * 2) & (timedeltas >= 0) & (timedeltas <= self.max_timedelta_seconds)
+            for other_index in np.flatnonzero(in_range):
+                other_event = queue[other_index]
+                if (other_event[1].lat, other_event[1].lng) in present:
+                    continue
+                present.add((other_event[1].lat, other_event[1].lng))
+                relations[event].append(Relation(other_event, float(distances[other_index]),
+                                                 event[0] - other_event[0]))
         return relations
 
     @staticmethod
@@ -71,8 +73,13 @@ class ClusteringHelper:
         inside_circle = []
         highest_timedelta = 0
         if self.useS2:
-            region = s2sphere.CellUnion(
-                S2Helper.get_s2cells_from_circle(middle.lat, middle.lng, self.max_radius, self.S2level))
+            # A coord is inside the covering if its cell of the same level is
+            covering = S2Helper.get_cell_ids_from_circle(middle.lat, middle.lng, self.max_radius, self.S2level)
+            events = list(relations)
+            in_covering = np.isin(S2Helper.lat_lng_to_cell_ids([event[1].lat for event in events],
+                                                               [event[1].lng for event in events], self.S2level),
+                                  covering)
+            in_region: Dict[Tuple, bool] = dict(zip(events, in_covering.tolist()))
 
         for event_relations in relations:
             # exclude previously clustered events...
@@ -84,8 +91,7 @@ class ClusteringHelper:
                                                             event_relations[1].lng)
             event_in_range = 0 <= distance <= max_radius
             if self.useS2:
-                event_in_range = region.contains(s2sphere.LatLng.from_degrees(event_relations[1].lat,
-                                                                              event_relations[1].lng).to_point())
+                event_in_range = in_region[event_relations]
             # timedelta of event being inspected to the earliest timestamp
             timedelta_end = latest_timestamp - event_relations[0]
             timedelta_start = event_relations[0] - earliest_timestamp
@@ -1,5 +1,6 @@
 import asyncio
 import concurrent.futures
+import math
 from timeit import default_timer as timer
 from typing import List, Optional, Tuple
 
@@ -12,8 +13,13 @@ from mapadroid.route.routecalc.calculate_route_all import route_calc_all
 from mapadroid.route.routecalc.ClusteringHelper import ClusteringHelper
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
+from mapadroid.utils.LazyImport import lazy_import
 from mapadroid.utils.madGlobals import RoutecalculationTypes
 
+np = lazy_import("numpy")
+# Passes of 2-opt improving a local route at most
+LOCAL_ROUTE_MAX_PASSES: int = 20
+
 
 class RoutecalcUtil:
     @staticmethod
@@ -98,6 +104,61 @@ class RoutecalcUtil:
                 await session.rollback()
         return calculated_route
 
+    @staticmethod
+    def calculate_local_route(start: Location, coords: List[Location], max_radius: int,
+                              max_coords_within_radius: int, use_s2: bool = False,
+                              s2_level: int = 15) -> List[Location]:
+        """
+        Calculates a route through a few coords (e.g. the subroute of a single worker) in memory. Unlike
+        calculate_route, the route starts at the coord nearest to the start given and does not return to it. The coords
+        are ordered by nearest neighbour and shortened by 2-opt, which is fine for up to a few hundred coords.
+        Args:
+            start: The position of the worker
+            coords:
+            max_radius:
+            max_coords_within_radius:
+            use_s2:
+            s2_level:
+
+        Returns: The route, neither persisted nor recorded in the routecalc entry
+        """
+        if max_radius and max_radius >= 1 and max_coords_within_radius:
+            coords = RoutecalcUtil.get_less_coords(coords, max_radius, max_coords_within_radius, use_s2, s2_level)
+        if len(coords) < 2:
+            return list(coords)
+        # Planar approximation around the start, index 0 is the start and the last index an end reachable from
+        # everywhere at no cost to turn the open route into a tour
+        points = np.array([(start.lat, start.lng)] + [(coord.lat, coord.lng) for coord in coords], dtype=float)
+        points[:, 1] *= math.cos(math.radians(start.lat))
+        distances = np.zeros((len(points) + 1, len(points) + 1))
+        distances[:-1, :-1] = np.sqrt(((points[:, np.newaxis, :] - points[np.newaxis, :, :]) ** 2).sum(axis=2))
+
+        order: List[int] = [0]
+        unvisited = np.ones(len(points), dtype=bool)
+        unvisited[0] = False
+        for _ in range(len(coords)):
+            candidates = np.flatnonzero(unvisited)
+            nearest: int = int(candidates[np.argmin(distances[order[-1], candidates])])
+            order.append(nearest)
+            unvisited[nearest] = False
+        tour = np.array(order + [len(points)])
+
+        for _ in range(LOCAL_ROUTE_MAX_PASSES):
+            improved: bool = False
+            for i in range(1, len(tour) - 2):
+                # Gain of reversing tour[i:j + 1] for each j, replacing the edges (i - 1, i) and (j, j + 1)
+                ends = np.arange(i + 1, len(tour) - 1)
+                delta = (distances[tour[i - 1], tour[ends]] + distances[tour[i], tour[ends + 1]]
+                         - distances[tour[i - 1], tour[i]] - distances[tour[ends], tour[ends + 1]])
+                best: int = int(np.argmin(delta))
+                if delta[best] < -1e-12:
+                    j: int = int(ends[best])
+                    tour[i:j + 1] = tour[i:j + 1][::-1].copy()
+                    improved = True
+            if not improved:
+                break
+        return [coords[index - 1] for index in tour[1:-1]]
+
     @staticmethod
     async def _write_route_to_db_entry(routecalc_entry: SettingsRoutecalc,
                                        new_route: List[Location]) -> None:
@@ -4,14 +4,14 @@ import platform
 from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
-import numpy as np
-
 from mapadroid.route.routecalc.calculate_route_quick import route_calc_impl
 from mapadroid.utils.collections import Location
+from mapadroid.utils.LazyImport import lazy_import
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, RoutecalculationTypes
 
 logger = get_logger(LoggerEnums.routecalc)
+np = lazy_import("numpy")
 
 
 def is_or_tools_available() -> bool:
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+from asyncio import CancelledError, Task
+from typing import Dict, List, Optional, Set
+
+from marshmallow import Schema
+
+from mapadroid.updater.GlobalJobLogEntry import GlobalJobLogEntry
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.utils)
+
+# Changes are collected for this amount of seconds before being appended to the journal
+FLUSH_DELAY: float = 1.0
+# The journal is compacted once it contains this many lines more than there are jobs in the log
+COMPACTION_THRESHOLD: int = 1000
+
+
+class JobLogStore:
+    """
+    Append-only persistence of the job log. Every change of a job appends one JSON line ({"id": ..., "entry": ...}
+    or {"id": ..., "deleted": true}) to the journal. Changes are coalesced per job and written off the event loop,
+    the journal is compacted (rewritten with the current state) once it grew too large.
+    The legacy update_log.json is imported once if no journal exists yet.
+    """
+
+    def __init__(self, schema: Schema, journal_path: str = "update_log.journal",
+                 legacy_path: str = "update_log.json"):
+        self.__schema: Schema = schema
+        self.__journal_path: str = journal_path
+        self.__legacy_path: str = legacy_path
+        self.__log: Dict[str, GlobalJobLogEntry] = {}
+        self.__changed: Set[str] = set()
+        self.__changes_pending: asyncio.Event = asyncio.Event()
+        self.__journal_lines: int = 0
+        self.__writer_task: Optional[Task] = None
+
+    async def load(self, log: Dict[str, GlobalJobLogEntry]) -> None:
+        """
+        Populates the log given with the persisted entries. The log is kept as reference for later writes.
+        """
+        self.__log = log
+        loop = asyncio.get_running_loop()
+        raw_entries: Dict[str, dict] = await loop.run_in_executor(None, self.__read)
+        for job_id, raw_entry in raw_entries.items():
+            try:
+                log[job_id] = self.__schema.load(raw_entry)
+            except Exception as e:
+                logger.warning("Ignoring entry {} of the job log as it could not be loaded: {}", job_id, e)
+        # Write the current state to a fresh journal to drop replayed history
+        await loop.run_in_executor(None, self.__compact, self.__dump(list(log.keys())))
+
+    def start(self) -> None:
+        if self.__writer_task is None or self.__writer_task.done():
+            self.__writer_task = asyncio.get_running_loop().create_task(self.__write_changes())
+
+    async def stop(self) -> None:
+        if self.__writer_task is not None:
+            self.__writer_task.cancel()
+            self.__writer_task = None
+        await self.__flush()
+
+    def mark_changed(self, job_id: str) -> None:
+        self.__changed.add(job_id)
+        self.__changes_pending.set()
+
+    async def __write_changes(self) -> None:
+        while True:
+            try:
+                await self.__changes_pending.wait()
+                await asyncio.sleep(FLUSH_DELAY)
+                await self.__flush()
+            except CancelledError:
+                break
+            except Exception as e:
+                logger.warning("Failed writing the job log: {}", e)
+
+    async def __flush(self) -> None:
+        self.__changes_pending.clear()
+        if not self.__changed:
+            return
+        changed: List[str] = list(self.__changed)
+        self.__changed.clear()
+        # Serialization has to happen on the loop as the entries are modified by the job processors
+        lines: List[str] = self.__dump(changed)
+        loop = asyncio.get_running_loop()
+        if self.__journal_lines + len(lines) > len(self.__log) + COMPACTION_THRESHOLD:
+            await loop.run_in_executor(None, self.__compact, self.__dump(list(self.__log.keys())))
+        else:
+            await loop.run_in_executor(None, self.__append, lines)
+
+    def __dump(self, job_ids: List[str]) -> List[str]:
+        lines: List[str] = []
+        for job_id in job_ids:
+            entry: Optional[GlobalJobLogEntry] = self.__log.get(job_id)
+            if entry is None:
+                lines.append(json.dumps({"id": job_id, "deleted": True}))
+            else:
+                lines.append(json.dumps({"id": job_id, "entry": self.__schema.dump(entry, many=False)}))
+        return lines
+
+    def __append(self, lines: List[str]) -> None:
+        with open(self.__journal_path, "a") as journal:
+            journal.write("".join(line + "\n" for line in lines))
+        self.__journal_lines += len(lines)
+
+    def __compact(self, lines: List[str]) -> None:
+        temp_path: str = self.__journal_path + ".tmp"
+        with open(temp_path, "w") as journal:
+            journal.write("".join(line + "\n" for line in lines))
+        os.replace(temp_path, self.__journal_path)
+        self.__journal_lines = len(lines)
+
+    def __read(self) -> Dict[str, dict]:
+        raw_entries: Dict[str, dict] = {}
+        if not os.path.exists(self.__journal_path) and os.path.exists(self.__legacy_path):
+            try:
+                with open(self.__legacy_path) as logfile:
+                    loaded_log = json.load(logfile)
+                if isinstance(loaded_log, dict):
+                    raw_entries.update({job_id: raw_entry for job_id, raw_entry in loaded_log.items()
+                                        if isinstance(raw_entry, dict)})
+            except json.decoder.JSONDecodeError:
+                logger.error('Corrupted {} file found. Please check remaining disk space or disk health.',
+                             self.__legacy_path)
+            os.remove(self.__legacy_path)
+        elif os.path.exists(self.__journal_path):
+            with open(self.__journal_path) as journal:
+                for line_number, line in enumerate(journal):
+                    try:
+                        record = json.loads(line)
+                    except json.decoder.JSONDecodeError:
+                        # Most likely the last line was not written entirely
+                        logger.warning("Skipping corrupted line {} of {}", line_number, self.__journal_path)
+                        continue
+                    if record.get("deleted"):
+                        raw_entries.pop(record["id"], None)
+                    elif isinstance(record.get("entry"), dict):
+                        raw_entries[record["id"]] = record["entry"]
+        return raw_entries
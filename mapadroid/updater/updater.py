@@ -4,7 +4,7 @@ import json
 import os
 import re
 import time
-from asyncio import CancelledError, Task
+from asyncio import CancelledError, Task, TimerHandle
 from datetime import datetime, timedelta
 from typing import AsyncGenerator, Dict, List, Optional, Tuple, Union
 
@@ -19,6 +19,7 @@ from mapadroid.mad_apk.utils import (is_newer_version, lookup_arch_enum,
 from mapadroid.updater.Autocommand import Autocommand
 from mapadroid.updater.GlobalJobLogAlgoType import GlobalJobLogAlgoType
 from mapadroid.updater.GlobalJobLogEntry import GlobalJobLogEntry
+from mapadroid.updater.JobLogStore import JobLogStore
 from mapadroid.updater.JobReturn import JobReturn
 from mapadroid.updater.JobStatus import JobStatus
 from mapadroid.updater.JobType import JobType
@@ -34,6 +35,8 @@ from mapadroid.websocket import AbstractCommunicator, WebsocketServer
 logger = get_logger(LoggerEnums.utils)
 
 SUCCESS_STATES = [JobStatus.SUCCESS, JobStatus.NOT_REQUIRED, JobStatus.NOT_SUPPORTED]
+# Minimum delay in seconds before a job which is to be retried is processed again
+JOB_RETRY_DELAY = 2
 
 
 class DeviceUpdater(object):
@@ -45,42 +48,36 @@ class DeviceUpdater(object):
         self._log: Dict[str, GlobalJobLogEntry] = {}
         self._available_jobs: Dict[str, List[SubJob]] = {}
         self._running_jobs_per_origin: Dict[str, GlobalJobLogEntry] = {}
+        # Jobs waiting for the job running on the origin to be finished
+        self._waiting_jobs_per_origin: Dict[str, List[GlobalJobLogEntry]] = {}
+        # Jobs to be put back into the queue at their processing date
+        self._scheduled_jobs: Dict[str, TimerHandle] = {}
         self._storage_obj: AbstractAPKStorage = storage_obj
         self._sub_job_schema: Schema = marshmallow_dataclass.class_schema(SubJob)()
         self._global_job_log_entry_schema: Schema = marshmallow_dataclass.class_schema(GlobalJobLogEntry)()
         self._autocommand_schema: Schema = marshmallow_dataclass.class_schema(Autocommand)()
+        self._log_store: JobLogStore = JobLogStore(self._global_job_log_entry_schema)
         self._stop_updater_threads: asyncio.Event = asyncio.Event()
         self.t_updater: List[Task] = []
 
     async def _load_log(self) -> None:
-        log_file: str = "update_log.json"
-        try:
-            if os.path.exists(log_file):
-                with open(log_file) as logfile:
-                    loaded_log = json.load(logfile)
-                if not isinstance(loaded_log, dict):
-                    logger.warning("Unable to ")
-                    os.remove(log_file)
-                    return
-                for issued_job_name, issued_job_raw in loaded_log.items():
-                    if not isinstance(issued_job_raw, dict):
-                        logger.warning("Ignoring entry {} of {} as it's not a dict", issued_job_name, log_file)
-                    issued_job: GlobalJobLogEntry = self._global_job_log_entry_schema.load(issued_job_raw)
-                    self._log[issued_job_name] = issued_job
-        except json.decoder.JSONDecodeError:
-            logger.error('Corrupted update_log.json file found. Deleting the file. Please check remaining disk space '
-                         'or disk health.')
-            os.remove(log_file)
+        await self._log_store.load(self._log)
 
     async def stop_updater(self):
         self._stop_updater_threads.set()
         for thread in self.t_updater:
             thread.cancel()
+        self.t_updater.clear()
+        for timer in self._scheduled_jobs.values():
+            timer.cancel()
+        self._scheduled_jobs.clear()
+        await self._log_store.stop()
 
     async def start_updater(self):
         await self.stop_updater()
         await self._load_jobs()
         await self._load_log()
+        self._log_store.start()
         await self._kill_old_jobs()
         await self._load_automatic_jobs()
         self._stop_updater_threads.clear()
@@ -140,6 +137,7 @@ class DeviceUpdater(object):
                 job_entry.processing_date = None
             job_entry.last_status = JobStatus.PENDING
 
+            self.__cancel_scheduled(job_id)
             await self._job_queue.put(job_entry)
             await self.__update_log(job_entry)
 
@@ -154,7 +152,7 @@ class DeviceUpdater(object):
                     job_entry.last_status = JobStatus.CANCELLED
                 elif job_entry.auto_command_settings is not None:
                     self._log.pop(job_id)
-            await self.__write_log()
+                self._log_store.mark_changed(job_id)
 
     async def __handle_job(self, job_item: GlobalJobLogEntry) -> bool:
         """
@@ -306,51 +304,82 @@ class DeviceUpdater(object):
         await asyncio.sleep(10)
         while not self._stop_updater_threads.is_set():
             try:
+                item: Optional[GlobalJobLogEntry] = await self._job_queue.get()
                 try:
-                    item: Optional[GlobalJobLogEntry] = self._job_queue.get_nowait()
-                except asyncio.queues.QueueEmpty:
-                    await asyncio.sleep(1)
-                    continue
-                if item is None:
-                    continue
-                # Boolean to control the release of the running job on the device
-                requeue: bool = False
-                try:
-                    async with self._update_mutex:
-                        if item.id not in self._log:
-                            continue
-
-                        if item.origin in self._running_jobs_per_origin \
-                                and item.id != self._running_jobs_per_origin[item.origin].id:
-                            # Do not run multiple (different) jobs on the same device at once
-                            await self._job_queue.put(item)
-                            continue
-                        self._running_jobs_per_origin[item.origin] = item
-
-                    await self._websocket.set_job_activated(item.origin)
-                    requeue = not await self.__handle_job(item)
-                    if requeue:
-                        await self._job_queue.put(item)
-                except Exception as e:
-                    logger.warning("Failed executing job")
-                    logger.exception(e)
+                    if item is None or not await self.__reserve_origin(item):
+                        continue
+                    await self.__process_job(item)
                 finally:
-                    await self._websocket.set_job_deactivated(item.origin)
-                    await self.__update_log(item)
-                    # While we requeue jobs of autocommands looping, these should not influence jobs to be run
-                    #  at any other time
-                    if not requeue or item.auto_command_settings is not None and item.last_status != JobStatus.FUTURE:
-                        async with self._update_mutex:
-                            self._running_jobs_per_origin.pop(item.origin)
                     self._job_queue.task_done()
-
             except (KeyboardInterrupt, CancelledError):
                 logger.info("process_update_queue-{} received keyboard interrupt, stopping", threadnumber)
                 break
-
-            await asyncio.sleep(2)
         logger.info("Updater thread stopped")
 
+    async def __reserve_origin(self, item: GlobalJobLogEntry) -> bool:
+        """
+        Marks the job as running on its origin. If a different job is running on the origin already, the job waits
+        for it to be finished.
+        Returns: Whether the job is to be processed now
+        """
+        async with self._update_mutex:
+            if item.id not in self._log:
+                return False
+            running: Optional[GlobalJobLogEntry] = self._running_jobs_per_origin.get(item.origin)
+            if running is not None and item.id != running.id:
+                # Do not run multiple (different) jobs on the same device at once
+                waiting: List[GlobalJobLogEntry] = self._waiting_jobs_per_origin.setdefault(item.origin, [])
+                if item not in waiting:
+                    waiting.append(item)
+                return False
+            self._running_jobs_per_origin[item.origin] = item
+            return True
+
+    async def __process_job(self, item: GlobalJobLogEntry) -> None:
+        # Boolean to control the release of the running job on the device
+        requeue: bool = False
+        try:
+            await self._websocket.set_job_activated(item.origin)
+            requeue = not await self.__handle_job(item)
+            if requeue:
+                self.__schedule(item)
+        except Exception as e:
+            logger.warning("Failed executing job")
+            logger.exception(e)
+        finally:
+            await self._websocket.set_job_deactivated(item.origin)
+            await self.__update_log(item)
+            # While we requeue jobs of autocommands looping, these should not influence jobs to be run
+            #  at any other time
+            if not requeue or item.auto_command_settings is not None and item.last_status != JobStatus.FUTURE:
+                await self.__release_origin(item.origin)
+
+    async def __release_origin(self, origin: str) -> None:
+        async with self._update_mutex:
+            self._running_jobs_per_origin.pop(origin, None)
+            # Hand the origin to the jobs waiting for it, the first one processed reserves it again
+            for waiting in self._waiting_jobs_per_origin.pop(origin, []):
+                self._job_queue.put_nowait(waiting)
+
+    def __schedule(self, item: GlobalJobLogEntry) -> None:
+        """
+        Puts the job back into the queue once its processing date is reached
+        """
+        self.__cancel_scheduled(item.id)
+        delay: float = JOB_RETRY_DELAY
+        if item.processing_date is not None:
+            delay = max(delay, item.processing_date - time.time())
+        self._scheduled_jobs[item.id] = asyncio.get_running_loop().call_later(delay, self.__enqueue_scheduled, item)
+
+    def __enqueue_scheduled(self, item: GlobalJobLogEntry) -> None:
+        self._scheduled_jobs.pop(item.id, None)
+        self._job_queue.put_nowait(item)
+
+    def __cancel_scheduled(self, job_id: str) -> None:
+        timer: Optional[TimerHandle] = self._scheduled_jobs.pop(job_id, None)
+        if timer is not None:
+            timer.cancel()
+
     async def add_job(self, origin: str, job_name: str,
                       auto_command: Optional[Autocommand] = None) -> bool:
         if job_name not in self._available_jobs:
@@ -369,14 +398,6 @@ class DeviceUpdater(object):
         await self.__update_log(new_entry)
         return True
 
-    async def __write_log(self):
-        async with self._update_mutex:
-            with open('update_log.json', 'w') as outfile:
-                to_dump = {}
-                for job_id, entry in self._log.items():
-                    to_dump[job_id] = self._global_job_log_entry_schema.dump(entry, many=False)
-                json.dump(to_dump, outfile, indent=4)
-
     async def delete_log_id(self, job_id: str):
         async with self._update_mutex:
             if job_id not in self._log:
@@ -385,6 +406,8 @@ class DeviceUpdater(object):
                 if job_entry.id == job_id:
                     return False
             self._log.pop(job_id)
+            self.__cancel_scheduled(job_id)
+            self._log_store.mark_changed(job_id)
             return True
 
     def get_log(self, including_auto_jobs=False) -> List[GlobalJobLogEntry]:
@@ -469,7 +492,6 @@ class DeviceUpdater(object):
                 else:
                     logger.info('Smart Update APK Installation for {} to {}',
                                 package.name, job_item.origin)
-                    apk_file = bytes()
                     async with self._db as session, session:
                         package_data: Optional[Tuple[AsyncGenerator,
                                                      str, str, str]] = await stream_package(session, self._storage_obj,
@@ -479,12 +501,11 @@ class DeviceUpdater(object):
                                            "requested.")
                             return True
                         gen_func, mimetype, filename, version = package_data
-                        async for chunk in gen_func:
-                            apk_file += chunk
-                    if mad_apk.mimetype == 'application/zip':
-                        returning = await communicator.install_bundle(300, data=apk_file)
-                    else:
-                        returning = await communicator.install_apk(300, data=apk_file)
+                        # The chunks are streamed to the device as they are read rather than loading the entire file
+                        if mad_apk.mimetype == 'application/zip':
+                            returning = await communicator.install_bundle(300, data=gen_func)
+                        else:
+                            returning = await communicator.install_apk(300, data=gen_func)
                     return returning if not 'RemoteGpsController'.lower() in str(sub_job_to_run.SYNTAX).lower() \
                         else True
             elif sub_job_to_run.TYPE == JobType.REBOOT:
@@ -520,6 +541,7 @@ class DeviceUpdater(object):
                 if job_entry.last_status in SUCCESS_STATES and (job_entry.auto_command_settings is None or
                                                                 not job_entry.auto_command_settings.redo):
                     self._log.pop(job_id)
+                    self._log_store.mark_changed(job_id)
         else:
             for job_id in list(self._log.keys()):
                 await self.delete_log_id(job_id)
@@ -604,7 +626,10 @@ class DeviceUpdater(object):
             return None
 
     async def __update_log(self, entry: Optional[GlobalJobLogEntry]):
+        if entry is None:
+            return
         async with self._update_mutex:
-            if entry is not None and entry.id not in self._log:
+            if entry.id not in self._log:
                 self._log[entry.id] = entry
-            await self.__write_log()
+            # Persisted in the background by the store
+            self._log_store.mark_changed(entry.id)
@@ -2,7 +2,9 @@ import asyncio
 from concurrent.futures import Executor
 from typing import Optional
 
-import cv2
+from mapadroid.utils.LazyImport import lazy_import
+
+cv2 = lazy_import("cv2")
 
 
 class AsyncioCv2:
@@ -36,12 +38,13 @@ class AsyncioCv2:
             executor, cv2.cvtColor, src, code, dst, dstCn)
 
     @staticmethod
-    async def GaussianBlur(src, ksize, sigmaX, dst=None, sigmaY: int = 0, borderType: int = cv2.BORDER_DEFAULT,
+    async def GaussianBlur(src, ksize, sigmaX, dst=None, sigmaY: int = 0, borderType: Optional[int] = None,
                            executor: Optional[Executor] = None):
+        border_type: int = cv2.BORDER_DEFAULT if borderType is None else borderType
         loop = asyncio.get_running_loop()
         # with concurrent.futures.ThreadPoolExecutor() as pool:
         return await loop.run_in_executor(
-            executor, cv2.GaussianBlur, src, ksize, sigmaX, dst, sigmaY, borderType)
+            executor, cv2.GaussianBlur, src, ksize, sigmaX, dst, sigmaY, border_type)
 
     @staticmethod
     async def Canny(image, threshold1: float, threshold2: float, edges=None, apertureSize: int = 3,
@@ -57,20 +60,12 @@ class AsyncioCv2:
                           minLineLength: float = 0, maxLineGap: float = 0,
                           executor: Optional[Executor] = None):
         raise ValueError("Do not use for now")
-        loop = asyncio.get_running_loop()
-        # with concurrent.futures.ThreadPoolExecutor() as pool:
-        return await loop.run_in_executor(
-            executor, cv2.HoughLinesP, image, rho, theta, threshold, lines, minLineLength, maxLineGap)
 
     @staticmethod
     async def morphologyEx(src, op, kernel, dst=None, anchor=None, iterations: int = 1,
-                           borderType=cv2.BORDER_CONSTANT, borderValue=None,
+                           borderType: Optional[int] = None, borderValue=None,
                            executor: Optional[Executor] = None):
         raise ValueError("Do not use for now")
-        loop = asyncio.get_running_loop()
-        # with concurrent.futures.ThreadPoolExecutor() as pool:
-        return await loop.run_in_executor(
-            executor, cv2.morphologyEx, src, op, kernel, dst, anchor, iterations, borderType, borderValue)
 
     @staticmethod
     async def HoughCircles(image, method, dp, minDist, circles=None, param1: int = 100, param2: int = 100,
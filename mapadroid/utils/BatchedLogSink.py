@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+# Messages queued per sink before messages below WARNING are dropped
+MAX_QUEUED_MESSAGES: int = 10000
+# The writer is woken up early once this amount of messages is queued
+BATCH_SIZE: int = 500
+# Seconds messages may stay queued at most
+FLUSH_INTERVAL: float = 0.5
+# Records kept per origin in the ring buffer and origins kept (least recently logging origins are dropped first)
+RING_BUFFER_SIZE: int = 1000
+RING_BUFFER_ORIGINS: int = 256
+
+WARNING_LEVEL_NO: int = 30
+ERROR_LEVEL_NO: int = 40
+
+
+class BatchedLogSink:
+    """
+    Sink of loguru handlers queueing the formatted messages for a writer thread instead of writing them in the
+    thread logging. The writer joins the queued messages and writes them with a single call.
+    Unlike loguru's enqueue=True, messages are not pickled and memory is bounded: If the writer can't keep up,
+    messages below WARNING are dropped (and the amount dropped is logged) rather than queued.
+    """
+
+    def __init__(self, writer: Callable[[str], None], on_stop: Optional[Callable[[], None]] = None,
+                 max_queued: int = MAX_QUEUED_MESSAGES):
+        self.__writer: Callable[[str], None] = writer
+        self.__on_stop: Optional[Callable[[], None]] = on_stop
+        self.__max_queued: int = max_queued
+        self.__queue: Deque[str] = deque()
+        self.__dropped: int = 0
+        self.__condition: threading.Condition = threading.Condition()
+        self.__stopped: bool = False
+        self.__thread: threading.Thread = threading.Thread(target=self.__run, name="log-writer", daemon=True)
+        self.__thread.start()
+
+    @classmethod
+    def for_stream(cls, stream: TextIO) -> "BatchedLogSink":
+        def write(text: str) -> None:
+            stream.write(text)
+            stream.flush()
+        return cls(write)
+
+    def write(self, message: str) -> None:
+        # loguru passes the formatted message carrying the record
+        level_no: int = message.record["level"].no
+        with self.__condition:
+            if len(self.__queue) >= self.__max_queued and level_no < WARNING_LEVEL_NO:
+                self.__dropped += 1
+                return
+            self.__queue.append(message)
+            if len(self.__queue) >= BATCH_SIZE or level_no >= ERROR_LEVEL_NO:
+                self.__condition.notify()
+
+    def stop(self) -> None:
+        """
+        Called by loguru once the handler is removed. Writes the messages still queued.
+        """
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+        self.__thread.join()
+        if self.__on_stop:
+            self.__on_stop()
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                if not self.__stopped and len(self.__queue) < BATCH_SIZE:
+                    self.__condition.wait(FLUSH_INTERVAL)
+                batch: Deque[str] = self.__queue
+                self.__queue = deque()
+                dropped: int = self.__dropped
+                self.__dropped = 0
+                stopped: bool = self.__stopped
+            if dropped:
+                batch.append("Log writer fell behind, dropped {} messages below WARNING\n".format(dropped))
+            if batch:
+                try:
+                    self.__writer("".join(batch))
+                except Exception as e:
+                    print("Failed writing log messages: {}".format(e))
+            if stopped:
+                return
+
+
+class LogRingBuffer:
+    """
+    Keeps the most recent records per origin in memory to be queried by MADmin. The origin is the identifier of the
+    log context (the device for workers, websocket and MITM data) or the name of the logger if not set.
+    """
+
+    def __init__(self, size: int = RING_BUFFER_SIZE, max_origins: int = RING_BUFFER_ORIGINS):
+        self.__size: int = size
+        self.__max_origins: int = max_origins
+        # (timestamp, level, module:line, message)
+        self.__entries: Dict[str, Deque[Tuple[float, str, str, str]]] = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+
+    def write(self, message: str) -> None:
+        record = message.record
+        origin: str = record["extra"].get("identifier") or record["extra"].get("name") or "unknown"
+        entry: Tuple[float, str, str, str] = (record["time"].timestamp(), record["level"].name,
+                                              "{}:{}".format(record["module"], record["line"]), record["message"])
+        with self.__lock:
+            entries: Optional[Deque[Tuple[float, str, str, str]]] = self.__entries.get(origin)
+            if entries is None:
+                if len(self.__entries) >= self.__max_origins:
+                    self.__entries.popitem(last=False)
+                entries = deque(maxlen=self.__size)
+                self.__entries[origin] = entries
+            else:
+                self.__entries.move_to_end(origin)
+            entries.append(entry)
+
+    def get_origins(self) -> List[str]:
+        with self.__lock:
+            return sorted(self.__entries.keys())
+
+    def get_entries(self, origin: str, since: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Args:
+            origin:
+            since: Only return records logged after the timestamp given
+            limit: Return the most recent records only
+
+        Returns: The records of the origin, oldest first
+        """
+        with self.__lock:
+            entries: List[Tuple[float, str, str, str]] = list(self.__entries.get(origin, ()))
+        if since is not None:
+            entries = [entry for entry in entries if entry[0] > since]
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return [{"timestamp": timestamp, "level": level, "location": location, "message": message}
+                for timestamp, level, location, message in entries]
+
+
+# Records logged and not yet dropped are kept across reconfigurations of the logging
+log_ring_buffer: LogRingBuffer = LogRingBuffer()
+
+
+class LogSampler:
+    """
+    Limits high-frequency log statements to one per interval (per key) and counts the statements suppressed meanwhile.
+    """
+
+    def __init__(self):
+        self.__last_logged: Dict[str, Tuple[float, int]] = {}
+
+    def sample(self, key: str, interval: float) -> Optional[int]:
+        """
+        Returns: None if the statement is to be suppressed, the amount of statements suppressed since the last one
+        logged otherwise
+        """
+        now: float = time.monotonic()
+        last_logged, suppressed = self.__last_logged.get(key, (0.0, 0))
+        if last_logged and now - last_logged < interval:
+            self.__last_logged[key] = (last_logged, suppressed + 1)
+            return None
+        self.__last_logged[key] = (now, 0)
+        return suppressed
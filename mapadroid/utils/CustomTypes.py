@@ -1,3 +1,5 @@
-from typing import Union
+from typing import AsyncIterable, Union
 
 MessageTyping = Union[str, bytes]
+# Binary messages may be streamed to devices chunk by chunk
+OutgoingMessageTyping = Union[MessageTyping, AsyncIterable[bytes]]
@@ -0,0 +1,162 @@
+import asyncio
+import inspect
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.metrics import Histogram, HistogramChild
+
+logger = get_logger(LoggerEnums.system)
+
+# Upper bounds (seconds) of the buckets of the histograms, the last bucket counts everything above
+HISTOGRAM_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds inbetween measurements of the lag of the loop
+LAG_INTERVAL: float = 0.1
+# Stack samples taken per stall at most, the remaining duration is attributed to the samples taken
+MAX_SAMPLES_PER_STALL: int = 20
+# Amount of stalls kept along with their stack
+MAX_STALLS_KEPT: int = 50
+# Name of stalls that could not be attributed to a coroutine or callback
+UNKNOWN_NAME: str = "unknown"
+ASYNCIO_PATH: str = os.path.dirname(asyncio.__file__)
+
+EVENT_LOOP_LAG_SECONDS: Histogram = Histogram("mad_event_loop_lag_seconds",
+                                              "Delay of a callback scheduled on the event loop",
+                                              buckets=HISTOGRAM_BUCKETS)
+EVENT_LOOP_STALL_SECONDS: Histogram = Histogram("mad_event_loop_stall_seconds",
+                                                "Lag of the event loop above the threshold by the coroutine sampled "
+                                                "blocking it", ["name"], buckets=HISTOGRAM_BUCKETS)
+
+
+class EventLoopMonitor:
+    """
+    Measures the lag of the event loop (the delay of a callback scheduled in LAG_INTERVAL) continuously. A watchdog
+    thread takes stack samples of the thread of the loop while the loop does not manage to run that callback within
+    the threshold. Once the loop catches up, the lag is attributed to the coroutine (or plain callback) sampled most
+    and recorded in the histogram of that name.
+    """
+
+    def __init__(self):
+        self.__max_lag: float = 0
+        self.__max_stall_by_name: Dict[str, float] = {}
+        # Timestamp, duration, name and stack of the latest stalls
+        self.__stalls: Deque[Tuple[float, float, str, str]] = deque(maxlen=MAX_STALLS_KEPT)
+        # Name and formatted stack of the samples of the current stall, appended to by the watchdog
+        self.__samples: List[Tuple[str, str]] = []
+        self.__threshold: float = 0.1
+        self.__heartbeat: float = time.monotonic()
+        self.__loop_thread_id: Optional[int] = None
+        self.__lag_task: Optional[asyncio.Task] = None
+        self.__stop_event: threading.Event = threading.Event()
+        self.__started_at: Optional[float] = None
+
+    def start(self, threshold: float) -> None:
+        """
+        Starts monitoring the running loop
+        Args:
+            threshold: Seconds the loop may be blocked before stack samples are taken
+        """
+        if self.__lag_task:
+            return
+        self.__threshold = threshold
+        self.__loop_thread_id = threading.get_ident()
+        self.__heartbeat = time.monotonic()
+        self.__started_at = time.time()
+        self.__stop_event.clear()
+        self.__lag_task = asyncio.get_running_loop().create_task(self.__measure_lag())
+        threading.Thread(target=self.__watch, name="event_loop_watchdog", daemon=True).start()
+        logger.info("Monitoring the event loop, taking stack samples when blocked for more than {}s", threshold)
+
+    def stop(self) -> None:
+        self.__stop_event.set()
+        if self.__lag_task:
+            self.__lag_task.cancel()
+            self.__lag_task = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "running": self.__lag_task is not None,
+            "started_at": self.__started_at,
+            "threshold": self.__threshold,
+            "lag": self.__histogram_to_json(EVENT_LOOP_LAG_SECONDS.labels(), self.__max_lag),
+            "stalls_by_name": {name: self.__histogram_to_json(histogram, self.__max_stall_by_name.get(name, 0))
+                               for (name,), histogram in EVENT_LOOP_STALL_SECONDS.get_children().items()},
+            "stalls": [{"timestamp": timestamp, "duration": duration, "name": name, "stack": stack}
+                       for timestamp, duration, name, stack in reversed(self.__stalls)]
+        }
+
+    @staticmethod
+    def __histogram_to_json(histogram: HistogramChild, maximum: float) -> Dict:
+        counts: List[int] = histogram.get_counts()
+        return {
+            "buckets": [{"le": bound, "count": count}
+                        for bound, count in zip(list(HISTOGRAM_BUCKETS) + ["+Inf"], counts)],
+            "count": sum(counts),
+            "sum": histogram.get_sum(),
+            "max": maximum
+        }
+
+    async def __measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected: float = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            lag: float = max(loop.time() - expected, 0)
+            self.__heartbeat = time.monotonic()
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            self.__max_lag = max(self.__max_lag, lag)
+            # Swapped rather than cleared as the watchdog may be appending
+            samples, self.__samples = self.__samples, []
+            if lag >= self.__threshold:
+                self.__record_stall(lag, samples)
+
+    def __record_stall(self, duration: float, samples: List[Tuple[str, str]]) -> None:
+        if samples:
+            name: str = Counter(name for name, _ in samples).most_common(1)[0][0]
+            stack: str = next(stack for sample_name, stack in samples if sample_name == name)
+        else:
+            # Blocked for less time than the watchdog needed to notice
+            name, stack = UNKNOWN_NAME, ""
+        EVENT_LOOP_STALL_SECONDS.labels(name).observe(duration)
+        self.__max_stall_by_name[name] = max(self.__max_stall_by_name.get(name, 0), duration)
+        self.__stalls.append((time.time(), duration, name, stack))
+        logger.warning("Event loop was blocked for {:.3f}s by {}", duration, name)
+
+    def __watch(self) -> None:
+        sample_interval: float = max(self.__threshold / 2, 0.01)
+        while not self.__stop_event.wait(sample_interval):
+            if time.monotonic() - self.__heartbeat < LAG_INTERVAL + self.__threshold:
+                continue
+            if len(self.__samples) >= MAX_SAMPLES_PER_STALL:
+                continue
+            frame = sys._current_frames().get(self.__loop_thread_id)
+            if frame is None:
+                continue
+            self.__samples.append((self.get_name_of_frame(frame), "".join(traceback.format_stack(frame))))
+            del frame
+
+    @staticmethod
+    def get_name_of_frame(frame) -> str:
+        """
+        Returns: The name of the outermost coroutine of the stack called by the loop (i.e. the coroutine of the task
+        running), the name of the outermost function called by the loop otherwise
+        """
+        name: Optional[str] = None
+        fallback: Optional[str] = None
+        # Frames of asyncio running the loop (and anything calling it) are not walked past
+        while frame is not None and ASYNCIO_PATH not in frame.f_code.co_filename:
+            code = frame.f_code
+            qualified_name: str = getattr(code, "co_qualname", code.co_name)
+            if code.co_flags & inspect.CO_COROUTINE:
+                name = qualified_name
+            fallback = qualified_name
+            frame = frame.f_back
+        return name or fallback or UNKNOWN_NAME
+
+
+event_loop_monitor: EventLoopMonitor = EventLoopMonitor()
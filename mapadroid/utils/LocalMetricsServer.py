@@ -0,0 +1,78 @@
+from enum import IntEnum
+from typing import Optional
+
+from aiohttp import web
+
+from mapadroid.utils.EventLoopMonitor import event_loop_monitor
+from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.madGlobals import MadGlobals
+from mapadroid.utils.metrics import CONTENT_TYPE, REGISTRY
+
+logger = get_logger(LoggerEnums.system)
+
+# Only reachable from the host itself, the stats include stacks of the code
+LOCAL_METRICS_HOST: str = "127.0.0.1"
+
+
+class LocalMetricsProcess(IntEnum):
+    """
+    Offset added to local_metrics_port by each process since all of them read the same config
+    """
+    MAD = 0
+    CORE = 1
+    MITM_RECEIVER = 2
+    MITM_MAPPER = 3
+    STATS_HANDLER = 4
+
+
+class LocalMetricsServer:
+    """
+    Serves the metrics of the process it runs in, /metrics in the OpenMetrics text format (e.g. to be scraped by
+    Prometheus) and /event_loop as JSON. Every process (MAD, core, MITM receiver, MITM mapper, stats handler) runs its
+    own server on local_metrics_port plus the offset of the process (see LocalMetricsProcess).
+    """
+
+    def __init__(self, port: int):
+        self.__port: int = port
+        self.__runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        app: web.Application = web.Application()
+        app.router.add_get("/metrics", self.__get_metrics)
+        app.router.add_get("/event_loop", self.__get_event_loop)
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        site: web.TCPSite = web.TCPSite(self.__runner, LOCAL_METRICS_HOST, self.__port)
+        await site.start()
+        logger.info("Serving local metrics on {}:{}", LOCAL_METRICS_HOST, self.__port)
+
+    async def stop(self) -> None:
+        if self.__runner:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    @staticmethod
+    async def __get_metrics(request: web.Request) -> web.Response:
+        return web.Response(body=REGISTRY.generate().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    @staticmethod
+    async def __get_event_loop(request: web.Request) -> web.Response:
+        return web.json_response(event_loop_monitor.get_stats())
+
+
+async def start_local_metrics_server(process: LocalMetricsProcess) -> Optional[LocalMetricsServer]:
+    """
+    Starts the server of the process if local_metrics_port is set. Failing to bind the port is logged and does not
+    stop the process.
+    """
+    if not MadGlobals.application_args.local_metrics_port:
+        return None
+    port: int = MadGlobals.application_args.local_metrics_port + process
+    local_metrics_server: LocalMetricsServer = LocalMetricsServer(port)
+    try:
+        await local_metrics_server.start()
+    except OSError as e:
+        logger.error("Unable to serve local metrics on {}:{}: {}", LOCAL_METRICS_HOST, port, e)
+        await local_metrics_server.stop()
+        return None
+    return local_metrics_server
@@ -0,0 +1,44 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import psutil
+from loguru import logger
+
+
+class StartupProfiler:
+    """
+    Records the time spent importing and initializing the subsystems on startup. Phases count the modules imported
+    meanwhile as modules loaded lazily are imported by the first subsystem using them.
+    For a breakdown of the imports per module, run MAD with python -X importtime.
+    """
+
+    def __init__(self):
+        # Name, duration (seconds), amount of modules imported
+        self.__phases: List[Tuple[str, float, int]] = []
+
+    def record_since_process_start(self, name: str) -> None:
+        """
+        Records the time since the process was started (interpreter startup and the imports of the entrypoint)
+        """
+        duration: float = time.time() - psutil.Process().create_time()
+        self.__phases.append((name, duration, len(sys.modules)))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        modules_before: int = len(sys.modules)
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__phases.append((name, time.perf_counter() - start, len(sys.modules) - modules_before))
+
+    def log_summary(self) -> None:
+        total: float = sum(duration for _, duration, _ in self.__phases)
+        logger.info("Startup took {:.2f}s", total)
+        for name, duration, modules_imported in sorted(self.__phases, key=lambda phase: phase[1], reverse=True):
+            logger.info("  {: <28} {: >7.2f}s ({} modules imported)", name, duration, modules_imported)
+
+
+startup_profiler: StartupProfiler = StartupProfiler()
@@ -1,7 +1,9 @@
 import asyncio
+import io
 import json
 import os
 import time
+from typing import Optional
 
 import ujson
 from aiocache import cached
@@ -25,17 +27,17 @@ def generate_path(path):
     return os.path.join(os.path.join(mapadroid.MAD_ROOT, path))
 
 
-async def image_resize(image, savepath, width=None, height=None):
+async def image_resize(image, savepath, width=None, height=None, data: Optional[bytes] = None):
     loop = asyncio.get_running_loop()
     # with concurrent.futures.ThreadPoolExecutor() as pool:
     await loop.run_in_executor(
-        None, _process_image_resize, image, savepath, width)
+        None, _process_image_resize, image, savepath, width, data)
 
 
-def _process_image_resize(image, savepath, width):
+def _process_image_resize(image, savepath, width, data: Optional[bytes] = None):
     basewidth = width
     filename = os.path.basename(image)
-    with Image.open(image) as img:
+    with Image.open(io.BytesIO(data) if data is not None else image) as img:
         wpercent = (basewidth / float(img.size[0]))
         hsize = int((float(img.size[1]) * float(wpercent)))
         img = img.resize((basewidth, hsize), Image.LANCZOS)
@@ -1,6 +1,13 @@
 import math
+from typing import Optional, Tuple
 
 from mapadroid.utils.collections import Location
+from mapadroid.utils.LazyImport import lazy_import
+
+np = lazy_import("numpy")
+
+# approximate radius of earth in km
+EARTH_RADIUS_KM: float = 6373.0
 
 
 def get_lat_lng_offsets_by_distance(distance):
@@ -12,8 +19,8 @@ def get_lat_lng_offsets_by_distance(distance):
 
 
 def get_distance_of_two_points_in_meters(start_lat, start_lon, dest_lat, dest_lon):
-    # approximate radius of earth in km
-    earth_radius = 6373.0
+    # Scalar variant of get_distances_in_meters, faster than numpy for single pairs
+    earth_radius = EARTH_RADIUS_KM
 
     lat1 = math.radians(start_lat)
     lon1 = math.radians(start_lon)
@@ -31,6 +38,59 @@ def get_distance_of_two_points_in_meters(start_lat, start_lon, dest_lat, dest_lo
     return distance * 1000
 
 
+def get_distances_in_meters(start_lat: float, start_lon: float, dest_lats, dest_lons):
+    """
+    Batch variant of get_distance_of_two_points_in_meters
+    Args:
+        start_lat:
+        start_lon:
+        dest_lats: Sequence or numpy array of latitudes
+        dest_lons: Sequence or numpy array of longitudes, same length as dest_lats
+
+    Returns: numpy array of the distances of the start to each destination
+    """
+    return _haversine_in_meters(np.radians(float(start_lat)), np.radians(float(start_lon)),
+                                np.radians(np.asarray(dest_lats, dtype=float)),
+                                np.radians(np.asarray(dest_lons, dtype=float)))
+
+
+def get_distance_matrix_in_meters(lats, lons, other_lats=None, other_lons=None):
+    """
+    Args:
+        lats:
+        lons:
+        other_lats: The latitudes of the columns, the coords given by lats and lons if None
+        other_lons:
+
+    Returns: numpy array (len(lats) x len(other_lats)) of the distances between each pair of coords
+    """
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    if other_lats is None or other_lons is None:
+        other_lats, other_lons = lats, lons
+    else:
+        other_lats = np.radians(np.asarray(other_lats, dtype=float))
+        other_lons = np.radians(np.asarray(other_lons, dtype=float))
+    return _haversine_in_meters(lats[:, np.newaxis], lons[:, np.newaxis],
+                                other_lats[np.newaxis, :], other_lons[np.newaxis, :])
+
+
+def get_nearest(start_lat: float, start_lon: float, dest_lats, dest_lons) -> Optional[Tuple[int, float]]:
+    """
+    Returns: The index of the destination nearest to the start and its distance, None if there are no destinations
+    """
+    if len(dest_lats) == 0:
+        return None
+    distances = get_distances_in_meters(start_lat, start_lon, dest_lats, dest_lons)
+    nearest: int = int(np.argmin(distances))
+    return nearest, float(distances[nearest])
+
+
+def _haversine_in_meters(lat1, lon1, lat2, lon2):
+    angle = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * np.arctan2(np.sqrt(angle), np.sqrt(1 - angle)) * EARTH_RADIUS_KM * 1000
+
+
 def get_middle_of_coord_list(list_of_coords) -> Location:
     if len(list_of_coords) == 1:
         return list_of_coords[0]
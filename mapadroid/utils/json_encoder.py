@@ -21,6 +21,13 @@ def mad_json_dumps_sync(data):
     return json.dumps(data, cls=MADEncoder)
 
 
+def mad_serialize_default(obj):
+    """
+    Fallback of orjson/msgpack for types not supported natively. Serializes like MADEncoder does.
+    """
+    return _mad_encoder.default(obj)
+
+
 class MADEncoder(json.JSONEncoder):
     def apk_encode(self, object_to_encode):
         if isinstance(object_to_encode, MADapks) or isinstance(object_to_encode, MADPackages):
@@ -65,3 +72,6 @@ class MADEncoder(json.JSONEncoder):
         elif obj is None:
             return None
         return json.JSONEncoder.default(self, obj)
+
+
+_mad_encoder: MADEncoder = MADEncoder()
@@ -1,3 +1,4 @@
+import copy
 import logging
 import os
 import sys
@@ -7,6 +8,9 @@ from typing import Optional
 
 from loguru import logger
 
+from mapadroid.utils.BatchedLogSink import (BatchedLogSink, LogRingBuffer,
+                                            LogSampler, log_ring_buffer)
+
 
 class LoggerEnums(Enum):
     unknown = "unknown"
@@ -46,6 +50,7 @@ logging_to_aiohttp_log = [LoggerEnums.aiohttp_access.value,
                           LoggerEnums.aiohttp_server.value,
                           LoggerEnums.aiohttp_client.value]
 logging_to_database_log = [LoggerEnums.sqlalchemy]
+_log_sampler: LogSampler = LogSampler()
 
 
 # ==================================
@@ -79,6 +84,9 @@ def init_logging(args, print_info: bool = True):
             log_format_c[log_format_c.index(log_fmt_mod_c)] = log_fmt_mod_fs
     fs_log_format = ' '.join(log_format_fs)
     log_format_console = ' '.join(log_format_c)
+    # Stops the writers of the previous configuration (writing the messages still queued) before creating the
+    # independent loggers writing the files
+    logger.remove()
     logconfig = {
         # "levels": [
         #   {"name": "DEBUG2", "no": 9, "color": "<blue>"},
@@ -89,21 +97,26 @@ def init_logging(args, print_info: bool = True):
         # ],
         "handlers": [
             {
-                "sink": sys.stdout,
+                "sink": BatchedLogSink.for_stream(sys.stdout),
                 "format": log_format_console,
                 "colorize": colorize,
                 "level": log_level_val,
-                "enqueue": True,
                 "filter": filter_errors
             },
             {
-                "sink": sys.stderr,
+                "sink": BatchedLogSink.for_stream(sys.stderr),
                 "format": log_format_console,
                 "colorize": colorize,
                 "level": "ERROR",
                 "diagnose": log_trace,
-                "backtrace": True,
-                "enqueue": True
+                "backtrace": True
+            },
+            {
+                "sink": log_ring_buffer,
+                "format": "{message}",
+                "colorize": False,
+                "level": min(log_level_val, log_file_level),
+                "filter": filter_internal
             }
         ],
         "extra": {"name": "Unknown", "identifier": ""},
@@ -116,10 +129,7 @@ def init_logging(args, print_info: bool = True):
             "level": log_file_level,
             "backtrace": True,
             "diagnose": log_file_trace,
-            "enqueue": True,
-            "encoding": "UTF-8",
-            "filter": lambda record: False if record["extra"]["name"]
-                                              in logging_to_aiohttp_log + logging_to_database_log else True
+            "filter": filter_internal
         },
             {
                 "sink": os.path.join(args.log_path, base_name + "_database.log"),
@@ -127,8 +137,6 @@ def init_logging(args, print_info: bool = True):
                 "level": log_file_level,
                 "backtrace": True,
                 "diagnose": log_file_trace,
-                "enqueue": True,
-                "encoding": "UTF-8",
                 "filter": lambda record: True if record["extra"]["name"] in logging_to_database_log else False
             },
             {
@@ -137,16 +145,13 @@ def init_logging(args, print_info: bool = True):
                 "level": log_file_level,
                 "backtrace": True,
                 "diagnose": log_file_trace,
-                "enqueue": True,
-                "encoding": "UTF-8",
                 "filter": lambda record: True if record["extra"]["name"] in logging_to_aiohttp_log else False
             }
         ]
         log_file_retention = str(args.log_file_retention) + " days"
         for log in file_logs:
-            log["retention"] = log_file_retention
-            log["rotation"] = str(args.log_file_rotation)
-            log["compression"] = "zip"
+            log["sink"] = get_batched_file_sink(log["sink"], str(args.log_file_rotation), log_file_retention)
+            log["colorize"] = False
         logconfig["handlers"].extend(file_logs)
     try:
         if print_info:
@@ -163,6 +168,31 @@ def init_logging(args, print_info: bool = True):
         logger.info("Setting log level to {} ({}).", str(log_level_val), log_level_label)
 
 
+def get_batched_file_sink(path: str, rotation: str, retention: str) -> BatchedLogSink:
+    """ Batches are written by an independent logger (without any handlers but the file) to keep the rotation,
+        retention and compression of loguru's file sinks
+    """
+    file_logger = copy.deepcopy(logger)
+    file_logger.add(path, format="{message}", level=0, rotation=rotation, retention=retention, compression="zip",
+                    encoding="UTF-8")
+    return BatchedLogSink(lambda text: file_logger.opt(raw=True).log(0, text), on_stop=file_logger.remove)
+
+
+def get_log_ring_buffer() -> LogRingBuffer:
+    return log_ring_buffer
+
+
+def log_sampled(key: str, interval: float) -> Optional[int]:
+    """ Rate limits high-frequency log statements, use like
+        suppressed = log_sampled("some_key", 10)
+        if suppressed is not None:
+            logger.debug("Something happened ({} times since)", suppressed)
+
+        Returns None if the statement is to be skipped, the amount of statements skipped since the last one otherwise
+    """
+    return _log_sampler.sample(key, interval)
+
+
 def log_level(arg_log_level, arg_debug_level):
     # List has an order, dict doesn't. We need the guaranteed order to
     # determine debug level based on arg_debug_level.
@@ -258,6 +288,10 @@ def filter_errors(record):
     return record["level"] != "ERROR"
 
 
+def filter_internal(record):
+    return record["extra"]["name"] not in logging_to_aiohttp_log + logging_to_database_log
+
+
 # ==================================
 # ========== Logger Inits ==========
 # ==================================
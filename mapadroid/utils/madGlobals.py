@@ -92,6 +92,11 @@ class MonSeenTypes(IntEnum):
     nearby_cell = 5
 
 
+class StatsRollupPeriod(IntEnum):
+    HOURLY = 0
+    DAILY = 1
+
+
 class PositionType(IntEnum):
     NORMAL = 0
     PRIOQ = 1
@@ -0,0 +1,297 @@
+"""
+Counters, gauges and histograms of the process, exposed in the OpenMetrics text format by the LocalMetricsServer.
+Metrics are defined once at module level next to the code updating them, e.g.
+
+    SUBMIT_SECONDS = Histogram("mad_example_seconds", "Seconds spent submitting", ["method"])
+
+    @SUBMIT_SECONDS.labels("mons").time()
+    async def mons(...):
+
+    with SUBMIT_SECONDS.labels("stops").time():
+        ...
+
+Updates do not take any lock: counters and histograms are counted in a shard per thread which are summed up when
+collected. Gauges hold a single value, the last value set wins.
+"""
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+CONTENT_TYPE: str = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Upper bounds (seconds) of the buckets of histograms, a bucket for everything above is added
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ChildType = TypeVar("ChildType")
+
+
+class _ShardedValues:
+    """
+    Values updated by one thread each. Appending to the list of shards is atomic, the values of the shards are only
+    ever updated by the thread owning the shard.
+    """
+
+    def __init__(self, size: int):
+        self.__size: int = size
+        self.__local: threading.local = threading.local()
+        self.__shards: List[List[float]] = []
+
+    def get(self) -> List[float]:
+        try:
+            return self.__local.values
+        except AttributeError:
+            values: List[float] = [0.0] * self.__size
+            self.__local.values = values
+            self.__shards.append(values)
+            return values
+
+    def sum(self) -> List[float]:
+        totals: List[float] = [0.0] * self.__size
+        for values in list(self.__shards):
+            for position, value in enumerate(values):
+                totals[position] += value
+        return totals
+
+
+class Timer:
+    """
+    Observes the seconds spent within a with block or within calls of the function decorated (sync or async).
+    """
+
+    def __init__(self, observe: Callable[[float], None]):
+        self.__observe: Callable[[float], None] = observe
+        self.__start: float = 0
+
+    def __enter__(self) -> "Timer":
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__observe(time.perf_counter() - self.__start)
+
+    def __call__(self, function: Callable) -> Callable:
+        observe: Callable[[float], None] = self.__observe
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def timed_coroutine(*args, **kwargs):
+                start: float = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - start)
+            return timed_coroutine
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start: float = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - start)
+        return timed
+
+
+class CounterChild:
+    def __init__(self):
+        self.__values: _ShardedValues = _ShardedValues(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self.__values.get()[0] += amount
+
+    def get(self) -> float:
+        return self.__values.sum()[0]
+
+
+class GaugeChild:
+    def __init__(self):
+        self.__value: float = 0
+        self.__function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.__value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Only to be called from a single thread (i.e. the event loop)
+        """
+        self.__value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.__value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        The value is taken from the function given whenever collected
+        """
+        self.__function = function
+
+    def get(self) -> float:
+        return self.__function() if self.__function else self.__value
+
+
+class HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.__buckets: Tuple[float, ...] = buckets
+        # One count per bucket, one for the values above the last bucket and the sum of the values observed
+        self.__values: _ShardedValues = _ShardedValues(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        values: List[float] = self.__values.get()
+        values[bisect.bisect_left(self.__buckets, value)] += 1
+        values[-1] += value
+
+    def time(self) -> Timer:
+        return Timer(self.observe)
+
+    def get_counts(self) -> List[int]:
+        """
+        Returns: The count of each bucket (not cumulative) and the count of the values above the last bucket
+        """
+        return [int(count) for count in self.__values.sum()[:-1]]
+
+    def get_sum(self) -> float:
+        return self.__values.sum()[-1]
+
+
+class _Metric(Generic[ChildType]):
+    TYPE: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional["MetricsRegistry"] = None):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self.__children: Dict[Tuple[str, ...], ChildType] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *labelvalues) -> ChildType:
+        key: Tuple[str, ...] = tuple(str(value) for value in labelvalues)
+        child: Optional[ChildType] = self.__children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError("Metric {} expects the labels {}".format(self.name, self.labelnames))
+            # setdefault is atomic, threads adding the same child get the same child
+            child = self.__children.setdefault(key, self._new_child())
+        return child
+
+    def get_children(self) -> Dict[Tuple[str, ...], ChildType]:
+        return dict(self.__children)
+
+    def _new_child(self) -> ChildType:
+        raise NotImplementedError
+
+    def _collect_child(self, labels: str, child: ChildType) -> List[str]:
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        lines: List[str] = ["# TYPE {} {}".format(self.name, self.TYPE),
+                            "# HELP {} {}".format(self.name, _escape(self.documentation))]
+        for labelvalues, child in sorted(self.get_children().items()):
+            lines.extend(self._collect_child(_format_labels(zip(self.labelnames, labelvalues)), child))
+        return lines
+
+
+class Counter(_Metric[CounterChild]):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _collect_child(self, labels: str, child: CounterChild) -> List[str]:
+        return ["{}_total{} {}".format(self.name, labels, _format_value(child.get()))]
+
+
+class Gauge(_Metric[GaugeChild]):
+    TYPE = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _collect_child(self, labels: str, child: GaugeChild) -> List[str]:
+        return ["{}{} {}".format(self.name, labels, _format_value(child.get()))]
+
+
+class Histogram(_Metric[HistogramChild]):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["MetricsRegistry"] = None):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> Timer:
+        return self.labels().time()
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _collect_child(self, labels: str, child: HistogramChild) -> List[str]:
+        lines: List[str] = []
+        counts: List[int] = child.get_counts()
+        cumulative: int = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels: str = _format_labels([("le", "+Inf" if bound == math.inf else repr(float(bound)))],
+                                                labels)
+            lines.append("{}_bucket{} {}".format(self.name, bucket_labels, cumulative))
+        lines.append("{}_count{} {}".format(self.name, labels, cumulative))
+        lines.append("{}_sum{} {}".format(self.name, labels, _format_value(child.get_sum())))
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.__metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self.__metrics:
+            raise ValueError("Metric {} has been registered already".format(metric.name))
+        self.__metrics[metric.name] = metric
+
+    def generate(self) -> str:
+        """
+        Returns: All metrics registered in the OpenMetrics text format
+        """
+        lines: List[str] = []
+        for metric in list(self.__metrics.values()):
+            lines.extend(metric.collect())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+
+
+def _format_labels(labels, existing: str = "") -> str:
+    formatted: str = ",".join('{}="{}"'.format(name, _escape(value)) for name, value in labels)
+    if existing:
+        # Appended to labels formatted already, i.e. {a="b"} and le="1.0" to {a="b",le="1.0"}
+        formatted = existing[1:-1] + "," + formatted if formatted else existing[1:-1]
+    return "{" + formatted + "}" if formatted else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    elif value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+REGISTRY: MetricsRegistry = MetricsRegistry()
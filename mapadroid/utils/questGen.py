@@ -1,10 +1,11 @@
 import gettext
 import json
 import re
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from mapadroid.db.model import Pokestop, TrsQuest
 from mapadroid.utils.gamemechanicutil import form_mapper
+from mapadroid.utils.json_encoder import MADEncoder
 from mapadroid.utils.language import i8ln, open_json_file
 from mapadroid.utils.madGlobals import MadGlobals
 from mapadroid.utils.RestHelper import RestApiResult, RestHelper
@@ -28,6 +29,9 @@ class QuestGen:
         self.apk_locale: Dict = {}
         self.remote_locale: Dict = {}
         self.locale_resources: Optional[Dict] = None
+        # Quests of generate_quest per (GUID, layer) as [state of the quest and stop they were generated of, quest,
+        # quest serialized (once requested)]. Quests are generated in the single language installed.
+        self.__generated_quests: Dict[Tuple[str, int], List] = {}
 
         self.__quest_rewards: Dict[int, str] = {
             1: _("Experience"),
@@ -168,6 +172,32 @@ class QuestGen:
         })
         return quest_raw
 
+    async def get_generated_quest(self, stop: Pokestop, quest: TrsQuest) -> Dict:
+        """
+        Returns: The quest as generated by generate_quest (not to be modified). The quest is only generated again once
+        the quest has been updated (new timestamp) or details of the stop changed.
+        """
+        return (await self.__get_cached_quest(stop, quest))[1]
+
+    async def get_rendered_quest(self, stop: Pokestop, quest: TrsQuest) -> str:
+        """
+        Returns: The quest of get_generated_quest serialized to JSON
+        """
+        cached: List = await self.__get_cached_quest(stop, quest)
+        if cached[2] is None:
+            cached[2] = json.dumps(cached[1], indent=None, cls=MADEncoder)
+        return cached[2]
+
+    async def __get_cached_quest(self, stop: Pokestop, quest: TrsQuest) -> List:
+        key: Tuple[str, int] = (quest.GUID, quest.layer)
+        state: Tuple = (quest.quest_timestamp, stop.name, stop.image, stop.latitude, stop.longitude,
+                        stop.is_ar_scan_eligible)
+        cached: Optional[List] = self.__generated_quests.get(key)
+        if cached is None or cached[0] != state:
+            cached = [state, await self.generate_quest(stop, quest), None]
+            self.__generated_quests[key] = cached
+        return cached
+
     def questreward(self, quest_reward_type: int) -> str:
         return self.__quest_rewards.get(quest_reward_type, "nothing")
 
@@ -505,7 +535,9 @@ class QuestGen:
             if int(target) == int(1):
                 text = _('Battle a Challenger')
 
-        quest_templates = await open_json_file('quest_templates')
+        quest_templates = self.__quest_templates
+        if quest_templates is None:
+            quest_templates = await open_json_file('quest_templates')
         if quest_template is not None and quest_template in quest_templates:
             text = _((quest_templates)[quest_template])
 
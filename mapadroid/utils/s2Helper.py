@@ -1,18 +1,22 @@
 import math
-import multiprocessing
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import gpxdata
+import numpy as np
 import s2sphere
 
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
 from mapadroid.utils.collections import Location
-from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
-                                 get_middle_of_coord_list)
+from mapadroid.utils.geo import get_middle_of_coord_list
 from mapadroid.utils.logging import LoggerEnums, get_logger
 
 logger = get_logger(LoggerEnums.utils)
 
+EARTH_RADIUS_METERS: float = 6373000
+# Bits of i and j (the position of the leaf cell within the face) mapped to the position on the Hilbert curve per step
+_LOOKUP_BITS: int = s2sphere.sphere.LOOKUP_BITS
+_MAX_SIZE: int = 1 << s2sphere.CellId.MAX_LEVEL
+
 
 class S2Helper:
     @staticmethod
@@ -27,6 +31,60 @@ class S2Helper:
         # Travers up to the parent ID and return this
         return cid.parent(level).id()
 
+    _lookup_pos: Optional[np.ndarray] = None
+
+    @staticmethod
+    def lat_lng_to_cell_ids(lats, lngs, level: int = 10) -> np.ndarray:
+        """
+        Batch variant of lat_lng_to_cell_id computing the cell IDs of all coords at once (same algorithm as
+        s2sphere.CellId.from_lat_lng)
+        Returns: numpy array (uint64) of the cell IDs
+        """
+        if S2Helper._lookup_pos is None:
+            S2Helper._lookup_pos = np.array(s2sphere.sphere.LOOKUP_POS, dtype=np.int64)
+        lats = np.radians(np.asarray(lats, dtype=float))
+        lngs = np.radians(np.asarray(lngs, dtype=float))
+        cos_lat = np.cos(lats)
+        points = np.stack((np.cos(lngs) * cos_lat, np.sin(lngs) * cos_lat, np.sin(lats)))
+        # The face is given by the axis of the largest component, ties going to the latter axis
+        abs_points = np.abs(points)
+        faces = np.where(abs_points[0] > abs_points[1],
+                         np.where(abs_points[0] > abs_points[2], 0, 2),
+                         np.where(abs_points[1] > abs_points[2], 1, 2))
+        negative = np.take_along_axis(points, faces[np.newaxis, :], axis=0)[0] < 0
+        faces = faces + 3 * negative
+        x, y, z = points
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = np.select([faces == 0, faces == 1, faces == 2, faces == 3, faces == 4],
+                          [y / x, -x / y, -x / z, z / x, z / y], -y / z)
+            v = np.select([faces == 0, faces == 1, faces == 2, faces == 3, faces == 4],
+                          [z / x, z / y, -y / z, y / x, -x / y], -x / z)
+        i = S2Helper._st_to_ij(S2Helper._uv_to_st(u))
+        j = S2Helper._st_to_ij(S2Helper._uv_to_st(v))
+
+        mask: int = (1 << _LOOKUP_BITS) - 1
+        cell_ids = faces.astype(np.int64) << (s2sphere.CellId.POS_BITS - 1)
+        bits = faces.astype(np.int64) & s2sphere.sphere.SWAP_MASK
+        for k in range(7, -1, -1):
+            bits = bits + (((i >> (k * _LOOKUP_BITS)) & mask) << (_LOOKUP_BITS + 2))
+            bits = bits + (((j >> (k * _LOOKUP_BITS)) & mask) << 2)
+            bits = S2Helper._lookup_pos[bits]
+            cell_ids |= (bits >> 2) << (k * 2 * _LOOKUP_BITS)
+            bits &= s2sphere.sphere.SWAP_MASK | s2sphere.sphere.INVERT_MASK
+        cell_ids = cell_ids.astype(np.uint64) * np.uint64(2) + np.uint64(1)
+        # Traverse up to the parent of the level given
+        lsb = np.uint64(1 << (2 * (s2sphere.CellId.MAX_LEVEL - level)))
+        return (cell_ids & ~(lsb - np.uint64(1))) | lsb
+
+    @staticmethod
+    def _uv_to_st(u: np.ndarray) -> np.ndarray:
+        # Quadratic projection as used by s2sphere
+        return np.where(u >= 0, 0.5 * np.sqrt(1 + 3 * np.abs(u)), 1 - 0.5 * np.sqrt(1 + 3 * np.abs(u)))
+
+    @staticmethod
+    def _st_to_ij(s: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor(_MAX_SIZE * s), 0, _MAX_SIZE - 1).astype(np.int64)
+
     # RM stores lat, long as well...
     # returns tuple  <lat, lng>
     @staticmethod
@@ -49,67 +107,58 @@ class S2Helper:
         cell = s2sphere.CellId(id_=int(cell_id)).to_lat_lng()
         return s2sphere.math.degrees(cell.lat().radians), s2sphere.math.degrees(cell.lng().radians), 0
 
-    @staticmethod
-    def _generate_star_locs(center, distance, ring):
-        results = []
-        for i in range(0, 6):
-            # Star_locs will contain the locations of the 6 vertices of
-            # the current ring (90,150,210,270,330 and 30 degrees from
-            # origin) to form a star
-            star_loc = S2Helper.get_new_coords(center, distance * ring,
-                                               90 + 60 * i)
-            for index in range(0, ring):
-                # Then from each point on the star, create locations
-                # towards the next point of star along the edge of the
-                # current ring
-                loc = S2Helper.get_new_coords(star_loc, distance * index, 210 + 60 * i)
-                results.append(loc)
-        return results
-
     # the following stuff is drafts for further consideration
     @staticmethod
-    def generate_locations(distance: float, geofence_helper: GeofenceHelper):
-        south, east, north, west = geofence_helper.get_polygon_from_fence()
-
-        corners = [
-            Location(south, east),
-            Location(south, west),
-            Location(north, east),
-            Location(north, west)
-        ]
-        # get the center
-        center = get_middle_of_coord_list(corners)
-
-        # get the farthest to the center...
-        farthest_dist = 0
-        for corner in corners:
-            dist_temp = get_distance_of_two_points_in_meters(
-                center.lat, center.lng, corner.lat, corner.lng)
-            if dist_temp > farthest_dist:
-                farthest_dist = dist_temp
-
-        # calculate step_limit, round up to reduce risk of losing stuff
-        step_limit = math.ceil(farthest_dist / distance)
-
-        # This will loop thorugh all the rings in the hex from the centre
-        # moving outwards
-        logger.info("Calculating positions for init scan")
-        num_cores = multiprocessing.cpu_count()
-        with multiprocessing.get_context("spawn").Pool(processes=num_cores) as pool:
-            temp = [pool.apply(S2Helper._generate_star_locs, args=(
-                center, distance, i)) for i in range(1, step_limit)]
+    def generate_locations(distance: float, geofence_helper: GeofenceHelper) -> List[Location]:
+        """
+        Covers the geofence with a hexagonal lattice (rows running east-west) of locations which are the distance
+        given (meters) apart from their neighbours.
+        Returns: The locations inside the geofence, ordered row by row from north to south alternating direction
+        """
+        south, west, north, east = geofence_helper.get_polygon_from_fence()
+        if south > north or west > east:
+            logger.error('No geofence to calculate positions for init scan in. Aborting.')
+            return []
+        # The lattice is anchored at the middle of the fence
+        center = get_middle_of_coord_list([Location(south, west), Location(north, east)])
 
-        results = [item for sublist in temp for item in sublist]
-        results.append(Location(center.lat, center.lng))
+        logger.info("Calculating positions for init scan")
+        meters_per_degree: float = math.radians(1) * EARTH_RADIUS_METERS
+        row_step: float = distance * math.sqrt(3) / 2 / meters_per_degree
+        row_indices = np.arange(math.floor((south - center.lat) / row_step),
+                                math.ceil((north - center.lat) / row_step) + 1)
+        row_lats = center.lat + row_indices * row_step
+        valid_rows = (row_lats >= -90) & (row_lats <= 90)
+        row_indices, row_lats = row_indices[valid_rows], row_lats[valid_rows]
+        lats: List = []
+        lngs: List = []
+        rows: List = []
+        for row_index, row_lat in zip(row_indices, row_lats):
+            # Every other row is shifted by half the distance, the step is kept in meters along the row
+            column_step: float = distance / (meters_per_degree * max(math.cos(math.radians(row_lat)), 1e-6))
+            shift: float = 0.5 if row_index % 2 else 0
+            columns = np.arange(math.floor((west - center.lng) / column_step - shift),
+                                math.ceil((east - center.lng) / column_step - shift) + 1)
+            row_lngs = center.lng + (columns + shift) * column_step
+            row_lngs = row_lngs[(row_lngs >= west) & (row_lngs <= east)]
+            lats.append(np.full(len(row_lngs), row_lat))
+            lngs.append(row_lngs)
+            rows.append(np.full(len(row_lngs), row_index))
+        lat_array = np.concatenate(lats) if lats else np.empty(0)
+        lng_array = np.concatenate(lngs) if lngs else np.empty(0)
+        row_array = np.concatenate(rows) if rows else np.empty(0, dtype=int)
 
         logger.info("Filtering positions for init scan")
         # Geofence results.
         if geofence_helper is not None and geofence_helper.is_enabled():
-            results = geofence_helper.get_geofenced_coordinates(results)
-            if not results:
+            inside = np.array(geofence_helper.are_coords_inside_include_geofence(
+                np.column_stack((lat_array, lng_array))), dtype=bool)
+            lat_array, lng_array, row_array = lat_array[inside], lng_array[inside], row_array[inside]
+            if len(lat_array) == 0:
                 logger.error('No cells regarded as valid for desired scan area. Check your provided geofences. '
                              'Aborting.')
-        return results
+                return []
+        return S2Helper._order_rows(lat_array, lng_array, row_array)
 
     @staticmethod
     def get_most_north(location_list):
@@ -122,49 +171,44 @@ class S2Helper:
         return most_north_and_east
 
     @staticmethod
-    def order_location_list_rows(location_list: List[Location]):
-        if location_list is None or len(location_list) == 0:
-            return []
-
-        new_list = []
-        flip = False
-        while len(location_list) > 0:
-            next_row = S2Helper.get_most_northern_row(location_list)
-            next_row = S2Helper.sort_row_from_west(next_row)
-            if flip:
-                next_row.reverse()
-                flip = False
-            else:
-                flip = True
-            for loc in next_row:
-                new_list.append(loc)
-            location_list = S2Helper.delete_row_from_list(
-                location_list, next_row)
-        return new_list
-
-    @staticmethod
-    def get_most_northern_row(location_list: List[Location]):
+    def order_location_list_rows(location_list: List[Location]) -> List[Location]:
+        """
+        Orders the locations row by row from north to south, alternating between west to east and east to west.
+        Locations within 1e-4 degrees of latitude of the northernmost location of a row are part of the row.
+        """
         if location_list is None or len(location_list) == 0:
             return []
-
-        most_north = S2Helper.get_most_north(location_list)
-        row = []
-        for location in location_list:
-            if most_north.lat - 1e-4 <= location.lat <= most_north.lat + 1e-4:
-                row.append(location)
-
-        return row
+        lats = np.array([location.lat for location in location_list], dtype=float)
+        lngs = np.array([location.lng for location in location_list], dtype=float)
+        by_lat = np.argsort(-lats, kind="stable")
+        rows = np.empty(len(location_list), dtype=int)
+        row: int = 0
+        row_north: float = lats[by_lat[0]]
+        for position in by_lat:
+            if lats[position] < row_north - 1e-4:
+                row += 1
+                row_north = lats[position]
+            rows[position] = row
+        # Rows are numbered from the south in _order_rows
+        order = S2Helper._get_row_order(lngs, -rows)
+        return [location_list[position] for position in order]
 
     @staticmethod
-    def delete_row_from_list(location_list, row):
-        if row is None or len(row) == 0:
-            return location_list
-        elif location_list is None or len(location_list) == 0:
-            return []
+    def _order_rows(lats, lngs, rows) -> List[Location]:
+        order = S2Helper._get_row_order(lngs, rows)
+        return [Location(float(lat), float(lng)) for lat, lng in zip(lats[order], lngs[order])]
 
-        for loc in row:
-            location_list.remove(loc)
-        return location_list
+    @staticmethod
+    def _get_row_order(lngs, rows):
+        """
+        Returns: The indices of the locations ordered by row (northernmost row, i.e. highest number, first) and
+        alternately west to east and east to west within the rows
+        """
+        if len(rows) == 0:
+            return np.empty(0, dtype=int)
+        _, row_ranks = np.unique(-rows, return_inverse=True)
+        direction = np.where(row_ranks % 2 == 0, 1, -1)
+        return np.lexsort((lngs * direction, row_ranks))
 
     @staticmethod
     def sort_row_from_west(row):
@@ -196,3 +240,12 @@ class S2Helper:
         coverer.max_level = level
         cells = coverer.get_covering(region)
         return cells
+
+    @staticmethod
+    def get_cell_ids_from_circle(lat, lng, radius, level=15) -> np.ndarray:
+        """
+        Returns: numpy array (uint64) of the IDs of the cells covering the circle. A coord is inside the covering if
+        its cell ID of the same level (see lat_lng_to_cell_ids) is, e.g. np.isin(cell_ids_of_coords, covering)
+        """
+        return np.array([cell.id() for cell in S2Helper.get_s2cells_from_circle(lat, lng, radius, level)],
+                        dtype=np.uint64)
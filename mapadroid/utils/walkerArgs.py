@@ -59,6 +59,9 @@ def parse_args():
                         action=argparse.BooleanOptionalAction,
                         help='Configure whether the settings_pogoauth entries (PTC or google accounts) should be '
                              'fetched only for the active instance or globally. Default: False')
+    parser.add_argument('-apri', '--account_pool_resync_interval', type=int, default=60,
+                        help='Accounts are kept in memory for assignments. Interval in seconds in which the accounts '
+                             'are reloaded from the DB to pick up changes done in MADmin. Default: 60')
 
     # DB Cleanup
     parser.add_argument('-ci', '--cleanup_interval', type=int, default=300,
@@ -72,6 +75,19 @@ def parse_args():
     parser.add_argument('--delete_incidents_n_hours', type=int, default=None,
                         help='Remove incidents from DB N hours after expiration. Only use positive values. '
                              'None if no cleanup is to be run. Default: None')
+    parser.add_argument('--db_cleanup_partitioning', action='store_true', default=False,
+                        help='Partition stats tables by day and drop expired partitions instead of deleting rows. '
+                             'Other tables are cleaned up in chunks (at most delete_mons_limit rows of mons and '
+                             'incidents per run) without OPTIMIZE TABLE. Partitioning a table for the first time '
+                             'rebuilds it once. Default: False')
+    parser.add_argument('--db_cleanup_chunk_size', type=int, default=1000,
+                        help='Number of rows deleted per transaction with --db_cleanup_partitioning. Default: 1000')
+    parser.add_argument('--db_cleanup_chunk_pause', type=float, default=0.1,
+                        help='Seconds to wait between chunks of deletes with --db_cleanup_partitioning. '
+                             'Default: 0.1')
+    parser.add_argument('--db_cleanup_partitions_ahead', type=int, default=3,
+                        help='Number of daily partitions to be created in advance with --db_cleanup_partitioning. '
+                             'Default: 3')
 
     # Websocket Settings (RGC receiver)
     parser.add_argument('-wsip', '--ws_ip', required=False, default="0.0.0.0", type=str,
@@ -201,6 +217,9 @@ def parse_args():
     # Path Settings
     parser.add_argument('-tmp', '--temp_path', default='temp',
                         help='Temp Folder for OCR Scanning. Default: temp')
+    parser.add_argument('--save_worker_screenshots', action='store_true', default=False,
+                        help='Store every screenshot taken by workers in the temp folder. Screenshots are analyzed '
+                             'in memory, only error screens are stored by default. Default: False')
     parser.add_argument('-upload', '--upload_path', default=os.path.join(mapadroid.MAD_ROOT, 'upload'),
                         help='Path for uploaded Files via madmin and for device installation. Default: '
                              '/absolute/path/to/upload')
@@ -266,6 +285,16 @@ def parse_args():
     parser.add_argument('-trace', '--trace', action='store_true', default=False,
                         help='Enable tracing of system stats, e.g. tracemalloc. '
                              'ONLY TO BE USED FOR DEBUGGING ISSUES. (Default: False)')
+    parser.add_argument('-dlm', '--disable_event_loop_monitor', action='store_true', default=False,
+                        help='Disable measuring the lag of the event loop and sampling the code blocking it '
+                             '(Default: False)')
+    parser.add_argument('-elst', '--event_loop_slow_threshold', default=0.1, type=float,
+                        help='Seconds the event loop may be blocked before stack samples of the code blocking it are '
+                             'taken (Default: 0.1)')
+    parser.add_argument('-lmp', '--local_metrics_port', default=0, type=int,
+                        help='Base port to serve the metrics of the processes on (127.0.0.1 only). Each process adds '
+                             'its offset: MAD/core +0/+1, MITM receiver +2, MITM mapper +3, stats handler +4. '
+                             '(Default: 0, disabled)')
 
     # Game Stats
     parser.add_argument('-ggs', '--game_stats', action='store_true', default=False,
@@ -276,6 +305,9 @@ def parse_args():
                         help='Generate mon seen stats (only with --game_stats)')
     parser.add_argument('-gsst', '--game_stats_save_time', default=300, type=int,
                         help='Number of seconds until worker information is saved to database')
+    parser.add_argument('-gssc', '--game_stats_submit_chunk_size', default=1000, type=int,
+                        help='Maximum number of rows written per statement when saving stats to database '
+                             '(Default: 1000)')
     parser.add_argument('-rds', '--raw_delete_shiny', default=0, type=int,
                         help='Delete shiny mon in raw stats older then x days (0 =  Disable (Default))')
 
@@ -306,7 +338,18 @@ def parse_args():
     parser.add_argument('-whmps', '--webhook_max_payload_size', default=0, type=int,
                         help='Split up the payload into chunks and send multiple requests. Default: 0 (unlimited)')
     parser.add_argument('-whwi', '--webhook_worker_interval', default=10, type=int,
-                        help='Send webhook every X seconds (Default: 10 [seconds])')
+                        help='Scan the DB for changes to send every X seconds if the change stream of the data ingest '
+                             'cannot be read (Default: 10 [seconds])')
+    parser.add_argument('-whc', '--webhook_concurrency', default=2, type=int,
+                        help='Requests sent to each webhook URL concurrently (Default: 2)')
+    parser.add_argument('-whmr', '--webhook_max_retries', default=3, type=int,
+                        help='Retries of a payload failing to be sent, with exponential backoff (Default: 3)')
+    parser.add_argument('-whqs', '--webhook_queue_size', default=100, type=int,
+                        help='Payloads queued per webhook URL at most, the oldest are dropped if a receiver can not '
+                             'keep up (Default: 100)')
+    parser.add_argument('-whri', '--webhook_recovery_interval', default=300, type=int,
+                        help='Changes are sent as soon as the data ingest publishes them. Scan the DB every X seconds '
+                             'for changes missed meanwhile (Default: 300 [seconds])')
 
     # Dynamic Rarity
     parser.add_argument('-rh', '--rarity_hours', type=int, default=72,
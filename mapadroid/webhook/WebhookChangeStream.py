@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.webhook)
+
+# Redis stream the data ingest publishes the IDs of the entities written to once committed. Every entry maps the
+# webhook types to the IDs changed (comma separated), e.g. {"raid": "gym_1,gym_2", "weather": "12345"}
+CHANGE_STREAM_KEY: str = "webhook_changes"
+# Approximate amount of entries kept in the stream, consumers only read the entries added since they started
+CHANGE_STREAM_MAXLEN: int = 10000
+# Entries read per call at most to keep the queries of the IDs changed reasonably sized
+CHANGE_STREAM_READ_COUNT: int = 100
+
+_SESSION_INFO_KEY: str = "webhook_changes"
+
+
+def record_change(session: AsyncSession, change_type: str, entity_id: Any) -> None:
+    """
+    Records the ID of an entity written within the session to be published by publish_changes once the session
+    has been committed. Changes of sessions rolled back or closed without publishing are dropped along with the session.
+    Args:
+        session:
+        change_type: The webhook type (pokemon, raid, quest, gym, pokestop, weather)
+        entity_id: The primary key the type is queried by
+    """
+    changes: Dict[str, Set[str]] = session.info.setdefault(_SESSION_INFO_KEY, {})
+    changes.setdefault(change_type, set()).add(str(entity_id))
+
+
+async def publish_changes(cache: Redis, session: AsyncSession) -> None:
+    """
+    Publishes the changes recorded in the session to the change stream. To be called after committing the session.
+    """
+    changes: Dict[str, Set[str]] = session.info.pop(_SESSION_INFO_KEY, None)
+    if not changes:
+        return
+    try:
+        await cache.xadd(CHANGE_STREAM_KEY, {change_type: ",".join(entity_ids)
+                                             for change_type, entity_ids in changes.items()},
+                         maxlen=CHANGE_STREAM_MAXLEN, approximate=True)
+    except Exception as e:
+        # Picked up by the recovery scans of the webhook worker
+        logger.warning("Failed publishing changes for webhooks: {}", e)
+
+
+class WebhookChangeConsumer:
+    """
+    Reads the changes published to the change stream since the consumer was created.
+    """
+
+    def __init__(self, cache: Redis):
+        self.__cache: Redis = cache
+        # The IDs of stream entries start with the time (ms) the entry was added at
+        self.__last_id: Union[str, bytes] = "{}-0".format(int(time.time() * 1000))
+        self.__available: bool = True
+
+    @property
+    def available(self) -> bool:
+        """
+        Returns: False if reading the stream failed last time
+        """
+        return self.__available
+
+    async def read(self, timeout: float) -> Dict[str, Set[str]]:
+        """
+        Waits up to the timeout given (seconds) for changes to be published.
+        Returns: The IDs changed per webhook type, empty if none were published or the stream cannot be read
+        """
+        try:
+            response: List[Tuple[bytes, List[Tuple[bytes, Dict[bytes, bytes]]]]] = await self.__cache.xread(
+                {CHANGE_STREAM_KEY: self.__last_id}, count=CHANGE_STREAM_READ_COUNT, block=max(1, int(timeout * 1000)))
+        except Exception as e:
+            if self.__available:
+                logger.warning("Failed reading the change stream of the data ingest, falling back to scanning the DB "
+                               "for changes: {}", e)
+            self.__available = False
+            await asyncio.sleep(timeout)
+            return {}
+        if not self.__available:
+            logger.info("Reading the change stream of the data ingest again")
+            self.__available = True
+        changes: Dict[str, Set[str]] = {}
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                self.__last_id = entry_id
+                for change_type, entity_ids in fields.items():
+                    if isinstance(change_type, bytes):
+                        change_type, entity_ids = change_type.decode(), entity_ids.decode()
+                    changes.setdefault(change_type, set()).update(entity_ids.split(","))
+        return changes
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from asyncio import Task
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import ClientError
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.webhook)
+
+# Seconds a single POST may take
+REQUEST_TIMEOUT: int = 5
+# Delay (seconds) before the first retry of a chunk, doubled per retry up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY: float = 1
+RETRY_MAX_DELAY: float = 30
+# Chunks failing in a row (after all retries) until the receiver is considered dead and no requests are sent for
+# CIRCUIT_BREAKER_COOLDOWN seconds. Chunks queued meanwhile are kept as long as the queue has room.
+CIRCUIT_BREAKER_FAILURES: int = 3
+CIRCUIT_BREAKER_COOLDOWN: float = 60
+
+
+class WebhookReceiver:
+    """
+    Delivers the payloads of a webhook URL. Chunks are queued per receiver and sent by the receiver's own senders
+    using a pooled session, a slow or dead receiver thus does not delay the others. Failed chunks are retried with
+    exponential backoff. If the queue is full, the oldest chunks are dropped.
+    """
+
+    def __init__(self, url: str, types: Optional[List[str]], max_payload_size: int, concurrency: int,
+                 max_retries: int, queue_size: int):
+        self.url: str = url
+        self.types: Optional[List[str]] = types
+        self.__max_payload_size: int = max_payload_size
+        self.__concurrency: int = max(1, concurrency)
+        self.__max_retries: int = max(0, max_retries)
+        self.__queue_size: int = max(1, queue_size)
+        # Serialized chunk, amount of messages per type, time queued
+        self.__queue: Deque[Tuple[bytes, Dict[str, int], float]] = deque()
+        self.__queued: asyncio.Condition = asyncio.Condition()
+        self.__session: Optional[aiohttp.ClientSession] = None
+        self.__senders: List[Task] = []
+        self.__failures_in_row: int = 0
+        self.__circuit_open_until: float = 0
+        # Metrics
+        self.__chunks_sent: int = 0
+        self.__chunks_failed: int = 0
+        self.__chunks_dropped: int = 0
+        self.__bytes_sent: int = 0
+        self.__last_lag: float = 0
+
+    def accepts(self, payload: Dict) -> bool:
+        return self.types is None or payload["type"] in self.types \
+            or payload["message"].get("seen_type", None) in self.types
+
+    async def start(self) -> None:
+        connector: aiohttp.TCPConnector = aiohttp.TCPConnector(limit=self.__concurrency)
+        self.__session = aiohttp.ClientSession(connector=connector,
+                                               timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                                               headers={"Content-Type": "application/json"})
+        loop = asyncio.get_running_loop()
+        self.__senders = [loop.create_task(self.__send_queued()) for _ in range(self.__concurrency)]
+
+    async def stop(self) -> None:
+        for sender in self.__senders:
+            sender.cancel()
+        await asyncio.gather(*self.__senders, return_exceptions=True)
+        self.__senders = []
+        if self.__session:
+            await self.__session.close()
+            self.__session = None
+
+    async def enqueue(self, payloads: List[Tuple[Dict, bytes]]) -> None:
+        """
+        Queues the payloads accepted by the receiver split into chunks of the max payload size
+        Args:
+            payloads: The payloads along with their JSON, shared by all receivers
+        """
+        accepted: List[Tuple[Dict, bytes]] = [(payload, serialized) for payload, serialized in payloads
+                                              if self.accepts(payload)]
+        if not accepted:
+            logger.debug2("Payload empty. Skip sending to: {} (Filter: {})", self.url, self.types)
+            return
+        size: int = self.__max_payload_size if self.__max_payload_size > 0 else len(accepted)
+        now: float = time.time()
+        async with self.__queued:
+            for start in range(0, len(accepted), size):
+                chunk: List[Tuple[Dict, bytes]] = accepted[start:start + size]
+                if len(self.__queue) >= self.__queue_size:
+                    self.__queue.popleft()
+                    self.__chunks_dropped += 1
+                self.__queue.append((b"[" + b",".join(serialized for _, serialized in chunk) + b"]",
+                                     Counter(payload["type"] for payload, _ in chunk), now))
+            self.__queued.notify(self.__concurrency)
+
+    def get_stats(self) -> Dict:
+        now: float = time.time()
+        return {
+            "url": self.url,
+            "queued": len(self.__queue),
+            # Seconds the oldest chunk queued is waiting, the time the last chunk sent waited if none is queued
+            "lag": now - self.__queue[0][2] if self.__queue else self.__last_lag,
+            "sent": self.__chunks_sent,
+            "failed": self.__chunks_failed,
+            "dropped": self.__chunks_dropped,
+            "bytes_sent": self.__bytes_sent,
+            "circuit_open": self.__circuit_open_until > now
+        }
+
+    async def __send_queued(self) -> None:
+        while True:
+            async with self.__queued:
+                await self.__queued.wait_for(lambda: len(self.__queue) > 0)
+                data, type_count, queued_at = self.__queue.popleft()
+            cooldown: float = self.__circuit_open_until - time.time()
+            if cooldown > 0:
+                await asyncio.sleep(cooldown)
+            if await self.__send_with_retries(data, type_count):
+                self.__last_lag = time.time() - queued_at
+
+    async def __send_with_retries(self, data: bytes, type_count: Dict[str, int]) -> bool:
+        for attempt in range(self.__max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            try:
+                async with self.__session.post(self.url, data=data, allow_redirects=True) as response:
+                    await response.read()
+                    if 200 <= response.status < 300:
+                        self.__chunks_sent += 1
+                        self.__bytes_sent += len(data)
+                        self.__failures_in_row = 0
+                        logger.success("Successfully sent payload to webhook {}. Stats: {}", self.url,
+                                       dict(type_count))
+                        return True
+                    logger.warning("Webhook destination {} returned status code other than 2xx: {}", self.url,
+                                   response.status)
+                    if 400 <= response.status < 500 and response.status != 429:
+                        # The payload is rejected, sending it again won't help
+                        break
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.warning("Sending webhook to {} failed (attempt {}/{}): {}", self.url, attempt + 1,
+                               self.__max_retries + 1, e)
+        self.__chunks_failed += 1
+        self.__failures_in_row += 1
+        if self.__failures_in_row >= CIRCUIT_BREAKER_FAILURES:
+            logger.warning("Webhook destination {} failed {} times in a row, pausing it for {} seconds", self.url,
+                           self.__failures_in_row, CIRCUIT_BREAKER_COOLDOWN)
+            self.__circuit_open_until = time.time() + CIRCUIT_BREAKER_COOLDOWN
+        return False
@@ -2,7 +2,9 @@ import asyncio
 import json
 import time
 from asyncio import Task
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import orjson
 
 from mapadroid.db.DbWebhookReader import DbWebhookReader
 from mapadroid.db.DbWrapper import DbWrapper
@@ -10,15 +12,28 @@ from mapadroid.db.model import Pokestop, TrsQuest
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
 from mapadroid.mapping_manager import MappingManager
 from mapadroid.utils.gamemechanicutil import calculate_mon_level
-from mapadroid.utils.json_encoder import mad_json_dumps
+from mapadroid.utils.json_encoder import mad_serialize_default
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MonSeenTypes, terminate_mad
 from mapadroid.utils.questGen import QuestGen
-from mapadroid.utils.RestHelper import RestApiResult, RestHelper
 from mapadroid.utils.s2Helper import S2Helper
+from mapadroid.webhook.WebhookChangeStream import WebhookChangeConsumer
+from mapadroid.webhook.WebhookReceiver import WebhookReceiver
 
 logger = get_logger(LoggerEnums.webhook)
 
+# Attribute of the messages identifying the entity per type. Messages of other types (quests) are identified by their
+# content
+ENTITY_ID_ATTRIBUTES: Dict[str, str] = {
+    "pokemon": "encounter_id",
+    "raid": "gym_id",
+    "gym": "gym_id",
+    "pokestop": "pokestop_id",
+    "weather": "s2_cell_id"
+}
+# Seconds the last message sent per entity is remembered to not send it again unchanged
+SENT_MESSAGES_TTL: int = 2 * 60 * 60
+
 
 class WebhookWorker:
     __excluded_areas = {}
@@ -30,7 +45,7 @@ class WebhookWorker:
         self.__db_wrapper: DbWrapper = db_wrapper
         self.__rarity = rarity
         self.__last_check = int(time.time())
-        self.__webhook_receivers = []
+        self.__webhook_receivers: List[WebhookReceiver] = []
         self.__webhook_types: Set[str] = set()
         self.__pokemon_types: Set[MonSeenTypes] = set()
         self.__mapping_manager: MappingManager = mapping_manager
@@ -41,98 +56,45 @@ class WebhookWorker:
             MonSeenTypes.encounter, MonSeenTypes.wild, MonSeenTypes.nearby_stop, MonSeenTypes.nearby_cell,
             MonSeenTypes.lure_wild, MonSeenTypes.lure_encounter
         }
-
-    def __payload_type_count(self, payload):
-        count = {}
-
-        for elem in payload:
-            count[elem["type"]] = count.get(elem["type"], 0) + 1
-
-        return count
-
-    def __payload_chunk(self, payload, size):
-        if size == 0:
-            return [payload]
-
-        return [payload[x: x + size] for x in range(0, len(payload), size)]
-
-    def __is_in_excluded_area(self, coordinate):
+        # (type, entity) -> (hash of the message sent last, time last seen)
+        self.__sent_messages: Dict[Tuple[str, Hashable], Tuple[int, float]] = {}
+
+    def __get_excluded(self, coordinates: List[Tuple[float, float]]) -> List[bool]:
+        """
+        Tests the coordinates of a batch against the excluded areas at once
+        Returns: Whether the coordinate at the same index is within any excluded area
+        """
+        excluded: List[bool] = [False] * len(coordinates)
         for gfh in self.__excluded_areas:
-            if gfh.is_coord_inside_include_geofence(coordinate):
-                return True
+            excluded = [is_excluded or in_area for is_excluded, in_area
+                        in zip(excluded, gfh.are_coords_inside_include_geofence(coordinates))]
+        return excluded
 
-        return False
-
-    async def __send_webhook(self, payloads):
+    async def __send_webhook(self, payloads: List[Tuple[Dict, bytes]]):
         if len(payloads) == 0:
             logger.debug2("Payload empty. Skip sending to webhook.")
             return
 
-        current_wh_num = 1
-        for webhook in self.__webhook_receivers:
-            payload_to_send = []
-            sub_types = webhook.get('types')
-
-            if sub_types is not None:
-                for payload in payloads:
-                    if payload["type"] in sub_types or \
-                            (payload["message"].get("seen_type", None) in sub_types):
-                        payload_to_send.append(payload)
-            else:
-                payload_to_send = payloads
-
-            if len(payload_to_send) == 0:
-                logger.debug2("Payload empty. Skip sending to: {} (Filter: {})", webhook.get('url'), sub_types)
-                continue
-            else:
-                logger.debug2("Sending to webhook: {} (Filter: {})", webhook.get('url'), sub_types)
+        for receiver in self.__webhook_receivers:
+            await receiver.enqueue(payloads)
 
-            payload_list = self.__payload_chunk(
-                payload_to_send, self.__args.webhook_max_payload_size
-            )
-
-            current_pl_num = 1
-            for payload_chunk in payload_list:
-                logger.debug4("Python data for payload: {}", payload_chunk)
-                logger.debug4("Payload: {}", await mad_json_dumps(payload_chunk))
-
-                try:
-                    response: RestApiResult = await RestHelper.send_post(webhook.get('url'),
-                                                                         data=payload_chunk,
-                                                                         headers={"Content-Type": "application/json"},
-                                                                         params=None,
-                                                                         timeout=5)
-                    if response.status_code != 200:
-                        logger.warning("Webhook destination {} returned status code other than 200 OK: {}",
-                                       webhook.get('url'), response.status_code)
-                    else:
-                        if len(self.__webhook_receivers) > 1:
-                            whcount_text = " [wh {}/{}]".format(current_wh_num, len(self.__webhook_receivers))
-                        else:
-                            whcount_text = ""
-
-                        if len(payload_list) > 1:
-                            whchunk_text = " [pl {}/{}]".format(current_pl_num, len(payload_list))
-                        else:
-                            whchunk_text = ""
-
-                        logger.success("Successfully sent payload to webhook{}{}. Stats: {}", whchunk_text,
-                                       whcount_text, await mad_json_dumps(self.__payload_type_count(payload_chunk)))
-                except Exception as e:
-                    logger.warning("Exception occured while sending webhook: {}", e)
-                    logger.exception(e)
-
-                current_pl_num += 1
-            current_wh_num += 1
+    def get_receiver_stats(self) -> List[Dict]:
+        """
+        Returns: The delivery metrics per webhook receiver (queued chunks, lag, chunks sent/failed/dropped, bytes sent)
+        """
+        return [receiver.get_stats() for receiver in self.__webhook_receivers]
 
     async def __prepare_quest_data(self, quest_data: Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]):
         ret = []
-        for stop, quests in quest_data.values():
-            if self.__is_in_excluded_area([stop.latitude, stop.longitude]):
+        stops_with_quests: List[Tuple[Pokestop, Dict[int, TrsQuest]]] = list(quest_data.values())
+        excluded: List[bool] = self.__get_excluded([(stop.latitude, stop.longitude)
+                                                    for stop, _ in stops_with_quests])
+        for (stop, quests), is_excluded in zip(stops_with_quests, excluded):
+            if is_excluded:
                 continue
             for layer, quest in quests.items():
                 try:
-                    transformed_quest = await self.__quest_gen.generate_quest(stop, quest)
+                    transformed_quest = await self.__quest_gen.get_generated_quest(stop, quest)
                     quest_payload = self.__construct_quest_payload(transformed_quest)
 
                     entire_payload = {"type": "quest", "message": quest_payload}
@@ -366,8 +328,9 @@ class WebhookWorker:
     def __prepare_raid_data(self, raid_data):
         ret = []
 
-        for raid in raid_data:
-            if self.__is_in_excluded_area([raid["latitude"], raid["longitude"]]):
+        excluded: List[bool] = self.__get_excluded([(raid["latitude"], raid["longitude"]) for raid in raid_data])
+        for raid, is_excluded in zip(raid_data, excluded):
+            if is_excluded:
                 continue
 
             # skip ex raid mon if disabled
@@ -433,8 +396,9 @@ class WebhookWorker:
     def __prepare_mon_data(self, mon_data: List[Dict]):
         ret = []
 
-        for mon in mon_data:
-            if self.__is_in_excluded_area([mon["latitude"], mon["longitude"]]):
+        excluded: List[bool] = self.__get_excluded([(mon["latitude"], mon["longitude"]) for mon in mon_data])
+        for mon, is_excluded in zip(mon_data, excluded):
+            if is_excluded:
                 logger.debug3("Webhook ignoring (excluded area) mon ID {} with encounter ID {}. Stats: {}/{}/{}",
                               mon["pokemon_id"],
                               mon["encounter_id"],
@@ -549,8 +513,9 @@ class WebhookWorker:
     def __prepare_gyms_data(self, gym_data):
         ret = []
 
-        for gym in gym_data:
-            if self.__is_in_excluded_area([gym["latitude"], gym["longitude"]]):
+        excluded: List[bool] = self.__get_excluded([(gym["latitude"], gym["longitude"]) for gym in gym_data])
+        for gym, is_excluded in zip(gym_data, excluded):
+            if is_excluded:
                 continue
 
             gym_payload = {
@@ -581,8 +546,10 @@ class WebhookWorker:
     def __prepare_stops_data(self, pokestop_data: List[Dict[str, Any]]):
         ret = []
 
-        for pokestop in pokestop_data:
-            if self.__is_in_excluded_area([pokestop["latitude"], pokestop["longitude"]]):
+        excluded: List[bool] = self.__get_excluded([(pokestop["latitude"], pokestop["longitude"])
+                                                    for pokestop in pokestop_data])
+        for pokestop, is_excluded in zip(pokestop_data, excluded):
+            if is_excluded:
                 continue
 
             pokestop_payload = {
@@ -649,10 +616,11 @@ class WebhookWorker:
                 for valid_type in self.__valid_types:
                     self.__webhook_types.add(valid_type)
 
-            self.__webhook_receivers.append({
-                "url": url.replace(" ", ""),
-                "types": sub_types
-            })
+            self.__webhook_receivers.append(WebhookReceiver(url.replace(" ", ""), sub_types,
+                                                            self.__args.webhook_max_payload_size,
+                                                            self.__args.webhook_concurrency,
+                                                            self.__args.webhook_max_retries,
+                                                            self.__args.webhook_queue_size))
 
     async def __build_excluded_areas(self):
         self.__excluded_areas: List[GeofenceHelper] = []
@@ -678,8 +646,25 @@ class WebhookWorker:
         if len(self.__excluded_areas) > 0:
             logger.info("Excluding {} areas from webhooks", len(self.__excluded_areas))
 
-    async def __create_payload(self):
-        logger.debug("Fetching data changed since {}", self.__last_check)
+    async def __create_payload(self, changes: Optional[Dict[str, Set[str]]] = None):
+        """
+        Args:
+            changes: The IDs changed per type as published by the data ingest. All data changed since the last
+            scan of the DB is fetched if None
+
+        Returns: The messages of the data changed
+        """
+        if changes is None:
+            logger.debug("Fetching data changed since {}", self.__last_check)
+        else:
+            logger.debug("Fetching data published by the data ingest: {}",
+                         {change_type: len(entity_ids) for change_type, entity_ids in changes.items()})
+
+        def changed_ids(change_type: str) -> Optional[Set[str]]:
+            return changes.get(change_type, set()) if changes is not None else None
+
+        def is_requested(change_type: str) -> bool:
+            return change_type in self.__webhook_types and (changes is None or change_type in changes)
 
         # the payload that is about to be sent
         full_payload = []
@@ -687,44 +672,53 @@ class WebhookWorker:
             # TODO: Single transaction...
             try:
                 # raids
-                if 'raid' in self.__webhook_types:
+                if is_requested('raid'):
                     raids = self.__prepare_raid_data(
-                        await DbWebhookReader.get_raids_changed_since(session, self.__last_check)
+                        await DbWebhookReader.get_raids_changed_since(session, self.__last_check,
+                                                                      changed_ids('raid'))
                     )
                     full_payload += raids
 
                 # quests
-                if 'quest' in self.__webhook_types:
+                if is_requested('quest'):
                     quest = await self.__prepare_quest_data(
-                        await DbWebhookReader.get_quests_changed_since(session, self.__last_check)
+                        await DbWebhookReader.get_quests_changed_since(session, self.__last_check,
+                                                                       changed_ids('quest'))
                     )
                     full_payload += quest
 
                 # weather
-                if 'weather' in self.__webhook_types:
+                if is_requested('weather'):
                     weather = self.__prepare_weather_data(
-                        await DbWebhookReader.get_weather_changed_since(session, self.__last_check)
+                        await DbWebhookReader.get_weather_changed_since(session, self.__last_check,
+                                                                        changed_ids('weather'))
                     )
                     full_payload += weather
 
                 # gyms
-                if 'gym' in self.__webhook_types:
+                if is_requested('gym'):
                     gyms = self.__prepare_gyms_data(
-                        await DbWebhookReader.get_gyms_changed_since(session, self.__last_check)
+                        await DbWebhookReader.get_gyms_changed_since(session, self.__last_check,
+                                                                     changed_ids('gym'))
                     )
                     full_payload += gyms
 
                 # stops
-                if 'pokestop' in self.__webhook_types:
+                if is_requested('pokestop'):
                     pokestops = self.__prepare_stops_data(
-                        await DbWebhookReader.get_stops_changed_since(session, self.__last_check)
+                        await DbWebhookReader.get_stops_changed_since(session, self.__last_check,
+                                                                      changed_ids('pokestop'))
                     )
                     full_payload += pokestops
 
                 # mon
-                if self.__pokemon_types:
+                if self.__pokemon_types and (changes is None or 'pokemon' in changes):
+                    encounter_ids: Optional[Set[str]] = changed_ids('pokemon')
                     mon = self.__prepare_mon_data(
-                        await DbWebhookReader.get_mon_changed_since(session, self.__last_check, self.__pokemon_types)
+                        await DbWebhookReader.get_mon_changed_since(
+                            session, self.__last_check, self.__pokemon_types,
+                            {int(encounter_id) for encounter_id in encounter_ids} if encounter_ids is not None
+                            else None)
                     )
                     full_payload += mon
             except Exception as e:
@@ -739,26 +733,82 @@ class WebhookWorker:
         loop = asyncio.get_running_loop()
         return loop.create_task(self.__run_worker())
 
+    def __serialize_unsent(self, payloads: List[Dict]) -> List[Tuple[Dict, bytes]]:
+        """
+        Serializes the payloads once for all receivers and drops the messages sent before unchanged. Entities are
+        published by the data ingest whenever they are written and the scans of the DB overlap.
+        Returns: The payloads not sent yet along with their JSON
+        """
+        now: float = time.time()
+        unsent: List[Tuple[Dict, bytes]] = []
+        for payload in payloads:
+            serialized: bytes = orjson.dumps(payload, default=mad_serialize_default,
+                                             option=orjson.OPT_PASSTHROUGH_DATETIME)
+            message_hash: int = hash(serialized)
+            entity_id: Optional[Hashable] = payload["message"].get(ENTITY_ID_ATTRIBUTES.get(payload["type"]))
+            key: Tuple[str, Hashable] = (payload["type"], entity_id if entity_id is not None else message_hash)
+            sent: Optional[Tuple[int, float]] = self.__sent_messages.get(key)
+            self.__sent_messages[key] = (message_hash, now)
+            if sent is None or sent[0] != message_hash:
+                unsent.append((payload, serialized))
+        return unsent
+
+    def __evict_sent_messages(self) -> None:
+        now: float = time.time()
+        outdated: List[Tuple[str, Hashable]] = [key for key, (_, last_seen) in self.__sent_messages.items()
+                                                if now - last_seen > SENT_MESSAGES_TTL]
+        for key in outdated:
+            del self.__sent_messages[key]
+
     async def __run_worker(self):
-        logger.info("Starting webhook worker thread, sending payload every {} seconds", self.__worker_interval_sec)
+        logger.info("Starting webhook worker thread, sending changes as they are published by the data ingest")
 
         self.__build_webhook_receivers()
         await self.__build_excluded_areas()
+        for receiver in self.__webhook_receivers:
+            await receiver.start()
+        try:
+            await self.__process_changes()
+        finally:
+            for receiver in self.__webhook_receivers:
+                await receiver.stop()
 
+        logger.info("Stopping webhook worker thread")
+
+    async def __process_changes(self):
         if self.__args.webhook_start_time != 0:
             self.__last_check = int(self.__args.webhook_start_time)
 
+        change_consumer: WebhookChangeConsumer = WebhookChangeConsumer(await self.__db_wrapper.get_cache())
+        last_scan: float = 0
         while not terminate_mad.is_set():
-            # Always check modifications of intervals N - 6 to NOW given processing of queues may take some time...
-            preparing_timestamp = int(time.time()) - 6 * self.__worker_interval_sec
-
-            # fetch data and create payload
-            full_payload = await self.__create_payload()
+            # Changes of the data ingest are sent right away, the DB is scanned for changes that were not published
+            # (e.g. while the stream could not be read or written by other tools)
+            scan_interval: int = self.__args.webhook_recovery_interval if change_consumer.available \
+                else self.__worker_interval_sec
+            if time.time() - last_scan >= scan_interval:
+                last_scan = time.time()
+                # Always check modifications of intervals N - 6 to NOW given processing of queues may take some time...
+                preparing_timestamp = int(time.time()) - 6 * self.__worker_interval_sec
+
+                # fetch data and create payload
+                full_payload = await self.__create_payload()
+                self.__last_check = preparing_timestamp
+                self.__evict_sent_messages()
+                self.__log_receiver_stats()
+            else:
+                changes: Dict[str, Set[str]] = await change_consumer.read(
+                    min(self.__worker_interval_sec, scan_interval - (time.time() - last_scan)))
+                if not changes:
+                    continue
+                full_payload = await self.__create_payload(changes)
 
             # send our payload
-            await self.__send_webhook(full_payload)
-
-            self.__last_check = preparing_timestamp
-            await asyncio.sleep(self.__worker_interval_sec)
-
-        logger.info("Stopping webhook worker thread")
+            await self.__send_webhook(self.__serialize_unsent(full_payload))
+
+    def __log_receiver_stats(self) -> None:
+        for stats in self.get_receiver_stats():
+            logger.info("Webhook {}: {} chunks queued (lag {:.1f}s), {} sent ({} bytes), {} failed, {} dropped{}",
+                        stats["url"], stats["queued"], stats["lag"], stats["sent"], stats["bytes_sent"],
+                        stats["failed"], stats["dropped"], " - paused as it keeps failing" if stats["circuit_open"]
+                        else "")
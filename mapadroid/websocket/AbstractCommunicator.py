@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterable, Optional, Tuple, Union
 
 from mapadroid.utils.collections import Location
 from mapadroid.utils.CustomTypes import MessageTyping
@@ -20,11 +20,19 @@ class AbstractCommunicator(ABC):
         pass
 
     @abstractmethod
-    async def install_apk(self, timeout: float, filepath: str = None, data=None) -> bool:
+    async def install_apk(self, timeout: float, filepath: str = None,
+                          data: Optional[Union[bytes, AsyncIterable[bytes]]] = None) -> bool:
+        """
+        Installs the file at filepath or the data passed. Data may be passed as async iterable of chunks to stream it
+        """
         pass
 
     @abstractmethod
-    async def install_bundle(self, timeout: float, filepath: str = None, data=None) -> bool:
+    async def install_bundle(self, timeout: float, filepath: str = None,
+                             data: Optional[Union[bytes, AsyncIterable[bytes]]] = None) -> bool:
+        """
+        Installs the file at filepath or the data passed. Data may be passed as async iterable of chunks to stream it
+        """
         pass
 
     @abstractmethod
@@ -115,6 +123,17 @@ class AbstractCommunicator(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_screenshot_data(self, quality: int = 70,
+                                  screenshot_type: ScreenshotType = ScreenshotType.JPEG) -> Optional[bytes]:
+        """
+
+        :param quality: of the screenshot (compression)
+        :param screenshot_type: whether it's jpeg or png
+        :return: the encoded screenshot or None if it could not be retrieved
+        """
+        pass
+
     @abstractmethod
     async def back_button(self) -> bool:
         pass
@@ -143,6 +162,14 @@ class AbstractCommunicator(ABC):
     async def is_pogo_topmost(self) -> bool:
         pass
 
+    @abstractmethod
+    async def is_screen_on_and_pogo_topmost(self) -> Tuple[bool, bool]:
+        """
+        Requests the screen state and the topmost app at once rather than one after the other
+        :return: whether the screen is on, whether pogo is topmost
+        """
+        pass
+
     @abstractmethod
     async def topmost_app(self) -> Optional[MessageTyping]:
         """
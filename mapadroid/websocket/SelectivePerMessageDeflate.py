@@ -0,0 +1,44 @@
+from typing import List, Sequence, Tuple
+
+from websockets import frames
+from websockets.extensions import Extension
+from websockets.extensions.permessage_deflate import (
+    PerMessageDeflate, ServerPerMessageDeflateFactory)
+from websockets.typing import ExtensionParameter
+
+
+class SelectivePerMessageDeflate(PerMessageDeflate):
+    """
+    Per-message deflate only compressing text messages (commands). Binary messages sent to devices are APKs/bundles
+    which are compressed already, deflating them merely costs CPU and memory.
+    RFC 7692 allows sending single messages uncompressed by not setting RSV1 on their first frame.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__compress_message: bool = True
+
+    def encode(self, frame: frames.Frame) -> frames.Frame:
+        if frame.opcode in frames.CTRL_OPCODES:
+            return frame
+        if frame.opcode is not frames.OP_CONT:
+            self.__compress_message = frame.opcode is frames.OP_TEXT
+        if not self.__compress_message:
+            return frame
+        return super().encode(frame)
+
+
+class SelectiveServerPerMessageDeflateFactory(ServerPerMessageDeflateFactory):
+    def __init__(self):
+        # Same settings as used by websockets.serve by default
+        super().__init__(server_max_window_bits=12, client_max_window_bits=12, compress_settings={"memLevel": 5})
+
+    def process_request_params(self, params: Sequence[ExtensionParameter],
+                               accepted_extensions: Sequence[Extension]) -> Tuple[List[ExtensionParameter],
+                                                                                  PerMessageDeflate]:
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, SelectivePerMessageDeflate(extension.remote_no_context_takeover,
+                                                           extension.local_no_context_takeover,
+                                                           extension.remote_max_window_bits,
+                                                           extension.local_max_window_bits,
+                                                           extension.compress_settings)
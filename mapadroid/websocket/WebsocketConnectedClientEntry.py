@@ -1,24 +1,28 @@
 import asyncio
-import math
 import time
-from typing import Dict, Optional
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional
 
 import websockets
 from loguru import logger
 
-from mapadroid.utils.CustomTypes import MessageTyping
+from mapadroid.utils.CustomTypes import MessageTyping, OutgoingMessageTyping
 from mapadroid.utils.madGlobals import (
     WebsocketWorkerConnectionClosedException, WebsocketWorkerRemovedException,
     WebsocketWorkerTimeoutException)
+from mapadroid.utils.metrics import Counter, Histogram
 from mapadroid.worker.AbstractWorker import AbstractWorker
 from mapadroid.worker.WorkerState import WorkerState
 
+# Streamed binary messages are sent in fragments of at most this size
+MESSAGE_FRAGMENT_SIZE: int = 1024 * 1024
 
-class ReceivedMessageEntry:
-    def __init__(self):
-        # TODO: consider timestamp of when the message was waited for to cleanup?
-        self.message: Optional[MessageTyping] = None
-        self.message_received_event: asyncio.Event = asyncio.Event()
+WEBSOCKET_COMMAND_SECONDS: Histogram = Histogram("mad_websocket_command_seconds",
+                                                 "Seconds until all responses to the messages sent arrived by the "
+                                                 "command of the first message", ["command"],
+                                                 buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+WEBSOCKET_COMMAND_TIMEOUTS: Counter = Counter("mad_websocket_command_timeouts",
+                                              "Messages sent without all responses arriving in time by the command "
+                                              "of the first message", ["command"])
 
 
 class WebsocketConnectedClientEntry:
@@ -30,57 +34,69 @@ class WebsocketConnectedClientEntry:
         self.worker_state: WorkerState = worker_state
         self.websocket_client_connection: Optional[websockets.WebSocketClientProtocol] = websocket_client_connection
         self.fail_counter: int = 0
-        self.received_messages: Dict[int, ReceivedMessageEntry] = {}
-        self.received_mutex: asyncio.Lock = asyncio.Lock()
+        # Responses are dispatched to the future of the message ID. Everything runs on the event loop and none of
+        # the accesses awaits in between, hence no locks are needed
+        self.received_messages: Dict[int, asyncio.Future] = {}
         self.message_id_counter: int = 0
-        self.message_id_mutex: asyncio.Lock = asyncio.Lock()
         # store a timestamp in order to cleanup (soft-states)
         self.last_message_received_at: float = 0
 
-    async def set_message_response(self, message_id: int, message: MessageTyping) -> None:
-        async with self.received_mutex:
-            message_entry = self.received_messages.get(message_id, None)
-            if message_entry is not None:
-                message_entry.message = message
-                message_entry.message_received_event.set()
-                self.last_message_received_at = time.time()
+    def set_message_response(self, message_id: int, message: MessageTyping) -> None:
+        response_future: Optional[asyncio.Future] = self.received_messages.get(message_id, None)
+        if response_future is not None and not response_future.done():
+            response_future.set_result(message)
+            self.last_message_received_at = time.time()
 
-    async def send_and_wait(self, message: MessageTyping, timeout: float, worker_instance: AbstractWorker,
+    async def send_and_wait(self, message: OutgoingMessageTyping, timeout: float, worker_instance: AbstractWorker,
                             byte_command: Optional[int] = None) -> Optional[MessageTyping]:
+        responses: List[Optional[MessageTyping]] = await self.send_and_wait_pipelined([message], timeout,
+                                                                                      worker_instance, byte_command)
+        return responses[0]
+
+    async def send_and_wait_pipelined(self, messages: List[OutgoingMessageTyping], timeout: float,
+                                      worker_instance: AbstractWorker,
+                                      byte_command: Optional[int] = None) -> List[Optional[MessageTyping]]:
+        """
+        Sends all messages back-to-back and waits for the responses afterwards rather than waiting for the response
+        of a message before sending the next one. The messages must thus not depend on each other's result.
+        Args:
+            messages: Sent in the order given. Binary messages may be passed as async iterable of chunks to stream
+            them as fragmented message rather than holding the entire message in memory
+            timeout: Timeout for all responses to arrive
+            worker_instance: The worker sending the messages
+            byte_command: Byte command of binary messages
+
+        Returns: The responses in the order of the messages, None for messages without a response in time
+        """
         if not self.worker_instance or self.worker_instance != worker_instance and worker_instance != 'madmin':
             # TODO: consider changing this...
             raise WebsocketWorkerRemovedException("Invalid worker instance, removed worker")
         elif not self.websocket_client_connection.open:
             raise WebsocketWorkerConnectionClosedException("Connection closed, stopping")
 
-        # install new ReceivedMessageEntry
-        message_id: int = await self.__get_new_message_id()
-        new_entry = ReceivedMessageEntry()
-        async with self.received_mutex:
-            self.received_messages[message_id] = new_entry
+        loop = asyncio.get_running_loop()
+        response_futures: Dict[int, asyncio.Future] = {}
+        command: str = self.__get_command_name(messages[0]) if messages else ""
+        start: float = time.perf_counter()
         try:
-            if isinstance(message, bytes):
-                logger.debug("sending binary: {}", message[:10])
-            else:
-                logger.debug("sending command: {}", message.strip())
-            # send message
-            await self.__send_message(message_id, message, byte_command)
+            for message in messages:
+                message_id: int = self.__get_new_message_id()
+                response_future: asyncio.Future = loop.create_future()
+                self.received_messages[message_id] = response_future
+                response_futures[message_id] = response_future
+                logger.opt(lazy=True).debug("sending command: {}", lambda: message.strip() if isinstance(message, str)
+                                            else message[:10] if isinstance(message, bytes) else "<stream>")
+                await self.__send_message(message_id, message, byte_command)
 
-            # wait for it to trigger...
             logger.debug2("Timeout towards: {}", timeout)
-            response = None
-            try:
-                event_triggered = await asyncio.wait_for(new_entry.message_received_event.wait(), timeout=timeout)
-                if event_triggered:
-                    logger.debug("Received answer in time, popping response")
-                    self.fail_counter = 0
-                    if isinstance(new_entry.message, str):
-                        logger.debug("Response: {}", new_entry.message.strip())
-                    else:
-                        logger.debug("Received binary data , starting with {}", new_entry.message[:10])
-                    response = new_entry.message
-            except asyncio.TimeoutError:
+            _, pending = await asyncio.wait(response_futures.values(), timeout=timeout)
+            WEBSOCKET_COMMAND_SECONDS.labels(command).observe(time.perf_counter() - start)
+            if not pending:
+                logger.debug("Received answer in time")
+                self.fail_counter = 0
+            else:
                 logger.warning("Timeout, increasing timeout-counter")
+                WEBSOCKET_COMMAND_TIMEOUTS.labels(command).inc()
                 self.fail_counter += 1
                 if self.fail_counter > 5:
                     logger.error("5 consecutive timeouts or origin is no longer connected, cleanup")
@@ -89,35 +105,50 @@ class WebsocketConnectedClientEntry:
                     except Exception as e:
                         logger.info("Failed closing connection forcefully after 5 timeouts: {}", e)
                     raise WebsocketWorkerTimeoutException("Multiple consecutive timeouts detected")
-
-            logger.debug("Done sending command")
-            return response
+            responses: List[Optional[MessageTyping]] = [response_future.result() if response_future.done() else None
+                                                        for response_future in response_futures.values()]
+            logger.opt(lazy=True).debug("Responses: {}", lambda: [response[:10] if isinstance(response, bytes)
+                                                                  else response.strip() if response else response
+                                                                  for response in responses])
+            return responses
         finally:
-            logger.debug2("Cleaning up received message.")
-            async with self.received_mutex:
-                del self.received_messages[message_id]
+            for message_id in response_futures.keys():
+                self.received_messages.pop(message_id, None)
+
+    @staticmethod
+    def __get_command_name(message: OutgoingMessageTyping) -> str:
+        # The first word of text messages (e.g. "screen" of "screen capture"), binary messages are not told apart
+        if isinstance(message, str):
+            words: List[str] = message.split(None, 1)
+            return words[0] if words else ""
+        return "bytes"
 
-    async def __send_message(self, message_id: int, message: MessageTyping,
+    async def __send_message(self, message_id: int, message: OutgoingMessageTyping,
                              byte_command: Optional[int] = None) -> None:
         if isinstance(message, str):
             to_be_sent: str = u"%s;%s" % (str(message_id), message)
-            logger.debug4("To be sent: {}", to_be_sent.strip())
+        elif byte_command is not None and not isinstance(message, bytes):
+            # Sent as one fragmented message. Every fragment waits for the write buffer to drain
+            to_be_sent: AsyncIterator[bytes] = self.__fragment_message(message_id, byte_command, message)
         elif byte_command is not None:
             to_be_sent: bytes = (int(message_id)).to_bytes(4, byteorder='big')
             to_be_sent += (int(byte_command)).to_bytes(4, byteorder='big')
             to_be_sent += message
             del message
-            logger.debug4("To be sent to (message ID: {}): {}", message_id, to_be_sent[:10])
         else:
             logger.error("Tried to send invalid message (bytes without byte command or no byte/str passed)")
             return
         await self.websocket_client_connection.send(to_be_sent)
 
-    async def __get_new_message_id(self) -> int:
-        async with self.message_id_mutex:
-            self.message_id_counter += 1
-            self.message_id_counter = int(math.fmod(self.message_id_counter, 100000))
-            if self.message_id_counter == 100000:
-                self.message_id_counter = 1
-            new_message_id = self.message_id_counter
-        return new_message_id
+    @staticmethod
+    async def __fragment_message(message_id: int, byte_command: int,
+                                 chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        yield (int(message_id)).to_bytes(4, byteorder='big') + (int(byte_command)).to_bytes(4, byteorder='big')
+        async for chunk in chunks:
+            chunk_view = memoryview(chunk)
+            for offset in range(0, len(chunk_view), MESSAGE_FRAGMENT_SIZE):
+                yield chunk_view[offset:offset + MESSAGE_FRAGMENT_SIZE]
+
+    def __get_new_message_id(self) -> int:
+        self.message_id_counter = self.message_id_counter % 100000 + 1
+        return self.message_id_counter
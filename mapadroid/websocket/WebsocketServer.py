@@ -29,6 +29,8 @@ from mapadroid.utils.madGlobals import WebsocketAbortRegistrationException
 from mapadroid.utils.pogoevent import PogoEvent
 from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
 from mapadroid.websocket.communicator import Communicator
+from mapadroid.websocket.SelectivePerMessageDeflate import \
+    SelectiveServerPerMessageDeflateFactory
 from mapadroid.websocket.WebsocketConnectedClientEntry import \
     WebsocketConnectedClientEntry
 from mapadroid.worker.strategy.AbstractWorkerStrategy import \
@@ -95,11 +97,10 @@ class WebsocketServer(object):
         await self.__setup_first_loop()
         # the type-check here is sorta wrong, not entirely sure why
         # noinspection PyTypeChecker
-        self.__server_task: websockets.WebSocketServer = await websockets.serve(self.__connection_handler,
-                                                                                self.__args.ws_ip,
-                                                                                int(self.__args.ws_port),
-                                                                                max_size=2 ** 25,
-                                                                                close_timeout=10)
+        # Compression is negotiated for commands only, binary payloads are sent uncompressed
+        self.__server_task: websockets.WebSocketServer = await websockets.serve(
+            self.__connection_handler, self.__args.ws_ip, int(self.__args.ws_port), max_size=2 ** 25,
+            close_timeout=10, compression=None, extensions=[SelectiveServerPerMessageDeflateFactory()])
 
     async def __close_all_connections_and_signal_stop(self):
         logger.info("Signaling all workers to stop")
@@ -340,18 +341,12 @@ class WebsocketServer(object):
         connection: websockets.WebSocketClientProtocol = client_entry.websocket_client_connection
         logger.info("Consumer handler starting")
         while connection.open:
-            message = None
             try:
                 message = await connection.recv()
-                # message = await asyncio.wait_for(connection.recv(), timeout=4.0)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(0.02)
             except websockets.ConnectionClosed as cc:
                 logger.warning("Connection was closed, stopping receiver. Exception: {}", repr(cc))
                 return
-
-            if message is not None:
-                await self.__on_message(client_entry, message)
+            self.__on_message(client_entry, message)
         logger.warning("Connection closed in __client_message_receiver")
 
     async def _stop_worker(self, origin: str) -> None:
@@ -360,11 +355,11 @@ class WebsocketServer(object):
             await entry.worker_instance.stop_worker()
 
     @staticmethod
-    async def __on_message(client_entry: WebsocketConnectedClientEntry, message: MessageTyping) -> None:
+    def __on_message(client_entry: WebsocketConnectedClientEntry, message: MessageTyping) -> None:
         response: Optional[MessageTyping] = None
         try:
             if isinstance(message, str):
-                logger.debug("Receiving message: {}", message.strip())
+                logger.opt(lazy=True).debug("Receiving message: {}", lambda: message.strip())
                 splitup = message.split(";", 1)
                 message_id = int(splitup[0])
                 response = splitup[1]
@@ -375,7 +370,7 @@ class WebsocketServer(object):
         except ValueError as e:
             logger.warning("Failed reading message ID of message received for {} ({})", client_entry.origin, repr(e))
             return
-        await client_entry.set_message_response(message_id, response)
+        client_entry.set_message_response(message_id, response)
 
     @staticmethod
     async def __close_websocket_client_connection(origin_of_worker: str,
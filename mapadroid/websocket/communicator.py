@@ -1,7 +1,8 @@
 import asyncio
 import re
 from ipaddress import IPv4Address, ip_address
-from typing import Optional, Set
+from typing import (AsyncIterable, AsyncIterator, List, Optional, Set, Tuple,
+                    Union)
 
 import websockets
 from aiofile import async_open
@@ -9,6 +10,7 @@ from aiofile import async_open
 from mapadroid.utils.collections import Location
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.geo import get_distance_of_two_points_in_meters
+from mapadroid.utils.global_variables import CHUNK_MAX_SIZE
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import (
     MadGlobals, ScreenshotType, WebsocketWorkerConnectionClosedException,
@@ -60,23 +62,37 @@ class Communicator(AbstractCommunicator):
             return await self.websocket_client_entry.send_and_wait(message, timeout=timeout,
                                                                    worker_instance=self.worker_instance_ref)
 
+    async def __run_pipelined(self, messages: List[MessageTyping],
+                              timeout: float = None) -> List[Optional[MessageTyping]]:
+        async with self.__send_mutex:
+            timeout = self.__command_timeout if timeout is None else timeout
+            return await self.websocket_client_entry.send_and_wait_pipelined(messages, timeout=timeout,
+                                                                             worker_instance=self.worker_instance_ref)
+
     async def __run_and_ok_bytes(self, message, timeout: float, byte_command: int = None) -> bool:
         async with self.__send_mutex:
             result = await self.websocket_client_entry.send_and_wait(message, timeout, self.worker_instance_ref,
                                                                      byte_command=byte_command)
             return result is not None and "OK" == result.strip()
 
-    async def install_apk(self, timeout: float, filepath: str = None, data=None) -> bool:
-        if not data:
-            async with async_open(filepath, "rb") as file:  # opening for [r]eading as [b]inary
-                data = await file.read()  # if you only wanted to read 512 bytes, do .read(512)
-        return await self.__run_and_ok_bytes(message=data, timeout=timeout, byte_command=1)
-
-    async def install_bundle(self, timeout: float, filepath: str = None, data=None) -> bool:
-        if not data:
-            async with async_open(filepath, "rb") as file:  # opening for [r]eading as [b]inary
-                data = await file.read()  # if you only wanted to read 512 bytes, do .read(512)
-        return await self.__run_and_ok_bytes(message=data, timeout=timeout, byte_command=2)
+    async def install_apk(self, timeout: float, filepath: str = None,
+                          data: Optional[Union[bytes, AsyncIterable[bytes]]] = None) -> bool:
+        return await self.__run_and_ok_bytes(message=data if data else self.__read_file_chunked(filepath),
+                                             timeout=timeout, byte_command=1)
+
+    async def install_bundle(self, timeout: float, filepath: str = None,
+                             data: Optional[Union[bytes, AsyncIterable[bytes]]] = None) -> bool:
+        return await self.__run_and_ok_bytes(message=data if data else self.__read_file_chunked(filepath),
+                                             timeout=timeout, byte_command=2)
+
+    @staticmethod
+    async def __read_file_chunked(filepath: str) -> AsyncIterator[bytes]:
+        async with async_open(filepath, "rb") as file:
+            while True:
+                chunk = await file.read(CHUNK_MAX_SIZE)
+                if not chunk:
+                    break
+                yield chunk
 
     async def start_app(self, package_name: str) -> bool:
         return await self.__run_and_ok("more start {}\r\n".format(package_name), self.__command_timeout)
@@ -141,9 +157,21 @@ class Communicator(AbstractCommunicator):
 
     async def get_screenshot(self, path: str, quality: int = 70,
                              screenshot_type: ScreenshotType = ScreenshotType.JPEG) -> bool:
+        encoded: Optional[bytes] = await self.get_screenshot_data(quality, screenshot_type)
+        if encoded is None:
+            return False
+        logger.debug("Storing screenshot...")
+        async with async_open(path, "wb") as fh:
+            await fh.write(encoded)
+        del encoded
+        logger.debug2("Done storing, returning")
+        return True
+
+    async def get_screenshot_data(self, quality: int = 70,
+                                  screenshot_type: ScreenshotType = ScreenshotType.JPEG) -> Optional[bytes]:
         if quality < 10 or quality > 100:
             logger.error("Invalid quality value passed for screenshots")
-            return False
+            return None
 
         screenshot_type_str: str = "jpeg"
         if screenshot_type == ScreenshotType.PNG:
@@ -151,23 +179,15 @@ class Communicator(AbstractCommunicator):
 
         encoded = await self.__run_get_gesponse("screen capture {} {}\r\n".format(screenshot_type_str, quality))
         if encoded is None:
-            return False
+            return None
         elif isinstance(encoded, str):
             logger.debug2("Screenshot response not binary")
             if "KO: " in encoded:
                 logger.error("get_screenshot: Could not retrieve screenshot. Make sure your RGC is updated.")
-                return False
             elif "OK:" not in encoded:
                 logger.error("get_screenshot: response not OK")
-                return False
-            return False
-        else:
-            logger.debug("Storing screenshot...")
-            async with async_open(path, "wb") as fh:
-                await fh.write(encoded)
-            del encoded
-            logger.debug2("Done storing, returning")
-            return True
+            return None
+        return encoded
 
     async def back_button(self) -> bool:
         return await self.__run_and_ok("screen back\r\n", self.__command_timeout)
@@ -179,13 +199,23 @@ class Communicator(AbstractCommunicator):
         return await self.__run_and_ok("touch text " + str(text), self.__command_timeout)
 
     async def is_screen_on(self) -> bool:
-        state = await self.__run_get_gesponse("more state screen\r\n")
+        return self.__is_screen_on_state(await self.__run_get_gesponse("more state screen\r\n"))
+
+    async def is_pogo_topmost(self) -> bool:
+        return self.__is_pogo_topmost_app(await self.__run_get_gesponse("more topmost app\r\n"))
+
+    async def is_screen_on_and_pogo_topmost(self) -> Tuple[bool, bool]:
+        state, topmost = await self.__run_pipelined(["more state screen\r\n", "more topmost app\r\n"])
+        return self.__is_screen_on_state(state), self.__is_pogo_topmost_app(topmost)
+
+    @staticmethod
+    def __is_screen_on_state(state: Optional[MessageTyping]) -> bool:
         if state is None:
             return False
         return "on" in state
 
-    async def is_pogo_topmost(self) -> bool:
-        topmost = await self.__run_get_gesponse("more topmost app\r\n")
+    @staticmethod
+    def __is_pogo_topmost_app(topmost: Optional[MessageTyping]) -> bool:
         if topmost is None:
             return False
         valid_pogo_states: Set[str] = {"com.nianticlabs.pokemongo",
@@ -6,6 +6,7 @@ from typing import Optional
 from mapadroid.db.model import SettingsPogoauth
 from mapadroid.ocr.pogoWindows import PogoWindows
 from mapadroid.ocr.screen_type import ScreenType
+from mapadroid.ocr.Screenshot import Screenshot
 from mapadroid.utils.collections import Location
 from mapadroid.utils.madConstants import TIMESTAMP_NEVER
 from mapadroid.utils.madGlobals import TransportType
@@ -35,6 +36,8 @@ class WorkerState:
         self.login_error_count: int = 0
         self.last_transport_type: TransportType = TransportType.TELEPORT
         self.last_screenshot_taken_at: int = TIMESTAMP_NEVER
+        # The screenshot last retrieved from the device, analyzed in memory
+        self.last_screenshot: Optional[Screenshot] = None
         self.last_screen_type: ScreenType = ScreenType.UNDEFINED
         self.current_sleep_duration: int = 0
         self.last_received_data_time: Optional[datetime] = None
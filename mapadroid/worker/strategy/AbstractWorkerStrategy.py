@@ -18,6 +18,7 @@ from mapadroid.mapping_manager.MappingManager import MappingManager
 from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
     MappingManagerDevicemappingKey
 from mapadroid.ocr.pogoWindows import PogoWindows
+from mapadroid.ocr.Screenshot import Screenshot
 from mapadroid.ocr.screen_type import ScreenType
 from mapadroid.ocr.screenPath import LoginType, WordToScreenMatching
 from mapadroid.utils.collections import Location, ScreenCoordinates
@@ -204,11 +205,11 @@ class AbstractWorkerStrategy(ABC):
         Return the state as a boolean do indicate a successful start
         :return:
         """
-        pogo_topmost = await self._communicator.is_pogo_topmost()
+        screen_on, pogo_topmost = await self._communicator.is_screen_on_and_pogo_topmost()
         if pogo_topmost:
             return True
 
-        if not await self._communicator.is_screen_on():
+        if not screen_on:
             await self._communicator.start_app("de.grennith.rgc.remotegpscontroller")
             logger.info("Turning screen on")
             await self._communicator.turn_screen_on()
@@ -535,13 +536,13 @@ class AbstractWorkerStrategy(ABC):
                 return False
         attempts = 0
 
-        screenshot_path = await self.get_screenshot_path()
-        if os.path.isdir(screenshot_path):
-            logger.error("_check_pogo_main_screen: screenshot.png/.jpg is not a file/corrupted")
+        if self._worker_state.last_screenshot is None:
+            logger.error("_check_pogo_main_screen: no screenshot available")
             return False
 
         logger.debug("_check_pogo_main_screen: checking mainscreen")
-        while not await self._pogo_windows_handler.check_pogo_mainscreen(screenshot_path, self._worker_state.origin):
+        while not await self._pogo_windows_handler.check_pogo_mainscreen(self._worker_state.last_screenshot,
+                                                                         self._worker_state.origin):
             logger.info("_check_pogo_main_screen: not on Mainscreen...")
             if attempts == max_attempts:
                 # could not reach raidtab in given max_attempts
@@ -549,21 +550,22 @@ class AbstractWorkerStrategy(ABC):
                                max_attempts)
                 return False
 
+            screenshot: Screenshot = self._worker_state.last_screenshot
             found: List[ScreenCoordinates] = await self._pogo_windows_handler.check_close_except_nearby_button(
-                await self.get_screenshot_path(), self._worker_state.origin, close_raid=True)
+                screenshot, self._worker_state.origin, close_raid=True)
             if found:
                 logger.debug("_check_pogo_main_screen: Found (X) button (except nearby)")
                 await self._communicator.click(found[0].x, found[0].y)
                 await asyncio.sleep(2)
             else:
                 button_coords: Optional[ScreenCoordinates] = await self._pogo_windows_handler \
-                    .look_for_button(screenshot_path, 2.20, 3.01)
+                    .look_for_button(screenshot, 2.20, 3.01)
                 if button_coords:
                     logger.debug("_check_pogo_main_screen: Found button (small)")
                     await self._communicator.click(button_coords.x, button_coords.y)
                     await asyncio.sleep(2)
                     return True
-                button_coords = await self._pogo_windows_handler.look_for_button(screenshot_path, 1.05, 2.20)
+                button_coords = await self._pogo_windows_handler.look_for_button(screenshot, 1.05, 2.20)
                 if button_coords:
                     logger.debug("_check_pogo_main_screen: Found button (big)")
                     await self._communicator.click(button_coords.x, button_coords.y)
@@ -592,13 +594,17 @@ class AbstractWorkerStrategy(ABC):
         screenshot_quality: int = await self.get_devicesettings_value(MappingManagerDevicemappingKey.SCREENSHOT_QUALITY,
                                                                       80)
 
-        take_screenshot = await self._communicator.get_screenshot(await self.get_screenshot_path(fileaddon=errorscreen),
-                                                                  screenshot_quality, screenshot_type)
+        screenshot_data: Optional[bytes] = await self._communicator.get_screenshot_data(screenshot_quality,
+                                                                                        screenshot_type)
+        if screenshot_data is not None:
+            self._worker_state.last_screenshot = Screenshot(screenshot_data, screenshot_type)
+            if errorscreen or MadGlobals.application_args.save_worker_screenshots:
+                await self._worker_state.last_screenshot.save(await self.get_screenshot_path(fileaddon=errorscreen))
 
         if self._worker_state.last_screenshot_taken_at and time_since_last_screenshot < 0.5:
             logger.info("screenshot taken recently, returning immediately")
             return True
-        elif not take_screenshot:
+        elif screenshot_data is None:
             logger.warning("Failed retrieving screenshot")
             return False
         else:
@@ -1,6 +1,5 @@
 import asyncio
 import math
-import os
 import time
 from abc import ABC, abstractmethod
 from datetime import timedelta
@@ -437,23 +436,23 @@ class QuestStrategy(AbstractMitmBaseStrategy, ABC):
                                                                  1)):
             logger.debug("checkPogoButton: Failed getting screenshot")
             return False
-        # TODO: os operation asyncio?
-        if os.path.isdir(await self.get_screenshot_path()):
-            logger.error("checkPogoButton: screenshot.png is not a file/corrupted")
+        screenshot = self._worker_state.last_screenshot
+        if screenshot is None:
+            logger.error("checkPogoButton: no screenshot available")
             return False
 
         logger.debug("checkPogoButton: checking for buttons")
         # TODO: need to be non-blocking
         found: bool = False
         coordinates: Optional[ScreenCoordinates] = await self._pogo_windows_handler \
-            .look_for_button(await self.get_screenshot_path(), 2.20, 3.01)
+            .look_for_button(screenshot, 2.20, 3.01)
         if coordinates:
             await self._communicator.click(coordinates.x, coordinates.y)
             await asyncio.sleep(1)
             logger.debug("checkPogoButton: Found button (small)")
         else:
             coordinates: Optional[ScreenCoordinates] = await self._pogo_windows_handler \
-                .look_for_button(await self.get_screenshot_path(), 1.05, 2.20)
+                .look_for_button(screenshot, 1.05, 2.20)
             if coordinates:
                 await self._communicator.click(coordinates.x, coordinates.y)
                 await asyncio.sleep(1)
@@ -473,13 +472,12 @@ class QuestStrategy(AbstractMitmBaseStrategy, ABC):
                 logger.debug("checkPogoClose: Could not get screenshot")
                 return False
 
-        # TODO: Async...
-        if os.path.isdir(await self.get_screenshot_path()):
-            logger.error("checkPogoClose: screenshot.png is not a file/corrupted")
+        if self._worker_state.last_screenshot is None:
+            logger.error("checkPogoClose: no screenshot available")
             return False
 
         logger.debug("checkPogoClose: checking for CloseX")
-        found = await self._pogo_windows_handler.check_close_except_nearby_button(await self.get_screenshot_path(),
+        found = await self._pogo_windows_handler.check_close_except_nearby_button(self._worker_state.last_screenshot,
                                                                                   self._worker_state.origin)
         if found:
             await self._communicator.click(found[0].x, found[0].y)
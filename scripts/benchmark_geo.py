@@ -0,0 +1,102 @@
+"""
+Compares the batch (numpy) geo functions with their scalar counterparts on random coords and checks both return the
+same results.
+
+Usage (from the root of MAD): python scripts/benchmark_geo.py --coords 20000 --rounds 3
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+import s2sphere
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mapadroid.utils.geo import (get_distance_matrix_in_meters,  # noqa: E402
+                                 get_distance_of_two_points_in_meters,
+                                 get_distances_in_meters, get_nearest)
+from mapadroid.utils.s2Helper import S2Helper  # noqa: E402
+
+# Area the random coords are spread across (roughly 20 x 20 km)
+CENTER: Tuple[float, float] = (50.0, 8.0)
+SPREAD: float = 0.1
+
+
+def measure(function: Callable, rounds: int):
+    durations: List[float] = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+    return result, min(durations)
+
+
+def report(name: str, scalar_duration: float, batch_duration: float, matching: bool) -> None:
+    print("{: <24} scalar {:9.4f}s  batch {:9.4f}s  speedup {:8.1f}x  {}"
+          .format(name, scalar_duration, batch_duration,
+                  scalar_duration / batch_duration if batch_duration else 0,
+                  "identical" if matching else "MISMATCH"))
+
+
+def run(amount: int, rounds: int) -> None:
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(CENTER[0] - SPREAD, CENTER[0] + SPREAD, amount)
+    lngs = rng.uniform(CENTER[1] - SPREAD, CENTER[1] + SPREAD, amount)
+    lat_list: List[float] = lats.tolist()
+    lng_list: List[float] = lngs.tolist()
+
+    scalar, scalar_duration = measure(lambda: [get_distance_of_two_points_in_meters(CENTER[0], CENTER[1], lat, lng)
+                                               for lat, lng in zip(lat_list, lng_list)], rounds)
+    batch, batch_duration = measure(lambda: get_distances_in_meters(CENTER[0], CENTER[1], lats, lngs), rounds)
+    report("distance row", scalar_duration, batch_duration, np.allclose(scalar, batch, rtol=0, atol=1e-6))
+
+    matrix_size: int = min(amount, 1000)
+    scalar, scalar_duration = measure(lambda: [[get_distance_of_two_points_in_meters(lat, lng, other_lat, other_lng)
+                                                for other_lat, other_lng in zip(lat_list[:matrix_size],
+                                                                                lng_list[:matrix_size])]
+                                               for lat, lng in zip(lat_list[:matrix_size], lng_list[:matrix_size])],
+                                      rounds)
+    batch, batch_duration = measure(lambda: get_distance_matrix_in_meters(lats[:matrix_size], lngs[:matrix_size]),
+                                    rounds)
+    report("distance matrix {}".format(matrix_size), scalar_duration, batch_duration,
+           np.allclose(scalar, batch, rtol=0, atol=1e-6))
+
+    def nearest_scalar() -> int:
+        distances = [get_distance_of_two_points_in_meters(CENTER[0], CENTER[1], lat, lng)
+                     for lat, lng in zip(lat_list, lng_list)]
+        return distances.index(min(distances))
+    scalar, scalar_duration = measure(nearest_scalar, rounds)
+    batch, batch_duration = measure(lambda: get_nearest(CENTER[0], CENTER[1], lats, lngs)[0], rounds)
+    report("nearest neighbour", scalar_duration, batch_duration, scalar == batch)
+
+    for level in (10, 15, 17):
+        scalar, scalar_duration = measure(lambda: [S2Helper.lat_lng_to_cell_id(lat, lng, level)
+                                                   for lat, lng in zip(lat_list, lng_list)], rounds)
+        batch, batch_duration = measure(lambda: S2Helper.lat_lng_to_cell_ids(lats, lngs, level), rounds)
+        report("cell ID level {}".format(level), scalar_duration, batch_duration,
+               np.array_equal(np.array(scalar, dtype=np.uint64), batch))
+
+    def in_circle_scalar() -> List[bool]:
+        region = s2sphere.CellUnion(S2Helper.get_s2cells_from_circle(CENTER[0], CENTER[1], 5000, 15))
+        return [region.contains(s2sphere.LatLng.from_degrees(lat, lng).to_point())
+                for lat, lng in zip(lat_list, lng_list)]
+
+    def in_circle_batch():
+        covering = S2Helper.get_cell_ids_from_circle(CENTER[0], CENTER[1], 5000, 15)
+        return np.isin(S2Helper.lat_lng_to_cell_ids(lats, lngs, 15), covering)
+    scalar, scalar_duration = measure(in_circle_scalar, rounds)
+    batch, batch_duration = measure(in_circle_batch, rounds)
+    report("inside cell cover", scalar_duration, batch_duration, np.array_equal(np.array(scalar), batch))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coords", type=int, default=20000, help="Amount of random coords. Default: 20000")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Rounds per function, the fastest round is reported. Default: 3")
+    args = parser.parse_args()
+    run(args.coords, args.rounds)
@@ -0,0 +1,65 @@
+"""
+Compares the staged screen detection (hash cache, OCR of the region of interest, full OCR) with running the full OCR
+only on a corpus of screenshots.
+
+Usage (from the root of MAD): python scripts/benchmark_screen_detection.py /path/to/screenshots --rounds 3
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mapadroid.ocr.screen_type import ScreenType  # noqa: E402
+from mapadroid.ocr.utils import (clear_screen_detection_cache,  # noqa: E402
+                                 screendetection_get_type_internal)
+
+IMAGE_ENDINGS = (".jpg", ".jpeg", ".png")
+
+
+def detect(path: str, staged: bool) -> Tuple[Optional[ScreenType], float]:
+    start = time.perf_counter()
+    result = screendetection_get_type_internal(path, "benchmark", staged=staged)
+    return (result[0] if result is not None else None), time.perf_counter() - start
+
+
+def run(corpus: List[str], rounds: int) -> None:
+    legacy_types: Dict[str, Optional[ScreenType]] = {}
+    legacy_duration: float = 0
+    for path in corpus:
+        legacy_types[path], duration = detect(path, staged=False)
+        legacy_duration += duration
+    print("Full OCR: {:.3f}s total, {:.3f}s per screenshot".format(legacy_duration, legacy_duration / len(corpus)))
+    print("Detected: {}".format(dict(Counter(str(screen_type) for screen_type in legacy_types.values()))))
+
+    clear_screen_detection_cache()
+    for round_number in range(1, rounds + 1):
+        staged_duration: float = 0
+        mismatches: List[str] = []
+        for path in corpus:
+            screen_type, duration = detect(path, staged=True)
+            staged_duration += duration
+            if screen_type != legacy_types[path]:
+                mismatches.append("{}: {} (full OCR: {})".format(path, screen_type, legacy_types[path]))
+        print("Staged round {}: {:.3f}s total, {:.3f}s per screenshot, speedup {:.2f}x, {} mismatches"
+              .format(round_number, staged_duration, staged_duration / len(corpus),
+                      legacy_duration / staged_duration if staged_duration else 0, len(mismatches)))
+        for mismatch in mismatches:
+            print("  " + mismatch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory containing screenshots (jpg/png) taken by workers")
+    parser.add_argument("--rounds", type=int, default=2,
+                        help="Rounds of the staged detection. Rounds after the first one are served by the hash "
+                             "cache. Default: 2")
+    args = parser.parse_args()
+    screenshots: List[str] = sorted(os.path.join(args.corpus, filename) for filename in os.listdir(args.corpus)
+                                    if filename.lower().endswith(IMAGE_ENDINGS))
+    if not screenshots:
+        sys.exit("No screenshots found in {}".format(args.corpus))
+    run(screenshots, args.rounds)
@@ -33,11 +33,14 @@ from mapadroid.ocr.pogoWindows import PogoWindows
 from mapadroid.plugins.pluginBase import PluginCollection
 from mapadroid.updater.updater import DeviceUpdater
 from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
+from mapadroid.utils.EventLoopMonitor import event_loop_monitor
+from mapadroid.utils.LocalMetricsServer import LocalMetricsProcess, LocalMetricsServer, start_local_metrics_server
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.pogoevent import PogoEvent
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.rarity import Rarity
+from mapadroid.utils.StartupProfiler import startup_profiler
 from mapadroid.utils.SystemStatsUtil import get_system_infos
 from mapadroid.webhook.webhookworker import WebhookWorker
 from mapadroid.websocket.WebsocketServer import WebsocketServer
@@ -66,7 +69,11 @@ async def start():
     webhook_task: Optional[Task] = None
     webhook_worker: Optional[WebhookWorker] = None
     t_usage: Optional[Task] = None
+    local_metrics_server: Optional[LocalMetricsServer] = None
     setup_runtime()
+    if not MadGlobals.application_args.disable_event_loop_monitor:
+        event_loop_monitor.start(MadGlobals.application_args.event_loop_slow_threshold)
+    local_metrics_server = await start_local_metrics_server(LocalMetricsProcess.MAD)
 
     if MadGlobals.application_args.config_mode:
         logger.info('Starting MAD in config mode')
@@ -81,23 +88,28 @@ async def start():
                      " -or    ---- only calculate routes")
         sys.exit(1)
     # Elements that should initialized regardless of the functionality being used
-    db_wrapper, db_exec = await DbFactory.get_wrapper(MadGlobals.application_args)
+    with startup_profiler.phase("database"):
+        db_wrapper, db_exec = await DbFactory.get_wrapper(MadGlobals.application_args)
 
     # TODO: MADPatcher(args, data_manager)
     #  data_manager.clear_on_boot()
     #  data_manager.fix_routecalc_on_boot()
-    event = PogoEvent(MadGlobals.application_args, db_wrapper)
-    await event.start_event_checker()
+    with startup_profiler.phase("event checker"):
+        event = PogoEvent(MadGlobals.application_args, db_wrapper)
+        await event.start_event_checker()
     # Do not remove this sleep unless you have solved the race condition on boot with the logger
     await asyncio.sleep(.1)
-    account_handler: AbstractAccountHandler = await setup_account_handler(db_wrapper)
-    mapping_manager: MappingManager = MappingManager(db_wrapper,
-                                                     account_handler=account_handler,
-                                                     configmode=MadGlobals.application_args.config_mode)
-    await mapping_manager.setup()
-    # Start MappingManagerServer in order to attach more mitmreceivers (minor scalability)
-    mapping_manager_grpc_server = MappingManagerServer(mapping_manager)
-    await mapping_manager_grpc_server.start()
+    with startup_profiler.phase("account handler"):
+        account_handler: AbstractAccountHandler = await setup_account_handler(db_wrapper)
+    with startup_profiler.phase("mapping manager"):
+        # Routes of the areas are prepared in the background afterwards
+        mapping_manager: MappingManager = MappingManager(db_wrapper,
+                                                         account_handler=account_handler,
+                                                         configmode=MadGlobals.application_args.config_mode)
+        await mapping_manager.setup()
+        # Start MappingManagerServer in order to attach more mitmreceivers (minor scalability)
+        mapping_manager_grpc_server = MappingManagerServer(mapping_manager)
+        await mapping_manager_grpc_server.start()
 
     if MadGlobals.application_args.only_routes:
         logger.info('Running in route recalculation mode. MAD will exit once complete')
@@ -109,58 +121,68 @@ async def start():
         logger.info("Done calculating routes!")
         # TODO: shutdown managers properly...
         sys.exit(0)
-    storage_elem = await get_storage_obj(db_wrapper)
+    with startup_profiler.phase("apk storage"):
+        storage_elem = await get_storage_obj(db_wrapper)
     if not MadGlobals.application_args.config_mode:
-        pogo_win_manager = PogoWindows(MadGlobals.application_args.temp_path,
-                                       MadGlobals.application_args.ocr_thread_count)
-        if MadGlobals.application_args.mitmmapper_type == MitmMapperType.grpc:
-            mitm_mapper: MitmMapperServer = MitmMapperServer()
-            await mitm_mapper.start()
-        elif MadGlobals.application_args.mitmmapper_type == MitmMapperType.redis:
-            mitm_mapper: RedisMitmMapper = RedisMitmMapper(db_wrapper)
-            # TODO... stats_handler needs to be handled using the MitmMapperServer (essentially that one needs to be split off)
-            await mitm_mapper.start()
-        else:
-            logger.info("Standalone stats and mitmmapper mode")
-            mitm_mapper: StandaloneMitmMapperAndStatsHandler = StandaloneMitmMapperAndStatsHandler(db_wrapper)
-            await mitm_mapper.start()
+        with startup_profiler.phase("mitm mapper"):
+            pogo_win_manager = PogoWindows(MadGlobals.application_args.temp_path,
+                                           MadGlobals.application_args.ocr_thread_count)
+            if MadGlobals.application_args.mitmmapper_type == MitmMapperType.grpc:
+                mitm_mapper: MitmMapperServer = MitmMapperServer()
+                await mitm_mapper.start()
+            elif MadGlobals.application_args.mitmmapper_type == MitmMapperType.redis:
+                mitm_mapper: RedisMitmMapper = RedisMitmMapper(db_wrapper)
+                # TODO... stats_handler needs to be handled using the MitmMapperServer (essentially that one needs to be split off)
+                await mitm_mapper.start()
+            else:
+                logger.info("Standalone stats and mitmmapper mode")
+                mitm_mapper: StandaloneMitmMapperAndStatsHandler = StandaloneMitmMapperAndStatsHandler(db_wrapper)
+                await mitm_mapper.start()
 
-    quest_gen: QuestGen = QuestGen()
-    await quest_gen.setup()
-    stats_handler: StatsHandlerServer = StatsHandlerServer(db_wrapper)
-    await stats_handler.start()
+    with startup_profiler.phase("quest generator"):
+        quest_gen: QuestGen = QuestGen()
+        await quest_gen.setup()
+    with startup_profiler.phase("stats handler"):
+        stats_handler: StatsHandlerServer = StatsHandlerServer(db_wrapper)
+        await stats_handler.start()
 
-    mitm_data_processor_manager = InProcessMitmDataProcessorManager(mitm_mapper, stats_handler, db_wrapper, quest_gen,
-                                                                    account_handler=account_handler)
-    await mitm_data_processor_manager.launch_processors()
+    with startup_profiler.phase("mitm data processors"):
+        mitm_data_processor_manager = InProcessMitmDataProcessorManager(mitm_mapper, stats_handler, db_wrapper,
+                                                                        quest_gen, account_handler=account_handler)
+        await mitm_data_processor_manager.launch_processors()
 
-    mitm_receiver = MITMReceiver(mitm_mapper, mapping_manager, db_wrapper,
-                                 storage_elem,
-                                 mitm_data_processor_manager.get_queue(),
-                                 account_handler=account_handler)
-    mitm_receiver_task: web.AppRunner = await mitm_receiver.start()
+    with startup_profiler.phase("mitm receiver"):
+        mitm_receiver = MITMReceiver(mitm_mapper, mapping_manager, db_wrapper,
+                                     storage_elem,
+                                     mitm_data_processor_manager.get_queue(),
+                                     account_handler=account_handler)
+        mitm_receiver_task: web.AppRunner = await mitm_receiver.start()
     logger.info('Starting websocket server on port {}'.format(str(MadGlobals.application_args.ws_port)))
-    ws_server = WebsocketServer(args=MadGlobals.application_args,
-                                mitm_mapper=mitm_mapper,
-                                stats_handler=stats_handler,
-                                db_wrapper=db_wrapper,
-                                mapping_manager=mapping_manager,
-                                pogo_window_manager=pogo_win_manager,
-                                event=event,
-                                account_handler=account_handler,
-                                enable_configmode=MadGlobals.application_args.config_mode)
-    # TODO: module/service?
-    await ws_server.start_server()
+    with startup_profiler.phase("websocket server"):
+        ws_server = WebsocketServer(args=MadGlobals.application_args,
+                                    mitm_mapper=mitm_mapper,
+                                    stats_handler=stats_handler,
+                                    db_wrapper=db_wrapper,
+                                    mapping_manager=mapping_manager,
+                                    pogo_window_manager=pogo_win_manager,
+                                    event=event,
+                                    account_handler=account_handler,
+                                    enable_configmode=MadGlobals.application_args.config_mode)
+        # TODO: module/service?
+        await ws_server.start_server()
 
-    device_updater = DeviceUpdater(ws_server, db_wrapper, storage_elem)
-    await device_updater.start_updater()
+    with startup_profiler.phase("device updater"):
+        device_updater = DeviceUpdater(ws_server, db_wrapper, storage_elem)
+        await device_updater.start_updater()
     if not MadGlobals.application_args.config_mode:
         if MadGlobals.application_args.webhook:
-            rarity = Rarity(MadGlobals.application_args, db_wrapper)
-            await rarity.start_dynamic_rarity()
-            webhook_worker = WebhookWorker(MadGlobals.application_args, db_wrapper, mapping_manager, rarity, quest_gen)
-            webhook_task: Task = await webhook_worker.start()
-            # TODO: Stop webhook_task properly
+            with startup_profiler.phase("webhook worker"):
+                rarity = Rarity(MadGlobals.application_args, db_wrapper)
+                await rarity.start_dynamic_rarity()
+                webhook_worker = WebhookWorker(MadGlobals.application_args, db_wrapper, mapping_manager, rarity,
+                                               quest_gen)
+                webhook_task: Task = await webhook_worker.start()
+                # TODO: Stop webhook_task properly
 
 
 
@@ -181,25 +203,29 @@ async def start():
         'mitm_data_processor_manager': mitm_data_processor_manager
     }
 
-    mad_plugins = PluginCollection('plugins', plugin_parts)
-    madmin = MADmin(db_wrapper, ws_server, mapping_manager, device_updater, storage_elem,
-                    quest_gen, account_handler)
-    plugin_parts["madmin"] = madmin
-    await mad_plugins.finish_init()
+    with startup_profiler.phase("plugins"):
+        mad_plugins = PluginCollection('plugins', plugin_parts)
+        madmin = MADmin(db_wrapper, ws_server, mapping_manager, device_updater, storage_elem,
+                        quest_gen, account_handler)
+        plugin_parts["madmin"] = madmin
+        await mad_plugins.finish_init()
     # MADmin needs to be started after sub-applications (plugins) have been added
 
     if not MadGlobals.application_args.disable_madmin or MadGlobals.application_args.config_mode:
         logger.info("Starting Madmin on port {}", str(MadGlobals.application_args.madmin_port))
-        madmin_app_runner = await madmin.madmin_start()
+        with startup_profiler.phase("madmin"):
+            madmin_app_runner = await madmin.madmin_start()
 
     if MadGlobals.application_args.statistic:
         logger.info("Starting statistics collector")
         loop = asyncio.get_running_loop()
         t_usage = loop.create_task(get_system_infos(db_wrapper))
 
-    db_cleanup: DbCleanup = DbCleanup(db_wrapper)
-    await db_cleanup.start()
+    with startup_profiler.phase("database cleanup"):
+        db_cleanup: DbCleanup = DbCleanup(db_wrapper)
+        await db_cleanup.start()
     logger.info("MAD is now running.....")
+    startup_profiler.log_summary()
     exit_code = 0
     try:
         while True:
@@ -210,6 +236,9 @@ async def start():
         try:
             logger.success("Stop called")
             terminate_mad.set()
+            event_loop_monitor.stop()
+            if local_metrics_server:
+                await local_metrics_server.stop()
             # now cleanup all threads...
             # TODO: check against args or init variables to None...
             if mitm_receiver:
@@ -252,6 +281,7 @@ async def start():
 
 
 if __name__ == "__main__":
+    startup_profiler.record_since_process_start("interpreter and imports")
     MadGlobals.load_args()
     os.environ['LANGUAGE'] = MadGlobals.application_args.language
     if MadGlobals.application_args.omp_thread_limit:
@@ -31,6 +31,8 @@ from mapadroid.ocr.pogoWindows import PogoWindows
 from mapadroid.plugins.pluginBase import PluginCollection
 from mapadroid.updater.updater import DeviceUpdater
 from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
+from mapadroid.utils.EventLoopMonitor import event_loop_monitor
+from mapadroid.utils.LocalMetricsServer import LocalMetricsProcess, LocalMetricsServer, start_local_metrics_server
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.pogoevent import PogoEvent
@@ -64,8 +66,12 @@ async def start():
     webhook_task: Optional[Task] = None  # Thread for WebHooks
     webhook_worker: Optional[WebhookWorker] = None
     t_usage: Optional[Task] = None
+    local_metrics_server: Optional[LocalMetricsServer] = None
 
     setup_runtime()
+    if not MadGlobals.application_args.disable_event_loop_monitor:
+        event_loop_monitor.start(MadGlobals.application_args.event_loop_slow_threshold)
+    local_metrics_server = await start_local_metrics_server(LocalMetricsProcess.CORE)
     if MadGlobals.application_args.config_mode:
         logger.info('Starting MAD in config mode')
     else:
@@ -198,6 +204,9 @@ async def start():
         try:
             logger.success("Stop called")
             terminate_mad.set()
+            event_loop_monitor.stop()
+            if local_metrics_server:
+                await local_metrics_server.stop()
             # now cleanup all threads...
             # TODO: check against args or init variables to None...
             if t_usage:
@@ -7,6 +7,8 @@ from typing import Optional
 from mapadroid.data_handler.grpc.StatsHandlerServer import StatsHandlerServer
 from mapadroid.db.DbFactory import DbFactory
 from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
+from mapadroid.utils.EventLoopMonitor import event_loop_monitor
+from mapadroid.utils.LocalMetricsServer import LocalMetricsProcess, LocalMetricsServer, start_local_metrics_server
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.SystemStatsUtil import get_system_infos
@@ -29,8 +31,12 @@ if py_version.major < 3 or (py_version.major == 3 and py_version.minor < 9):
 
 async def start():
     t_usage: Optional[Task] = None
+    local_metrics_server: Optional[LocalMetricsServer] = None
 
     setup_runtime()
+    if not MadGlobals.application_args.disable_event_loop_monitor:
+        event_loop_monitor.start(MadGlobals.application_args.event_loop_slow_threshold)
+    local_metrics_server = await start_local_metrics_server(LocalMetricsProcess.STATS_HANDLER)
     if MadGlobals.application_args.config_mode and MadGlobals.application_args.only_routes:
         logger.error('Unable to run with config_mode and only_routes.  Only use one option')
         sys.exit(1)
@@ -60,6 +66,9 @@ async def start():
         try:
             logger.success("Stop called")
             terminate_mad.set()
+            event_loop_monitor.stop()
+            if local_metrics_server:
+                await local_metrics_server.stop()
             # now cleanup all threads...
             if t_usage:
                 t_usage.cancel()
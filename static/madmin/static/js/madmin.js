@@ -25,6 +25,19 @@ let locInjectBtn = L.easyButton({
     }]
 });
 
+// Rebuilds the objects of responses requested with layout=columnar ({"id": [...], "lat": [...]})
+function rowsOfColumns(columns) {
+    const keys = Object.keys(columns);
+    const count = keys.length > 0 ? columns[keys[0]].length : 0;
+    const rows = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const row = {};
+        keys.forEach(function (key) { row[key] = columns[key][i]; });
+        rows[i] = row;
+    }
+    return rows;
+}
+
 function copyClipboard(text) {
     navigator.clipboard.writeText(text.replace("|", ",")).then(function () {
         alert('Copying to clipboard was successful!');
@@ -116,6 +129,7 @@ let init = true;
 let fetchTimeout = null;
 let clickToScanActive = false;
 let cleanupInterval = null;
+let stateFeed = null;
 const teamNames = ["Uncontested", "Mystic", "Valor", "Instinct"];
 const iconBasePath = "https://raw.githubusercontent.com/whitewillem/PogoAssets/resized/icons_large";
 
@@ -379,51 +393,87 @@ new Vue({
         map_fetch_everything(force_update_all = false) {
             const urlFilter = this.buildUrlFilter(false, force_update_all);
 
-            this.map_fetch_workers();
+            // workers, routes and prio queues are pushed by the state feed while it is connected
+            const stateFeedOpen = stateFeed !== null && stateFeed.readyState === EventSource.OPEN;
+
+            if (!stateFeedOpen) {
+                this.map_fetch_workers();
+            }
             this.map_fetch_gyms(urlFilter);
-            this.map_fetch_routes();
+            if (!stateFeedOpen) {
+                this.map_fetch_routes();
+            }
             this.map_fetch_geofences();
             this.map_fetch_areas();
             this.map_fetch_spawns(urlFilter);
             this.map_fetch_quests(urlFilter);
             this.map_fetch_stops(urlFilter);
             this.map_fetch_mons(urlFilter);
-            this.map_fetch_prioroutes();
+            if (!stateFeedOpen) {
+                this.map_fetch_prioroutes();
+            }
             this.map_fetch_cells(urlFilter);
 
             this.updateBounds(true);
         },
-        map_fetch_workers() {
-            this.mapGuardedFetch("workers", "get_workers", function (res) {
-                res.data.forEach(function (worker) {
-                    const name = worker["name"];
+        map_subscribe_state_feed() {
+            if (typeof EventSource === "undefined") {
+                return;
+            }
 
-                    if (this.workers[name]) {
-                        leaflet_data.workers[name].setLatLng([worker["lat"], worker["lon"]])
-                    }
-                    else {
-                        this.workers[name] = worker;
-
-                        leaflet_data.workers[name] = L.circleMarker([worker["lat"], worker["lon"]], {
-                            radius: 7,
-                            color: "#E612CB",
-                            fillColor: "#E612CB",
-                            weight: 1,
-                            opacity: 0.9,
-                            fillOpacity: 0.9,
-                            pane: layerOrders.workers.pane,
-                            pmIgnore: true,
-                        }).bindPopup(name);
-
-                        this.addMouseEventPopup(leaflet_data.workers[name]);
-
-                        if (this.layers.stat.workers) {
-                            this.mapAddLayer(leaflet_data.workers[name], layerOrders.workers.bringTo);
-                        }
+            stateFeed = new EventSource("state_feed?topics=workers,routes,prioroutes");
+            stateFeed.addEventListener("workers", function (event) {
+                const data = JSON.parse(event.data);
+                this.map_apply_workers(data.changed);
+                data.removed.forEach(function (name) {
+                    if (leaflet_data.workers[name]) {
+                        map.removeLayer(leaflet_data.workers[name]);
+                        delete leaflet_data.workers[name];
                     }
+                    delete this.workers[name];
                 }, this);
+            }.bind(this));
+            stateFeed.addEventListener("routes", function (event) {
+                this.map_apply_routes(JSON.parse(event.data).changed);
+            }.bind(this));
+            stateFeed.addEventListener("prioroutes", function (event) {
+                this.map_apply_prioroutes(JSON.parse(event.data).changed);
+            }.bind(this));
+        },
+        map_fetch_workers() {
+            this.mapGuardedFetch("workers", "get_workers", function (res) {
+                this.map_apply_workers(res.data);
             });
         },
+        map_apply_workers(workers) {
+            workers.forEach(function (worker) {
+                const name = worker["name"];
+
+                if (this.workers[name]) {
+                    leaflet_data.workers[name].setLatLng([worker["lat"], worker["lon"]])
+                }
+                else {
+                    this.workers[name] = worker;
+
+                    leaflet_data.workers[name] = L.circleMarker([worker["lat"], worker["lon"]], {
+                        radius: 7,
+                        color: "#E612CB",
+                        fillColor: "#E612CB",
+                        weight: 1,
+                        opacity: 0.9,
+                        fillOpacity: 0.9,
+                        pane: layerOrders.workers.pane,
+                        pmIgnore: true,
+                    }).bindPopup(name);
+
+                    this.addMouseEventPopup(leaflet_data.workers[name]);
+
+                    if (this.layers.stat.workers) {
+                        this.mapAddLayer(leaflet_data.workers[name], layerOrders.workers.bringTo);
+                    }
+                }
+            }, this);
+        },
         map_fetch_gyms(urlFilter) {
             if (!this.layers.stat.gyms) {
                 return;
@@ -523,135 +573,141 @@ new Vue({
         },
         map_fetch_routes() {
             this.mapGuardedFetch("routes", "get_route", function (res) {
-                res.data.forEach(function (route) {
-                    route.editableId = route.id
-
-                    let hasUnappliedCounterpart = false;
-                    if (Array.isArray(route.subroutes)) {
-                        route.subroutes.forEach(function (subroute) {
-                            subroute.mode = route.mode;
-                            if (subroute.tag === "unapplied") {
-                                hasUnappliedCounterpart = true;
-                                subroute.editableId = route.id;
-                            }
-                        }, this);
-                    }
+                this.map_apply_routes(res.data);
+            });
+        },
+        map_apply_routes(routes) {
+            routes.forEach(function (route) {
+                route.editableId = route.id
+
+                let hasUnappliedCounterpart = false;
+                if (Array.isArray(route.subroutes)) {
+                    route.subroutes.forEach(function (subroute) {
+                        subroute.mode = route.mode;
+                        if (subroute.tag === "unapplied") {
+                            hasUnappliedCounterpart = true;
+                            subroute.editableId = route.id;
+                        }
+                    }, this);
+                }
 
-                    const settingPrefix = "layers-dyn-routes-";
-                    const routeSettingName = settingPrefix + route.id;
-                    let show = this.getStoredSetting(routeSettingName, false);
+                const settingPrefix = "layers-dyn-routes-";
+                const routeSettingName = settingPrefix + route.id;
+                let show = this.getStoredSetting(routeSettingName, false);
 
-                    // if the unapplied route was visible last time, but has been applied since, show the normal route instead
-                    if (!hasUnappliedCounterpart) {
-                        const unappliedRouteSettingName = routeSettingName + "_unapplied";
-                        show = show || this.getStoredSetting(unappliedRouteSettingName, false);
-                        this.updateStoredSetting(routeSettingName, show);
-                        this.removeStoredSetting(unappliedRouteSettingName);
-                    }
+                // if the unapplied route was visible last time, but has been applied since, show the normal route instead
+                if (!hasUnappliedCounterpart) {
+                    const unappliedRouteSettingName = routeSettingName + "_unapplied";
+                    show = show || this.getStoredSetting(unappliedRouteSettingName, false);
+                    this.updateStoredSetting(routeSettingName, show);
+                    this.removeStoredSetting(unappliedRouteSettingName);
+                }
 
-                    this.mapAddRoute(route, show);
+                this.mapAddRoute(route, show);
 
-                    if (Array.isArray(route.subroutes)) {
-                         route.subroutes.forEach(function (subroute) {
-                             this.mapAddRoute(subroute, this.getStoredSetting(settingPrefix + subroute.id, false));
-                         }, this);
-                     }
-                }, this);
-            });
+                if (Array.isArray(route.subroutes)) {
+                     route.subroutes.forEach(function (subroute) {
+                         this.mapAddRoute(subroute, this.getStoredSetting(settingPrefix + subroute.id, false));
+                     }, this);
+                 }
+            }, this);
         },
         map_fetch_prioroutes() {
             this.mapGuardedFetch("prioroutes", "get_prioroute", function (res) {
-                res.data.forEach(function (route) {
-                    const name = route.name;
-
-                    if (this.layers.dyn.prioroutes[name]) {
-                        map.removeLayer(leaflet_data.prioroutes[name]);
-                    }
-
-                    let mode;
-                    let cradius;
-
-                    if (route.mode === "mon_mitm" || route.mode === "iv_mitm") {
-                        mode = "mons";
-                        cradius = this.settings.routes.coordinateRadius.mons;
-                    }
-                    else if (route.mode === "pokestops") {
-                        mode = "quests";
-                        cradius = this.settings.routes.coordinateRadius.quests;
-                    }
-                    else if (route.mode === "raids_mitm") {
-                        mode = "raids";
-                        cradius = this.settings.routes.coordinateRadius.raids;
-                    }
+                this.map_apply_prioroutes(res.data);
+            });
+        },
+        map_apply_prioroutes(routes) {
+            routes.forEach(function (route) {
+                const name = route.name;
 
-                    const linecoords = [];
-                    const group = L.layerGroup();
+                if (this.layers.dyn.prioroutes[name]) {
+                    map.removeLayer(leaflet_data.prioroutes[name]);
+                }
 
-                    // only display first 10 entries of the queue
-                    const now = Math.round((new Date()).getTime() / 1000);
-                    route.coordinates.slice(0, 14).forEach(function (coord, index) {
-                        const until = coord.timestamp - now;
-                        let hue;
-                        let sat;
+                let mode;
+                let cradius;
 
-                        if (until < 0) {
-                            hue = 0;
-                            sat = 100;
-                        }
-                        else {
-                            hue = 120;
-                            sat = (index * 100) / 15;
-                        }
+                if (route.mode === "mon_mitm" || route.mode === "iv_mitm") {
+                    mode = "mons";
+                    cradius = this.settings.routes.coordinateRadius.mons;
+                }
+                else if (route.mode === "pokestops") {
+                    mode = "quests";
+                    cradius = this.settings.routes.coordinateRadius.quests;
+                }
+                else if (route.mode === "raids_mitm") {
+                    mode = "raids";
+                    cradius = this.settings.routes.coordinateRadius.raids;
+                }
 
-                        const color = `hsl(${hue}, ${sat}%, 50%)`;
+                const linecoords = [];
+                const group = L.layerGroup();
 
-                        L.circle([coord.latitude, coord.longitude], {
-                            ctimestamp: coord.timestamp,
-                            radius: cradius,
-                            color: color,
-                            fillColor: color,
-                            weight: 1,
-                            opacity: 0.8,
-                            fillOpacity: 0.5,
-                            pmIgnore: true,
-                            pane: layerOrders.routes.pane,
-                        })
-                        .bindPopup(this.build_prioq_popup)
-                        .addTo(group);
+                // only display first 10 entries of the queue
+                const now = Math.round((new Date()).getTime() / 1000);
+                route.coordinates.slice(0, 14).forEach(function (coord, index) {
+                    const until = coord.timestamp - now;
+                    let hue;
+                    let sat;
+
+                    if (until < 0) {
+                        hue = 0;
+                        sat = 100;
+                    }
+                    else {
+                        hue = 120;
+                        sat = (index * 100) / 15;
+                    }
 
-                        linecoords.push([coord.latitude, coord.longitude]);
-                    }, this);
+                    const color = `hsl(${hue}, ${sat}%, 50%)`;
 
-                    // add route to layergroup
-                    L.polyline(linecoords, {
-                        "color": "#000000",
-                        "weight": 2,
-                        "opacity": 0.2,
-                        "pane": layerOrders.routes.pane,
-                        "pmIgnore": true
+                    L.circle([coord.latitude, coord.longitude], {
+                        ctimestamp: coord.timestamp,
+                        radius: cradius,
+                        color: color,
+                        fillColor: color,
+                        weight: 1,
+                        opacity: 0.8,
+                        fillOpacity: 0.5,
+                        pmIgnore: true,
+                        pane: layerOrders.routes.pane,
                     })
-                    .bindPopup(this.build_prioq_route_popup(route), { className: "routepopup" })
+                    .bindPopup(this.build_prioq_popup)
                     .addTo(group);
 
-                    // add layergroup to management object
-                    leaflet_data.prioroutes[name] = group;
+                    linecoords.push([coord.latitude, coord.longitude]);
+                }, this);
 
-                    const settings = {
-                        "show": this.getStoredSetting("layers-dyn-prioroutes-" + name, false),
-                        "mode": mode
-                    };
+                // add route to layergroup
+                L.polyline(linecoords, {
+                    "color": "#000000",
+                    "weight": 2,
+                    "opacity": 0.2,
+                    "pane": layerOrders.routes.pane,
+                    "pmIgnore": true
+                })
+                .bindPopup(this.build_prioq_route_popup(route), { className: "routepopup" })
+                .addTo(group);
 
-                    this.$set(this.layers.dyn.prioroutes, name, settings);
+                // add layergroup to management object
+                leaflet_data.prioroutes[name] = group;
 
-                }, this);
-            });
+                const settings = {
+                    "show": this.getStoredSetting("layers-dyn-prioroutes-" + name, false),
+                    "mode": mode
+                };
+
+                this.$set(this.layers.dyn.prioroutes, name, settings);
+
+            }, this);
         },
         map_fetch_spawns(urlFilter) {
-            this.mapGuardedFetch("spawns", "get_spawns" + urlFilter, function (res) {
+            this.mapGuardedFetch("spawns", "get_spawns" + urlFilter + "&layout=columnar", function (res) {
                 res.data.forEach(function (spawns) {
                     const eventName = spawns["EVENT"];
 
-                    spawns["Coords"].forEach(function (spawn) {
+                    rowsOfColumns(spawns["Coords"]).forEach(function (spawn) {
                         let color;
 
                         if (spawn["endtime"] !== null) {
@@ -904,10 +960,10 @@ new Vue({
                 return;
             }
 
-            this.mapGuardedFetch("cellupdates", "get_cells" + urlFilter, function (res) {
+            this.mapGuardedFetch("cellupdates", "get_cells" + urlFilter + "&layout=columnar", function (res) {
                 const now = Math.round((new Date()).getTime() / 1000);
 
-                res.data.forEach(function (cell) {
+                rowsOfColumns(res.data).forEach(function (cell) {
                     const id = cell["id"];
 
                     if (this.cellupdates[id]) {
@@ -2279,6 +2335,7 @@ if (route.mode === "mon_mitm" && typeof route.editableId === "number") {
 
             // initial load
             this.map_fetch_everything();
+            this.map_subscribe_state_feed();
 
             // intervals
             setInterval(this.map_fetch_everything, 6000);
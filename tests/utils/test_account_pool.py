@@ -0,0 +1,89 @@
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from mapadroid.account_handler.AbstractAccountHandler import AccountPurpose
+from mapadroid.account_handler.AccountPool import AccountPool
+from mapadroid.db.helper.SettingsPogoauthHelper import SettingsPogoauthHelper
+from mapadroid.db.model import SettingsPogoauth
+from mapadroid.utils.madGlobals import MadGlobals
+
+
+class FakeSession:
+    def __init__(self, db_wrapper):
+        self.db_wrapper = db_wrapper
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def expunge_all(self):
+        pass
+
+    async def commit(self):
+        self.db_wrapper.commits += 1
+
+    async def rollback(self):
+        self.db_wrapper.rollbacks += 1
+
+
+class FakeDbWrapper:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def __aenter__(self):
+        return FakeSession(self)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def get_instance_id(self):
+        return 1
+
+
+class TestAccountPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.application_args = MadGlobals.application_args
+        MadGlobals.application_args = types.SimpleNamespace(account_pool_resync_interval=60)
+        # account_id -> device_id as stored in the DB
+        self.assigned_in_db = {1: None, 2: None}
+        self.db_wrapper = FakeDbWrapper()
+        self.pool = AccountPool(self.db_wrapper)
+
+    def tearDown(self) -> None:
+        MadGlobals.application_args = self.application_args
+
+    async def __get_all(self, session, instance_id):
+        return [SettingsPogoauth(account_id=account_id, device_id=device_id, login_type="ptc",
+                                 username="user{}".format(account_id), level=30)
+                for account_id, device_id in self.assigned_in_db.items()]
+
+    async def __assign_to_device(self, session, device_id, account_id):
+        if account_id not in self.assigned_in_db or self.assigned_in_db[account_id] not in (None, device_id):
+            return False
+        self.assigned_in_db[account_id] = device_id
+        return True
+
+    def test_acquire_resyncs_if_account_was_assigned_elsewhere(self):
+        async def acquire_after_other_process_assigned():
+            await self.pool.sync()
+            # Assigned by another process after the pool was loaded, account 1 would be picked first otherwise
+            self.assigned_in_db[1] = 9
+            return await self.pool.acquire(5, AccountPurpose.IV, lambda auth: True, None)
+
+        with mock.patch.object(SettingsPogoauthHelper, "get_all", side_effect=self.__get_all), \
+                mock.patch.object(SettingsPogoauthHelper, "assign_to_device", side_effect=self.__assign_to_device):
+            auth = asyncio.run(acquire_after_other_process_assigned())
+        self.assertEqual(auth.account_id, 2)
+        self.assertEqual(self.assigned_in_db, {1: 9, 2: 5})
+        self.assertEqual(self.db_wrapper.rollbacks, 1)
+        self.assertEqual(self.pool.get_assigned(9).account_id, 1)
+        self.assertEqual(self.pool.get_assigned(5).account_id, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from mapadroid.utils.geo import (get_distance_matrix_in_meters,
+                                 get_distance_of_two_points_in_meters,
+                                 get_distances_in_meters, get_nearest)
+from mapadroid.utils.s2Helper import S2Helper
+
+
+class TestGeo(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1)
+        # Random coords all over the world along with the poles, the antimeridian and the corners of a face
+        self.lats = np.concatenate([rng.uniform(-90, 90, 2000), [90, -90, 0, 0, 35.264389682754654]])
+        self.lngs = np.concatenate([rng.uniform(-180, 180, 2000), [0, 0, 180, -180, 45]])
+
+    def test_distances_match_scalar(self):
+        distances = get_distances_in_meters(52.516499, 13.380591, self.lats, self.lngs)
+        for lat, lng, distance in zip(self.lats, self.lngs, distances):
+            self.assertAlmostEqual(get_distance_of_two_points_in_meters(52.516499, 13.380591, lat, lng), distance,
+                                   places=3)
+        matrix = get_distance_matrix_in_meters(self.lats[:20], self.lngs[:20])
+        self.assertEqual(matrix.shape, (20, 20))
+        self.assertAlmostEqual(matrix[3][7], get_distance_of_two_points_in_meters(self.lats[3], self.lngs[3],
+                                                                                  self.lats[7], self.lngs[7]),
+                               places=3)
+
+    def test_nearest(self):
+        self.assertIsNone(get_nearest(0, 0, [], []))
+        index, distance = get_nearest(52.0, 13.0, [52.1, 52.001, 51.9], [13.0, 13.0, 13.0])
+        self.assertEqual(index, 1)
+        self.assertAlmostEqual(distance, get_distance_of_two_points_in_meters(52.0, 13.0, 52.001, 13.0))
+
+    def test_cell_ids_match_scalar(self):
+        for level in (10, 15, 17, 30):
+            cell_ids = S2Helper.lat_lng_to_cell_ids(self.lats, self.lngs, level)
+            self.assertEqual([S2Helper.lat_lng_to_cell_id(lat, lng, level) for lat, lng in zip(self.lats, self.lngs)],
+                             cell_ids.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from mapadroid.madmin.MapDataCache import DELTA_INTERVAL, MapDataCache, MapDataEntry
+from mapadroid.utils.collections import Location
+
+
+class TestMapDataCache(unittest.TestCase):
+    def test_raid_ending_between_deltas(self):
+        now = 1_800_000_000
+        gym = {"id": "gym", "team_id": 1, "raid": {"end": now + 7}}
+        fetched_since = []
+
+        async def fetcher(ne_corner, sw_corner, timestamp, cached):
+            fetched_since.append(timestamp)
+            if timestamp is not None:
+                # Nothing is written to the DB when the raid ends
+                return {}
+            return {"gym": MapDataEntry(latitude=50.0, longitude=8.0, modified=now, serialized=gym,
+                                        expires=now + 7, expired_serialized=dict(gym, raid=None))}
+
+        async def get_gyms():
+            entries, version, _ = await cache.get_entries("gyms", fetcher, Location(50.0001, 8.0001),
+                                                          Location(49.9999, 7.9999))
+            return entries["gym"].serialized, version
+
+        cache = MapDataCache()
+        with mock.patch("mapadroid.madmin.MapDataCache.time.time", return_value=now):
+            gym_with_raid, version_with_raid = asyncio.run(get_gyms())
+        with mock.patch("mapadroid.madmin.MapDataCache.time.time", return_value=now + DELTA_INTERVAL + 1):
+            self.assertEqual(asyncio.run(get_gyms()), (gym_with_raid, version_with_raid))
+        with mock.patch("mapadroid.madmin.MapDataCache.time.time", return_value=now + 2 * DELTA_INTERVAL + 2):
+            gym_after_raid, version_after_raid = asyncio.run(get_gyms())
+
+        self.assertEqual(len(fetched_since), 3)
+        self.assertIsNone(fetched_since[0])
+        self.assertIsNotNone(fetched_since[2])
+        self.assertEqual(gym_with_raid["raid"], {"end": now + 7})
+        self.assertIsNone(gym_after_raid["raid"])
+        self.assertEqual(gym_after_raid["team_id"], 1)
+        self.assertNotEqual(version_with_raid, version_after_raid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import unittest
+
+from mapadroid.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def test_exposition(self):
+        counter = Counter("test_requests", "Requests \"received\"", ["type"], registry=self.registry)
+        gauge = Gauge("test_queue_size", "Items queued", registry=self.registry)
+        histogram = Histogram("test_seconds", "Seconds spent", ["method"], buckets=(0.1, 1.0),
+                              registry=self.registry)
+        counter.labels(101).inc()
+        counter.labels(101).inc(2)
+        gauge.set_function(lambda: 7)
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.labels("mons").observe(value)
+        self.assertEqual(self.registry.generate().splitlines(), [
+            '# TYPE test_requests counter',
+            '# HELP test_requests Requests \\"received\\"',
+            'test_requests_total{type="101"} 3.0',
+            '# TYPE test_queue_size gauge',
+            '# HELP test_queue_size Items queued',
+            'test_queue_size 7.0',
+            '# TYPE test_seconds histogram',
+            '# HELP test_seconds Seconds spent',
+            'test_seconds_bucket{method="mons",le="0.1"} 2',
+            'test_seconds_bucket{method="mons",le="1.0"} 3',
+            'test_seconds_bucket{method="mons",le="+Inf"} 4',
+            'test_seconds_count{method="mons"} 4',
+            'test_seconds_sum{method="mons"} 3.65',
+            '# EOF'])
+        with self.assertRaises(ValueError):
+            Counter("test_requests", "Registered twice", registry=self.registry)
+        with self.assertRaises(ValueError):
+            counter.labels()
+
+    def test_threads_and_timer(self):
+        counter = Counter("test_increments", "Increments", registry=self.registry)
+        histogram = Histogram("test_timed_seconds", "Seconds", registry=self.registry)
+
+        def increment():
+            for _ in range(10000):
+                counter.inc()
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.labels().get(), 40000)
+
+        @histogram.time()
+        async def timed_coroutine():
+            await asyncio.sleep(0.01)
+            return 1
+        self.assertEqual(asyncio.run(timed_coroutine()), 1)
+        with histogram.time():
+            pass
+        self.assertEqual(sum(histogram.labels().get_counts()), 2)
+        self.assertGreaterEqual(histogram.labels().get_sum(), 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from mapadroid.ocr import utils
+from mapadroid.ocr.screen_type import ScreenType
+
+
+class TestScreenDetectionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        utils.clear_screen_detection_cache()
+        fd, self.path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+        Image.new("RGB", (1080, 1920), (40, 120, 200)).save(self.path)
+
+    def tearDown(self) -> None:
+        utils.clear_screen_detection_cache()
+        os.remove(self.path)
+
+    def test_only_known_screens_are_cached(self):
+        words = {"text": ["Password"], "top": [1000], "left": [0], "width": [10], "height": [10]}
+        roi = mock.Mock(side_effect=[(ScreenType.UNDEFINED, {}), (ScreenType.PTC, words)])
+        full = mock.Mock(return_value=(ScreenType.UNDEFINED, {}))
+        with mock.patch.object(utils, "_detect_in_region_of_interest", roi), \
+                mock.patch.object(utils, "_detect_in_full_frame", full):
+            self.assertEqual(utils.screendetection_get_type_internal(self.path, "test")[0], ScreenType.UNDEFINED)
+            self.assertEqual(utils.screendetection_get_type_internal(self.path, "test")[0], ScreenType.PTC)
+            self.assertEqual(utils.screendetection_get_type_internal(self.path, "test")[:2], (ScreenType.PTC, words))
+        self.assertEqual(roi.call_count, 2)
+        self.assertEqual(full.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, timezone
+
+from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.route.SpawnSchedule import SpawnSchedule
+
+
+class TestSpawnSchedule(unittest.TestCase):
+    def setUp(self) -> None:
+        self.schedule = SpawnSchedule(GeofenceHelper(None, None), None)
+        # spawnpoint, latitude, longitude, spawndef, despawn_sec
+        self.schedule.merge([(1, 50.0, 8.0, 240, 1900),
+                             (2, 50.1, 8.1, 15, 3500),
+                             (3, 50.2, 8.2, 240, 1000),
+                             (4, 50.3, 8.3, 240, 2400)])
+        self.now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_next_spawns(self):
+        timestamp = int(self.now.timestamp())
+        # Spawns at second 100 (30 minutes before despawning) and 600 of the hour
+        self.assertEqual([(timestamp + 100, 50.0, 8.0), (timestamp + 600, 50.3, 8.3)],
+                         [(spawn_time, location.lat, location.lng)
+                          for spawn_time, location in self.schedule.get_spawns_between(self.now, 600)])
+
+    def test_next_spawns_wrap_around_the_hour(self):
+        now = self.now.replace(minute=55)
+        timestamp = int(now.timestamp())
+        # Spawns at second 3500 (an hour before despawning) and 100 of the next hour
+        self.assertEqual([timestamp + 200, timestamp + 400],
+                         [spawn_time for spawn_time, _ in self.schedule.get_spawns_between(now, 600)])
+        self.assertEqual(4, len(self.schedule.get_spawns_between(now)))
+
+    def test_merge_replaces_spawnpoints(self):
+        self.schedule.merge([(1, 50.0, 8.0, 240, 2000)])
+        self.assertEqual(4, len(self.schedule))
+        self.assertEqual([int(self.now.timestamp()) + 200],
+                         [spawn_time for spawn_time, location in self.schedule.get_spawns_between(self.now, 300)])
+
+
+if __name__ == '__main__':
+    unittest.main()